@@ -143,6 +143,22 @@ async def _lifespan(_app: FastAPI):
         except Exception:
             logging.warning("Session score backfill failed", exc_info=True)
 
+        # Drain legacy per-sample WHOOP HR/RR rows into the chunk store (idempotent).
+        try:
+            from rivaflow.db.compact_whoop_streams import compact_legacy_streams
+
+            compact_legacy_streams()
+        except Exception:
+            logging.warning("WHOOP stream compaction failed", exc_info=True)
+
+        # Pack legacy JSON session HR lines into garmin_hr_packed (idempotent).
+        try:
+            from rivaflow.db.repositories.session_repo import SessionRepository
+
+            SessionRepository.pack_legacy_hr_series()
+        except Exception:
+            logging.warning("Session HR series packing failed", exc_info=True)
+
     if not settings.IS_TEST:
         try:
             _start_scheduler_if_enabled()
@@ -8,7 +8,7 @@ from rivaflow.api.rate_limit import limiter
 from rivaflow.core.dependencies import get_analytics_service, get_current_user
 from rivaflow.core.error_handling import route_error_handler
 from rivaflow.core.exceptions import NotFoundError, ValidationError
-from rivaflow.core.services import whoop_dashboard_analytics
+from rivaflow.core.services import hrv_lab, whoop_daily_agg, whoop_dashboard_analytics
 from rivaflow.core.services.analytics_service import AnalyticsService
 from rivaflow.core.services.fight_dynamics_service import FightDynamicsService
 from rivaflow.core.utils.cache import cached
@@ -1009,3 +1009,44 @@ def get_whoop_readiness_model(
 ):
     """Recovery readiness model. Cached 10 min."""
     return _get_whoop_readiness_model_cached(user_id=current_user["id"], days=days)
+
+
+@cached(ttl_seconds=600, key_prefix="whoop_circadian")
+def _get_whoop_circadian_cached(user_id: int, days: int = 56, window_days: int = 7):
+    return whoop_daily_agg.circadian_rhythm(user_id, days, window_days)
+
+
+@router.get("/whoop/circadian")
+@limiter.limit("60/minute")
+@route_error_handler("whoop circadian")
+def get_whoop_circadian(
+    request: Request,
+    days: int = Query(default=56, ge=14, le=365),
+    window_days: int = Query(default=7, ge=3, le=28),
+    current_user: dict = Depends(get_current_user),
+):
+    """Rolling HR cosinor (mesor, amplitude, acrophase) and rhythm drift. Cached 10 min.
+
+    Only the last week of rollups is re-derived in the request; older days are
+    served as stored by the nightly rollup backfill.
+    """
+    return _get_whoop_circadian_cached(
+        user_id=current_user["id"], days=days, window_days=window_days
+    )
+
+
+@cached(ttl_seconds=600, key_prefix="whoop_hrv_lab")
+def _get_whoop_hrv_lab_cached(user_id: int, days: int = 28):
+    return hrv_lab.trend(user_id, days)
+
+
+@router.get("/whoop/hrv-lab")
+@limiter.limit("60/minute")
+@route_error_handler("whoop hrv lab")
+def get_whoop_hrv_lab(
+    request: Request,
+    days: int = Query(default=28, ge=7, le=365),
+    current_user: dict = Depends(get_current_user),
+):
+    """Nightly spectral / non-linear HRV trend from the stored HRV lab nights. Cached 10 min."""
+    return _get_whoop_hrv_lab_cached(user_id=current_user["id"], days=days)
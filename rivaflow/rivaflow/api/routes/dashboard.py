@@ -15,60 +15,12 @@ from rivaflow.core.services.readiness_service import ReadinessService
 from rivaflow.core.services.session_service import SessionService
 from rivaflow.core.services.streak_service import StreakService
 from rivaflow.core.utils.cache import cached
-from rivaflow.db.database import convert_query, get_connection
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
-def _calculate_daily_streak(user_id: int) -> int:
-    """Count consecutive days with at least one session, working back from today/yesterday."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            convert_query("""
-                SELECT DISTINCT session_date::date AS d
-                FROM sessions
-                WHERE user_id = ?
-                ORDER BY d DESC
-            """),
-            (user_id,),
-        )
-        rows = cursor.fetchall()
-
-    if not rows:
-        return 0
-
-    from datetime import date as dt_date
-
-    session_dates = sorted(
-        [
-            (
-                dict(r)["d"]
-                if isinstance(dict(r)["d"], dt_date)
-                else dt_date.fromisoformat(str(dict(r)["d"])[:10])
-            )
-            for r in rows
-        ],
-        reverse=True,
-    )
-
-    today = dt_date.today()
-    # Current streak starts if most recent session is today or yesterday
-    if session_dates[0] < today - timedelta(days=1):
-        return 0
-
-    streak = 1
-    for i in range(1, len(session_dates)):
-        if session_dates[i] == session_dates[i - 1] - timedelta(days=1):
-            streak += 1
-        else:
-            break
-
-    return streak
-
-
 @cached(ttl_seconds=300, key_prefix="dashboard_summary")
 def _get_dashboard_summary_cached(
     user_id: int,
@@ -213,12 +165,13 @@ def get_quick_stats(
     # Get user stats efficiently (no unbounded query)
     stats = session_service.session_repo.get_user_stats(user_id)
 
-    # Weekly training streak — count consecutive weeks with at least one session
+    # Daily training streak — read from the maintained streak state
     try:
-        weekly_streak = _calculate_daily_streak(user_id)
+        training_streak = StreakService().get_streak(user_id, "training")
+        daily_streak = training_streak["current_streak"]
     except Exception as e:
-        logger.warning("Weekly streak calculation failed: %s", e)
-        weekly_streak = 0
+        logger.warning("Training streak lookup failed: %s", e)
+        daily_streak = 0
 
     # Next milestone
     closest_milestone = milestone_service.get_closest_milestone(user_id)
@@ -226,7 +179,7 @@ def get_quick_stats(
     return {
         "total_sessions": stats["total_sessions"],
         "total_hours": stats["total_hours"],
-        "current_streak": weekly_streak,
+        "current_streak": daily_streak,
         "next_milestone": closest_milestone,
     }
 
@@ -33,15 +33,23 @@ def ingest_daily(
     payload: GarminDailyIngest,
     current_user: dict = Depends(get_current_user),
 ) -> dict:
-    """Upsert a batch of daily Garmin metrics for the authenticated user."""
+    """Upsert a batch of daily Garmin metrics for the authenticated user.
+
+    The whole batch is written with one statement per few hundred days, so a multi-month backfill is a
+    single request.
+    """
     user_id: int = current_user["id"]
-    count = 0
-    for metric in payload.metrics:
-        fields = metric.model_dump(exclude={"metric_date"})
-        GarminDailyRepository.upsert(user_id, metric.metric_date, **fields)
-        count += 1
-    logger.info("Garmin daily ingest — user_id=%s upserted=%s", user_id, count)
-    return {"upserted": count}
+    counts = GarminDailyRepository.upsert_many(
+        user_id, [metric.model_dump() for metric in payload.metrics]
+    )
+    logger.info(
+        "Garmin daily ingest — user_id=%s received=%s inserted=%s updated=%s",
+        user_id,
+        len(payload.metrics),
+        counts["inserted"],
+        counts["updated"],
+    )
+    return {"upserted": counts["inserted"] + counts["updated"], **counts}
 
 
 @router.get("/daily")
@@ -4,7 +4,7 @@ import csv
 import io
 from datetime import date
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import StreamingResponse
 
 from rivaflow.api.rate_limit import limiter
@@ -66,6 +66,33 @@ def get_range_report(
     return report
 
 
+@router.get("/compare")
+@limiter.limit("30/minute")
+@route_error_handler("compare_reports", detail="Failed to compare reports")
+def compare_reports(
+    request: Request,
+    period: str = Query("month", pattern="^(week|month)$"),
+    count: int = Query(6, ge=2, le=24),
+    target_date: date = None,  # type: ignore[assignment]
+    tz: str | None = Query(None, description="IANA timezone, e.g. Australia/Sydney"),
+    current_user: dict = Depends(get_current_user),
+    service: ReportService = Depends(get_report_service),
+):
+    """Compare summaries across the last N weeks or months.
+
+    Without target_date the newest period is the one containing the user's
+    local today (tz, else their profile timezone).
+    """
+    periods = service.compare_periods(
+        user_id=current_user["id"],
+        period_type=period,
+        count=count,
+        target_date=target_date,
+        tz=tz,
+    )
+    return {"period": period, "periods": periods}
+
+
 @router.get("/week/csv")
 @limiter.limit("60/minute")
 @route_error_handler("export_week_csv", detail="Failed to export CSV")
@@ -445,6 +445,28 @@ def get_session(
     return session
 
 
+@router.get("/{session_id}/hr-series")
+@route_error_handler("get_session_hr_series", detail="Failed to get HR series")
+def get_session_hr_series(
+    session_id: int,
+    points: int | None = Query(
+        default=None,
+        ge=3,
+        le=2000,
+        description="Downsample to at most this many points (LTTB). Full series if omitted.",
+    ),
+    current_user: dict = Depends(get_current_user),
+    service: SessionService = Depends(get_session_service),
+):
+    """Get a session's HR line as [offset_sec, bpm] pairs for the detail chart."""
+    series = service.get_hr_series(
+        user_id=current_user["id"], session_id=session_id, max_points=points
+    )
+    if series is None:
+        raise NotFoundError(f"Session {session_id} not found or access denied")
+    return series
+
+
 @router.get("/", response_model=list[SessionResponse])
 @route_error_handler("list_sessions", detail="Failed to list sessions")
 def list_sessions(
@@ -68,6 +68,23 @@ def banister_trimp(
     return total
 
 
+def banister_trimp_ms(ts_ms, bpm, max_hr: float, rest_hr: float) -> float:
+    """banister_trimp over parallel, already time-ordered epoch-ms / bpm sequences (the chunk store's
+    array views) — the same gap-clamped HRR weighting, without building a datetime per sample.
+    """
+    if not ts_ms or max_hr <= rest_hr:
+        return 0.0
+    hrr = max_hr - rest_hr
+    total = 0.0
+    for i in range(1, len(ts_ms)):
+        gap = (ts_ms[i] - ts_ms[i - 1]) / 1000.0
+        if gap > 0:
+            dur_min = min(gap, _GAP_CLAMP_SEC) / 60.0
+            x = max(0.0, min(1.0, (bpm[i] - rest_hr) / hrr))
+            total += dur_min * x * _MALE_K * exp(_MALE_E * x)
+    return total
+
+
 def session_load(
     samples: list[tuple[datetime, int]], max_hr: float, rest_hr: float
 ) -> float:
@@ -2,53 +2,195 @@
 
 Cosinor fit of time-of-day HR/HRV (WHOOP_FUTURE_STATE_PLAN.md B17): mesor, amplitude, acrophase + the
 nocturnal HR dip — reproducible from HR timing, relevant to Ruby's fixed >9h need and Sabbath rhythm.
+
+The fit only needs nine sums of the cos/sin/y cross-products (``CosinorSums``), and sums add. So a day's
+samples are reduced once to its sums (the whoop_daily_agg rollup stores them), and any run of days is fit
+from the days' sums. ``rolling_cosinor`` takes prefix sums over a daily series, so every sliding window is
+one subtraction and one 2x2 solve however long the window, and ``rhythm_drift`` summarises how the
+windows' mesor, amplitude and acrophase move.
 """
 
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
+from dataclasses import astuple, dataclass
+from itertools import accumulate
 from math import atan2, cos, pi, sin
-from statistics import mean
 
 OMEGA = 2 * pi / 24.0  # one cycle per 24h
+MIN_POINTS = 8
+# Centred sums from raw ones cancel to rounding noise, not exactly 0, when every point sits at one hour
+_DEGENERATE_EPS = 1e-9
+
+
+@dataclass
+class CosinorSums:
+    """Sufficient statistics of a cosinor fit: count, then sums of c, s, y, c², s², c·s, c·y, s·y for
+    c = cos(ωt), s = sin(ωt). ``as_list``/``from_list`` round-trip them through JSON."""
+
+    n: float = 0.0
+    sc: float = 0.0
+    ss: float = 0.0
+    sy: float = 0.0
+    scc: float = 0.0
+    sss: float = 0.0
+    scs: float = 0.0
+    scy: float = 0.0
+    ssy: float = 0.0
+
+    @classmethod
+    def from_samples(
+        cls, hours: Sequence[float], values: Sequence[float]
+    ) -> CosinorSums:
+        sums = cls()
+        for h, y in zip(hours, values):
+            sums.add(h, y)
+        return sums
+
+    @classmethod
+    def from_list(cls, values: Sequence[float]) -> CosinorSums:
+        return cls(*values)
+
+    def as_list(self) -> list[float]:
+        return list(astuple(self))
+
+    def add(self, hour: float, value: float) -> None:
+        c, s = cos(OMEGA * hour), sin(OMEGA * hour)
+        self.n += 1
+        self.sc += c
+        self.ss += s
+        self.sy += value
+        self.scc += c * c
+        self.sss += s * s
+        self.scs += c * s
+        self.scy += c * value
+        self.ssy += s * value
+
+    def __add__(self, other: CosinorSums) -> CosinorSums:
+        return CosinorSums(*(a + b for a, b in zip(astuple(self), astuple(other))))
+
+    def __sub__(self, other: CosinorSums) -> CosinorSums:
+        return CosinorSums(*(a - b for a, b in zip(astuple(self), astuple(other))))
+
+    def fit(self) -> dict:
+        """``cosinor``'s result from the sums alone."""
+        n = round(self.n)
+        if n < MIN_POINTS:
+            return {
+                "available": False,
+                "reason": "Need ≥8 time-stamped points across the day.",
+            }
+        # Regress y = M + b·cos(ωt) + c·sin(ωt) via normal equations on the centred sums
+        m_c, m_s, m_y = self.sc / n, self.ss / n, self.sy / n
+        scc = self.scc - self.sc * m_c
+        sss = self.sss - self.ss * m_s
+        scs = self.scs - self.sc * m_s
+        scy = self.scy - self.sc * m_y
+        ssy = self.ssy - self.ss * m_y
+        det = scc * sss - scs * scs
+        if det <= _DEGENERATE_EPS * n * n:
+            return {
+                "available": False,
+                "reason": "Time points too clustered to fit a rhythm.",
+            }
+        b = (scy * sss - ssy * scs) / det
+        c = (ssy * scc - scy * scs) / det
+        mesor = m_y - b * m_c - c * m_s
+        amplitude = (b * b + c * c) ** 0.5
+        acrophase_hour = (atan2(c, b) / OMEGA) % 24.0
+        return {
+            "available": True,
+            "mesor": round(mesor, 1),
+            "amplitude": round(amplitude, 1),
+            "acrophase_hour": round(acrophase_hour, 1),
+            "n": n,
+            "headline": f"Daily HR rhythm peaks around {round(acrophase_hour, 1)}h, amplitude {round(amplitude, 1)} bpm.",
+        }
 
 
 def cosinor(hours: list[float], values: list[float]) -> dict:
     """Least-squares cosinor: value ≈ M + A·cos(ω(t − φ)). Returns mesor M, amplitude A, and acrophase φ
     (hour of peak). Needs points spread across the day."""
-    n = len(hours)
-    if n < 8 or len(values) != n:
+    if len(values) != len(hours):
         return {
             "available": False,
             "reason": "Need ≥8 time-stamped points across the day.",
         }
-    # Regress y = M + b·cos(ωt) + c·sin(ωt) via normal equations (closed form).
-    cs = [cos(OMEGA * h) for h in hours]
-    sn = [sin(OMEGA * h) for h in hours]
-    m_y = mean(values)
-    m_c = mean(cs)
-    m_s = mean(sn)
-    # centred sums
-    scc = sum((c - m_c) ** 2 for c in cs)
-    sss = sum((s - m_s) ** 2 for s in sn)
-    scs = sum((c - m_c) * (s - m_s) for c, s in zip(cs, sn))
-    scy = sum((c - m_c) * (y - m_y) for c, y in zip(cs, values))
-    ssy = sum((s - m_s) * (y - m_y) for s, y in zip(sn, values))
-    det = scc * sss - scs * scs
-    if det == 0:
+    return CosinorSums.from_samples(hours, values).fit()
+
+
+def rolling_cosinor(
+    daily: Sequence[CosinorSums | None], window_days: int = 7
+) -> list[dict]:
+    """One fit per full ``window_days`` window ending on each day of ``daily`` (one entry per consecutive
+    day, None for a day without data), in order. Each result carries ``end_index`` (into ``daily``) and
+    ``days_with_data``, and fits from prefix sums, so the whole series costs O(len(daily)).
+    """
+    zero = CosinorSums()
+    prefix = [zero, *accumulate((d or zero for d in daily), lambda a, b: a + b)]
+    present = [0, *accumulate(d is not None for d in daily)]
+    fits = []
+    for end in range(window_days, len(daily) + 1):
+        fit = (prefix[end] - prefix[end - window_days]).fit()
+        fit["end_index"] = end - 1
+        fit["days_with_data"] = present[end] - present[end - window_days]
+        fits.append(fit)
+    return fits
+
+
+def rolling_cosinor_by_user(
+    daily_by_user: Mapping[int, Sequence[CosinorSums | None]], window_days: int = 7
+) -> dict[int, list[dict]]:
+    """``rolling_cosinor`` for a cohort, keyed like ``daily_by_user``."""
+    return {
+        user_id: rolling_cosinor(daily, window_days)
+        for user_id, daily in daily_by_user.items()
+    }
+
+
+def _slope(xs: list[float], ys: list[float]) -> float:
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx if sxx else 0.0
+
+
+def rhythm_drift(fits: list[dict], min_windows: int = 3) -> dict:
+    """How the rhythm moves across ``rolling_cosinor`` windows: least-squares trends per week of mesor,
+    amplitude and acrophase, and the change first → last window. Acrophase is unwrapped across midnight
+    before fitting, so a peak sliding from 23.5h to 0.5h reads as +1h, not −23h."""
+    usable = [f for f in fits if f.get("available")]
+    if len(usable) < min_windows:
         return {
             "available": False,
-            "reason": "Time points too clustered to fit a rhythm.",
+            "reason": f"Need ≥{min_windows} windows with a fitted rhythm.",
         }
-    b = (scy * sss - ssy * scs) / det
-    c = (ssy * scc - scy * scs) / det
-    mesor = m_y - b * m_c - c * m_s
-    amplitude = (b * b + c * c) ** 0.5
-    acrophase_hour = (atan2(c, b) / OMEGA) % 24.0
+    days = [f["end_index"] for f in usable]
+    phases = [usable[0]["acrophase_hour"]]
+    for f in usable[1:]:
+        step = (f["acrophase_hour"] - phases[-1] + 12.0) % 24.0 - 12.0
+        phases.append(phases[-1] + step)
+    acrophase_per_week = round(_slope(days, phases) * 7, 2)
+    shift = round(phases[-1] - phases[0], 1)
+    if acrophase_per_week >= 0.25:
+        direction = "later"
+    elif acrophase_per_week <= -0.25:
+        direction = "earlier"
+    else:
+        direction = "stable"
     return {
         "available": True,
-        "mesor": round(mesor, 1),
-        "amplitude": round(amplitude, 1),
-        "acrophase_hour": round(acrophase_hour, 1),
-        "n": n,
-        "headline": f"Daily HR rhythm peaks around {round(acrophase_hour, 1)}h, amplitude {round(amplitude, 1)} bpm.",
+        "windows": len(usable),
+        "acrophase_hour": usable[-1]["acrophase_hour"],
+        "acrophase_shift_hours": shift,
+        "acrophase_per_week": acrophase_per_week,
+        "mesor_per_week": round(_slope(days, [f["mesor"] for f in usable]) * 7, 2),
+        "amplitude_per_week": round(
+            _slope(days, [f["amplitude"] for f in usable]) * 7, 2
+        ),
+        "direction": direction,
+        "headline": (
+            f"HR rhythm peak is drifting {direction} ({acrophase_per_week:+.2f} h/week)."
+            if direction != "stable"
+            else f"HR rhythm peak is steady around {usable[-1]['acrophase_hour']}h."
+        ),
     }
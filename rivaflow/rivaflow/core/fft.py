@@ -0,0 +1,60 @@
+"""Stdlib-only radix-2 FFT shared by the spectral cores (hrv_spectral, respiratory_spectral).
+
+The physiology cores are deliberately numpy-free, so this is a plain iterative Cooley-Tukey transform over
+Python complex numbers: O(n log n) for power-of-two n, with the twiddle factors computed once per stage.
+"""
+
+from __future__ import annotations
+
+from cmath import exp
+from math import pi
+
+
+def next_pow2(n: int) -> int:
+    """Smallest power of two >= n (1 for n <= 1)."""
+    size = 1
+    while size < n:
+        size <<= 1
+    return size
+
+
+def fft(values: list[complex], inverse: bool = False) -> list[complex]:
+    """Discrete Fourier transform X[k] = sum_m x[m]·exp(∓2πi·km/n), unnormalised.
+
+    `inverse=True` flips the exponent sign (+) WITHOUT the 1/n scale — callers that want the true inverse
+    divide themselves. `len(values)` must be a power of two.
+    """
+    n = len(values)
+    if n & (n - 1):
+        raise ValueError(f"fft length must be a power of two, got {n}")
+    out = list(values)
+    # bit-reversal permutation
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            out[i], out[j] = out[j], out[i]
+
+    sign = 1.0 if inverse else -1.0
+    size = 2
+    while size <= n:
+        half = size // 2
+        twiddles = [exp(sign * 2j * pi * k / size) for k in range(half)]
+        for start in range(0, n, size):
+            for k in range(half):
+                a = out[start + k]
+                b = out[start + k + half] * twiddles[k]
+                out[start + k] = a + b
+                out[start + k + half] = a - b
+        size <<= 1
+    return out
+
+
+def rfft_power(values: list[float], size: int) -> list[float]:
+    """|X[k]|² for k = 0..size/2 of a real series zero-padded to `size` (a power of two ≥ len(values))."""
+    spectrum = fft([complex(v) for v in values] + [0j] * (size - len(values)))
+    return [z.real * z.real + z.imag * z.imag for z in spectrum[: size // 2 + 1]]
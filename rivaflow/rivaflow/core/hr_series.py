@@ -0,0 +1,118 @@
+"""Per-session HR line (sessions.garmin_hr_packed): compact codec, lazy view and LTTB downsampling (pure core).
+
+The Air forward link pushes ``[offset_sec, bpm]`` pairs. They are stored as one small blob instead of JSON
+text: a codec byte, then zlib over the unsigned-varint deltas of the offsets followed by one uint8 per bpm
+(clamped to 0..255). ``HRSeries`` wraps a stored blob (or a legacy JSON string) and decodes only when the
+pairs are first asked for, so rows that carry the column but never chart it pay nothing.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+
+CODEC_VERSION = 1
+MAX_BPM = 255
+
+
+def encode(pairs: list[list[int]]) -> bytes:
+    """Pack ``[offset_sec, bpm]`` pairs (sorted by offset, offsets >= 0) into a blob."""
+    body = bytearray()
+    previous = 0
+    for offset, _ in pairs:
+        delta = int(offset) - previous
+        if delta < 0:
+            raise ValueError("HR series offsets must be non-decreasing and >= 0")
+        previous = int(offset)
+        while delta >= 0x80:
+            body.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        body.append(delta)
+    body.extend(min(max(int(bpm), 0), MAX_BPM) for _, bpm in pairs)
+    return bytes([CODEC_VERSION]) + zlib.compress(bytes(body))
+
+
+def pack(pairs: list[list[int]]) -> bytes:
+    """``encode`` for client-supplied pairs: sorted by offset, negative offsets dropped."""
+    return encode(sorted((p for p in pairs if int(p[0]) >= 0), key=lambda p: int(p[0])))
+
+
+def decode(payload: bytes) -> list[list[int]]:
+    """Unpack a blob written by ``encode`` back into ``[offset_sec, bpm]`` pairs."""
+    payload = bytes(payload)
+    if payload[0] != CODEC_VERSION:
+        raise ValueError(f"Unknown HR series codec {payload[0]}")
+    body = zlib.decompress(payload[1:])
+    offsets = []
+    pos = total = 0
+    # The bpm tail is one byte per sample, so the varint head ends where len(offsets) == len(tail)
+    while pos < len(body) - len(offsets):
+        shift = delta = 0
+        while True:
+            byte = body[pos]
+            pos += 1
+            delta |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        total += delta
+        offsets.append(total)
+    return [[offset, bpm] for offset, bpm in zip(offsets, body[pos:])]
+
+
+class HRSeries:
+    """Lazily decoded HR line: holds the stored value and decodes it on first access."""
+
+    __slots__ = ("_raw", "_pairs")
+
+    def __init__(self, raw: bytes | str | None):
+        self._raw = raw
+        self._pairs: list[list[int]] | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self._raw)
+
+    @property
+    def pairs(self) -> list[list[int]]:
+        if self._pairs is None:
+            if not self._raw:
+                self._pairs = []
+            elif isinstance(self._raw, str):  # legacy JSON text (migration 120)
+                self._pairs = json.loads(self._raw)
+            else:
+                self._pairs = decode(self._raw)
+        return self._pairs
+
+
+def lttb(pairs: list[list[int]], threshold: int) -> list[list[int]]:
+    """Largest-Triangle-Three-Buckets downsample to ``threshold`` points, keeping peaks and troughs.
+
+    Always keeps the first and last point. Series already at or under the threshold (or a threshold
+    below 3) come back unchanged.
+    """
+    n = len(pairs)
+    if threshold >= n or threshold < 3:
+        return list(pairs)
+
+    sampled = [pairs[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(pairs[j][0] for j in range(next_start, next_end)) / span
+        avg_y = sum(pairs[j][1] for j in range(next_start, next_end)) / span
+
+        ax, ay = pairs[a]
+        best_area, best = -1.0, int(i * every) + 1
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            x, y = pairs[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best_area, best = area, j
+        sampled.append(pairs[best])
+        a = best
+    sampled.append(pairs[-1])
+    return sampled
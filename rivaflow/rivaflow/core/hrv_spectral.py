@@ -7,6 +7,11 @@ review's guardrails baked in so the numbers are honest:
     spectral numbers with no defensible meaning. We refuse to compute on shorter windows.
   - **Lomb-Scargle, not FFT.** RR intervals are unevenly sampled in time; Lomb-Scargle handles that directly
     without the resampling artifact an FFT would need. Pure-Python (no numpy dependency).
+  - **Three interchangeable Lomb-Scargle engines** (`lomb_scargle`). "reference" is the original per-frequency
+    loop, kept as the ground truth. "recurrence" evaluates the whole grid from the four trig sums
+    (C, S, C2, S2), with each beat's phasor advanced by one complex multiply per grid step instead of fresh trig
+    calls. "fast" is Press & Rybicki (1989): it extirpolates the samples onto a uniform mesh and gets every
+    frequency's sums from one FFT, so the cost is O(N + M log M) and overnight-length windows stay cheap.
   - **LF:HF is a DESCRIPTIVE ratio, not "sympatho-vagal balance"** (Billman 2013): LF is mixed baroreflex/
     autonomic, not a clean sympathetic index. We report it as a trend, labelled, never as a balance measure.
   - **Poincaré SD1 ≡ RMSSD/√2** and SD2 maps to SDNN — SD1 carries no information beyond RMSSD, so it is a
@@ -18,8 +23,14 @@ spectrum. HF band carries beat-detection jitter, so an artifact-% caveat should
 
 from __future__ import annotations
 
+from cmath import exp
+from collections.abc import Sequence
 from dataclasses import dataclass
-from math import atan2, cos, pi, sin, sqrt
+from itertools import accumulate
+from math import atan2, copysign, cos, hypot, log, pi, prod, sin, sqrt
+from operator import mul
+
+from rivaflow.core.fft import fft, next_pow2
 
 # Standard HRV frequency bands (Hz) — Task Force 1996.
 VLF_BAND = (0.0033, 0.04)
@@ -30,6 +41,13 @@ MIN_WINDOW_SEC = 300.0  # ≥5 min — below this, spectral HRV is not validly i
 MIN_BEATS = 150  # and enough beats to resolve the bands
 FREQ_STEP = 0.002  # spectral grid resolution (Hz)
 
+SPECTRAL_METHODS = ("reference", "recurrence", "fast")
+FAST_MIN_BEATS = 1500  # ~25 min of beats: from here on the default is "fast"
+EXTIRP_POINTS = 6  # Lagrange nodes each sample is spread over on the fast engine's mesh
+EXTIRP_OVERSAMPLE = (
+    8  # mesh points per output frequency — sets the fast engine's interpolation error
+)
+
 
 def sdnn(intervals: list[float]) -> float | None:
     """Standard deviation of RR intervals (ms)."""
@@ -91,6 +109,123 @@ def _lomb_scargle_power(times: list[float], values: list[float], freq: float) ->
     return 0.5 * (p_c + p_s)
 
 
+def _power_from_sums(n: int, c: float, s: float, c2: float, s2: float) -> float:
+    """Lomb-Scargle power from the trig sums at one frequency: C = Σx·cos ωt, S = Σx·sin ωt, C2 = Σcos 2ωt,
+    S2 = Σsin 2ωt. Identical to `_lomb_scargle_power`, with τ folded in by angle addition (2ωτ =
+    atan2(S2, C2)) instead of a second pass over the beats."""
+    hyp = hypot(c2, s2)
+    if hyp > 0:
+        cos_wtau = sqrt(0.5 * (1.0 + c2 / hyp))
+        sin_wtau = copysign(sqrt(max(0.0, 0.5 * (1.0 - c2 / hyp))), s2)
+    else:
+        cos_wtau, sin_wtau = 1.0, 0.0
+    cos_sum = c * cos_wtau + s * sin_wtau
+    sin_sum = s * cos_wtau - c * sin_wtau
+    cc = 0.5 * (n + hyp)  # Σcos²ω(t-τ)
+    ss = 0.5 * (n - hyp)  # Σsin²ω(t-τ)
+    p_c = (cos_sum * cos_sum / cc) if cc > 0 else 0.0
+    p_s = (sin_sum * sin_sum / ss) if ss > 0 else 0.0
+    return 0.5 * (p_c + p_s)
+
+
+def _sums_recurrence(
+    times: list[float], values: list[float], f0: float, step: float, count: int
+) -> list[tuple[float, float, float, float]]:
+    """(C, S, C2, S2) on the grid f0 + k·step. Each beat's phasor e^{iωt} is advanced to the next frequency
+    by one complex multiply (angle addition), and the 2ω sums are Σ(e^{iωt})², so trig is evaluated twice
+    per beat rather than 6 times per beat per frequency."""
+    phasors = [exp(2j * pi * f0 * t) for t in times]
+    rotations = [exp(2j * pi * step * t) for t in times]
+    sums = []
+    for _ in range(count):
+        z1 = sum(map(mul, values, phasors))  # C + iS
+        z2 = sum(map(mul, phasors, phasors))  # C2 + iS2 (double angle)
+        sums.append((z1.real, z1.imag, z2.real, z2.imag))
+        phasors = list(map(mul, phasors, rotations))
+    return sums
+
+
+# Lagrange denominators Π_{b≠a}(a − b) for nodes 0..EXTIRP_POINTS-1 — the same for every sample.
+_EXTIRP_DENOMS = [
+    prod(a - b for b in range(EXTIRP_POINTS) if b != a) for a in range(EXTIRP_POINTS)
+]
+
+
+def _extirpolate(mesh: list[complex], value: complex, u: float) -> None:
+    """Spread `value` at fractional mesh position u onto the EXTIRP_POINTS nearest nodes with Lagrange
+    weights (Press & Rybicki's "extirpolation"), wrapping modulo the mesh length."""
+    size = len(mesh)
+    base = int(u)
+    if u == base:
+        mesh[base % size] += value
+        return
+    first = base - EXTIRP_POINTS // 2 + 1
+    offsets = [u - (first + j) for j in range(EXTIRP_POINTS)]
+    full = value * prod(offsets)
+    for j, (offset, denom) in enumerate(zip(offsets, _EXTIRP_DENOMS)):
+        mesh[(first + j) % size] += full / (offset * denom)
+
+
+def _sums_fast(
+    times: list[float], values: list[float], f0: float, step: float, count: int
+) -> list[tuple[float, float, float, float]]:
+    """(C, S, C2, S2) on the grid f0 + k·step via extirpolation + FFT (Press & Rybicki 1989).
+
+    Σx·e^{iωt} at ω = 2π(f0 + k·step) is Σ (x·e^{i2πf0·t})·e^{i2πk·u/M} with u = t·step·M: the f0 offset is
+    demodulated into the sample weights, the weights are extirpolated onto an M-point mesh, and one inverse
+    FFT yields every k. Wrapping u modulo M is exact because e^{i2πk·u/M} has period M in u. The 2ω sums
+    use the same trick at 2·f0 and 2·step."""
+    t0 = times[0]
+    size = next_pow2(EXTIRP_OVERSAMPLE * count)
+    mesh_1 = [0j] * size
+    mesh_2 = [0j] * size
+    for t, x in zip(times, values):
+        rel = t - t0  # Lomb-Scargle power is invariant to the time origin
+        carrier = exp(2j * pi * f0 * rel)
+        _extirpolate(mesh_1, x * carrier, (rel * step * size) % size)
+        _extirpolate(mesh_2, carrier * carrier, (2.0 * rel * step * size) % size)
+    z1 = fft(mesh_1, inverse=True)
+    z2 = fft(mesh_2, inverse=True)
+    return [(z1[k].real, z1[k].imag, z2[k].real, z2[k].imag) for k in range(count)]
+
+
+def lomb_scargle(
+    times: list[float],
+    values: list[float],
+    f0: float,
+    step: float,
+    count: int,
+    method: str = "recurrence",
+) -> list[float]:
+    """Lomb-Scargle power at the `count` frequencies f0 + k·step (Hz). `values` should be mean-subtracted.
+
+    `method` picks the engine (SPECTRAL_METHODS): "reference" loops `_lomb_scargle_power` per frequency;
+    "recurrence" gives the same numbers to rounding error; "fast" is the extirpolated FFT engine, accurate to
+    a small relative error and the only one whose cost does not scale with beats × frequencies.
+    """
+    if method not in SPECTRAL_METHODS:
+        raise ValueError(f"Unknown Lomb-Scargle method: {method!r}")
+    if count <= 0 or not times:
+        return []
+    if method == "reference":
+        return [_lomb_scargle_power(times, values, f0 + k * step) for k in range(count)]
+    engine = _sums_fast if method == "fast" else _sums_recurrence
+    n = len(times)
+    return [
+        _power_from_sums(n, *sums) for sums in engine(times, values, f0, step, count)
+    ]
+
+
+def _grid_count(lo: float, hi: float) -> int:
+    """Number of FREQ_STEP grid points in [lo, hi), counted the way the band sum has always walked it."""
+    count = 0
+    f = lo
+    while f < hi:
+        count += 1
+        f += FREQ_STEP
+    return count
+
+
 @dataclass
 class SpectralHRV:
     vlf: float
@@ -121,73 +256,135 @@ class SpectralHRV:
         }
 
 
-def dfa_alpha1(
-    intervals: list[float], min_box: int = 4, max_box: int = 16
-) -> dict | None:
-    """B18 — DFA α1 (short-term detrended fluctuation scaling exponent), research-grade and artifact-fragile
-    (WHOOP_FUTURE_STATE_PLAN.md B18). α1 ≈ 0.75 ↔ aerobic threshold (VT1); ≈ 0.5 ↔ anaerobic (VT2). REQUIRES
-    near-ECG-grade RR — the caller must gate on artifact-% (suppress above ~3%) and treat it as experimental.
-    Returns None with too few beats."""
-    n = len(intervals)
-    if n < max_box * 4:
-        return None
-    mean_rr = sum(intervals) / n
-    y = []  # integrated (cumulative-sum) profile
-    acc = 0.0
-    for x in intervals:
-        acc += x - mean_rr
-        y.append(acc)
+DFA_WINDOW_BEATS = 200  # sliding-window α1: beats per window (~2-3 min of exercise RR)
+DFA_STEP_BEATS = 20  # and beats between successive windows
+
+
+class _DFAProfile:
+    """Integrated (cumulative-sum) profile of one RR window, with prefix sums of y, j·y and y² so the
+    least-squares linear fit residual of ANY box [a, a+box) comes out in O(1) instead of a per-box pass.
+    """
+
+    def __init__(self, intervals: list[float]):
+        n = len(intervals)
+        mean_rr = sum(intervals) / n
+        y = list(accumulate(x - mean_rr for x in intervals))
+        self.n = n
+        self._sum_y = [0.0, *accumulate(y)]
+        self._sum_jy = [0.0, *accumulate(j * v for j, v in enumerate(y))]
+        self._sum_yy = [0.0, *accumulate(v * v for v in y)]
 
+    def box_residual(self, start: int, box: int) -> float:
+        """Σ (y − linear fit)² over the box [start, start+box), from closed-form sums with local x = j − start."""
+        end = start + box
+        sy = self._sum_y[end] - self._sum_y[start]
+        sxy = self._sum_jy[end] - self._sum_jy[start] - start * sy
+        syy = self._sum_yy[end] - self._sum_yy[start]
+        sx = box * (box - 1) / 2.0
+        sxx = (box - 1) * box * (2 * box - 1) / 6.0
+        cxx = sxx - sx * sx / box
+        cxy = sxy - sx * sy / box
+        rss = syy - sy * sy / box - (cxy * cxy / cxx if cxx else 0.0)
+        return max(rss, 0.0)
+
+    def fluctuation(self, box: int) -> float | None:
+        """F(n): RMS detrended fluctuation over non-overlapping boxes tiled from the window start."""
+        starts = range(0, self.n - box + 1, box)
+        if not starts:
+            return None
+        return sqrt(
+            sum(self.box_residual(a, box) for a in starts) / (len(starts) * box)
+        )
+
+
+def _scaling_exponent(profile: _DFAProfile, boxes: Sequence[int]) -> float | None:
+    """Slope of log F(n) vs log n over `boxes` — None with fewer than 3 usable box sizes."""
     logs: list[tuple[float, float]] = []
-    box = min_box
-    while box <= max_box:
-        fluct = []
-        for start in range(0, n - box + 1, box):
-            seg = y[start : start + box]
-            # linear detrend of the box
-            xs = list(range(box))
-            mx = (box - 1) / 2.0
-            my = sum(seg) / box
-            sxx = sum((xi - mx) ** 2 for xi in xs)
-            sxy = sum((xi - mx) * (si - my) for xi, si in zip(xs, seg))
-            slope = sxy / sxx if sxx else 0.0
-            intercept = my - slope * mx
-            fluct.append(
-                sum((si - (slope * xi + intercept)) ** 2 for xi, si in zip(xs, seg))
-                / box
-            )
-        if fluct:
-            f_n = (sum(fluct) / len(fluct)) ** 0.5
-            if f_n > 0:
-                from math import log as _log
-
-                logs.append((_log(box), _log(f_n)))
-        box += 1
+    for box in boxes:
+        f_n = profile.fluctuation(box)
+        if f_n:
+            logs.append((log(box), log(f_n)))
     if len(logs) < 3:
         return None
-    # slope of log F(n) vs log n = alpha1
     mlx = sum(p[0] for p in logs) / len(logs)
     mly = sum(p[1] for p in logs) / len(logs)
     sxx = sum((p[0] - mlx) ** 2 for p in logs)
     sxy = sum((p[0] - mlx) * (p[1] - mly) for p in logs)
-    alpha1 = sxy / sxx if sxx else 0.0
+    return sxy / sxx if sxx else 0.0
+
+
+def _alpha1_zone(alpha1: float) -> str:
     if alpha1 >= 0.75:
-        zone = "aerobic (≤VT1)"
-    elif alpha1 >= 0.5:
-        zone = "threshold (VT1–VT2)"
-    else:
-        zone = "hard (≥VT2)"
+        return "aerobic (≤VT1)"
+    if alpha1 >= 0.5:
+        return "threshold (VT1–VT2)"
+    return "hard (≥VT2)"
+
+
+def dfa_alpha1(
+    intervals: list[float],
+    min_box: int = 4,
+    max_box: int = 16,
+    boxes: Sequence[int] | None = None,
+) -> dict | None:
+    """B18 — DFA α1 (short-term detrended fluctuation scaling exponent), research-grade and artifact-fragile
+    (WHOOP_FUTURE_STATE_PLAN.md B18). α1 ≈ 0.75 ↔ aerobic threshold (VT1); ≈ 0.5 ↔ anaerobic (VT2). REQUIRES
+    near-ECG-grade RR — the caller must gate on artifact-% (suppress above ~3%) and treat it as experimental.
+    `boxes` overrides the min_box..max_box range with arbitrary box sizes. Returns None with too few beats.
+    """
+    sizes = sorted(set(boxes)) if boxes else list(range(min_box, max_box + 1))
+    n = len(intervals)
+    if not sizes or n < sizes[-1] * 4:
+        return None
+    alpha1 = _scaling_exponent(_DFAProfile(intervals), sizes)
+    if alpha1 is None:
+        return None
     return {
         "alpha1": round(alpha1, 3),
-        "zone": zone,
+        "zone": _alpha1_zone(alpha1),
         "beats": n,
         "note": "Experimental; α1≈0.75↔VT1, ≈0.5↔VT2. Only trust with low artifact (<~3%) RR.",
     }
 
 
-def frequency_domain(intervals: list[float]) -> SpectralHRV | None:
+def dfa_alpha1_series(
+    intervals: list[float],
+    window: int = DFA_WINDOW_BEATS,
+    step: int = DFA_STEP_BEATS,
+    min_box: int = 4,
+    max_box: int = 16,
+) -> list[dict]:
+    """Sliding-window α1 across a whole session — the VT1/VT2 zone timeline. One entry per window of
+    `window` beats, advanced `step` beats at a time: {"start_beat", "end_beat", "alpha1", "zone"}. Each
+    window costs O(window) to build its prefix sums plus O(window/box) per box size. The same artifact
+    caveat as `dfa_alpha1` applies to every point."""
+    window = max(window, max_box * 4)
+    sizes = range(min_box, max_box + 1)
+    timeline = []
+    for start in range(0, len(intervals) - window + 1, max(step, 1)):
+        alpha1 = _scaling_exponent(
+            _DFAProfile(intervals[start : start + window]), sizes
+        )
+        if alpha1 is None:
+            continue
+        timeline.append(
+            {
+                "start_beat": start,
+                "end_beat": start + window,
+                "alpha1": round(alpha1, 3),
+                "zone": _alpha1_zone(alpha1),
+            }
+        )
+    return timeline
+
+
+def frequency_domain(
+    intervals: list[float], method: str | None = None
+) -> SpectralHRV | None:
     """Lomb-Scargle frequency-domain HRV over a single contiguous RR segment. Returns None unless the window
-    is ≥5 min and ≥150 beats (short-window spectra are not validly interpretable)."""
+    is ≥5 min and ≥150 beats (short-window spectra are not validly interpretable). `method` selects the
+    Lomb-Scargle engine (see `lomb_scargle`); by default long windows (≥FAST_MIN_BEATS) use "fast" and
+    shorter ones "recurrence"."""
     if len(intervals) < MIN_BEATS:
         return None
     # Time axis = cumulative beat times (seconds); RR in ms.
@@ -202,13 +399,14 @@ def frequency_domain(intervals: list[float]) -> SpectralHRV | None:
     mean_rr = sum(intervals) / len(intervals)
     values = [x - mean_rr for x in intervals]  # detrend (remove DC)
 
+    if method is None:
+        method = "fast" if len(intervals) >= FAST_MIN_BEATS else "recurrence"
+
     def band_power(lo: float, hi: float) -> float:
-        f = lo
-        p = 0.0
-        while f < hi:
-            p += _lomb_scargle_power(times, values, f) * FREQ_STEP
-            f += FREQ_STEP
-        return p
+        powers = lomb_scargle(
+            times, values, lo, FREQ_STEP, _grid_count(lo, hi), method=method
+        )
+        return sum(powers) * FREQ_STEP
 
     vlf = band_power(*VLF_BAND)
     lf = band_power(*LF_BAND)
@@ -0,0 +1,297 @@
+"""B6 tuning harness — grid-search the prevention engine's thresholds over many users' backtests (pure core).
+
+``validate_engine`` scores ONE timeline of tiers produced with the shipped constants. Calibrating means
+replaying every user's history under many (AMBER_Z, RED_Z, CUSUM_K, CUSUM_H, SLOW_DRIFT_DELTA,
+DETECTION_LEAD_DAYS) combinations, and recomputing ``robust_baseline`` and ``cusum_positive`` from scratch
+for every day of every replay is O(days²) per combination. This harness splits the work by what each
+part depends on:
+
+  1. **Per user, once.** Rolling median/MAD baselines are kept in incremental sorted windows
+     (``RollingWindow``: bisect insert/evict, with MAD read by merging outward from the median). Each
+     day's worse-z and slow-drift z are parameter-free, so they are computed once per signal.
+  2. **Per distinct CUSUM_K, once.** The running one-sided CUSUM depends only on k.
+  3. **Per parameter set.** What remains are threshold comparisons and the family fusion from
+     ``evaluate_prevention``, scored with ``validate_engine`` itself, so the metrics are exactly the gate's.
+
+Users are independent, so ``tune`` fans them out over a process pool and sums the per-user scores for each
+parameter set. Input per user is a chronological list of daily signal values, one row per day, with None
+for a missing signal.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import Any
+
+from rivaflow.core.prevention import (
+    AMBER_Z,
+    CUSUM_H,
+    CUSUM_K,
+    DETECTION_LEAD_DAYS,
+    MAD_SCALE,
+    RED_Z,
+    SIGNAL_FAMILY,
+    SLOW_DRIFT_DELTA,
+    WORSE_WHEN,
+    robust_z,
+    validate_engine,
+)
+
+BASELINE_DAYS = 28  # trailing days (today excluded) in the robust baseline
+DRIFT_SHORT_DAYS = 7  # recent days (today included) compared against it for slow drift
+MIN_BASELINE_POINTS = 5  # robust_baseline's minimum
+POOL_MIN_USERS = 4  # fewer users than this are swept inline
+
+DEFAULT_PARAMS = {
+    "amber_z": AMBER_Z,
+    "red_z": RED_Z,
+    "cusum_k": CUSUM_K,
+    "cusum_h": CUSUM_H,
+    "drift_delta": SLOW_DRIFT_DELTA,
+    "lead_days": DETECTION_LEAD_DAYS,
+}
+
+
+class RollingWindow:
+    """The last ``size`` pushes (None = no reading that day) with their non-None values kept sorted, so
+    median and MAD are read without re-sorting the window."""
+
+    __slots__ = ("size", "_ring", "_sorted")
+
+    def __init__(self, size: int):
+        self.size = size
+        self._ring: deque[float | None] = deque()
+        self._sorted: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def push(self, value: float | None) -> None:
+        self._ring.append(value)
+        if value is not None:
+            insort(self._sorted, value)
+        if len(self._ring) > self.size:
+            old = self._ring.popleft()
+            if old is not None:
+                del self._sorted[bisect_left(self._sorted, old)]
+
+    def median(self) -> float:
+        s, n = self._sorted, len(self._sorted)
+        mid = n // 2
+        return s[mid] if n % 2 else (s[mid - 1] + s[mid]) / 2
+
+    def mad(self, med: float) -> float:
+        """Median absolute deviation from ``med``. Deviations grow monotonically walking outward from
+        ``med`` on either side, so merging the two walks yields them in order and stops at the middle.
+        """
+        s, n = self._sorted, len(self._sorted)
+        lo_rank, hi_rank = (n - 1) // 2, n // 2
+        i, j = bisect_left(s, med) - 1, bisect_left(s, med)
+        rank, low = 0, 0.0
+        while True:
+            if j >= n or (i >= 0 and med - s[i] <= s[j] - med):
+                dev, i = med - s[i], i - 1
+            else:
+                dev, j = s[j] - med, j + 1
+            if rank == lo_rank:
+                low = dev
+            if rank == hi_rank:
+                return (low + dev) / 2
+            rank += 1
+
+
+def _signal_series(
+    values: list[float | None], worse_when: str
+) -> tuple[list[float | None], list[float | None]]:
+    """Per-day (worse_z, drift_z) for one signal, None where there is no reading or no baseline yet."""
+    baseline = RollingWindow(BASELINE_DAYS)
+    recent = RollingWindow(DRIFT_SHORT_DAYS)
+    worse, drift = [], []
+    for value in values:
+        recent.push(value)
+        if value is None or len(baseline) < MIN_BASELINE_POINTS:
+            worse.append(None)
+            drift.append(None)
+        else:
+            med = baseline.median()
+            mad_ = baseline.mad(med)
+            worse.append(robust_z(value, med, mad_, worse_when))
+            scale = MAD_SCALE * mad_ if mad_ > 0 else 1.0
+            z = (recent.median() - med) / scale
+            drift.append(z if worse_when == "high" else -z)
+        baseline.push(value)
+    return worse, drift
+
+
+def _running_cusum(worse: list[float | None], k: float) -> list[float | None]:
+    """``cusum_positive`` over each day's history, carried forward instead of recomputed."""
+    s, out = 0.0, []
+    for z in worse:
+        if z is None:
+            out.append(None)
+        else:
+            s = max(0.0, s + z - k)
+            out.append(s)
+    return out
+
+
+def _precompute(days: list[dict]) -> dict[str, tuple[list, list]]:
+    signals = {}
+    for name in SIGNAL_FAMILY:
+        values = [row.get(name) for row in days]
+        if any(v is not None for v in values):
+            signals[name] = _signal_series(values, WORSE_WHEN[name])
+    return signals
+
+
+def _timeline(
+    labels: list[str],
+    signals: dict[str, tuple[list, list]],
+    cusums: dict[str, list],
+    params: dict[str, Any],
+) -> list[dict]:
+    """Day-by-day tiers under ``params`` — ``evaluate_prevention``'s fusion on precomputed series."""
+    timeline = []
+    for t, day in enumerate(labels):
+        flagged, strong = set(), set()
+        readings = 0
+        vagal = False
+        for name, (worse, drift) in signals.items():
+            wz = worse[t]
+            if wz is None:
+                continue
+            readings += 1
+            vagal = vagal or name == "lnrmssd"
+            family = SIGNAL_FAMILY[name]
+            if (
+                wz >= params["amber_z"]
+                or cusums[name][t] >= params["cusum_h"]
+                or drift[t] >= params["drift_delta"]
+            ):
+                flagged.add(family)
+            if wz >= params["red_z"]:
+                strong.add(family)
+        if not vagal and readings < 2:
+            continue  # evaluate_prevention: still building baselines
+        if len(strong) >= 2:
+            tier = "red"
+        elif len(flagged) >= 2:
+            tier = "amber"
+        else:
+            tier = "green"
+        timeline.append({"day": day, "tier": tier})
+    return timeline
+
+
+def backtest_timeline(
+    days: list[dict], params: dict[str, Any] | None = None
+) -> list[dict]:
+    """One user's ``[{"day", "tier"}]`` backtest under ``params`` (missing keys = shipped constants).
+    ``days`` is chronological, one row per day: ``{"day": "YYYY-MM-DD", "rhr": ..., "lnrmssd": ...}``.
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    signals = _precompute(days)
+    cusums = {
+        name: _running_cusum(worse, params["cusum_k"])
+        for name, (worse, _) in signals.items()
+    }
+    return _timeline([row["day"] for row in days], signals, cusums, params)
+
+
+def _sweep_user(job: tuple) -> list[tuple[int, int, int, int, bool]]:
+    """Process-pool entry point: (days, onsets, param sets) -> per set (onsets, detected, false ambers,
+    days backtested, passes)."""
+    days, onsets, param_sets = job
+    labels = [row["day"] for row in days]
+    signals = _precompute(days)
+    cusums_by_k = {
+        k: {name: _running_cusum(worse, k) for name, (worse, _) in signals.items()}
+        for k in {p["cusum_k"] for p in param_sets}
+    }
+    scores = []
+    for params in param_sets:
+        timeline = _timeline(labels, signals, cusums_by_k[params["cusum_k"]], params)
+        v = validate_engine(timeline, onsets, params["lead_days"])
+        scores.append(
+            (
+                v["onsets_tagged"],
+                v["onsets_detected"],
+                v["false_ambers"],
+                v["days_backtested"],
+                v["passes"],
+            )
+        )
+    return scores
+
+
+def param_grid(**values: list) -> list[dict[str, Any]]:
+    """Every combination of the given per-parameter value lists. Unlisted parameters stay at the shipped
+    constants, e.g. ``param_grid(amber_z=[1.25, 1.5, 1.75], cusum_h=[3, 4, 5])`` is nine sets.
+    """
+    unknown = set(values) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown prevention parameters: {sorted(unknown)}")
+    axes = {
+        name: values.get(name, [default]) for name, default in DEFAULT_PARAMS.items()
+    }
+    return [dict(zip(axes, combo)) for combo in product(*axes.values())]
+
+
+def tune(
+    users: list[dict],
+    grid: list[dict[str, Any]] | None = None,
+    *,
+    workers: int | None = None,
+) -> list[dict]:
+    """Score every parameter set in ``grid`` (default: the shipped constants) across all users, best first.
+
+    ``users``: ``[{"days": [...daily rows, see backtest_timeline], "onsets": {"YYYY-MM-DD", ...}}]``.
+    ``workers`` sizes the process pool used from ``POOL_MIN_USERS`` users (None = the executor's default,
+    0 = always inline). Each result holds the params, pooled detection and false-amber rates, and how many
+    users' backtests pass ``validate_engine``'s gate. Sets are ranked by users passing, then detection
+    rate, then fewest false ambers per week.
+    """
+    grid = grid or param_grid()
+    jobs = [(u["days"], set(u.get("onsets") or ()), grid) for u in users]
+    if workers != 0 and len(jobs) >= POOL_MIN_USERS:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            per_user = list(pool.map(_sweep_user, jobs))
+    else:
+        per_user = [_sweep_user(job) for job in jobs]
+
+    results = []
+    for i, params in enumerate(grid):
+        onsets = detected = false_ambers = days = passing = 0
+        for scores in per_user:
+            o, d, f, n, passes = scores[i]
+            onsets += o
+            detected += d
+            false_ambers += f
+            days += n
+            passing += passes
+        results.append(
+            {
+                "params": params,
+                "users": len(per_user),
+                "users_passing": passing,
+                "onsets_tagged": onsets,
+                "onsets_detected": detected,
+                "detection_rate": round(detected / onsets, 3) if onsets else None,
+                "false_ambers": false_ambers,
+                "false_ambers_per_week": (
+                    round(false_ambers / (days / 7.0), 2) if days else 0.0
+                ),
+                "days_backtested": days,
+            }
+        )
+    results.sort(
+        key=lambda r: (
+            -r["users_passing"],
+            -(r["detection_rate"] or 0.0),
+            r["false_ambers_per_week"],
+        )
+    )
+    return results
@@ -6,32 +6,46 @@ Respiration modulates heart rate via the respiratory sinus arrhythmia (RSA): the
 the breathing frequency, which sits within 0.1-0.5 Hz (6-30 breaths/min — the same plausible band
 _resp_rpm already enforces). RR beats are unevenly sampled in time (beat-to-beat, not clock-tick), so this
 module resamples ONE contiguous, QC-clean RR segment (rr_quality.clean_segments — never across a real
-dropout, which would fabricate continuity the beats never had) onto a uniform time grid, demeans it, then
-scans a direct-form DFT over the band only to find the dominant frequency.
-
-Cost bound: resampling a window of `window_sec` seconds at RESAMPLE_HZ gives n = window_sec * RESAMPLE_HZ
-uniform samples. The DFT below evaluates only the discrete bins inside [BAND_LO_HZ, BAND_HI_HZ] (not a full
-spectrum) — k = (BAND_HI_HZ - BAND_LO_HZ) / FREQ_STEP_HZ bins, each an O(n) sum — so total cost is O(n*k).
-`window_sec` is itself capped at MAX_WINDOW_SEC (see _bounded_window), which bounds n and therefore the
-whole scan to a fixed, small cost regardless of how much RR history the caller has: at the cap,
-n = 300s * 4Hz = 1200 samples and k = (0.5-0.1)/0.005 = 80 bins, so <=96,000 multiply-adds — comfortably
-sub-second in pure Python.
+dropout, which would fabricate continuity the beats never had) onto a uniform time grid, then takes a
+Welch-averaged power spectrum and reads the dominant frequency inside the band.
+
+Welch: the resampled series is cut into WELCH_SEGMENT_SEC windows overlapping by WELCH_OVERLAP, each one
+demeaned, Hann-tapered and zero-padded to >=FFT_MIN_SIZE points (bins of RESAMPLE_HZ / size, ~0.004 Hz),
+and the windows' power spectra are averaged. Averaging trades a little resolution for a much steadier peak
+on noisy optical RR. A parabolic fit through the peak bin and its neighbours then places the peak between
+bins.
+
+Cost bound: each window is one O(m log m) stdlib FFT (core/fft.py), so a window of n resampled samples
+costs O(n/hop * m log m). At the MAX_WINDOW_SEC cap (15 min, 3600 samples) that is ~27 FFTs of 1024
+points. The old direct-DFT scan needed the 5-minute cap to stay sub-second. The cap now exists only to keep
+the estimate local to one stretch of sleep, and longer windows simply average more segments.
 """
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
-from math import cos, pi, sin
+from math import ceil, cos, pi
+from operator import add
 
-VERSION = "resp-bandpass-v1"
+from rivaflow.core.fft import next_pow2, rfft_power
+from rivaflow.core.rr_quality import MIN_CLEAN_SEGMENT, clean_segments
+
+VERSION = "resp-welch-v2"
 
 RESAMPLE_HZ = 4.0  # uniform-grid resample rate
 BAND_LO_HZ = 0.1  # 6 breaths/min — matches _resp_rpm's plausible floor
 BAND_HI_HZ = 0.5  # 30 breaths/min — matches _resp_rpm's plausible ceiling
-FREQ_STEP_HZ = 0.005  # ~80 bins across the band — resolves better than +/-1rpm
 MIN_WINDOW_SEC = 60.0  # below this, RSA has too few oscillation cycles to trust a peak
 MAX_WINDOW_SEC = (
-    300.0  # bound n fed to the DFT scan (see module docstring's cost bound)
+    900.0  # keep the estimate local to one stretch of sleep (see module docstring)
+)
+WELCH_SEGMENT_SEC = (
+    64.0  # Welch window length — >=6 cycles even at the 6 breaths/min floor
+)
+WELCH_OVERLAP = 0.5  # 50% overlap between consecutive Welch windows
+FFT_MIN_SIZE = (
+    1024  # zero-pad each window to at least this — ~0.004 Hz (0.23 rpm) bins at 4 Hz
 )
 AGREEMENT_TOLERANCE_RPM = 2.0  # how close the spectral + counting estimates must land to trust the spectral one
 
@@ -42,6 +56,7 @@ class SpectralRespiration:
     window_sec: float
     n_samples: int
     dominant_hz: float
+    n_windows: int = 1  # Welch windows averaged into the spectrum
 
 
 def _beat_times(intervals: list[float]) -> list[float]:
@@ -57,8 +72,8 @@ def _beat_times(intervals: list[float]) -> list[float]:
 def _bounded_window(
     times: list[float], intervals: list[float]
 ) -> tuple[list[float], list[float]] | None:
-    """The most recent <=MAX_WINDOW_SEC slice of (times, intervals) — bounds the DFT's cost (see module
-    docstring). None when the available segment (or its bounded tail) is under MIN_WINDOW_SEC.
+    """The most recent <=MAX_WINDOW_SEC slice of (times, intervals) (see module docstring). None when the
+    available segment (or its bounded tail) is under MIN_WINDOW_SEC.
     """
     if not times or times[-1] < MIN_WINDOW_SEC:
         return None
@@ -96,32 +111,68 @@ def _resample_uniform(
     return grid, out
 
 
-def _dominant_band_frequency(times: list[float], values: list[float]) -> float | None:
-    """Scan BAND_LO_HZ..BAND_HI_HZ in FREQ_STEP_HZ steps for the frequency with peak DFT power (direct-form
-    single-frequency DFT, not a full FFT — see module docstring's cost bound). None on a degenerate input.
-    """
+def _hann(n: int) -> list[float]:
+    if n < 2:
+        return [1.0] * n
+    return [0.5 - 0.5 * cos(2.0 * pi * i / (n - 1)) for i in range(n)]
+
+
+def _welch_power(values: list[float], hz: float) -> tuple[list[float], float, int]:
+    """Welch-averaged power spectrum of a uniformly-sampled series: (power per bin, bin width in Hz, windows
+    averaged). Windows shorter than the series overlap by WELCH_OVERLAP; a series shorter than one window
+    is a single window."""
+    n = len(values)
+    seg = min(n, int(WELCH_SEGMENT_SEC * hz))
+    hop = max(1, int(seg * (1.0 - WELCH_OVERLAP)))
+    size = next_pow2(max(seg, FFT_MIN_SIZE))
+    taper = _hann(seg)
+    total = [0.0] * (size // 2 + 1)
+    windows = 0
+    for start in range(0, n - seg + 1, hop):
+        chunk = values[start : start + seg]
+        mean_v = sum(chunk) / seg
+        total = list(
+            map(
+                add,
+                total,
+                rfft_power([(v - mean_v) * w for v, w in zip(chunk, taper)], size),
+            )
+        )
+        windows += 1
+    return [p / windows for p in total], hz / size, windows
+
+
+def _dominant_band_frequency(
+    values: list[float], hz: float
+) -> tuple[float, int] | None:
+    """(peak frequency in BAND_LO_HZ..BAND_HI_HZ, Welch windows averaged) for a uniformly-sampled series,
+    the peak refined between bins by a parabolic fit. None on a degenerate input (too short, or no power in
+    the band)."""
     if len(values) < 2:
         return None
-    best_power = -1.0
-    best_freq: float | None = None
-    f = BAND_LO_HZ
-    while f <= BAND_HI_HZ:
-        w = 2.0 * pi * f
-        re = sum(v * cos(w * t) for t, v in zip(times, values))
-        im = sum(v * sin(w * t) for t, v in zip(times, values))
-        power = re * re + im * im
-        if power > best_power:
-            best_power = power
-            best_freq = f
-        f += FREQ_STEP_HZ
-    return best_freq
+    power, bin_hz, windows = _welch_power(values, hz)
+    lo = max(1, ceil(BAND_LO_HZ / bin_hz))
+    hi = min(len(power) - 1, int(BAND_HI_HZ / bin_hz))
+    if hi < lo:
+        return None
+    peak = max(range(lo, hi + 1), key=power.__getitem__)
+    if power[peak] <= 0:
+        return None
+    offset = 0.0
+    if 0 < peak < len(power) - 1:
+        left, mid, right = power[peak - 1], power[peak], power[peak + 1]
+        curvature = left - 2.0 * mid + right
+        if curvature < 0:
+            offset = 0.5 * (left - right) / curvature
+    freq = min(max((peak + offset) * bin_hz, BAND_LO_HZ), BAND_HI_HZ)
+    return freq, windows
 
 
 def estimate_respiratory_rate(segment: list[float]) -> SpectralRespiration | None:
     """Spectral (band-pass) RSA respiratory-rate estimate from ONE contiguous, QC-cleaned RR segment (ms) —
-    see rr_quality.clean_segments. Resamples the (bounded) window onto a uniform grid, demeans, then finds
-    the dominant frequency in the respiratory band. None when the segment is too short to resolve any
-    oscillation cycles (< MIN_WINDOW_SEC) or the band scan is degenerate.
+    see rr_quality.clean_segments. Resamples the (bounded) window onto a uniform grid, then finds the
+    dominant frequency of its Welch spectrum in the respiratory band. None when the segment is too short to
+    resolve any oscillation cycles (< MIN_WINDOW_SEC) or the spectrum is degenerate.
     """
     times = _beat_times(segment)
     windowed = _bounded_window(times, segment)
@@ -129,16 +180,31 @@ def estimate_respiratory_rate(segment: list[float]) -> SpectralRespiration | Non
         return None
     win_times, win_vals = windowed
 
-    grid_t, resampled = _resample_uniform(win_times, win_vals, RESAMPLE_HZ)
-    mean_v = sum(resampled) / len(resampled)
-    demeaned = [v - mean_v for v in resampled]
-
-    freq = _dominant_band_frequency(grid_t, demeaned)
-    if freq is None:
+    _, resampled = _resample_uniform(win_times, win_vals, RESAMPLE_HZ)
+    peak = _dominant_band_frequency(resampled, RESAMPLE_HZ)
+    if peak is None:
         return None
+    freq, windows = peak
     return SpectralRespiration(
         rpm=60.0 * freq,
         window_sec=win_times[-1] - win_times[0],
         n_samples=len(resampled),
         dominant_hz=freq,
+        n_windows=windows,
     )
+
+
+def estimate_night(
+    intervals: Sequence[float], min_len: int = MIN_CLEAN_SEGMENT
+) -> list[SpectralRespiration]:
+    """Respiratory-rate estimates for every clean segment of a night's raw RR series (ms), in order.
+
+    Splits with rr_quality.clean_segments (never across a dropout) and skips segments too short to
+    estimate, so a night yields one estimate per usable stretch of contiguous beats.
+    """
+    estimates = []
+    for segment in clean_segments(intervals, min_len=min_len):
+        estimate = estimate_respiratory_rate(segment)
+        if estimate is not None:
+            estimates.append(estimate)
+    return estimates
@@ -21,7 +21,8 @@ what makes the readiness / prevention signals trustworthy. lnRMSSD and the basel
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections import deque
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass, field
 from math import log, sqrt
 
@@ -163,6 +164,172 @@ def clean_segments(
     return segments
 
 
+@dataclass
+class RRStreamUpdate:
+    """What one `RRQualityStream.push` (or `close`) finalised. `corrected_idx` indexes the whole cleaned stream
+    (as `RRQuality.corrected_idx` does), so concatenating every update's `beats` reproduces `assess_rr`.
+    """
+
+    beats: list[float] = field(
+        default_factory=list
+    )  # newly finalised cleaned beats (ms)
+    corrected_idx: list[int] = field(default_factory=list)
+    segments: list[list[float]] = field(
+        default_factory=list
+    )  # newly closed clean_segments runs
+
+
+class RRQualityStream:
+    """Incremental `assess_rr` + `clean_segments` for RR that arrives in chunks (live or drained streams).
+
+    Feed chunks to `push` as they arrive and call `close` at the end of the stream. The emitted beats,
+    corrected indices and segments are exactly what the batch functions return for the concatenated
+    input, so a stream never has to be re-fetched and re-cleaned from the start of its window.
+
+    State is O(run length): the pending flagged-run length and its last valid neighbour (for interpolation),
+    the open contiguous segment, plus running counters. RMSSD runs over every emitted beat; with
+    `rmssd_window` the `rolling_rmssd` accumulators cover only the last N successive differences.
+    """
+
+    def __init__(
+        self, min_segment: int = MIN_CLEAN_SEGMENT, rmssd_window: int | None = None
+    ):
+        self.min_segment = min_segment
+        self.n_raw = 0
+        self.n_flagged = 0
+        self.n_cleaned = 0
+        self.n_corrected = 0
+        self.closed = False
+        # assess_rr: last valid beat (Malik reference + interpolation anchor) and the flagged run since it
+        self._last_valid: float | None = None
+        self._pending_flagged = 0
+        # clean_segments: the open contiguous run and its own Malik reference (reset at every break)
+        self._segment: list[float] = []
+        self._segment_last: float | None = None
+        # RMSSD accumulators over emitted beats
+        self._last_beat: float | None = None
+        self._sq_diff_sum = 0.0
+        self._n_diffs = 0
+        self._window: deque[float] | None = (
+            deque(maxlen=rmssd_window) if rmssd_window else None
+        )
+
+    def push(self, chunk: Iterable[float | None]) -> RRStreamUpdate:
+        """Consume the next RR chunk (ms); `None` entries are skipped like the batch functions skip them."""
+        if self.closed:
+            raise ValueError("RRQualityStream is closed")
+        update = RRStreamUpdate()
+        for value in chunk:
+            if value is None:
+                continue
+            rr = float(value)
+            self.n_raw += 1
+            self._assess(rr, update)
+            self._segment_step(rr, update)
+        return update
+
+    def close(self) -> RRStreamUpdate:
+        """End of stream: a trailing flagged run has no next neighbour and is dropped, and the open segment
+        is closed if it is long enough."""
+        update = RRStreamUpdate()
+        if not self.closed:
+            self._pending_flagged = 0
+            if len(self._segment) >= self.min_segment:
+                update.segments.append(self._segment)
+            self._segment = []
+            self.closed = True
+        return update
+
+    def _assess(self, rr: float, update: RRStreamUpdate) -> None:
+        last = self._last_valid
+        if not (RR_MIN_MS <= rr <= RR_MAX_MS) or (
+            last is not None and abs(rr - last) / last > MALIK_REL_THRESHOLD
+        ):
+            self.n_flagged += 1
+            self._pending_flagged += 1
+            return
+        gap = self._pending_flagged
+        if gap and last is not None:
+            step = (rr - last) / (gap + 1)
+            for k in range(1, gap + 1):
+                update.corrected_idx.append(self.n_cleaned)
+                self.n_corrected += 1
+                self._emit(last + step * k, update)
+        # a flagged run with no valid beat before it (stream start) is dropped, as in assess_rr
+        self._pending_flagged = 0
+        self._emit(rr, update)
+        self._last_valid = rr
+
+    def _emit(self, beat: float, update: RRStreamUpdate) -> None:
+        update.beats.append(beat)
+        self.n_cleaned += 1
+        if self._last_beat is not None:
+            d = beat - self._last_beat
+            self._sq_diff_sum += d * d
+            self._n_diffs += 1
+            if self._window is not None:
+                self._window.append(d * d)
+        self._last_beat = beat
+
+    def _segment_step(self, rr: float, update: RRStreamUpdate) -> None:
+        last = self._segment_last
+        if RR_MIN_MS <= rr <= RR_MAX_MS and (
+            last is None or abs(rr - last) / last <= MALIK_REL_THRESHOLD
+        ):
+            self._segment.append(rr)
+            self._segment_last = rr
+            return
+        if len(self._segment) >= self.min_segment:
+            update.segments.append(self._segment)
+        self._segment = []
+        self._segment_last = None
+
+    @property
+    def artifact_pct(self) -> float:
+        """Running % of raw intervals flagged — 100 before any input, like `assess_rr([])`."""
+        return 100.0 * self.n_flagged / self.n_raw if self.n_raw else 100.0
+
+    @property
+    def usable(self) -> bool:
+        return (
+            self.n_cleaned >= MIN_CLEAN_INTERVALS
+            and self.artifact_pct <= MAX_ARTIFACT_FRACTION * 100.0
+        )
+
+    @property
+    def rmssd(self) -> float | None:
+        """RMSSD (ms) over every beat emitted so far — equals `rmssd(assess_rr(...).cleaned)`."""
+        if not self._n_diffs:
+            return None
+        return sqrt(self._sq_diff_sum / self._n_diffs)
+
+    @property
+    def ln_rmssd(self) -> float | None:
+        r = self.rmssd
+        return log(r) if r else None
+
+    @property
+    def rolling_rmssd(self) -> float | None:
+        """RMSSD over the last `rmssd_window` successive differences (None without a window or data)."""
+        if not self._window:
+            return None
+        return sqrt(sum(self._window) / len(self._window))
+
+    @property
+    def rolling_ln_rmssd(self) -> float | None:
+        r = self.rolling_rmssd
+        return log(r) if r else None
+
+    def as_meta(self) -> dict:
+        """Running provenance dict, the streaming counterpart of `RRQuality.as_meta`."""
+        return {
+            "artifact_pct": round(self.artifact_pct, 1),
+            "intervals_used": self.n_cleaned,
+            "corrected": self.n_corrected,
+            "usable": self.usable,
+        }
+
+
 def rmssd(intervals: Sequence[float]) -> float | None:
     """RMSSD (ms) = sqrt(mean of squared successive differences). Expects an already-cleaned series
     (call `assess_rr` first). Returns None if there are too few intervals to form a difference set.
@@ -7,6 +7,7 @@ Uses PG advisory locks to prevent duplicate job execution when multiple
 gunicorn workers each start their own scheduler instance.
 """
 
+import asyncio
 import logging
 from datetime import timedelta
 
@@ -28,6 +29,11 @@ _LOCK_IDS = {
     # 900006/900007 were cockpit_snapshot / prevention_escalation — WHOOP jobs
     # retired 2026-08-07 (v2 Wave 1c freeze); keep the IDs unused so a future job
     # never collides with a lock a stale process might still hold.
+    "training_counters_rebuild": 900008,
+    "report_snapshots": 900009,
+    "physiology_snapshots": 900010,
+    "hrv_lab": 900011,
+    "whoop_daily_agg": 900012,
 }
 
 
@@ -346,6 +352,117 @@ async def _token_cleanup_job() -> None:
         _release_advisory_lock("token_cleanup")
 
 
+async def _training_counters_rebuild_job() -> None:
+    """Recompute every user's milestone counters from sessions (nightly, 04:00 UTC).
+
+    Session writes keep user_training_counters in step incrementally; this
+    repairs any drift from writes that bypassed the repository or a
+    best-effort distinct recount that failed.
+    """
+    if not _try_advisory_lock("training_counters_rebuild"):
+        return
+    try:
+        from rivaflow.db.repositories.training_counter_repo import (
+            TrainingCounterRepository,
+        )
+
+        written = TrainingCounterRepository.rebuild_all()
+        logger.info("Training counters rebuilt for %d users", written)
+    except Exception:
+        logger.error("Training counters rebuild job failed", exc_info=True)
+    finally:
+        _release_advisory_lock("training_counters_rebuild")
+
+
+async def _report_snapshots_job(period_type: str) -> None:
+    """Materialize last week's or last month's reports at period rollover."""
+    if not _try_advisory_lock("report_snapshots"):
+        return
+    try:
+        from rivaflow.core.services.report_service import ReportService
+
+        written = ReportService().snapshot_closed_period(period_type)
+        logger.info(
+            "Report snapshots: %d %s reports materialized", written, period_type
+        )
+    except Exception:
+        logger.error("Report snapshot job failed", exc_info=True)
+    finally:
+        _release_advisory_lock("report_snapshots")
+
+
+async def _physiology_snapshots_job() -> None:
+    """Precompute stale physiology snapshots (every 15 min).
+
+    The first run after the service's local midnight recomputes every user with
+    inputs, so the day's first /analytics/physiology or Grapple turn is a read.
+    Later runs only pick up users whose garmin_daily or session writes moved
+    their input version since.
+    """
+    if not _try_advisory_lock("physiology_snapshots"):
+        return
+    try:
+        from rivaflow.core.services.physiology_service import warm_snapshots
+
+        written = warm_snapshots()
+        if written:
+            logger.info("Physiology snapshots: %d users precomputed", written)
+    except Exception:
+        logger.error("Physiology snapshot job failed", exc_info=True)
+    finally:
+        _release_advisory_lock("physiology_snapshots")
+
+
+async def _hrv_lab_job() -> None:
+    """Run the nightly HRV lab over nights that have ended (hourly).
+
+    A night ends at local noon, so hourly runs reach each timezone soon after.
+    Nights already stored with their current RR count are skipped. The process
+    pool runs in a worker thread so the event loop keeps serving requests.
+    """
+    if not _try_advisory_lock("hrv_lab"):
+        return
+    try:
+        from rivaflow.core.services.hrv_lab import run_nightly
+
+        result = await asyncio.to_thread(run_nightly)
+        if result["nights"]:
+            logger.info(
+                "HRV lab: %d nights, %d windows analysed",
+                result["nights"],
+                result["windows"],
+            )
+    except Exception:
+        logger.error("HRV lab job failed", exc_info=True)
+    finally:
+        _release_advisory_lock("hrv_lab")
+
+
+async def _whoop_daily_agg_job() -> None:
+    """Bring every user's stored daily HR/RR rollups up to date (nightly).
+
+    Request-path readers only derive stale days inline, so the pooled re-derive
+    after a deriver version bump or a long gap happens here. The process pool
+    runs in a worker thread so the event loop keeps serving requests.
+    """
+    if not _try_advisory_lock("whoop_daily_agg"):
+        return
+    try:
+        from rivaflow.core.services.whoop_daily_agg import backfill
+
+        result = await asyncio.to_thread(backfill)
+        if result["recomputed"]:
+            logger.info(
+                "WHOOP daily rollups: %d days re-derived for %d users",
+                result["recomputed"],
+                result["users"],
+            )
+    except Exception:
+        logger.error("WHOOP daily rollup backfill failed", exc_info=True)
+    finally:
+        _release_advisory_lock("whoop_daily_agg")
+
+
 # ---------------------------------------------------------------------------
 # Lifecycle
 # ---------------------------------------------------------------------------
@@ -411,6 +528,67 @@ def start_scheduler() -> None:
         replace_existing=True,
     )
 
+    # Daily 04:00 UTC — milestone counters drift repair
+    _scheduler.add_job(
+        _training_counters_rebuild_job,
+        "cron",
+        hour=4,
+        minute=0,
+        id="training_counters_rebuild",
+        replace_existing=True,
+    )
+
+    # Tuesday 01:30 / 2nd of month 01:45 UTC — closed week/month report snapshots
+    # (a day after rollover so the period has ended in every timezone)
+    _scheduler.add_job(
+        _report_snapshots_job,
+        "cron",
+        args=["week"],
+        day_of_week="tue",
+        hour=1,
+        minute=30,
+        id="report_snapshots_week",
+        replace_existing=True,
+    )
+    _scheduler.add_job(
+        _report_snapshots_job,
+        "cron",
+        args=["month"],
+        day=2,
+        hour=1,
+        minute=45,
+        id="report_snapshots_month",
+        replace_existing=True,
+    )
+
+    # Every 15 min — physiology snapshots (covers local midnight and fresh ingests)
+    _scheduler.add_job(
+        _physiology_snapshots_job,
+        "cron",
+        minute="*/15",
+        id="physiology_snapshots",
+        replace_existing=True,
+    )
+
+    # Hourly at :20 — nightly HRV lab over nights that ended in any timezone
+    _scheduler.add_job(
+        _hrv_lab_job,
+        "cron",
+        minute=20,
+        id="hrv_lab",
+        replace_existing=True,
+    )
+
+    # Daily 05:40 UTC — pooled backfill of stale WHOOP daily rollups
+    _scheduler.add_job(
+        _whoop_daily_agg_job,
+        "cron",
+        hour=5,
+        minute=40,
+        id="whoop_daily_agg",
+        replace_existing=True,
+    )
+
     # The WHOOP cockpit-snapshot (4x/day + startup warmup) and hourly prevention-escalation
     # jobs were retired 2026-08-07 (v2 Wave 1c freeze) — the band is cold standby and the
     # raw whoop_hr/whoop_rr feed is dead, so there is nothing left for them to compute.
@@ -721,10 +721,10 @@ class CurriculumService:
         evidence stays human-confirmed via POST /slots/{id}/evidence, and
         slots already evidenced from THIS session are excluded (idempotent).
         """
-        from rivaflow.core.services.grapple.session_extraction_service import (
-            _fold,
+        from rivaflow.core.services.glossary_index import (
+            fold_name,
+            get_glossary_index,
         )
-        from rivaflow.db.repositories import GlossaryRepository
         from rivaflow.db.repositories.session_roll_repo import (
             SessionRollRepository,
         )
@@ -747,24 +747,10 @@ class CurriculumService:
             return {"session_id": session_id, "candidates": []}
 
         # Folded name keys (name + aliases) for every session movement.
-        glossary = {m["id"]: m for m in GlossaryRepository.list_all()}
-
-        def keys_for(mid: int) -> set[str]:
-            m = glossary.get(mid)
-            if not m:
-                return set()
-            keys = {_fold(m["name"])}
-            raw = m.get("aliases")
-            if isinstance(raw, str):
-                try:
-                    raw = json.loads(raw)
-                except (ValueError, TypeError):
-                    raw = []
-            keys.update(_fold(str(a)) for a in raw or [])
-            return keys
-
-        drilled_keys = {k: mid for mid in drilled_ids for k in keys_for(mid)}
-        live_keys = {k: mid for mid in live_hits for k in keys_for(mid)}
+        index = get_glossary_index()
+        glossary = index.by_id
+        drilled_keys = {k: mid for mid in drilled_ids for k in index.keys_for(mid)}
+        live_keys = {k: mid for mid in live_hits for k in index.keys_for(mid)}
 
         # Slots already evidenced from this session (idempotent re-display).
         evidenced_slots = {
@@ -777,7 +763,7 @@ class CurriculumService:
         for slot in self.repo.list_slots(user_id, belt):
             if slot["id"] in evidenced_slots:
                 continue
-            finish_key = _fold(slot.get("seq_finish") or "")
+            finish_key = fold_name(slot.get("seq_finish") or "")
             if not finish_key:
                 continue
             matched_live = live_keys.get(finish_key)
@@ -17,14 +17,15 @@ the frontend. Touches counted from session_techniques plus roll submissions_for.
 """
 
 import json
+from bisect import bisect_left, bisect_right
 from collections import Counter
+from collections.abc import Mapping
 from datetime import date, timedelta
 from typing import Any
 
-from rivaflow.db.repositories import (
-    GlossaryRepository,
-    SessionRepository,
-)
+from rivaflow.core.services.glossary_index import get_glossary_index
+from rivaflow.core.utils.cache import get_cache
+from rivaflow.db.repositories import SessionRepository
 from rivaflow.db.repositories.session_roll_repo import SessionRollRepository
 from rivaflow.db.repositories.session_technique_repo import SessionTechniqueRepository
 
@@ -41,6 +42,7 @@ WINDOW_WEEKS = {"8w": 8, "12w": 12}
 # Mat exposure counts BJJ time only — S&C/cardio/mobility have no game axes.
 BJJ_TYPES = ["gi", "no-gi", "open-mat", "drilling", "competition"]
 ALL_TIME_START = date(2000, 1, 1)
+_CACHE_TTL_SECONDS = 600
 
 
 class GameDistributionService:
@@ -48,30 +50,80 @@ class GameDistributionService:
 
     def __init__(self):
         self.session_repo = SessionRepository()
-        self.glossary_repo = GlossaryRepository()
         self.technique_repo = SessionTechniqueRepository()
         self.roll_repo = SessionRollRepository()
 
     def get_game_distribution(
         self, user_id: int, window: str = "all"
     ) -> dict[str, Any]:
+        if window not in WINDOW_WEEKS:
+            window = "all"
+        return self.get_all_windows(user_id)[window]
+
+    def get_all_windows(self, user_id: int) -> dict[str, dict[str, Any]]:
+        """Radar payloads for every window ("all" plus WINDOW_WEEKS) from one load.
+
+        Cached per user under the ``analytics_`` prefix, which session writes
+        clear, so switching windows on the panel never reloads.
+        """
+        cache = get_cache()
+        cache_key = f"analytics_game_distribution_windows:{user_id}"
+        payloads = cache.get(cache_key, None)
+        if payloads is not None:
+            return payloads
+
         end = date.today()
-        weeks = WINDOW_WEEKS.get(window)
-        if weeks:
+        timeline = self._load_timeline(user_id, end)
+        payloads = {"all": self._payload(timeline, "all", ALL_TIME_START, end)}
+        for window, weeks in WINDOW_WEEKS.items():
             start = end - timedelta(weeks=weeks)
-            prev_start = start - timedelta(weeks=weeks)
-            prev_end = start - timedelta(days=1)
-        else:
-            window = "all"
-            start, prev_start, prev_end = ALL_TIME_START, None, None
+            payloads[window] = self._payload(
+                timeline,
+                window,
+                start,
+                end,
+                prev_start=start - timedelta(weeks=weeks),
+                prev_end=start - timedelta(days=1),
+            )
+        cache.set(cache_key, payloads, _CACHE_TTL_SECONDS)
+        return payloads
+
+    def _load_timeline(self, user_id: int, end: date) -> "_SessionTimeline":
+        """Load every BJJ session up to *end* with its techniques and rolls once."""
+        sessions = self.session_repo.get_by_date_range(
+            user_id, ALL_TIME_START, end, types=BJJ_TYPES
+        )
+        session_ids = [s["id"] for s in sessions]
+        techs_by_session = (
+            self.technique_repo.batch_get_by_session_ids(session_ids)
+            if session_ids
+            else {}
+        )
+        rolls_by_session = (
+            self.roll_repo.get_by_session_ids(user_id, session_ids)
+            if session_ids
+            else {}
+        )
+        return _SessionTimeline(
+            sessions, techs_by_session, rolls_by_session, get_glossary_index().by_id
+        )
 
-        movement_map = {m["id"]: m for m in self.glossary_repo.list_all()}
-        current = self._window_stats(user_id, start, end, movement_map)
+    def _payload(
+        self,
+        timeline: "_SessionTimeline",
+        window: str,
+        start: date,
+        end: date,
+        prev_start: date | None = None,
+        prev_end: date | None = None,
+    ) -> dict[str, Any]:
+        current = timeline.window_stats(start, end)
         prev = (
-            self._window_stats(user_id, prev_start, prev_end, movement_map)
+            timeline.window_stats(prev_start, prev_end)
             if prev_start is not None and prev_end is not None
             else None
         )
+        windowed = window in WINDOW_WEEKS
 
         axes = []
         axis_max = {
@@ -115,7 +167,7 @@ class GameDistributionService:
         return {
             "window": {
                 "mode": window,
-                "start": start.isoformat() if weeks else None,
+                "start": start.isoformat() if windowed else None,
                 "end": end.isoformat(),
                 "prev_start": prev_start.isoformat() if prev_start else None,
                 "prev_end": prev_end.isoformat() if prev_end else None,
@@ -139,41 +191,52 @@ class GameDistributionService:
             },
         }
 
-    def _window_stats(
-        self,
-        user_id: int,
-        start: date,
-        end: date,
-        movement_map: dict[int, dict],
-    ) -> dict[str, Any]:
-        sessions = self.session_repo.get_by_date_range(
-            user_id, start, end, types=BJJ_TYPES
-        )
-        session_ids = [s["id"] for s in sessions]
-        techs_by_session = (
-            self.technique_repo.batch_get_by_session_ids(session_ids)
-            if session_ids
-            else {}
-        )
-        rolls_by_session = (
-            self.roll_repo.get_by_session_ids(user_id, session_ids)
-            if session_ids
-            else {}
-        )
 
-        coverage_sets: dict[str, set[int]] = {key: set() for key in AXIS_KEYS}
-        frequency: Counter = Counter({key: 0 for key in AXIS_KEYS})
-        load: dict[str, float] = {key: 0.0 for key in AXIS_KEYS}
-        other_touches = 0
-        total_touches = 0
-        distinct_movements: set[int] = set()
-        sessions_with_techniques = 0
-        load_sessions_with_hr = 0
-        total_trimp = 0.0
+class _SessionTimeline:
+    """Per-session radar contributions, date-sorted, with prefix accumulators.
 
-        for session in sessions:
-            per_axis: Counter = Counter()
+    Additive metrics (touches, TRIMP, minutes, session counts) for any date
+    window are a difference of two prefix rows; only the distinct-movement
+    sets need a pass over the sessions inside the window.
+    """
 
+    # Prefix row layout: one column per axis for frequency and for load, then
+    # the scalar totals below.
+    _SCALARS = (
+        "mat_mins",
+        "sessions_with_techniques",
+        "load_sessions_with_hr",
+        "total_trimp",
+        "other_touches",
+        "total_touches",
+    )
+
+    def __init__(
+        self,
+        sessions: list[dict],
+        techs_by_session: dict[int, list[dict]],
+        rolls_by_session: dict[int, list[dict]],
+        movement_map: Mapping[int, dict],
+    ):
+        self._axes = [key for key, _ in AXES]
+        self._col = {
+            name: 2 * len(self._axes) + i for i, name in enumerate(self._SCALARS)
+        }
+        width = 2 * len(self._axes) + len(self._SCALARS)
+        dated = [
+            (day, s) for s in sessions if (day := _coerce_date(s.get("session_date")))
+        ]
+        dated.sort(key=lambda pair: pair[0])
+
+        self.dates: list[date] = []
+        self.touched: list[tuple[dict[str, set[int]], set[int]]] = []
+        self.prefix: list[list[float]] = [[0.0] * width]
+        for day, session in dated:
+            per_axis: Counter = Counter()
+            axis_ids: dict[str, set[int]] = {}
+            movement_ids: set[int] = set()
+            other = 0
+            touches = 0
             for mid in _session_movement_ids(
                 techs_by_session.get(session["id"], []),
                 rolls_by_session.get(session["id"], []),
@@ -181,44 +244,81 @@ class GameDistributionService:
                 movement = movement_map.get(mid) if mid else None
                 if not movement:
                     continue
-                total_touches += 1
-                distinct_movements.add(movement["id"])
+                touches += 1
+                movement_ids.add(movement["id"])
                 category = movement.get("category")
                 if category in AXIS_KEYS:
                     per_axis[category] += 1
-                    coverage_sets[category].add(movement["id"])
+                    axis_ids.setdefault(category, set()).add(movement["id"])
                 else:
-                    other_touches += 1
-
-            if per_axis:
-                sessions_with_techniques += 1
-                for category, count in per_axis.items():
-                    frequency[category] += count
+                    other += 1
 
+            row = [0.0] * width
+            for i, key in enumerate(self._axes):
+                row[i] = per_axis[key]
             trimp = session.get("garmin_training_load")
-            if trimp is not None:
-                load_sessions_with_hr += 1
-                total_trimp += float(trimp)
-                axis_total = sum(per_axis.values())
-                if axis_total > 0:
-                    for category, count in per_axis.items():
-                        load[category] += float(trimp) * (count / axis_total)
+            axis_total = sum(per_axis.values())
+            if trimp is not None and axis_total > 0:
+                for i, key in enumerate(self._axes):
+                    row[len(self._axes) + i] = float(trimp) * (
+                        per_axis[key] / axis_total
+                    )
+            col = self._col
+            row[col["mat_mins"]] = session.get("duration_mins") or 0
+            row[col["sessions_with_techniques"]] = 1 if per_axis else 0
+            row[col["load_sessions_with_hr"]] = 1 if trimp is not None else 0
+            row[col["total_trimp"]] = float(trimp) if trimp is not None else 0.0
+            row[col["other_touches"]] = other
+            row[col["total_touches"]] = touches
+
+            last = self.prefix[-1]
+            self.prefix.append([a + b for a, b in zip(last, row, strict=True)])
+            self.dates.append(day)
+            self.touched.append((axis_ids, movement_ids))
+
+    def window_stats(self, start: date, end: date) -> dict[str, Any]:
+        """Radar metrics over sessions dated start..end (inclusive)."""
+        lo = bisect_left(self.dates, start)
+        hi = bisect_right(self.dates, end)
+        # Rounding the prefix difference drops float noise from long prefixes.
+        total = [round(b - a, 6) for a, b in zip(self.prefix[lo], self.prefix[hi])]
+        n_axes = len(self._axes)
+        col = self._col
+
+        coverage_sets: dict[str, set[int]] = {key: set() for key in AXIS_KEYS}
+        distinct_movements: set[int] = set()
+        for axis_ids, movement_ids in self.touched[lo:hi]:
+            for key, ids in axis_ids.items():
+                coverage_sets[key] |= ids
+            distinct_movements |= movement_ids
 
         return {
             "coverage": {key: len(ids) for key, ids in coverage_sets.items()},
-            "frequency": dict(frequency),
-            "load": load,
-            "mat_hours": sum((s.get("duration_mins") or 0) for s in sessions) / 60.0,
-            "sessions_in_window": len(sessions),
-            "sessions_with_techniques": sessions_with_techniques,
-            "load_sessions_with_hr": load_sessions_with_hr,
-            "total_trimp": total_trimp,
-            "other_touches": other_touches,
-            "total_touches": total_touches,
+            "frequency": {key: int(total[i]) for i, key in enumerate(self._axes)},
+            "load": {key: total[n_axes + i] for i, key in enumerate(self._axes)},
+            "mat_hours": total[col["mat_mins"]] / 60.0,
+            "sessions_in_window": hi - lo,
+            "sessions_with_techniques": int(total[col["sessions_with_techniques"]]),
+            "load_sessions_with_hr": int(total[col["load_sessions_with_hr"]]),
+            "total_trimp": total[col["total_trimp"]],
+            "other_touches": int(total[col["other_touches"]]),
+            "total_touches": int(total[col["total_touches"]]),
             "distinct_movements": len(distinct_movements),
         }
 
 
+def _coerce_date(value: Any) -> date | None:
+    """session_date arrives as date (Postgres) or ISO string (SQLite)."""
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return None
+
+
 def _session_movement_ids(techs: list[dict], rolls: list[dict]) -> list[int]:
     """All movement ids a session touched: logged techniques + roll subs-for."""
     mids = [mid for tech in techs if isinstance(mid := tech.get("movement_id"), int)]
@@ -0,0 +1,133 @@
+"""Process-wide in-memory index of the movements glossary.
+
+The glossary is a few hundred near-static rows, yet technique analytics, game
+distribution, technique effectiveness, curriculum evidence, voice-log movement
+resolution and the glossary RAG each ran ``SELECT * FROM movements_glossary``
+(and rebuilt their own name/alias dicts) per request. ``get_glossary_index``
+serves one shared, read-only ``GlossaryIndex`` per process and reloads it only
+when the stored glossary version moves (custom movement create/delete bumps it)
+or this process wrote to the glossary itself.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from types import MappingProxyType
+
+from rivaflow.db.repositories.glossary_repo import GlossaryRepository
+
+# How long a process trusts its index before re-reading the stored version;
+# writes from other processes become visible within this window.
+_VERSION_CHECK_SECONDS = 10.0
+
+
+def fold_name(name: str) -> str:
+    """Case/punctuation-insensitive key for movement matching."""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def _aliases(movement: dict) -> list[str]:
+    raw = movement.get("aliases")
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except (ValueError, TypeError):
+            raw = []
+    return [str(a) for a in raw or []]
+
+
+class GlossaryIndex:
+    """Read-only lookups over one glossary snapshot.
+
+    Movement dicts are shared by every caller in the process: read them,
+    copy before changing them.
+    """
+
+    def __init__(self, movements: list[dict], version: int = 0):
+        self.version = version
+        self.movements = tuple(movements)
+        by_name: dict[str, dict] = {}
+        by_alias: dict[str, dict] = {}
+        by_category: dict[str, list[dict]] = defaultdict(list)
+        for m in self.movements:
+            by_name[fold_name(m["name"])] = m
+            for alias in _aliases(m):
+                by_alias.setdefault(fold_name(alias), m)
+            by_category[m.get("category") or "other"].append(m)
+        self.by_id = MappingProxyType({m["id"]: m for m in self.movements})
+        self.by_category = MappingProxyType(
+            {cat: tuple(ms) for cat, ms in by_category.items()}
+        )
+        self._by_name = by_name
+        self._by_alias = by_alias
+
+    def get(self, movement_id: int) -> dict | None:
+        """Movement by ID, or None."""
+        return self.by_id.get(movement_id)
+
+    def resolve(self, name: str) -> dict | None:
+        """Movement by folded name, then folded alias. Never guesses."""
+        key = fold_name(name)
+        if not key:
+            return None
+        return self._by_name.get(key) or self._by_alias.get(key)
+
+    def keys_for(self, movement_id: int) -> set[str]:
+        """Folded name and alias keys for a movement (empty if unknown)."""
+        m = self.by_id.get(movement_id)
+        if not m:
+            return set()
+        return {fold_name(m["name"])} | {fold_name(a) for a in _aliases(m)}
+
+    def search(self, term: str) -> list[dict]:
+        """Movements whose name, description or aliases contain term (any case)."""
+        needle = term.lower()
+        return [
+            m
+            for m in self.movements
+            if needle in m["name"].lower()
+            or needle in (m.get("description") or "").lower()
+            or any(needle in a.lower() for a in _aliases(m))
+        ]
+
+
+_lock = threading.Lock()
+_index: GlossaryIndex | None = None
+_local_writes_seen = -1
+_checked_at = 0.0
+
+
+def get_glossary_index() -> GlossaryIndex:
+    """Get the shared glossary index, reloading it if the glossary changed."""
+    global _index, _local_writes_seen, _checked_at  # noqa: PLW0603
+
+    index = _index
+    now = time.monotonic()
+    if (
+        index is not None
+        and _local_writes_seen == GlossaryRepository.local_writes
+        and now - _checked_at < _VERSION_CHECK_SECONDS
+    ):
+        return index
+
+    with _lock:
+        local_writes = GlossaryRepository.local_writes
+        version = GlossaryRepository.get_version()
+        if (
+            _index is None
+            or _index.version != version
+            or local_writes != _local_writes_seen
+        ):
+            _index = GlossaryIndex(GlossaryRepository.list_all(), version)
+        _local_writes_seen = local_writes
+        _checked_at = time.monotonic()
+        return _index
+
+
+def reset_glossary_index() -> None:
+    """Drop the shared index so the next call reloads it."""
+    global _index  # noqa: PLW0603
+    with _lock:
+        _index = None
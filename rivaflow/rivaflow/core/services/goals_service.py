@@ -2,9 +2,12 @@
 
 from datetime import date
 
-from rivaflow.core.services.analytics_service import AnalyticsService
 from rivaflow.core.services.report_service import ReportService
-from rivaflow.db.repositories import ProfileRepository, SessionRepository
+from rivaflow.db.repositories import (
+    ProfileRepository,
+    SessionRepository,
+    StreakRepository,
+)
 from rivaflow.db.repositories.goal_progress_repo import GoalProgressRepository
 
 
@@ -15,8 +18,8 @@ class GoalsService:
         self.profile_repo = ProfileRepository()
         self.session_repo = SessionRepository()
         self.goal_progress_repo = GoalProgressRepository()
+        self.streak_repo = StreakRepository()
         self.report_service = ReportService()
-        self.analytics_service = AnalyticsService()
 
     def get_current_week_progress(self, user_id: int, tz: str | None = None) -> dict:
         """Get current week's goal progress vs targets.
@@ -274,16 +277,15 @@ class GoalsService:
     def get_training_streaks(self, user_id: int, tz: str | None = None) -> dict:
         """Get training session streaks (consecutive days trained).
 
-        Uses existing AnalyticsService streak calculation.
+        Reads the maintained training streak state (no session scan).
         """
         from rivaflow.core.services.report_service import today_in_tz
 
-        # Get consistency analytics which includes streak data
-        consistency = self.analytics_service.get_consistency_analytics(user_id)
+        streak = self.streak_repo.get_streak(user_id, "training")
 
         return {
-            "current_streak": consistency["streaks"]["current"],
-            "longest_streak": consistency["streaks"]["longest"],
+            "current_streak": streak["current_streak"],
+            "longest_streak": streak["longest_streak"],
             "last_updated": today_in_tz(tz).isoformat(),
         }
 
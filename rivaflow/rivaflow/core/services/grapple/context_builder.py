@@ -2,16 +2,27 @@
 
 import json
 import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import date, datetime, timedelta
+from typing import Any
 
 from rivaflow.core.services.insights_analytics import InsightsAnalyticsService
 from rivaflow.core.services.privacy_service import PrivacyService
 from rivaflow.core.time_utils import utcnow
+from rivaflow.core.utils.cache import get_cache
 from rivaflow.db.repositories.checkin_repo import CheckinRepository
 from rivaflow.db.repositories.coach_preferences_repo import (
     CoachPreferencesRepository,
 )
 from rivaflow.db.repositories.grading_repo import GradingRepository
+from rivaflow.db.repositories.grapple_context_repo import (
+    COACH_PREFS,
+    PROFILE,
+    READINESS,
+    SESSIONS,
+    GrappleContextRepository,
+)
 from rivaflow.db.repositories.profile_repo import ProfileRepository
 from rivaflow.db.repositories.readiness_repo import ReadinessRepository
 from rivaflow.db.repositories.session_repo import SessionRepository
@@ -19,6 +30,67 @@ from rivaflow.db.repositories.user_repo import UserRepository
 
 logger = logging.getLogger(__name__)
 
+# Caps how long a cached section can miss changes outside its versioned
+# domains (gym timetables, streak rollovers)
+SECTION_TTL_SECONDS = 3600
+
+# Data domains each prompt section reads. A section is cached per user and
+# local day under those domains' versions (GrappleContextRepository), so a
+# write rebuilds only the sections that read it. None = never cached:
+# physiology is already served from its own stored snapshot, and the
+# curriculum is written outside these domains.
+SECTION_DOMAINS: dict[str, tuple[str, ...] | None] = {
+    "directives": (PROFILE, COACH_PREFS),
+    "profile": (PROFILE, COACH_PREFS),
+    "timetable": (PROFILE,),
+    "streak": (SESSIONS,),
+    "sessions": (SESSIONS,),
+    "readiness": (READINESS,),
+    "checkins": (READINESS,),
+    "deep_analytics": (SESSIONS, READINESS),
+    "physiology": None,
+    "curriculum": None,
+}
+
+# Producer method and prompt label of every section, in prompt order
+SECTION_PRODUCERS: dict[str, tuple[str, str]] = {
+    "directives": ("_build_directives", "Coaching preferences"),
+    "profile": ("_build_profile_section", "Profile"),
+    "timetable": ("_build_timetable_section", "Gym timetable"),
+    "streak": ("_build_streak_section", "Training streak"),
+    "sessions": ("_build_sessions_section", "Training history"),
+    "readiness": ("_build_readiness_section", "Readiness"),
+    "checkins": ("_build_checkin_context", "Check-in"),
+    "deep_analytics": ("_build_deep_analytics_context", "Deep analytics"),
+    "physiology": ("_build_physiology_context", "Physiology"),
+    "curriculum": ("_build_curriculum_context", "Curriculum"),
+}
+
+# How long each uncached section may run, from when it starts, before the
+# prompt goes out without it
+SECTION_TIMEOUT_SECONDS: dict[str, float] = {
+    "directives": 2.0,
+    "profile": 2.0,
+    "timetable": 2.0,
+    "streak": 2.0,
+    "sessions": 3.0,
+    "readiness": 2.0,
+    "checkins": 2.0,
+    "deep_analytics": 4.0,
+    "physiology": 3.0,
+    "curriculum": 2.0,
+}
+
+# A section still waiting for a worker this long into a build is dropped
+BUILD_TIMEOUT_SECONDS = 6.0
+
+# Threads per prompt build. Each running section holds at most one
+# connection, so this bounds one chat turn's share of the database pool
+# (maxconn=20), and one build's slow sections never delay another's.
+SECTION_WORKERS = 4
+
+_TIMED_OUT = object()
+
 
 class GrappleContextBuilder:
     """
@@ -30,6 +102,9 @@ class GrappleContextBuilder:
     # Map current_grade strings to belt keys used by directives
     BELT_KEYWORDS = ["black", "brown", "purple", "blue", "white"]
 
+    # Context data versions, read once per prompt build (see _section_key)
+    _data_versions: dict[str, int] | None = None
+
     def __init__(self, user_id: int):
         """
         Initialize context builder.
@@ -69,15 +144,20 @@ class GrappleContextBuilder:
         Returns:
             Complete system prompt string
         """
-        user_context = self._build_user_context()
-        prefs = CoachPreferencesRepository.get(self.user_id)
-        mode_directive = self._build_mode_directive(prefs)
-        style_directive = self._build_style_directive(prefs)
-        injury_directive = self._build_injury_directive(prefs)
-        gi_nogi_directive = self._build_gi_nogi_directive(prefs)
-        belt = self._get_belt_from_profile()
-        belt_directive = self._build_belt_directive(belt)
-        ruleset_directive = self._build_ruleset_directive(prefs)
+        self._data_versions = None
+        sections = self._gather_sections(SECTION_PRODUCERS)
+        user_context = self._build_user_context(sections)
+        directives = self._section_result(sections, "directives")
+        if directives is _TIMED_OUT:
+            directives = ("",) * 6
+        (
+            mode_directive,
+            style_directive,
+            injury_directive,
+            gi_nogi_directive,
+            belt_directive,
+            ruleset_directive,
+        ) = directives
 
         return f"""You are Grapple, RivaFlow's AI BJJ coach. You hold coral-belt-level \
 knowledge — decades of accumulated expertise across all aspects of Brazilian \
@@ -183,6 +263,18 @@ CURRENT USER DATA:
 Now respond to the user's questions using this context. Reference their \
 specific training data when relevant."""
 
+    def _build_directives(self) -> tuple[str, str, str, str, str, str]:
+        """Mode, style, injury, gi/no-gi, belt and ruleset directives."""
+        prefs = CoachPreferencesRepository.get(self.user_id)
+        return (
+            self._build_mode_directive(prefs),
+            self._build_style_directive(prefs),
+            self._build_injury_directive(prefs),
+            self._build_gi_nogi_directive(prefs),
+            self._build_belt_directive(self._get_belt_from_profile()),
+            self._build_ruleset_directive(prefs),
+        )
+
     def _build_mode_directive(self, prefs: dict | None) -> str:
         """Build mode-specific coaching directive."""
         if not prefs:
@@ -507,30 +599,179 @@ Athlete competes under NAGA (North American Grappling Association) rules:
             return directive
         return ""
 
-    def _build_user_context(self) -> str:
+    def _build_user_context(self, sections: dict[str, Any] | None = None) -> str:
         """
         Build context string from user's training history.
 
+        Args:
+            sections: Results of ``_gather_sections``; gathered here when omitted
+
         Returns:
             Formatted context string
         """
-        # Get user profile
-        user = self.user_repo.get_by_id(self.user_id)
-        if not user:
+        if sections is None:
+            sections = self._gather_sections(
+                name for name in SECTION_PRODUCERS if name != "directives"
+            )
+
+        profile_block = self._section_text(sections, "profile")
+        if not profile_block:
             return "User profile not found."
+        context_parts = [profile_block]
 
-        # Get recent sessions (last 30 days + 20 most recent)
-        thirty_days_ago = utcnow() - timedelta(days=30)
-        recent_sessions = self.session_repo.get_recent(self.user_id, limit=200)
+        for name in ("timetable", "streak"):
+            block = self._section_text(sections, name)
+            if block:
+                context_parts.append(block)
 
-        # Redact all sessions for LLM
-        redacted_sessions = []
-        for session in recent_sessions:
-            redacted = PrivacyService.redact_for_llm(session, include_notes=True)
-            redacted_sessions.append(redacted)
+        sessions_block = self._section_text(sections, "sessions")
+        if not sessions_block:
+            context_parts.append("No training sessions logged yet.")
+            return "\n".join(context_parts)
+        context_parts.append(sessions_block)
+
+        readiness_block = self._section_text(sections, "readiness")
+        if readiness_block:
+            context_parts.extend(["", readiness_block])
+
+        # Optional enrichments: a failure here only drops its own block
+        for name in ("checkins", "deep_analytics", "physiology", "curriculum"):
+            try:
+                block = self._section_text(sections, name)
+                if block:
+                    context_parts.extend(["", block])
+            except Exception:
+                logger.debug(
+                    "%s context unavailable", SECTION_PRODUCERS[name][1], exc_info=True
+                )
+
+        return "\n".join(context_parts)
+
+    def _data_version_map(self) -> dict[str, int]:
+        """The user's context data versions, read once per prompt build."""
+        if self._data_versions is None:
+            self._data_versions = GrappleContextRepository.get_versions(self.user_id)
+        return self._data_versions
+
+    def _section_key(self, name: str) -> str | None:
+        """Cache key of a section: the versions of the data domains it reads
+        (``SECTION_DOMAINS``) and the day. None for a section never cached."""
+        domains = SECTION_DOMAINS[name]
+        if domains is None:
+            return None
+        versions = self._data_version_map()
+        return ":".join(
+            [
+                "grapple_ctx",
+                str(self.user_id),
+                name,
+                date.today().isoformat(),
+                *(f"{d}={versions[d]}" for d in domains),
+            ]
+        )
+
+    def _produce(self, name: str, key: str | None, started: dict[str, float]):
+        """Build one section and cache it under ``key``, recording in
+        ``started`` when it began. A producer that raises is not cached, so the
+        next turn retries it."""
+        started[name] = time.monotonic()
+        value = getattr(self, SECTION_PRODUCERS[name][0])()
+        if key is not None:
+            get_cache().set(key, value, SECTION_TTL_SECONDS)
+        return value
+
+    def _gather_sections(self, names) -> dict[str, Any]:
+        """Every named section, by name, built concurrently.
+
+        Cached sections are served inline. The rest run on this build's own
+        pool of ``SECTION_WORKERS`` threads. Each may run for its
+        ``SECTION_TIMEOUT_SECONDS`` once started, and one that has not started
+        within ``BUILD_TIMEOUT_SECONDS`` is dropped. A section still running at
+        its deadline is left to finish in the background (its result is cached
+        for the next turn) and reported as timed out, so a slow section never
+        holds up the prompt. A section that raised maps to its exception,
+        re-raised by ``_section_result``.
+        """
+        cache = get_cache()
+        results: dict[str, Any] = {}
+        futures: dict[Future, str] = {}
+        started: dict[str, float] = {}
+        pool = ThreadPoolExecutor(
+            max_workers=SECTION_WORKERS, thread_name_prefix="grapple-ctx"
+        )
+        build_deadline = time.monotonic() + BUILD_TIMEOUT_SECONDS
+
+        def deadline(name: str, now: float) -> float:
+            if name in started:
+                return started[name] + SECTION_TIMEOUT_SECONDS[name]
+            # Not started yet: look again once it could have, or the build ends
+            return min(build_deadline, now + SECTION_TIMEOUT_SECONDS[name])
+
+        try:
+            for name in names:
+                key = self._section_key(name)
+                cached = cache.get(key, None) if key is not None else None
+                if cached is not None:
+                    results[name] = cached
+                    continue
+                futures[pool.submit(self._produce, name, key, started)] = name
+
+            pending = set(futures)
+            while pending:
+                now = time.monotonic()
+                remaining = min(deadline(futures[f], now) for f in pending) - now
+                done, pending = wait(
+                    pending, timeout=max(remaining, 0), return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    error = future.exception()
+                    results[futures[future]] = error or future.result()
+                now = time.monotonic()
+                expired = {
+                    f
+                    for f in pending
+                    if deadline(futures[f], now) <= now
+                    and (futures[f] in started or build_deadline <= now)
+                }
+                for future in expired:
+                    results[futures[future]] = _TIMED_OUT
+                    logger.warning(
+                        "Grapple %s context timed out for user %s",
+                        futures[future],
+                        self.user_id,
+                    )
+                pending -= expired
+        finally:
+            # Running sections finish (and cache) in the background
+            pool.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    @staticmethod
+    def _section_result(sections: dict[str, Any], name: str):
+        """A gathered section's value, re-raising what its producer raised."""
+        value = sections[name]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def _section_text(self, sections: dict[str, Any], name: str) -> str:
+        """A gathered prompt section, or a note telling the coach it is missing
+        this turn when it timed out."""
+        value = self._section_result(sections, name)
+        if value is _TIMED_OUT:
+            return (
+                f"({SECTION_PRODUCERS[name][1]} data unavailable this turn: it did "
+                "not load in time. Do not guess at it.)"
+            )
+        return value
+
+    def _build_profile_section(self) -> str:
+        """Name, practitioner context and training preferences — empty when the
+        user does not exist."""
+        user = self.user_repo.get_by_id(self.user_id)
+        if not user:
+            return ""
 
-        # Calculate summary stats
-        total_sessions = len(redacted_sessions)
         context_parts = [
             "USER PROFILE:",
             f"Name: {user['first_name']} {user['last_name']}",
@@ -540,14 +781,14 @@ Athlete competes under NAGA (North American Grappling Association) rules:
 
         # Inject practitioner context from coach preferences
         prefs = CoachPreferencesRepository.get(self.user_id)
+        profile = None
+        try:
+            profile = self.profile_repo.get(self.user_id)
+        except Exception:
+            logger.debug("Profile lookup failed", exc_info=True)
         if prefs:
             ctx = ["PRACTITIONER CONTEXT:"]
             # Belt from profile (source of truth)
-            profile = None
-            try:
-                profile = self.profile_repo.get(self.user_id)
-            except Exception:
-                pass
             grade_str = (profile or {}).get("current_grade")
             if grade_str:
                 ctx.append(f"Belt: {grade_str}")
@@ -619,7 +860,6 @@ Athlete competes under NAGA (North American Grappling Association) rules:
 
         # Inject profile training preferences
         try:
-            profile = self.profile_repo.get(self.user_id)
             if profile:
                 profile_ctx = []
                 if profile.get("default_gym"):
@@ -642,8 +882,13 @@ Athlete competes under NAGA (North American Grappling Association) rules:
         except Exception:
             logger.debug("Profile enrichment skipped", exc_info=True)
 
-        # Inject today's gym timetable
+        return "\n".join(context_parts)
+
+    def _build_timetable_section(self) -> str:
+        """Today's classes at the primary gym."""
+        context_parts = []
         try:
+            profile = self.profile_repo.get(self.user_id)
             primary_gym_id = None
             if profile and profile.get("primary_gym_id"):
                 primary_gym_id = profile["primary_gym_id"]
@@ -667,7 +912,11 @@ Athlete competes under NAGA (North American Grappling Association) rules:
         except Exception:
             logger.debug("Gym timetable enrichment skipped", exc_info=True)
 
-        # Inject streak data
+        return "\n".join(context_parts)
+
+    def _build_streak_section(self) -> str:
+        """Current training streak."""
+        context_parts = []
         try:
             from rivaflow.db.repositories.streak_repo import StreakRepository
 
@@ -683,150 +932,132 @@ Athlete competes under NAGA (North American Grappling Association) rules:
         except Exception:
             logger.debug("Streak enrichment skipped", exc_info=True)
 
-        if total_sessions > 0:
-            # Calculate training stats
-            total_duration = sum(s.get("duration_mins", 0) for s in redacted_sessions)
-            total_rolls = sum(s.get("rolls_count", 0) for s in redacted_sessions)
-            avg_intensity = (
-                sum(s.get("intensity", 0) for s in redacted_sessions) / total_sessions
-            )
+        return "\n".join(context_parts)
 
-            # Get unique gyms and techniques
-            gyms = set(s.get("gym", "") for s in redacted_sessions if s.get("gym"))
-            all_techniques = set()
-            for s in redacted_sessions:
-                if s.get("techniques"):
-                    all_techniques.update(s["techniques"])
-
-            # Sessions in last 30 days
-            sessions_last_30_days = [
-                s
-                for s in redacted_sessions
-                if s.get("date") and self._parse_date(s["date"]) >= thirty_days_ago
-            ]
+    def _build_sessions_section(self) -> str:
+        """Training summary and the last 15 sessions in detail — empty when no
+        sessions are logged."""
+        # Get recent sessions (last 30 days + 20 most recent)
+        thirty_days_ago = utcnow() - timedelta(days=30)
+        recent_sessions = self.session_repo.get_recent(self.user_id, limit=200)
 
-            context_parts.extend(
-                [
-                    "TRAINING SUMMARY:",
-                    f"Total sessions logged: {total_sessions}",
-                    f"Sessions in last 30 days: {len(sessions_last_30_days)}",
-                    f"Total training time: {total_duration} minutes ({total_duration / 60:.1f} hours)",
-                    f"Total rolls: {total_rolls}",
-                    f"Average intensity: {avg_intensity:.1f}/5",
-                    f"Gyms trained at: {', '.join(sorted(gyms)) if gyms else 'Not specified'}",
-                    f"Techniques practiced: {len(all_techniques)} unique techniques",
-                    "",
-                ]
-            )
+        # Redact all sessions for LLM
+        redacted_sessions = []
+        for session in recent_sessions:
+            redacted = PrivacyService.redact_for_llm(session, include_notes=True)
+            redacted_sessions.append(redacted)
 
-            # Show last 15 sessions in detail
-            context_parts.append("RECENT SESSIONS (last 15):")
-            context_parts.append("")
-
-            for session in redacted_sessions[:15]:
-                date_val = session.get("date", "Unknown")
-                date_str = str(date_val) if date_val != "Unknown" else "Unknown"
-                gym = session.get("gym", "Unknown")
-                duration = session.get("duration_mins", 0)
-                intensity = session.get("intensity", 0)
-                rolls = session.get("rolls_count", 0)
-                techniques = session.get("techniques", [])
-                notes = session.get("notes", "")
-
-                session_summary = (
-                    f"- {date_str} at {gym}: {duration}min, intensity {intensity}/5"
-                )
-                if rolls > 0:
-                    session_summary += f", {rolls} rolls"
-                if techniques:
-                    techniques_str = ", ".join(techniques[:5])
-                    if len(techniques) > 5:
-                        techniques_str += f" (+{len(techniques) - 5} more)"
-                    session_summary += f" | Techniques: {techniques_str}"
-                if session.get("trimp") is not None:
-                    hr_bits = f" | Load: TRIMP {round(float(session['trimp']))}"
-                    if session.get("avg_hr") is not None:
-                        hr_bits += f", avg HR {session['avg_hr']}"
-                    if session.get("max_hr") is not None:
-                        hr_bits += f", max {session['max_hr']}"
-                    session_summary += hr_bits
-                if session.get("partners"):
-                    session_summary += (
-                        f" | Partners: {', '.join(session['partners'][:4])}"
-                    )
-                if notes:
-                    session_summary += f" | Notes: {notes[:200]}"
+        total_sessions = len(redacted_sessions)
+        if not total_sessions:
+            return ""
 
-                context_parts.append(session_summary)
+        context_parts = []
+        # Calculate training stats
+        total_duration = sum(s.get("duration_mins", 0) for s in redacted_sessions)
+        total_rolls = sum(s.get("rolls_count", 0) for s in redacted_sessions)
+        avg_intensity = (
+            sum(s.get("intensity", 0) for s in redacted_sessions) / total_sessions
+        )
+
+        # Get unique gyms and techniques
+        gyms = set(s.get("gym", "") for s in redacted_sessions if s.get("gym"))
+        all_techniques = set()
+        for s in redacted_sessions:
+            if s.get("techniques"):
+                all_techniques.update(s["techniques"])
+
+        # Sessions in last 30 days
+        sessions_last_30_days = [
+            s
+            for s in redacted_sessions
+            if s.get("date") and self._parse_date(s["date"]) >= thirty_days_ago
+        ]
 
-            # Add recent readiness data if available (last 7 days)
-            end_date = date.today()
-            start_date = end_date - timedelta(days=7)
-            recent_readiness = self.readiness_repo.get_by_date_range(
-                self.user_id, start_date, end_date
+        context_parts.extend(
+            [
+                "TRAINING SUMMARY:",
+                f"Total sessions logged: {total_sessions}",
+                f"Sessions in last 30 days: {len(sessions_last_30_days)}",
+                f"Total training time: {total_duration} minutes ({total_duration / 60:.1f} hours)",
+                f"Total rolls: {total_rolls}",
+                f"Average intensity: {avg_intensity:.1f}/5",
+                f"Gyms trained at: {', '.join(sorted(gyms)) if gyms else 'Not specified'}",
+                f"Techniques practiced: {len(all_techniques)} unique techniques",
+                "",
+            ]
+        )
+
+        # Show last 15 sessions in detail
+        context_parts.append("RECENT SESSIONS (last 15):")
+        context_parts.append("")
+
+        for session in redacted_sessions[:15]:
+            date_val = session.get("date", "Unknown")
+            date_str = str(date_val) if date_val != "Unknown" else "Unknown"
+            gym = session.get("gym", "Unknown")
+            duration = session.get("duration_mins", 0)
+            intensity = session.get("intensity", 0)
+            rolls = session.get("rolls_count", 0)
+            techniques = session.get("techniques", [])
+            notes = session.get("notes", "")
+
+            session_summary = (
+                f"- {date_str} at {gym}: {duration}min, intensity {intensity}/5"
             )
-            if recent_readiness:
-                context_parts.append("")
-                context_parts.append(
-                    "RECENT CHECK-INS (last 7 days, subjective 1-5 scales; "
-                    "5 = best for energy/sleep, worst for soreness/stress):"
-                )
-                for r in recent_readiness:
-                    # Real column names are check_date/energy/soreness/sleep/
-                    # stress on 1-5 (MA-F2: the old keys read nothing and
-                    # fabricated 'Energy 0/10' every day). Missing values are
-                    # omitted, never zeroed.
-                    r_date = r.get("check_date", "Unknown")
-                    fields = [
-                        ("Energy", r.get("energy")),
-                        ("Soreness", r.get("soreness")),
-                        ("Sleep", r.get("sleep")),
-                        ("Stress", r.get("stress")),
-                    ]
-                    bits = [f"{k} {v}/5" for k, v in fields if v is not None]
-                    if r.get("composite_score") is not None:
-                        bits.append(f"composite {r['composite_score']}/20")
-                    if bits:
-                        context_parts.append(f"- {r_date}: " + ", ".join(bits))
-
-            # ── Daily check-in context ──
-            try:
-                checkin_ctx = self._build_checkin_context()
-                if checkin_ctx:
-                    context_parts.append("")
-                    context_parts.append(checkin_ctx)
-            except Exception:
-                logger.debug("Check-in context unavailable", exc_info=True)
-
-            # ── Deep analytics context ──
-            try:
-                deep = self._build_deep_analytics_context()
-                if deep:
-                    context_parts.append("")
-                    context_parts.append(deep)
-            except Exception:
-                logger.debug("Deep analytics context unavailable", exc_info=True)
+            if rolls > 0:
+                session_summary += f", {rolls} rolls"
+            if techniques:
+                techniques_str = ", ".join(techniques[:5])
+                if len(techniques) > 5:
+                    techniques_str += f" (+{len(techniques) - 5} more)"
+                session_summary += f" | Techniques: {techniques_str}"
+            if session.get("trimp") is not None:
+                hr_bits = f" | Load: TRIMP {round(float(session['trimp']))}"
+                if session.get("avg_hr") is not None:
+                    hr_bits += f", avg HR {session['avg_hr']}"
+                if session.get("max_hr") is not None:
+                    hr_bits += f", max {session['max_hr']}"
+                session_summary += hr_bits
+            if session.get("partners"):
+                session_summary += f" | Partners: {', '.join(session['partners'][:4])}"
+            if notes:
+                session_summary += f" | Notes: {notes[:200]}"
+
+            context_parts.append(session_summary)
 
-            # ── Body-state context (Air biometrics + canonical readiness) ──
-            try:
-                physio = self._build_physiology_context()
-                if physio:
-                    context_parts.append("")
-                    context_parts.append(physio)
-            except Exception:
-                logger.debug("Physiology context unavailable", exc_info=True)
-
-            # ── Purple-belt curriculum context ──
-            try:
-                curriculum = self._build_curriculum_context()
-                if curriculum:
-                    context_parts.append("")
-                    context_parts.append(curriculum)
-            except Exception:
-                logger.debug("Curriculum context unavailable", exc_info=True)
+        return "\n".join(context_parts)
 
-        else:
-            context_parts.append("No training sessions logged yet.")
+    def _build_readiness_section(self) -> str:
+        """Readiness check-ins over the last 7 days."""
+        context_parts = []
+        # Add recent readiness data if available (last 7 days)
+        end_date = date.today()
+        start_date = end_date - timedelta(days=7)
+        recent_readiness = self.readiness_repo.get_by_date_range(
+            self.user_id, start_date, end_date
+        )
+        if recent_readiness:
+            context_parts.append(
+                "RECENT CHECK-INS (last 7 days, subjective 1-5 scales; "
+                "5 = best for energy/sleep, worst for soreness/stress):"
+            )
+            for r in recent_readiness:
+                # Real column names are check_date/energy/soreness/sleep/
+                # stress on 1-5 (MA-F2: the old keys read nothing and
+                # fabricated 'Energy 0/10' every day). Missing values are
+                # omitted, never zeroed.
+                r_date = r.get("check_date", "Unknown")
+                fields = [
+                    ("Energy", r.get("energy")),
+                    ("Soreness", r.get("soreness")),
+                    ("Sleep", r.get("sleep")),
+                    ("Stress", r.get("stress")),
+                ]
+                bits = [f"{k} {v}/5" for k, v in fields if v is not None]
+                if r.get("composite_score") is not None:
+                    bits.append(f"composite {r['composite_score']}/20")
+                if bits:
+                    context_parts.append(f"- {r_date}: " + ", ".join(bits))
 
         return "\n".join(context_parts)
 
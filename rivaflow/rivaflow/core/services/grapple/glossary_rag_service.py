@@ -2,12 +2,10 @@
 
 import logging
 
+from rivaflow.core.services.glossary_index import get_glossary_index
 from rivaflow.core.services.grapple.llm_client import (
     GrappleLLMClient,
 )
-from rivaflow.db.repositories.glossary_repo import (
-    GlossaryRepository,
-)
 
 logger = logging.getLogger(__name__)
 
@@ -62,14 +60,16 @@ async def technique_qa(question: str, user_id: int) -> dict:
         Dict with 'answer', 'sources', 'tokens'
     """
     # Search glossary for relevant techniques
-    results = GlossaryRepository.list_all(search=question)
+    index = get_glossary_index()
+    results = index.search(question)
 
     # Also try individual words for broader matches
+    seen_ids = {entry["id"] for entry in results}
     words = [w for w in question.split() if len(w) > 3 and w.lower() not in _STOP_WORDS]
     for word in words[:3]:
-        extra = GlossaryRepository.list_all(search=word)
-        for entry in extra:
-            if entry not in results:
+        for entry in index.search(word):
+            if entry["id"] not in seen_ids:
+                seen_ids.add(entry["id"])
                 results.append(entry)
 
     # Limit context to top 10 most relevant
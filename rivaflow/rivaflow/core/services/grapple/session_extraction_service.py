@@ -2,8 +2,8 @@
 
 import json
 import logging
-import re
 
+from rivaflow.core.services.glossary_index import fold_name, get_glossary_index
 from rivaflow.core.services.grapple.llm_client import (
     GrappleLLMClient,
 )
@@ -41,11 +41,6 @@ def normalize_class_type(raw: str | None) -> str:
     return _CLASS_TYPE_ALIASES.get(raw.strip().lower(), "gi")
 
 
-def _fold(name: str) -> str:
-    """Case/punctuation-insensitive key for movement matching."""
-    return re.sub(r"[^a-z0-9]", "", name.lower())
-
-
 def resolve_movements(names: list[str]) -> tuple[list[dict], list[str]]:
     """Resolve technique names to glossary movements (MA-F4).
 
@@ -54,30 +49,15 @@ def resolve_movements(names: list[str]) -> tuple[list[dict], list[str]]:
     Never guesses: an unmatched name stays a free string, it does not get the
     closest ID.
     """
-    from rivaflow.db.repositories import GlossaryRepository
-
-    movements = GlossaryRepository.list_all()
-    by_name: dict[str, dict] = {}
-    by_alias: dict[str, dict] = {}
-    for m in movements:
-        by_name[_fold(m["name"])] = m
-        raw_aliases = m.get("aliases")
-        if isinstance(raw_aliases, str):
-            try:
-                raw_aliases = json.loads(raw_aliases)
-            except (ValueError, TypeError):
-                raw_aliases = []
-        for alias in raw_aliases or []:
-            by_alias.setdefault(_fold(str(alias)), m)
+    index = get_glossary_index()
 
     resolved: list[dict] = []
     unresolved: list[str] = []
     seen_ids: set[int] = set()
     for name in names:
-        key = _fold(name)
-        if not key:
+        if not fold_name(name):
             continue
-        match = by_name.get(key) or by_alias.get(key)
+        match = index.resolve(name)
         if match is None:
             unresolved.append(name)
         elif match["id"] not in seen_ids:
@@ -0,0 +1,285 @@
+"""Nightly HRV lab — B4/B18 metrics over every clean 5-minute window of a night (migration 132).
+
+core/hrv_spectral.py and core/respiratory_spectral.py each analyse ONE caller-supplied segment. This is the
+batch that runs them systematically: a night's RR (sleep_window.night_window, the same night a
+whoop_daily_agg rollup is attributed to) is split into contiguous clean runs (rr_quality.clean_segments,
+never across a dropout), and each run is cut into consecutive stationary windows of ``WINDOW_SEC``. Every
+window gets Lomb-Scargle frequency-domain HRV, Poincaré SD1/SD2, DFA α1 and a spectral respiratory rate.
+The windows of ALL stale nights, across users, fan out over one process pool. Each night then stores the
+median, quartiles and range of every metric in whoop_hrv_lab, next to the day's rollup.
+
+``run_nightly`` is the batch engine, scheduled hourly so each user's night is picked up soon after it ends
+in their timezone. A night is stale when it has RR but no row, or its stored ``rr_count`` or
+``lab_version`` no longer matches, so the hourly reruns cost one count per candidate night. ``trend``
+serves stored nights only and never computes.
+
+DFA α1 is only summarised for nights whose artifact % is at most ``DFA_MAX_ARTIFACT_PCT`` (dfa_alpha1
+leaves that gate to its caller). LF:HF stays a descriptive ratio, as in hrv_spectral.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Hashable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, date, datetime, timedelta
+from statistics import median, quantiles
+from typing import Any
+
+from rivaflow.core.hrv_spectral import (
+    MIN_WINDOW_SEC,
+    dfa_alpha1,
+    frequency_domain,
+    poincare,
+)
+from rivaflow.core.respiratory_spectral import estimate_respiratory_rate
+from rivaflow.core.rr_quality import assess_rr, clean_segments
+from rivaflow.core.sleep_window import night_window, user_tz
+from rivaflow.db.repositories.whoop_repo import WhoopRepository
+
+logger = logging.getLogger(__name__)
+
+LAB_VERSION = "hrv-lab-v1"
+WINDOW_SEC = MIN_WINDOW_SEC  # the shortest window spectral HRV is valid on
+POOL_MIN_WINDOWS = 24  # fewer windows are analysed inline (~2h of clean sleep)
+DFA_MAX_ARTIFACT_PCT = 3.0  # dfa_alpha1 needs near-ECG-grade RR
+LOOKBACK_NIGHTS = 2  # nights before the local today that each run re-checks
+METRICS = (
+    "lf",
+    "hf",
+    "total_power",
+    "lf_hf",
+    "lf_nu",
+    "hf_nu",
+    "sd1",
+    "sd2",
+    "sd2_sd1",
+    "alpha1",
+    "resp_rpm",
+)
+
+
+def split_windows(
+    segment: Sequence[float], window_sec: float = WINDOW_SEC
+) -> list[list[float]]:
+    """Consecutive, non-overlapping runs of ``segment`` each spanning at least ``window_sec`` of beats.
+    A trailing run shorter than that is dropped."""
+    windows: list[list[float]] = []
+    current: list[float] = []
+    span_ms = 0.0
+    limit_ms = window_sec * 1000.0
+    for rr in segment:
+        current.append(rr)
+        span_ms += rr
+        if span_ms >= limit_ms:
+            windows.append(current)
+            current, span_ms = [], 0.0
+    return windows
+
+
+def night_windows(rr_ms: Sequence[float]) -> list[list[float]]:
+    """Every stationary ``WINDOW_SEC`` window of a night's raw RR series (ms), in order."""
+    return [w for segment in clean_segments(rr_ms) for w in split_windows(segment)]
+
+
+def analyse_window(window: list[float]) -> dict[str, float | None]:
+    """Every lab metric for one window — None where its estimator declines the window (pure)."""
+    out: dict[str, float | None] = dict.fromkeys(METRICS)
+    spectral = frequency_domain(window)
+    if spectral is not None:
+        out.update(
+            lf=spectral.lf,
+            hf=spectral.hf,
+            total_power=spectral.total_power,
+            lf_hf=spectral.lf_hf if spectral.hf > 0 else None,
+            lf_nu=spectral.lf_nu,
+            hf_nu=spectral.hf_nu,
+        )
+    geometry = poincare(window)
+    if geometry is not None:
+        out.update(sd1=geometry.sd1, sd2=geometry.sd2, sd2_sd1=geometry.ratio)
+    dfa = dfa_alpha1(window)
+    if dfa is not None:
+        out["alpha1"] = dfa["alpha1"]
+    resp = estimate_respiratory_rate(window)
+    if resp is not None:
+        out["resp_rpm"] = resp.rpm
+    return out
+
+
+def _window_job(job: tuple) -> tuple[Hashable, dict[str, float | None]]:
+    """Process-pool entry point: (night key, window) -> (night key, metrics)."""
+    key, window = job
+    return key, analyse_window(window)
+
+
+def _distribution(values: list[float]) -> dict[str, float | int]:
+    if len(values) >= 2:
+        p25, _, p75 = quantiles(values, n=4, method="inclusive")
+    else:
+        p25 = p75 = values[0]
+    return {
+        "median": round(median(values), 3),
+        "p25": round(p25, 3),
+        "p75": round(p75, 3),
+        "min": round(min(values), 3),
+        "max": round(max(values), 3),
+        "n": len(values),
+    }
+
+
+def summarise_night(
+    results: list[dict[str, float | None]], artifact_pct: float, minutes: float
+) -> dict[str, Any]:
+    """A night's stored metrics from its windows' results: per-metric distribution, or None when no
+    window produced the metric (α1 is withheld above ``DFA_MAX_ARTIFACT_PCT``)."""
+    dfa_ok = artifact_pct <= DFA_MAX_ARTIFACT_PCT
+    summary: dict[str, Any] = {
+        "windows": len(results),
+        "minutes": round(minutes, 1),
+        "artifact_pct": round(artifact_pct, 1),
+        "alpha1_gated": not dfa_ok,
+    }
+    for metric in METRICS:
+        values = [r[metric] for r in results if r[metric] is not None]
+        if metric == "alpha1" and not dfa_ok:
+            values = []
+        summary[metric] = _distribution(values) if values else None
+    return summary
+
+
+def analyse_nights(
+    nights: Mapping[Hashable, Sequence[float]], *, workers: int | None = None
+) -> dict[Hashable, dict[str, Any]]:
+    """``summarise_night`` for each night's raw RR (ms), keyed like ``nights``.
+
+    All nights' windows are analysed as one batch. ``workers`` sizes the process pool used once there are
+    ``POOL_MIN_WINDOWS`` windows (None = the executor's default, 0 = always inline).
+    """
+    jobs = []
+    minutes: dict[Hashable, float] = {}
+    for key, rr in nights.items():
+        windows = night_windows(rr)
+        minutes[key] = sum(sum(w) for w in windows) / 60_000
+        jobs.extend((key, w) for w in windows)
+    if workers != 0 and len(jobs) >= POOL_MIN_WINDOWS:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_window_job, jobs, chunksize=8))
+    else:
+        results = list(map(_window_job, jobs))
+
+    by_night: dict[Hashable, list[dict[str, float | None]]] = {k: [] for k in nights}
+    for key, metrics in results:
+        by_night[key].append(metrics)
+    return {
+        key: summarise_night(
+            by_night[key], assess_rr(rr).artifact_pct if rr else 0.0, minutes[key]
+        )
+        for key, rr in nights.items()
+    }
+
+
+def _night_iso(day: date, tz) -> tuple[str, str, datetime]:
+    start, end = night_window(day, tz)
+    return start.isoformat(), end.isoformat(), end
+
+
+def run_nightly(
+    *,
+    now: datetime | None = None,
+    lookback: int = LOOKBACK_NIGHTS,
+    user_ids: list[int] | None = None,
+    workers: int | None = None,
+) -> dict[str, int]:
+    """Analyse every stale, ended night among the last ``lookback`` local days of each user with RR, and
+    store the results. Returns ``{"users": checked, "nights": analysed, "windows": analysed}``.
+    """
+    now = now or datetime.now(UTC)
+    if user_ids is None:
+        user_ids = WhoopRepository.rr_user_ids(now - timedelta(days=lookback + 2), now)
+
+    nights: dict[tuple[int, str], Sequence[float]] = {}
+    counts: dict[tuple[int, str], int] = {}
+    for user_id in user_ids:
+        tz = user_tz(user_id)
+        today = now.astimezone(tz).date()
+        days = [today - timedelta(days=i) for i in range(lookback, 0, -1)]
+        stored = {
+            str(row["day"])[:10]: row
+            for row in WhoopRepository.get_hrv_lab_range(
+                user_id, days[0].isoformat(), days[-1].isoformat()
+            )
+        }
+        for day in days:
+            start_iso, end_iso, end = _night_iso(day, tz)
+            if end > now:
+                continue
+            count = WhoopRepository.rr_count_range(user_id, start_iso, end_iso)
+            row = stored.get(day.isoformat())
+            if not count or (
+                row is not None
+                and row["lab_version"] == LAB_VERSION
+                and row["rr_count"] == count
+            ):
+                continue
+            key = (user_id, day.isoformat())
+            nights[key] = WhoopRepository.rr_series(user_id, start_iso, end_iso).values
+            counts[key] = count
+
+    if not nights:
+        return {"users": len(user_ids), "nights": 0, "windows": 0}
+    summaries = analyse_nights(nights, workers=workers)
+    WhoopRepository.upsert_hrv_labs(
+        [
+            (
+                user_id,
+                day,
+                json.dumps(summaries[(user_id, day)]),
+                LAB_VERSION,
+                counts[(user_id, day)],
+            )
+            for user_id, day in nights
+        ]
+    )
+    return {
+        "users": len(user_ids),
+        "nights": len(nights),
+        "windows": sum(s["windows"] for s in summaries.values()),
+    }
+
+
+def trend(user_id: int, days: int = 28, today: date | None = None) -> dict[str, Any]:
+    """Stored lab nights over the last ``days`` local days, ascending: per night the medians, plus the
+    latest night's full distributions. Reads whoop_hrv_lab only — a night not yet analysed is absent.
+    """
+    today = today or datetime.now(user_tz(user_id)).date()
+    start = today - timedelta(days=days)
+    rows = WhoopRepository.get_hrv_lab_range(
+        user_id, start.isoformat(), today.isoformat()
+    )
+    nights = []
+    latest = None
+    for row in rows:
+        metrics = json.loads(row["metrics_json"])
+        nights.append(
+            {
+                "day": str(row["day"])[:10],
+                "windows": metrics["windows"],
+                "artifact_pct": metrics["artifact_pct"],
+                **{
+                    m: metrics[m]["median"] if metrics.get(m) else None for m in METRICS
+                },
+            }
+        )
+        latest = {"day": str(row["day"])[:10], **metrics}
+    return {
+        "days": days,
+        "nights": nights,
+        "latest": latest,
+        "lab_version": LAB_VERSION,
+        "note": (
+            "Medians over clean 5-minute windows. LF:HF is a descriptive ratio, NOT a sympatho-vagal "
+            "balance measure. α1 is experimental and withheld above 3% artifact."
+        ),
+    }
@@ -34,7 +34,6 @@ from rivaflow.core.services.insights_summary import (
 )
 from rivaflow.db.repositories import (
     FriendRepository,
-    GlossaryRepository,
     ReadinessRepository,
     SessionRepository,
     SessionRollRepository,
@@ -52,7 +51,6 @@ class InsightsAnalyticsService:
         self.readiness_repo = ReadinessRepository()
         self.roll_repo = SessionRollRepository()
         self.friend_repo = FriendRepository()
-        self.glossary_repo = GlossaryRepository()
         self.technique_repo = SessionTechniqueRepository()
 
     # ------------------------------------------------------------------
@@ -104,7 +102,6 @@ class InsightsAnalyticsService:
         return compute_technique_effectiveness(
             self.session_repo,
             self.roll_repo,
-            self.glossary_repo,
             self.technique_repo,
             user_id,
             start_date,
@@ -9,15 +9,16 @@ from collections import Counter, defaultdict
 from datetime import date, timedelta
 from typing import Any
 
+from rivaflow.core.services.glossary_index import get_glossary_index
 from rivaflow.core.services.insights_math import (
     _ewma,
     _linear_slope,
     _pearson_r,
     _shannon_entropy,
 )
+from rivaflow.core.services.partner_index import get_partner_index
 from rivaflow.db.repositories import (
     FriendRepository,
-    GlossaryRepository,
     ReadinessRepository,
     SessionRepository,
     SessionRollRepository,
@@ -216,7 +217,6 @@ def compute_training_load_management(
 def compute_technique_effectiveness(
     session_repo: SessionRepository,
     roll_repo: SessionRollRepository,
-    glossary_repo: GlossaryRepository,
     technique_repo: SessionTechniqueRepository,
     user_id: int,
     start_date: date | None = None,
@@ -251,8 +251,7 @@ def compute_technique_effectiveness(
                 train_counts[mid] += 1
 
     # Build glossary lookup
-    movements = glossary_repo.list_all()
-    movement_map = {m["id"]: m for m in movements}
+    movement_map = get_glossary_index().by_id
 
     # All unique movement IDs
     all_ids = set(sub_counts.keys()) | set(train_counts.keys())
@@ -339,18 +338,10 @@ def compute_partner_progression(
             "insight": "Partner not found.",
         }
 
-    # Get all rolls with this partner
-    rolls = roll_repo.get_by_partner_id(user_id, partner_id)
-    # Also get by name
-    name_rolls = roll_repo.list_by_partner_name(user_id, partner["name"])
-
-    # Deduplicate by roll ID
-    seen_ids: set[int] = set()
-    all_rolls = []
-    for r in rolls + name_rolls:
-        if r["id"] not in seen_ids:
-            seen_ids.add(r["id"])
-            all_rolls.append(r)
+    # Linked and name-matched rolls, oldest first, from the per-user index
+    all_rolls = get_partner_index(roll_repo, user_id).rolls_for(
+        partner_id, partner["name"]
+    )
 
     if len(all_rolls) < 3:
         return {
@@ -366,16 +357,6 @@ def compute_partner_progression(
             ),
         }
 
-    # Sort by session date
-    session_cache: dict[int, date] = {}
-    for r in all_rolls:
-        sid = r["session_id"]
-        if sid not in session_cache:
-            s = session_repo.get_by_id(user_id, sid)
-            session_cache[sid] = s["session_date"] if s else date.today()
-
-    all_rolls.sort(key=lambda r: session_cache[r["session_id"]])
-
     # Calculate per-roll sub result (1 = sub for, -1 = sub against, 0 = neutral)
     results = []
     for r in all_rolls:
@@ -384,7 +365,7 @@ def compute_partner_progression(
         score = subs_for - subs_against
         results.append(
             {
-                "date": session_cache[r["session_id"]].isoformat(),
+                "date": r["session_date"].isoformat(),
                 "subs_for": subs_for,
                 "subs_against": subs_against,
                 "score": score,
@@ -3,10 +3,10 @@
 import random
 from typing import Any
 
-from rivaflow.core.constants import MILESTONE_QUOTES
+from rivaflow.core.constants import MILESTONE_QUOTES, MILESTONES
 from rivaflow.db.repositories.milestone_repo import MilestoneRepository
-from rivaflow.db.repositories.session_repo import SessionRepository
 from rivaflow.db.repositories.streak_repo import StreakRepository
+from rivaflow.db.repositories.training_counter_repo import TrainingCounterRepository
 
 SESSION_MILESTONES = [50, 100, 250, 500, 1000, 2500, 5000]
 ROLL_MILESTONES = [100, 500, 1000, 5000, 10000]
@@ -23,14 +23,24 @@ class MilestoneService:
         """
         Check all milestone types against current totals.
         Returns list of newly achieved milestones.
+
+        Only types whose highest crossed threshold is above the highest one
+        already achieved reach the per-type insert path.
         """
         new_milestones = []
 
         # Calculate current totals
         totals = self._get_current_totals(user_id)
+        achieved = self.milestone_repo.get_highest_achieved_by_type(user_id)
 
         # Check each milestone type
         for milestone_type, current_value in totals.items():
+            crossed = max(
+                (t for t in MILESTONES.get(milestone_type, []) if current_value >= t),
+                default=None,
+            )
+            if crossed is None or crossed <= achieved.get(milestone_type, 0):
+                continue
             milestone = self.milestone_repo.check_and_create_milestone(
                 user_id, milestone_type, current_value
             )
@@ -40,8 +50,8 @@ class MilestoneService:
         return new_milestones
 
     def _get_current_totals(self, user_id: int) -> dict:
-        """Calculate current totals for all milestone types."""
-        totals = SessionRepository.get_milestone_totals(user_id)
+        """Read current totals for all milestone types from the counters row."""
+        totals = TrainingCounterRepository.get(user_id)
 
         # Streak: current checkin streak
         checkin_streak = self.streak_repo.get_streak(user_id, "checkin")
@@ -137,7 +147,7 @@ class MilestoneService:
         """Check if user just hit a session count milestone."""
         from rivaflow.core.services.notification_service import NotificationService
 
-        total = SessionRepository.get_total_count_for_user(user_id)
+        total = TrainingCounterRepository.get(user_id)["sessions"]
         achieved: list[dict[str, Any]] = []
         for milestone in SESSION_MILESTONES:
             if total == milestone:
@@ -156,7 +166,7 @@ class MilestoneService:
         """Check if user just hit a total rolls milestone."""
         from rivaflow.core.services.notification_service import NotificationService
 
-        total = SessionRepository.get_total_rolls_for_user(user_id)
+        total = TrainingCounterRepository.get(user_id)["rolls"]
         achieved: list[dict[str, Any]] = []
         for milestone in ROLL_MILESTONES:
             if total == milestone:
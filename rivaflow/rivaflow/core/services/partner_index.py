@@ -0,0 +1,90 @@
+"""One-pass partner roll index for partner analytics.
+
+Partner progression, the partner matrix and head-to-head used to look rolls
+up per partner (two queries each) and then fetch each roll's session row to
+learn its date. The index loads every roll with its session date in one
+joined query and groups it by partner once; per-partner roll lists and stats
+are memoized on the index, and the index itself is cached per user under the
+``analytics_`` prefix so session writes invalidate it.
+"""
+
+from collections import defaultdict
+from typing import Any
+
+from rivaflow.core.utils.cache import get_cache
+from rivaflow.db.repositories import SessionRollRepository
+
+_CACHE_TTL_SECONDS = 600
+
+
+class PartnerRollIndex:
+    """All of a user's rolls grouped by linked partner ID and unlinked name."""
+
+    def __init__(self, rolls: list[dict]):
+        """Build the index from rolls ordered oldest first (see list_with_session_dates)."""
+        self._by_partner_id: dict[int, list[dict]] = defaultdict(list)
+        self._by_name: dict[str, list[dict]] = defaultdict(list)
+        for roll in rolls:
+            if roll.get("partner_id"):
+                self._by_partner_id[roll["partner_id"]].append(roll)
+            elif roll.get("partner_name"):
+                self._by_name[roll["partner_name"].strip().lower()].append(roll)
+        self._rolls_memo: dict[tuple[int, str], list[dict]] = {}
+        self._stats_memo: dict[int, dict[str, Any]] = {}
+
+    def rolls_for(self, partner_id: int, name: str | None = None) -> list[dict]:
+        """Rolls linked to partner_id plus unlinked rolls logged under their name.
+
+        Ordered by session date, oldest first.
+        """
+        key = (partner_id, (name or "").strip().lower())
+        if key not in self._rolls_memo:
+            linked = self._by_partner_id.get(partner_id, [])
+            unlinked = self._by_name.get(key[1], []) if key[1] else []
+            rolls = linked + unlinked
+            if linked and unlinked:
+                rolls.sort(key=lambda r: r["session_date"])
+            self._rolls_memo[key] = rolls
+        return self._rolls_memo[key]
+
+    def stats(self, partner_id: int) -> dict[str, Any]:
+        """All-time stats for rolls linked to partner_id.
+
+        Same shape as ``SessionRollRepository.get_partner_stats``.
+        """
+        if partner_id not in self._stats_memo:
+            rolls = self._by_partner_id.get(partner_id, [])
+            total_rolls = len(rolls)
+            subs_for = sum(len(r.get("submissions_for") or []) for r in rolls)
+            subs_against = sum(len(r.get("submissions_against") or []) for r in rolls)
+            self._stats_memo[partner_id] = {
+                "partner_id": partner_id,
+                "total_rolls": total_rolls,
+                "total_submissions_for": subs_for,
+                "total_submissions_against": subs_against,
+                "subs_per_roll": (
+                    round(subs_for / total_rolls, 2) if total_rolls > 0 else 0
+                ),
+                "taps_per_roll": (
+                    round(subs_against / total_rolls, 2) if total_rolls > 0 else 0
+                ),
+                "sub_ratio": (
+                    round(subs_for / subs_against, 2)
+                    if subs_against > 0
+                    else float("inf") if subs_for > 0 else 0
+                ),
+            }
+        return self._stats_memo[partner_id]
+
+
+def get_partner_index(
+    roll_repo: SessionRollRepository, user_id: int
+) -> PartnerRollIndex:
+    """Get the user's partner roll index, building it on a cache miss."""
+    cache = get_cache()
+    cache_key = f"analytics_partner_index:{user_id}"
+    index = cache.get(cache_key, None)
+    if index is None:
+        index = PartnerRollIndex(roll_repo.list_with_session_dates(user_id))
+        cache.set(cache_key, index, _CACHE_TTL_SECONDS)
+    return index
@@ -9,6 +9,8 @@ from collections import Counter, defaultdict
 from datetime import date, timedelta
 from typing import Any
 
+from rivaflow.core.services.glossary_index import get_glossary_index
+from rivaflow.core.services.partner_index import get_partner_index
 from rivaflow.db.repositories import (
     FriendRepository,
     GlossaryRepository,
@@ -433,41 +435,27 @@ def compute_partner_analytics(
                 pass
         session_partners_json[s["id"]] = names
 
+    index = get_partner_index(roll_repo, user_id)
+
     partner_matrix = []
     for partner in partners:
-        stats = roll_repo.get_partner_stats(user_id, partner["id"])
+        stats = index.stats(partner["id"])
         name_lower = partner["name"].strip().lower()
 
-        # Count detailed rolls in date range (linked by partner_id)
-        rolls_in_range = roll_repo.get_by_partner_id(user_id, partner["id"])
-        rolls_in_range = [
-            r
-            for r in rolls_in_range
-            if start_date
-            <= get_session_date(session_repo, user_id, r["session_id"])
-            <= end_date
-        ]
-
-        # Also count unlinked rolls (partner_id IS NULL, matched by name)
-        unlinked_rolls = roll_repo.list_by_partner_name(user_id, partner["name"])
-        unlinked_in_range = [
+        # Detailed rolls in date range: linked by partner_id, or unlinked
+        # (partner_id IS NULL) and matched by name
+        all_partner_rolls = [
             r
-            for r in unlinked_rolls
-            if start_date
-            <= get_session_date(session_repo, user_id, r["session_id"])
-            <= end_date
+            for r in index.rolls_for(partner["id"], partner["name"])
+            if start_date <= r["session_date"] <= end_date
         ]
-
-        all_partner_rolls = rolls_in_range + unlinked_in_range
         detailed_count = len(all_partner_rolls)
         detailed_session_ids = {r["session_id"] for r in all_partner_rolls}
 
-        # Track most recent session date for this partner
-        last_rolled_date = None
-        for r in all_partner_rolls:
-            sd = get_session_date(session_repo, user_id, r["session_id"])
-            if last_rolled_date is None or sd > last_rolled_date:
-                last_rolled_date = sd
+        # Most recent session date for this partner (rolls are oldest first)
+        last_rolled_date = (
+            all_partner_rolls[-1]["session_date"] if all_partner_rolls else None
+        )
 
         # Simple mode: count sessions with this partner in JSON,
         # EXCLUDING sessions already counted via detailed rolls
@@ -723,7 +711,7 @@ def compute_partner_relationship(
 
     favorite_techniques = []
     if sub_movement_counts:
-        glossary = {m["id"]: m for m in GlossaryRepository().list_all()}
+        glossary = get_glossary_index().by_id
         favorite_techniques = [
             glossary[mid]["name"]
             for mid, _ in sub_movement_counts.most_common(5)
@@ -782,8 +770,9 @@ def compute_head_to_head(
     if not partner1 or not partner2:
         return {}
 
-    stats1 = roll_repo.get_partner_stats(user_id, partner1_id)
-    stats2 = roll_repo.get_partner_stats(user_id, partner2_id)
+    index = get_partner_index(roll_repo, user_id)
+    stats1 = index.stats(partner1_id)
+    stats2 = index.stats(partner2_id)
 
     return {
         "partner1": {
@@ -11,10 +11,15 @@ Sunday → Rest.
 Scale note: sessions carry EDWARDS TRIMP while cardio_load.scale_to_21's constants were fit on
 raw Banister units. Same order of magnitude, and the 0-21 mapping is display-feel rather than
 physiology; revisit if the hub ever pushes intraday samples for a true Banister path.
+
+Results are stored per user (physiology_snapshot_repo) for the local day and the user's input version,
+which garmin_daily and session writes bump. A live call recomputes only when either has moved, and the
+scheduler's physiology_snapshots job warms each user's snapshot once the day rolls over.
 """
 
 from __future__ import annotations
 
+import logging
 from datetime import date, datetime, timedelta
 from math import log
 from typing import Any
@@ -23,10 +28,16 @@ from zoneinfo import ZoneInfo
 from rivaflow.core.cardio_load import scale_to_21
 from rivaflow.core.readiness import blend_readiness, zscore
 from rivaflow.core.sleep_metrics import sleep_debt
+from rivaflow.core.strain_fit import policy_for_user
 from rivaflow.core.strain_target import prescribe_strain
 from rivaflow.core.training_load import acwr
 from rivaflow.db.repositories import SessionRepository
 from rivaflow.db.repositories.garmin_daily_repo import GarminDailyRepository
+from rivaflow.db.repositories.physiology_snapshot_repo import (
+    PhysiologySnapshotRepository,
+)
+
+logger = logging.getLogger(__name__)
 
 TZ = ZoneInfo("Australia/Melbourne")
 BASELINE_FETCH_DAYS = 45  # daily-biometrics window pulled for baselines
@@ -45,12 +56,30 @@ class PhysiologyService:
         garmin_repo: type[GarminDailyRepository] = GarminDailyRepository,
         session_repo: SessionRepository | None = None,
     ):
+        # Snapshots describe the real tables, so an injected data source bypasses them
+        self.snapshot_repo = (
+            PhysiologySnapshotRepository
+            if garmin_repo is GarminDailyRepository and session_repo is None
+            else None
+        )
         self.garmin_repo = garmin_repo
         self.session_repo = session_repo or SessionRepository()
 
     def get_physiology(self, user_id: int, today: date | None = None) -> dict[str, Any]:
+        """The live result for today is served from the stored snapshot while it is current. An
+        explicit ``today`` always recomputes."""
+        if today is not None or self.snapshot_repo is None:
+            return self._compute(user_id, today or datetime.now(TZ).date())
         # The server runs UTC; "today" (and therefore Sunday) is Ruby's Melbourne day.
-        today = today or datetime.now(TZ).date()
+        today = datetime.now(TZ).date()
+        stored, version = self.snapshot_repo.get(user_id, today)
+        if stored is not None:
+            return stored
+        result = self._compute(user_id, today)
+        self.snapshot_repo.save(user_id, today, version, result)
+        return result
+
+    def _compute(self, user_id: int, today: date) -> dict[str, Any]:
         is_sabbath = today.weekday() == 6  # Sunday, Ruby's rest day
 
         rows = self.garmin_repo.get_range(user_id, days=BASELINE_FETCH_DAYS)
@@ -67,7 +96,9 @@ class PhysiologyService:
         )
 
         chronic, acute = self._strain_inputs(daily_raw)
-        strain = prescribe_strain(readiness.get("state"), chronic, acute)
+        strain = prescribe_strain(
+            readiness.get("state"), chronic, acute, policy=policy_for_user(user_id)
+        )
 
         sleep_hours = [
             float(r["sleep_hours"]) for r in rows if r.get("sleep_hours") is not None
@@ -273,6 +304,28 @@ def daily_trimp_series(
     return [d.isoformat() for d in days], [by_day.get(d, 0.0) for d in days]
 
 
+def warm_snapshots(today: date | None = None) -> int:
+    """Recompute and store the snapshot of every user with physiology inputs whose stored one is not
+    current for ``today`` (default: the local day). Returns users written. A failing user is logged and
+    skipped."""
+    today = today or datetime.now(TZ).date()
+    service = PhysiologyService()
+    written = 0
+    for user_id in PhysiologySnapshotRepository.get_stale_user_ids(
+        today, BASELINE_FETCH_DAYS, LOAD_WINDOW_DAYS * 2
+    ):
+        try:
+            _, version = PhysiologySnapshotRepository.get(user_id, today)
+            result = service._compute(user_id, today)
+            PhysiologySnapshotRepository.save(user_id, today, version, result)
+            written += 1
+        except Exception:
+            logger.warning(
+                "Physiology snapshot failed for user %d", user_id, exc_info=True
+            )
+    return written
+
+
 def _as_date(value: Any) -> date:
     """metric_date/session_date arrive as date (Postgres) or ISO string (SQLite)."""
     if isinstance(value, date):
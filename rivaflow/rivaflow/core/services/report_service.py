@@ -6,6 +6,8 @@ from datetime import UTC, date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from rivaflow.db.repositories import ReadinessRepository, SessionRepository
+from rivaflow.db.repositories.profile_repo import ProfileRepository
+from rivaflow.db.repositories.report_snapshot_repo import ReportSnapshotRepository
 from rivaflow.db.repositories.session_repo import MAT_CLASS_TYPES
 from rivaflow.db.repositories.session_roll_repo import SessionRollRepository
 
@@ -23,6 +25,16 @@ def today_in_tz(tz: str | None = None) -> date:
     return datetime.now(UTC).date()
 
 
+def is_period_closed(end_date: date, today: date | None = None) -> bool:
+    """True once end_date has passed in every timezone.
+
+    UTC today minus one day: no user's local date lags UTC by more than that.
+    """
+    if today is None:
+        today = datetime.now(UTC).date()
+    return end_date < today - timedelta(days=1)
+
+
 class ReportService:
     """Business logic for generating training reports."""
 
@@ -30,6 +42,7 @@ class ReportService:
         self.session_repo = SessionRepository()
         self.readiness_repo = ReadinessRepository()
         self.roll_repo = SessionRollRepository()
+        self.snapshot_repo = ReportSnapshotRepository()
 
     def get_week_dates(
         self, target_date: date | None = None, tz: str | None = None
@@ -62,11 +75,116 @@ class ReportService:
 
         return first_day, last_day
 
+    def snapshot_period_type(self, start_date: date, end_date: date) -> str | None:
+        """Return "week" or "month" when the range is exactly one such period."""
+        if start_date.weekday() == 0 and end_date == start_date + timedelta(days=6):
+            return "week"
+        if start_date.day == 1 and (start_date, end_date) == self.get_month_dates(
+            start_date
+        ):
+            return "month"
+        return None
+
     def generate_report(self, user_id: int, start_date: date, end_date: date) -> dict:
         """
         Generate comprehensive report for date range.
-        Uses optimized queries to load only necessary data.
+
+        Closed calendar weeks and months are served from (and stored to) the
+        report snapshot table; open periods and custom ranges are computed.
+        """
+        period_type = self.snapshot_period_type(start_date, end_date)
+        if period_type is None or not is_period_closed(end_date):
+            return self._build_report(user_id, start_date, end_date)
+
+        report = self.snapshot_repo.get(user_id, start_date, end_date)
+        if report is None:
+            report = self._build_report(user_id, start_date, end_date)
+            self.snapshot_repo.save(user_id, period_type, report)
+        return report
+
+    def generate_reports(
+        self, user_id: int, periods: list[tuple[date, date]]
+    ) -> list[dict]:
+        """Generate reports for several periods (e.g. month-over-month comparison).
+
+        Stored snapshots for all periods are fetched in one query; only the
+        missing or still-open periods are computed.
+        """
+        stored = self.snapshot_repo.get_many(user_id, periods)
+        reports = []
+        for start_date, end_date in periods:
+            report = stored.get((start_date, end_date))
+            if report is None:
+                report = self.generate_report(user_id, start_date, end_date)
+            reports.append(report)
+        return reports
+
+    def compare_periods(
+        self,
+        user_id: int,
+        period_type: str,
+        count: int,
+        target_date: date | None = None,
+        tz: str | None = None,
+    ) -> list[dict]:
+        """Summaries for the last *count* weeks or months, oldest first.
+
+        The period containing target_date is the newest one. It defaults to
+        today in *tz*, or in the user's profile timezone when *tz* is None.
+        Closed periods come from one batched snapshot read.
         """
+        if target_date is None:
+            if tz is None:
+                tz = (ProfileRepository.get(user_id) or {}).get("timezone")
+            target_date = today_in_tz(tz)
+        period_dates = (
+            self.get_week_dates if period_type == "week" else self.get_month_dates
+        )
+        start_date, end_date = period_dates(target_date)
+        periods = [(start_date, end_date)]
+        for _ in range(count - 1):
+            start_date, end_date = period_dates(start_date - timedelta(days=1))
+            periods.append((start_date, end_date))
+        periods.reverse()
+
+        return [
+            {
+                "start_date": report["start_date"],
+                "end_date": report["end_date"],
+                "summary": report["summary"],
+                "breakdown_by_type": report["breakdown_by_type"],
+            }
+            for report in self.generate_reports(user_id, periods)
+        ]
+
+    def snapshot_closed_period(
+        self, period_type: str, today: date | None = None
+    ) -> int:
+        """Materialize the most recent closed week or month for active users.
+
+        Run by the scheduler at period rollover. Users whose snapshot already
+        exists are skipped. Returns the number of snapshots written.
+        """
+        if today is None:
+            today = datetime.now(UTC).date()
+        period_dates = (
+            self.get_week_dates if period_type == "week" else self.get_month_dates
+        )
+        start_date, end_date = period_dates(today - timedelta(days=2))
+        if not is_period_closed(end_date, today):
+            start_date, end_date = period_dates(start_date - timedelta(days=1))
+
+        written = 0
+        for user_id in self.snapshot_repo.get_active_user_ids(start_date, end_date):
+            if self.snapshot_repo.get(user_id, start_date, end_date) is not None:
+                continue
+            report = self._build_report(user_id, start_date, end_date)
+            self.snapshot_repo.save(user_id, period_type, report)
+            written += 1
+        return written
+
+    def _build_report(self, user_id: int, start_date: date, end_date: date) -> dict:
+        """Compute a report from sessions and readiness for the date range."""
         # Load sessions with only required columns to reduce data transfer
         sessions = self.session_repo.get_by_date_range(user_id, start_date, end_date)
         readiness_entries = self.readiness_repo.get_by_date_range(
@@ -5,15 +5,18 @@ from datetime import date
 from typing import Any
 
 from rivaflow.core.constants import SPARRING_CLASS_TYPES
+from rivaflow.core.hr_series import lttb
 from rivaflow.core.services.streak_service import StreakService
 from rivaflow.core.utils.cache import get_cache
 from rivaflow.db.repositories import (
     SessionRepository,
     SessionRollRepository,
+    TrainingCounterRepository,
 )
 from rivaflow.db.repositories.checkin_repo import CheckinRepository
 from rivaflow.db.repositories.friend_repo import FriendRepository
 from rivaflow.db.repositories.glossary_repo import GlossaryRepository
+from rivaflow.db.repositories.report_snapshot_repo import ReportSnapshotRepository
 from rivaflow.db.repositories.session_technique_repo import SessionTechniqueRepository
 from rivaflow.db.repositories.social_connection_repo import SocialConnectionRepository
 from rivaflow.db.repositories.user_repo import UserRepository
@@ -135,6 +138,8 @@ class SessionService:
 
         self._create_rolls(user_id, session_id, session_rolls, partners)
         self._create_techniques(user_id, session_id, session_techniques, techniques)
+        if session_rolls or partners or session_techniques or techniques:
+            self._refresh_distinct_counters(user_id, session_id)
 
         # Create check-in record for this session
         self.checkin_repo.upsert_checkin(
@@ -161,6 +166,17 @@ class SessionService:
         """Get a session by ID."""
         return self.session_repo.get_by_id(user_id, session_id)
 
+    def get_hr_series(
+        self, user_id: int, session_id: int, max_points: int | None = None
+    ) -> dict[str, Any] | None:
+        """The session's HR line, LTTB-downsampled to at most *max_points* points."""
+        series = self.session_repo.get_hr_series(user_id, session_id)
+        if series is None:
+            return None
+        pairs = series.pairs
+        points = lttb(pairs, max_points) if max_points else pairs
+        return {"session_id": session_id, "total_points": len(pairs), "points": points}
+
     def get_adjacent_sessions(self, user_id: int, session_id: int) -> dict[str, Any]:
         """
         Get the previous and next session IDs for navigation.
@@ -228,6 +244,27 @@ class SessionService:
                 self.technique_detail_repo.delete_by_session(session_id)
             self._create_techniques(user_id, session_id, None, techniques)
 
+        if (
+            session_rolls is not None
+            or session_techniques is not None
+            or techniques is not None
+        ):
+            self._refresh_distinct_counters(user_id, session_id)
+            # The row update may have been a no-op, so it cannot be relied on
+            # to drop closed-period snapshots counting the old rolls
+            ReportSnapshotRepository.invalidate_session_details(user_id, session_id)
+
+        # Moving a session to another day can split or join streak runs
+        new_date = kwargs.get("session_date")
+        if (
+            new_date is not None
+            and str(new_date)[:10] != str(original.get("session_date"))[:10]
+        ):
+            try:
+                self.streak_service.rebuild_streaks(user_id)
+            except Exception:
+                logger.warning("Failed to rebuild streak for session %s", session_id)
+
         # Best-effort session scoring recalc
         self._score_session(user_id, session_id)
 
@@ -235,10 +272,30 @@ class SessionService:
 
         return updated
 
+    @staticmethod
+    def _refresh_distinct_counters(user_id: int, session_id: int) -> None:
+        """Best-effort recount of distinct partners/techniques after a write.
+
+        Rolls and techniques are written on their own connections, so the
+        recount cannot share their transaction. A failure here must not fail
+        the session write: the nightly counter rebuild repairs the row.
+        """
+        try:
+            TrainingCounterRepository.refresh_distinct(user_id)
+        except Exception:
+            logger.warning(
+                "Failed to refresh training counters for session %s", session_id
+            )
+
     def delete_session(self, user_id: int, session_id: int) -> bool:
         """Delete a session by ID. Returns True if deleted, False if not found."""
         result = self.session_repo.delete(user_id, session_id)
         if result:
+            self._refresh_distinct_counters(user_id, session_id)
+            try:
+                self.streak_service.rebuild_streaks(user_id)
+            except Exception:
+                logger.warning("Failed to rebuild streak for session %s", session_id)
             _invalidate_session_caches()
         return result
 
@@ -4,9 +4,12 @@ from collections import Counter, defaultdict
 from datetime import date, timedelta
 from typing import Any
 
+from rivaflow.core.services.training_calendar import TrainingCalendar, years_between
 from rivaflow.db.repositories import (
     GradingRepository,
     SessionRepository,
+    StreakRepository,
+    TrainingCalendarRepository,
 )
 
 
@@ -16,6 +19,16 @@ class StreakAnalyticsService:
     def __init__(self):
         self.session_repo = SessionRepository()
         self.grading_repo = GradingRepository()
+        self.streak_repo = StreakRepository()
+        self.calendar_repo = TrainingCalendarRepository()
+
+    def _calendar(
+        self, user_id: int, start_date: date, end_date: date, types: list[str] | None
+    ) -> TrainingCalendar:
+        years = self.calendar_repo.get_years(
+            user_id, years_between(start_date, end_date), types
+        )
+        return TrainingCalendar(start_date, end_date, years)
 
     def get_consistency_analytics(
         self,
@@ -38,6 +51,7 @@ class StreakAnalyticsService:
             - class_type_distribution: Breakdown by class type
             - gym_breakdown: Training by location
             - streaks: Current and longest streaks
+            - calendar: Trained days per week, longest run and longest gap
         """
         if not start_date:
             start_date = date.today() - timedelta(days=90)
@@ -71,63 +85,22 @@ class StreakAnalyticsService:
             {"gym": gym, "sessions": count} for gym, count in gym_counts.most_common()
         ]
 
-        # Calculate streaks
-        all_sessions = self.session_repo.get_recent(
-            user_id, 1000
-        )  # Get more for streak calc
-        current_streak, longest_streak = self._calculate_streaks(all_sessions)
+        # Streaks come from the maintained training streak state
+        training_streak = self.streak_repo.get_streak(user_id, "training")
+
+        calendar = self._calendar(user_id, start_date, end_date, types)
 
         return {
             "weekly_volume": weekly_volume,
             "class_type_distribution": class_type_distribution,
             "gym_breakdown": gym_breakdown,
             "streaks": {
-                "current": current_streak,
-                "longest": longest_streak,
+                "current": training_streak["current_streak"],
+                "longest": training_streak["longest_streak"],
             },
+            "calendar": calendar.consistency(),
         }
 
-    def _calculate_streaks(self, sessions: list[dict]) -> tuple:
-        """Calculate current and longest training streaks."""
-        if not sessions:
-            return 0, 0
-
-        # Sort by date descending
-        sorted_sessions = sorted(
-            sessions, key=lambda s: s["session_date"], reverse=True
-        )
-
-        # Get unique dates
-        session_dates = sorted(
-            list(set(s["session_date"] for s in sorted_sessions)), reverse=True
-        )
-
-        current_streak = 0
-        longest_streak = 0
-        temp_streak = 1
-
-        # Calculate current streak from today
-        today = date.today()
-        if session_dates and session_dates[0] >= today - timedelta(days=1):
-            current_streak = 1
-            for i in range(1, len(session_dates)):
-                if session_dates[i] == session_dates[i - 1] - timedelta(days=1):
-                    current_streak += 1
-                else:
-                    break
-
-        # Calculate longest streak
-        for i in range(1, len(session_dates)):
-            if session_dates[i] == session_dates[i - 1] - timedelta(days=1):
-                temp_streak += 1
-                longest_streak = max(longest_streak, temp_streak)
-            else:
-                temp_streak = 1
-
-        longest_streak = max(longest_streak, temp_streak)
-
-        return current_streak, longest_streak
-
     def get_training_frequency_heatmap(
         self,
         user_id: int,
@@ -141,38 +114,20 @@ class StreakAnalyticsService:
         if not end_date:
             end_date = date.today()
 
-        sessions = self.session_repo.get_by_date_range(
-            user_id, start_date, end_date, types=types
-        )
-
-        # Aggregate by day
-        daily: dict[str, dict] = defaultdict(lambda: {"count": 0, "total_intensity": 0})
-        for s in sessions:
-            day_key = s["session_date"].isoformat()
-            daily[day_key]["count"] += 1
-            daily[day_key]["total_intensity"] += s.get("intensity", 0) or 0
+        training_calendar = self._calendar(user_id, start_date, end_date, types)
 
-        # Build full calendar grid
         calendar = []
-        current = start_date
-        while current <= end_date:
-            day_key = current.isoformat()
-            entry = daily.get(day_key)
-            if entry and entry["count"] > 0:
-                avg_intensity = round(entry["total_intensity"] / entry["count"], 1)
-                calendar.append(
-                    {
-                        "date": day_key,
-                        "count": entry["count"],
-                        "intensity": avg_intensity,
-                    }
-                )
-            else:
-                calendar.append({"date": day_key, "count": 0, "intensity": 0})
-            current += timedelta(days=1)
+        for day, count, total_intensity in training_calendar.days():
+            calendar.append(
+                {
+                    "date": day.isoformat(),
+                    "count": count,
+                    "intensity": round(total_intensity / count, 1) if count else 0,
+                }
+            )
 
-        total_active_days = sum(1 for d in calendar if d["count"] > 0)
-        total_days = len(calendar)
+        total_active_days = training_calendar.active_days
+        total_days = training_calendar.total_days
 
         return {
             "calendar": calendar,
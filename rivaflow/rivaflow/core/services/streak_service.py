@@ -114,8 +114,8 @@ class StreakService:
         """
         Get current status of all streaks.
 
-        Recalculates the checkin streak from daily_checkins history to
-        ensure accuracy even when write paths missed streak updates.
+        Reads the maintained streak state rows only; lapsed runs already
+        report a live ``current_streak`` of 0.
 
         Returns dict with:
         - checkin: streak dict
@@ -124,7 +124,7 @@ class StreakService:
         - any_at_risk: bool
         """
         streaks = {
-            "checkin": self.streak_repo.recalculate_checkin_streak(user_id),
+            "checkin": self.streak_repo.get_streak(user_id, "checkin"),
             "training": self.streak_repo.get_streak(user_id, "training"),
             "readiness": self.streak_repo.get_streak(user_id, "readiness"),
         }
@@ -161,6 +161,22 @@ class StreakService:
         """Get a specific streak."""
         return self.streak_repo.get_streak(user_id, streak_type)
 
+    def rebuild_streaks(
+        self, user_id: int, streak_types: tuple[str, ...] = ("training",)
+    ) -> dict:
+        """
+        Re-derive streaks from history after past dates were edited or deleted.
+
+        Incremental check-ins only move a streak forward; call this when a
+        session/check-in date changes or a row is removed.
+
+        Returns dict of streak_type -> rebuilt streak dict.
+        """
+        return {
+            streak_type: self.streak_repo.rebuild_streak(user_id, streak_type)
+            for streak_type in streak_types
+        }
+
     def get_all_streaks(self, user_id: int) -> list[dict]:
         """Get all streak types."""
         return self.streak_repo.get_all_streaks(user_id)
@@ -4,10 +4,8 @@ from collections import Counter
 from datetime import date, timedelta
 from typing import Any
 
-from rivaflow.db.repositories import (
-    GlossaryRepository,
-    SessionRepository,
-)
+from rivaflow.core.services.glossary_index import get_glossary_index
+from rivaflow.db.repositories import SessionRepository
 from rivaflow.db.repositories.session_technique_repo import SessionTechniqueRepository
 
 
@@ -16,7 +14,6 @@ class TechniqueAnalyticsService:
 
     def __init__(self):
         self.session_repo = SessionRepository()
-        self.glossary_repo = GlossaryRepository()
         self.technique_repo = SessionTechniqueRepository()
 
     def get_technique_analytics(
@@ -52,8 +49,7 @@ class TechniqueAnalyticsService:
         )
 
         # Build movement lookup
-        movements = self.glossary_repo.list_all()
-        movement_map = {m["id"]: m for m in movements}
+        movement_map = get_glossary_index().by_id
 
         # Get session_techniques in bulk
         session_ids = [s["id"] for s in sessions]
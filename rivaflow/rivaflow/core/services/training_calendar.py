@@ -0,0 +1,105 @@
+"""Date-range views and consistency metrics over the compact training calendar.
+
+``TrainingCalendarRepository`` stores one bitset of trained days per user and
+year. ``TrainingCalendar`` stitches the years covering a date range into one
+Python int (bit n = start + n days), so active days, runs, gaps and per-week
+frequency are popcounts and shifts rather than loops over session rows.
+"""
+
+from datetime import date, timedelta
+
+from rivaflow.db.repositories.training_calendar_repo import (
+    CalendarYear,
+    day_index,
+)
+
+
+def years_between(start: date, end: date) -> list[int]:
+    """Calendar years touched by start..end (inclusive)."""
+    return list(range(start.year, end.year + 1))
+
+
+def longest_run(bits: int) -> int:
+    """Length of the longest run of consecutive set bits."""
+    length = 0
+    while bits:
+        bits &= bits >> 1
+        length += 1
+    return length
+
+
+class TrainingCalendar:
+    """Trained-day bits and per-day totals for one inclusive date range."""
+
+    def __init__(self, start: date, end: date, years: dict[int, CalendarYear]):
+        self.start = start
+        self.end = end
+        self.total_days = max((end - start).days + 1, 0)
+        self._years = years
+
+        bits = 0
+        for year, calendar in years.items():
+            offset = (date(year, 1, 1) - start).days
+            if offset >= 0:
+                bits |= calendar.trained << offset
+            else:
+                bits |= calendar.trained >> -offset
+        self.bits = bits & ((1 << self.total_days) - 1)
+
+    @property
+    def active_days(self) -> int:
+        return self.bits.bit_count()
+
+    def day_totals(self, day: date) -> tuple[int, int, int]:
+        """(sessions, summed intensity, minutes) logged on *day*."""
+        calendar = self._years.get(day.year)
+        if calendar is None:
+            return 0, 0, 0
+        index = day_index(day)
+        return (
+            calendar.counts[index],
+            calendar.intensity[index],
+            calendar.minutes[index],
+        )
+
+    def days(self):
+        """Yield (day, sessions, summed intensity) for every day in the range."""
+        for offset in range(self.total_days):
+            day = self.start + timedelta(days=offset)
+            if self.bits >> offset & 1:
+                count, intensity, _ = self.day_totals(day)
+                yield day, count, intensity
+            else:
+                yield day, 0, 0
+
+    def longest_run_days(self) -> int:
+        """Most consecutive trained days in the range."""
+        return longest_run(self.bits)
+
+    def longest_gap_days(self) -> int:
+        """Most consecutive rest days between two trained days in the range."""
+        if self.active_days < 2:
+            return 0
+        first = (self.bits & -self.bits).bit_length() - 1
+        last = self.bits.bit_length() - 1
+        span = ((1 << (last - first + 1)) - 1) << first
+        return longest_run(~self.bits & span)
+
+    def weekly_days(self) -> list[int]:
+        """Trained days in each 7-day block counted from the range start."""
+        return [
+            (self.bits >> offset & 0x7F).bit_count()
+            for offset in range(0, self.total_days, 7)
+        ]
+
+    def consistency(self) -> dict:
+        """Frequency, run and gap metrics for the range."""
+        weeks = self.total_days / 7
+        return {
+            "active_days": self.active_days,
+            "total_days": self.total_days,
+            "days_per_week": round(self.active_days / weeks, 2) if weeks else 0,
+            "weekly_days": self.weekly_days(),
+            "longest_run_days": self.longest_run_days(),
+            "longest_gap_days": self.longest_gap_days(),
+        }
@@ -0,0 +1,418 @@
+"""whoop_daily_agg deriver — per-day rollups of the HR/RR chunk store (Wave 3.4, migration 117).
+
+A local day's rollup covers two windows: the calendar day (00:00 -> 24:00) for HR summary and cardio load,
+and the night attributed to it (sleep_window.night_window, 18:00 -> next 12:00) for the overnight bucket
+medians, resting HR and resting RMSSD. A day therefore depends on raw data up to 12:00 the next day, and is
+stored ``complete`` only once that has passed. Each rollup also carries the calendar day's cosinor sums
+(``COSINOR_KEY``, core/circadian.py), so rhythm fits over any run of days read no raw samples.
+
+``refresh`` is the batch engine. One grouped query returns per-hour sample totals over the whole range
+(``WhoopStreamRepository.bucket_counts``). Each day's ``sample_count`` is summed from that with prefix sums,
+so the staleness check costs no per-day COUNTs. Only days whose count, deriver version or completeness
+changed are recomputed, from ONE HR read and ONE RR read spanning them. Larger batches fan out over a
+process pool, and the results are upserted in bulk. Only ``backfill`` (the nightly scheduler job) uses the
+pool; the request-path readers below refresh inline. The multi-week readers below (``daily_rollups``,
+``daily_resting_rmssd``, ``daily_cardio_load``, ``daily_cosinor_sums``, ``circadian_rhythm``, ``summary``) read rollups only and never scan raw samples
+themselves.
+
+Bumping ``DERIVER_VERSION`` invalidates every stored day lazily. ``invalidate`` does the same for one user
+or one day range without a release.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from itertools import accumulate
+from statistics import mean
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from rivaflow.core.cardio_load import banister_trimp_ms, scale_to_21
+from rivaflow.core.circadian import CosinorSums, rhythm_drift, rolling_cosinor
+from rivaflow.core.rr_quality import assess_rr, ln_rmssd, rmssd
+from rivaflow.core.sleep_window import (
+    MIN_BUCKETS_PER_NIGHT,
+    NIGHT_BUCKETS_KEY,
+    night_bucket_medians_ms,
+    night_window,
+    user_tz,
+)
+from rivaflow.db.repositories.whoop_repo import WhoopRepository
+from rivaflow.db.repositories.whoop_stream_repo import HR, RR, WhoopStreamRepository
+
+logger = logging.getLogger(__name__)
+
+DERIVER_VERSION = "daily-agg-v2"
+# metrics_json key under which a rollup carries its calendar day's CosinorSums (hours from local midnight)
+COSINOR_KEY = "cosinor_sums"
+INVALIDATED = "invalidated"  # deriver_version stamped by invalidate() — never equal to a real version
+POOL_MIN_DAYS = 8  # stale days below this are derived inline (a pool's startup costs more than it saves)
+BACKFILL_DAYS = 365  # longest window a rollup reader serves (the circadian endpoint)
+INLINE_REFRESH_DAYS = 7  # recent days a request re-derives; older come from backfill
+MAX_HR = 177  # Ruby's age-predicted (Tanaka) max — see core/max_hr.py
+DEFAULT_REST_HR = (
+    60  # resting HR for the load curve when the night is too thin to measure one
+)
+
+
+@dataclass(frozen=True)
+class DayWindow:
+    """Epoch-ms bounds for one local day: [start_ms, end_ms) for the day, [night_start_ms, night_end_ms]
+    for its night."""
+
+    day: date
+    start_ms: int
+    end_ms: int
+    night_start_ms: int
+    night_end_ms: int
+
+
+def _ms(dt: datetime) -> int:
+    return round(dt.timestamp() * 1000)
+
+
+def day_window(day: date, tz: ZoneInfo) -> DayWindow:
+    start = datetime.combine(day, datetime.min.time(), tz)
+    night_start, night_end = night_window(day, tz)
+    return DayWindow(
+        day,
+        _ms(start),
+        _ms(start + timedelta(days=1)),
+        _ms(night_start),
+        _ms(night_end),
+    )
+
+
+def derive_day(window: DayWindow, hr_ts, hr_bpm, rr_ts, rr_ms) -> dict[str, Any]:
+    """One day's metrics from time-ordered HR and RR arrays that cover at least the day's windows (pure)."""
+    d_lo, d_hi = bisect_left(hr_ts, window.start_ms), bisect_left(hr_ts, window.end_ms)
+    n_lo = bisect_left(hr_ts, window.night_start_ms)
+    n_hi = bisect_right(hr_ts, window.night_end_ms)
+    buckets = night_bucket_medians_ms(hr_ts, hr_bpm, n_lo, n_hi)
+    resting_hr = (
+        min(buckets.values()) if len(buckets) >= MIN_BUCKETS_PER_NIGHT else None
+    )
+
+    day_bpm = hr_bpm[d_lo:d_hi]
+    load = banister_trimp_ms(
+        hr_ts[d_lo:d_hi], day_bpm, MAX_HR, resting_hr or DEFAULT_REST_HR
+    )
+
+    r_lo = bisect_left(rr_ts, window.night_start_ms)
+    r_hi = bisect_right(rr_ts, window.night_end_ms)
+    quality = assess_rr(rr_ms[r_lo:r_hi])
+    night_rmssd = rmssd(quality.cleaned) if quality.usable else None
+    night_ln = ln_rmssd(quality.cleaned) if quality.usable else None
+
+    return {
+        "hr_samples": d_hi - d_lo,
+        "avg_hr": round(mean(day_bpm), 1) if day_bpm else None,
+        "resting_hr": resting_hr,
+        "cardio_load": round(load, 3),
+        "cardio_load_21": scale_to_21(load),
+        "rr_samples": r_hi - r_lo,
+        "rmssd": round(night_rmssd, 2) if night_rmssd is not None else None,
+        "ln_rmssd": round(night_ln, 4) if night_ln is not None else None,
+        "artifact_pct": round(quality.artifact_pct, 1) if r_hi > r_lo else None,
+        NIGHT_BUCKETS_KEY: {str(i): m for i, m in sorted(buckets.items())},
+        COSINOR_KEY: CosinorSums.from_samples(
+            [(ts - window.start_ms) / 3_600_000 for ts in hr_ts[d_lo:d_hi]], day_bpm
+        ).as_list(),
+    }
+
+
+def _derive_job(job: tuple) -> tuple[str, dict[str, Any]]:
+    """Process-pool entry point: (window, hr_ts, hr_bpm, rr_ts, rr_ms) -> (day, metrics)."""
+    window = job[0]
+    return window.day.isoformat(), derive_day(*job)
+
+
+def _sample_counts(
+    windows: list[DayWindow], counts: list[tuple[int, int]]
+) -> dict[date, int]:
+    """Each day's dependency-window sample total (day start -> night end) from per-hour chunk totals,
+    via prefix sums. Hours straddling a window edge count whole, so a late sample there can at worst
+    trigger one unnecessary recompute, never a missed one."""
+    starts = [bucket * 1000 for bucket, _ in counts]
+    prefix = [0, *accumulate(n for _, n in counts)]
+    hour_ms = 3600 * 1000
+    totals = {}
+    for w in windows:
+        lo = bisect_left(starts, w.start_ms - hour_ms + 1)
+        hi = bisect_right(starts, w.night_end_ms)
+        totals[w.day] = prefix[hi] - prefix[lo]
+    return totals
+
+
+def _slice(series, lo_ms: int, hi_ms: int) -> tuple:
+    lo, hi = bisect_left(series.ts_ms, lo_ms), bisect_right(series.ts_ms, hi_ms)
+    return series.ts_ms[lo:hi], series.values[lo:hi]
+
+
+def refresh(
+    user_id: int,
+    start_day: date,
+    end_day: date,
+    *,
+    tz: ZoneInfo | None = None,
+    now: datetime | None = None,
+    workers: int | None = None,
+) -> dict[str, int]:
+    """Bring [start_day, end_day]'s rollups up to date, recomputing only stale days.
+
+    A day is stale when it has no row but has samples, when its stored ``sample_count`` differs from the
+    current chunk totals, when its ``deriver_version`` is not ``DERIVER_VERSION``, or when it was stored
+    incomplete and its night has since ended. ``workers`` sizes the process pool used once there are
+    ``POOL_MIN_DAYS`` stale days (None = the executor's default, 0 = always inline).
+
+    Returns ``{"checked": days, "recomputed": days}``.
+    """
+    tz = tz or user_tz(user_id)
+    now_ms = _ms(now or datetime.now(UTC))
+    days = [
+        start_day + timedelta(days=i) for i in range((end_day - start_day).days + 1)
+    ]
+    if not days:
+        return {"checked": 0, "recomputed": 0}
+    windows = [day_window(day, tz) for day in days]
+
+    counts = _sample_counts(
+        windows,
+        WhoopStreamRepository.bucket_counts(
+            user_id,
+            datetime.fromtimestamp(windows[0].start_ms / 1000, UTC),
+            datetime.fromtimestamp(windows[-1].night_end_ms / 1000, UTC),
+        ),
+    )
+    stored = {
+        str(row["day"])[:10]: row
+        for row in WhoopRepository.get_daily_agg_range(
+            user_id, days[0].isoformat(), days[-1].isoformat()
+        )
+    }
+
+    stale = []
+    for w in windows:
+        row = stored.get(w.day.isoformat())
+        complete = now_ms > w.night_end_ms
+        if row is None:
+            if counts[w.day]:
+                stale.append(w)
+        elif (
+            row["deriver_version"] != DERIVER_VERSION
+            or row["sample_count"] != counts[w.day]
+            or (complete and not row["complete"])
+        ):
+            stale.append(w)
+    if not stale:
+        return {"checked": len(days), "recomputed": 0}
+
+    span = (
+        datetime.fromtimestamp(stale[0].start_ms / 1000, UTC).isoformat(),
+        datetime.fromtimestamp(stale[-1].night_end_ms / 1000, UTC).isoformat(),
+    )
+    hr = WhoopRepository.hr_series(user_id, *span)
+    rr = WhoopRepository.rr_series(user_id, *span)
+    jobs = [
+        (
+            w,
+            *_slice(hr, w.start_ms, w.night_end_ms),
+            *_slice(rr, w.night_start_ms, w.night_end_ms),
+        )
+        for w in stale
+    ]
+    if workers != 0 and len(jobs) >= POOL_MIN_DAYS:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = dict(pool.map(_derive_job, jobs, chunksize=4))
+    else:
+        results = dict(map(_derive_job, jobs))
+
+    WhoopRepository.upsert_daily_aggs(
+        user_id,
+        [
+            (
+                w.day.isoformat(),
+                json.dumps(results[w.day.isoformat()]),
+                DERIVER_VERSION,
+                counts[w.day],
+                now_ms > w.night_end_ms,
+            )
+            for w in stale
+        ],
+    )
+    return {"checked": len(days), "recomputed": len(stale)}
+
+
+def backfill(
+    days: int = BACKFILL_DAYS,
+    *,
+    now: datetime | None = None,
+    user_ids: list[int] | None = None,
+    workers: int | None = None,
+) -> dict[str, int]:
+    """``refresh`` the last ``days`` local days of every user with HR or RR in them, on the process pool.
+
+    Scheduled nightly, so a ``DERIVER_VERSION`` bump or a first visit never re-derives history inside a
+    request. Returns ``{"users": checked, "recomputed": days}``.
+    """
+    now = now or datetime.now(UTC)
+    if user_ids is None:
+        since = now - timedelta(days=days + 1)
+        user_ids = sorted(
+            set(WhoopStreamRepository.user_ids(HR, since, now))
+            | set(WhoopStreamRepository.user_ids(RR, since, now))
+        )
+    recomputed = 0
+    for user_id in user_ids:
+        tz = user_tz(user_id)
+        today = now.astimezone(tz).date()
+        result = refresh(
+            user_id,
+            today - timedelta(days=days - 1),
+            today,
+            tz=tz,
+            now=now,
+            workers=workers,
+        )
+        recomputed += result["recomputed"]
+    return {"users": len(user_ids), "recomputed": recomputed}
+
+
+def invalidate(
+    user_id: int | None = None,
+    start_day: date | None = None,
+    end_day: date | None = None,
+) -> int:
+    """Mark stored rollups stale (all users, or one user, optionally a day range) so the next ``refresh``
+    over them recomputes. Returns rows marked."""
+    return WhoopRepository.invalidate_daily_agg(
+        user_id,
+        start_day.isoformat() if start_day else None,
+        end_day.isoformat() if end_day else None,
+        INVALIDATED,
+    )
+
+
+def daily_rollups(
+    user_id: int, days: int = 28, today: date | None = None
+) -> list[dict[str, Any]]:
+    """The last `days` local days' rollups (refreshed first), ascending: ``{"day", "complete", **metrics}``.
+    Days with no data have no entry."""
+    tz = user_tz(user_id)
+    today = today or datetime.now(tz).date()
+    start = today - timedelta(days=days - 1)
+    refresh(user_id, start, today, tz=tz, workers=0)
+    rows = []
+    for row in WhoopRepository.get_daily_agg_range(
+        user_id, start.isoformat(), today.isoformat()
+    ):
+        metrics = json.loads(row["metrics_json"])
+        metrics.pop(NIGHT_BUCKETS_KEY, None)
+        metrics.pop(COSINOR_KEY, None)
+        rows.append(
+            {"day": str(row["day"])[:10], "complete": bool(row["complete"]), **metrics}
+        )
+    return rows
+
+
+def daily_cosinor_sums(
+    user_id: int, days: int = 56, today: date | None = None
+) -> list[tuple[str, CosinorSums | None]]:
+    """The last `days` local days' ``(day, CosinorSums)``, ascending, one entry per calendar day — None
+    where there is no rollup or it predates the sums.
+
+    Only the last ``INLINE_REFRESH_DAYS`` are refreshed first; older days are served as stored (``backfill``
+    keeps them current), so a cold year-long request re-derives a week of raw HR at most.
+    """
+    tz = user_tz(user_id)
+    today = today or datetime.now(tz).date()
+    start = today - timedelta(days=days - 1)
+    recent = max(start, today - timedelta(days=INLINE_REFRESH_DAYS - 1))
+    refresh(user_id, recent, today, tz=tz, workers=0)
+    stored = {
+        str(row["day"])[:10]: json.loads(row["metrics_json"]).get(COSINOR_KEY)
+        for row in WhoopRepository.get_daily_agg_range(
+            user_id, start.isoformat(), today.isoformat()
+        )
+    }
+    out = []
+    for i in range(days):
+        day = (start + timedelta(days=i)).isoformat()
+        sums = stored.get(day)
+        out.append((day, CosinorSums.from_list(sums) if sums else None))
+    return out
+
+
+def circadian_rhythm(
+    user_id: int, days: int = 56, window_days: int = 7, today: date | None = None
+) -> dict[str, Any]:
+    """Rolling ``window_days`` cosinor fits of round-the-clock HR over the last `days` days, plus their
+    drift (core/circadian.py), from the rollups' stored sums."""
+    daily = daily_cosinor_sums(user_id, days, today)
+    fits = rolling_cosinor([sums for _, sums in daily], window_days)
+    windows = [
+        {
+            "end_day": daily[f["end_index"]][0],
+            "days_with_data": f["days_with_data"],
+            "mesor": f["mesor"],
+            "amplitude": f["amplitude"],
+            "acrophase_hour": f["acrophase_hour"],
+        }
+        for f in fits
+        if f["available"]
+    ]
+    latest = next((f for f in reversed(fits) if f["available"]), None)
+    return {
+        "days": days,
+        "window_days": window_days,
+        "current": latest,
+        "windows": windows,
+        "drift": rhythm_drift(fits),
+    }
+
+
+def daily_resting_rmssd(user_id: int, days: int = 30) -> list[dict[str, Any]]:
+    """Per-day overnight resting HRV: ``[{"day", "rmssd", "ln_rmssd"}]`` for days with a usable night."""
+    return [
+        {"day": r["day"], "rmssd": r["rmssd"], "ln_rmssd": r["ln_rmssd"]}
+        for r in daily_rollups(user_id, days)
+        if r.get("ln_rmssd") is not None
+    ]
+
+
+def daily_cardio_load(user_id: int, days: int = 30) -> list[dict[str, Any]]:
+    """Per-day raw Banister load: ``[{"day", "cardio_load", "cardio_load_21"}]`` for days with HR."""
+    return [
+        {
+            "day": r["day"],
+            "cardio_load": r["cardio_load"],
+            "cardio_load_21": r["cardio_load_21"],
+        }
+        for r in daily_rollups(user_id, days)
+        if r.get("hr_samples")
+    ]
+
+
+def summary(user_id: int, days: int = 28) -> dict[str, Any]:
+    """Multi-week summary over the last `days` days, read from the rollups alone."""
+    rows = daily_rollups(user_id, days)
+
+    def _mean(key: str) -> float | None:
+        values = [r[key] for r in rows if r.get(key) is not None]
+        return round(mean(values), 2) if values else None
+
+    return {
+        "days": days,
+        "days_with_data": len(rows),
+        "avg_resting_hr": _mean("resting_hr"),
+        "avg_rmssd": _mean("rmssd"),
+        "avg_ln_rmssd": _mean("ln_rmssd"),
+        "total_cardio_load": round(sum(r.get("cardio_load") or 0.0 for r in rows), 1),
+        "avg_cardio_load_21": _mean("cardio_load_21"),
+        "deriver_version": DERIVER_VERSION,
+    }
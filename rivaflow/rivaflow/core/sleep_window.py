@@ -15,11 +15,13 @@ the threshold) — avoids a cycle.
 
 from __future__ import annotations
 
+import json
 import logging
 import time
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from collections.abc import Callable
-from datetime import date, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from statistics import median, pvariance
 from zoneinfo import ZoneInfo
 
@@ -47,14 +49,16 @@ _LOOKBACK_NIGHTS = (
 )
 _THRESHOLD_CACHE_TTL_SEC = (
     6 * 60 * 60
-)  # ~6h/process — the learner scans 30 nights of HR; mirrors
-# whoop_profile's per-process TTL cache pattern (see core/whoop_profile.py) rather than recomputing per call.
+)  # ~6h — age past which the persisted threshold (sleep_thresholds) is re-learned
+
+# metrics_json key under which a whoop_daily_agg rollup carries its night's {bucket_idx: median_bpm}
+NIGHT_BUCKETS_KEY = "hr_night_buckets"
 
 _threshold_cache: dict[int, tuple[float, str, float]] = {}
 
 
 def _clear_threshold_cache() -> None:
-    """Test hook — reset the per-process learned-threshold cache between test cases."""
+    """Test hook — reset the per-process copy of the learned threshold between test cases."""
     _threshold_cache.clear()
 
 
@@ -167,59 +171,120 @@ def personal_threshold_offset(
     return offset, LEARNED_VERSION
 
 
-def _parse_ts(ts: str) -> datetime:
-    """Parse a stored ISO timestamp (handles trailing Z). Local copy of whoop_analytics._parse_ts — kept
-    here rather than imported so this module has no import-time dependency on whoop_analytics, which
-    imports this module (avoids a cycle)."""
-    dt = datetime.fromisoformat(str(ts).replace("Z", "+00:00"))
-    return dt if dt.tzinfo else dt.replace(tzinfo=ZoneInfo("UTC"))
+def night_bucket_medians_ms(ts_ms, bpm, lo: int, hi: int) -> dict[int, int]:
+    """bucket_hr's medians for samples [lo, hi) of an epoch-ms-ordered stream, in integer arithmetic.
+
+    Same buckets and medians as bucket_hr on those points (5-min buckets counted from the first non-zero
+    sample, upper median), but straight off the chunk store's arrays: no datetime parsing, no re-sort.
+    """
+    buckets: dict[int, list[int]] = defaultdict(list)
+    t0 = None
+    for i in range(lo, hi):
+        b = bpm[i]
+        if not b:
+            continue
+        if t0 is None:
+            t0 = ts_ms[i]
+        buckets[(ts_ms[i] - t0) // 300_000].append(b)
+    return {i: sorted(vs)[len(vs) // 2] for i, vs in buckets.items()}
+
+
+def night_window(day: date, tz: ZoneInfo) -> tuple[datetime, datetime]:
+    """The night attributed to `day`: 18:00 local on `day` -> 12:00 local the next day. Shared with the
+    whoop_daily_agg deriver so the medians it stores cover exactly the window the learner would read.
+    """
+    start = datetime.combine(day, datetime.min.time(), tz).replace(hour=18)
+    return start, start + timedelta(hours=18)
+
+
+def _stored_night_medians(metrics_json: str) -> dict[int, int] | None:
+    """A rollup's precomputed night bucket medians, if the deriver stored them."""
+    stored = json.loads(metrics_json).get(NIGHT_BUCKETS_KEY)
+    if stored is None:
+        return None
+    return {int(i): int(v) for i, v in stored.items()}
 
 
-def _night_bucket_medians(user_id: int, day: date, tz: ZoneInfo) -> dict[int, int]:
-    """One night's (18:00 `day` -> 12:00 next day, local) 5-min bucket bpm medians — the same night window
-    whoop_analytics._day_sleep uses. Reads raw HR only, never a stored sleep output: the learner cannot
-    create a feedback loop through the rollups it feeds, even when a given night's own sleep was (or still
-    is) computed using the FLOOR threshold — the learner reads the raw HR stream directly, not that result.
+def _learning_nights(
+    user_id: int, nights: list[date], tz: ZoneInfo
+) -> list[dict[int, int]]:
+    """Per-night bucket medians for `nights` (ascending): complete whoop_daily_agg rollups first, then ONE
+    chunk-store read spanning whatever nights the rollups don't cover. Reads raw HR (or medians derived
+    from raw HR), never a stored sleep output, so the learner cannot feed back through its own results.
     """
     from rivaflow.db.repositories.whoop_repo import WhoopRepository
 
-    start = datetime.combine(day, datetime.min.time(), tz).replace(hour=18)
-    end = start + timedelta(
-        hours=18
-    )  # 18:00 -> next 12:00, matching _day_sleep's night window
-    hr = WhoopRepository.hr_range(user_id, start.isoformat(), end.isoformat())
-    pts = [
-        (_parse_ts(str(h["ts"])), int(h["bpm"]))
-        for h in hr
-        if h.get("bpm") and h.get("ts")
-    ]
-    if not pts:
-        return {}
-    med, _, _ = bucket_hr(pts)
-    return med
+    by_night: dict[date, dict[int, int]] = {}
+    for row in WhoopRepository.get_daily_agg_range(
+        user_id, nights[0].isoformat(), nights[-1].isoformat()
+    ):
+        if not row["complete"]:
+            continue
+        medians = _stored_night_medians(row["metrics_json"])
+        if medians is not None:
+            by_night[date.fromisoformat(str(row["day"])[:10])] = medians
+
+    missing = [night for night in nights if night not in by_night]
+    if missing:
+        span_start, _ = night_window(missing[0], tz)
+        _, span_end = night_window(missing[-1], tz)
+        series = WhoopRepository.hr_series(
+            user_id, span_start.isoformat(), span_end.isoformat()
+        )
+        for night in missing:
+            start, end = night_window(night, tz)
+            start_ms = round(start.timestamp() * 1000)
+            end_ms = round(end.timestamp() * 1000)
+            lo = bisect_left(series.ts_ms, start_ms)
+            hi = bisect_right(series.ts_ms, end_ms)
+            by_night[night] = night_bucket_medians_ms(
+                series.ts_ms, series.values, lo, hi
+            )
+    return [by_night[night] for night in nights]
+
+
+def user_tz(user_id: int) -> ZoneInfo:
+    """The user's profile timezone, UTC when unset."""
+    from rivaflow.db.repositories.profile_repo import ProfileRepository
+
+    profile = ProfileRepository.get(user_id)
+    return ZoneInfo((profile or {}).get("timezone") or "UTC")
 
 
 def personal_threshold_for_user(user_id: int) -> tuple[float, str]:
-    """DB-backed personal_threshold_offset: the user's last ~30 nights of raw HR, bucketed via bucket_hr,
-    fed to the pure learner above. Cached per-process (~6h TTL — see _THRESHOLD_CACHE_TTL_SEC) since the
-    learner scans 30 nights of HR on every call otherwise. Never raises: any DB/lookup failure falls back
-    to the fixed floor, same contract as whoop_profile.get_whoop_profile.
+    """DB-backed personal_threshold_offset over the user's last ~30 nights (see _learning_nights).
+
+    The result is persisted in sleep_thresholds and shared by every worker: a row younger than
+    _THRESHOLD_CACHE_TTL_SEC is served as-is, and only a stale or missing one re-learns. A per-process copy
+    of the row spares the lookup on hot paths. Never raises: any DB/lookup failure falls back to the fixed
+    floor.
     """
+    from rivaflow.db.repositories.whoop_repo import WhoopRepository
+
     cached = _threshold_cache.get(user_id)
-    now = time.monotonic()
+    now = time.time()
     if cached is not None and now - cached[2] < _THRESHOLD_CACHE_TTL_SEC:
         return cached[0], cached[1]
 
     try:
-        from rivaflow.core.whoop_profile import get_whoop_profile
-
-        profile = get_whoop_profile(user_id)
-        today = datetime.now(profile.tz).date()
-        nights = [
-            _night_bucket_medians(user_id, today - timedelta(days=n), profile.tz)
-            for n in range(1, _LOOKBACK_NIGHTS + 1)
-        ]
-        offset, version = personal_threshold_offset(nights)
+        stored = WhoopRepository.get_sleep_threshold(
+            user_id,
+            datetime.now(UTC) - timedelta(seconds=_THRESHOLD_CACHE_TTL_SEC),
+        )
+        if stored:
+            offset, version = float(stored["offset_bpm"]), stored["version"]
+        else:
+            tz = user_tz(user_id)
+            today = datetime.now(tz).date()
+            nights = _learning_nights(
+                user_id,
+                [today - timedelta(days=n) for n in range(_LOOKBACK_NIGHTS, 0, -1)],
+                tz,
+            )
+            offset, version = personal_threshold_offset(nights)
+            WhoopRepository.upsert_sleep_threshold(
+                user_id, offset, version, sum(1 for night in nights if night)
+            )
     except Exception:  # noqa: BLE001 — the learner must never break sleep detection
         logger.warning(
             "personal_threshold_for_user failed for user %s; using floor",
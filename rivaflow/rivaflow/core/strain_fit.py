@@ -16,14 +16,20 @@ Kept out of strain_target.py — which stays pure and DB-free like readiness.py
 into whoop_daily_agg for real history. ``_fit_multipliers_from_samples`` is the pure regression core (no DB,
 no readiness fusion): it's the unit-test seam, fed either real samples assembled by ``fit_strain_multipliers``
 or a synthetic fixture.
+
+``stored_strain_policy`` is the routine path. Each state keeps exponentially forgotten sufficient statistics
+(``DoseStats``, table strain_dose_stats) that are updated once per completed day, so the fitted multiplier
+and r² are O(1) reads. ``policy_for_user`` hands that policy to ``prescribe_strain`` per call. The full
+``refit_strain_stats`` (db/refit_strain_stats.py) rebuilds the sums from history for audits.
 """
 
 from __future__ import annotations
 
 import logging
 import os
-from collections.abc import Callable, Mapping
-from datetime import date, timedelta
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from typing import Any
 
 from rivaflow.core.readiness import blend_readiness, zscore
@@ -53,6 +59,17 @@ _BAND_WIDTH_DEFAULT = (
 
 ENV_FLAG = "WHOOP_STRAIN_POLICY"
 
+# Incremental fit (DoseStats, migration 130). A completed day is folded into its state's sums once, and
+# every stored sum decays by FORGET per calendar day, an effective memory of about 1 / (1 - FORGET) days.
+FORGET = 0.99
+# Stored stats under another version are refit
+STATS_VERSION = f"dose-stats-v1-forget{FORGET}"
+# Day i's sample needs day i+1's night, which ends at noon on i+2, so day i is folded on i+3
+FOLD_LAG_DAYS = 3
+LOOKBACK_DAYS = 30  # extra history re-read so new days see their full state/chronic/baseline windows
+FULL_FIT_DAYS = 90  # history folded by a full refit
+_DEGENERATE_EPS = 1e-12
+
 
 def _ols_zero_crossing(pairs: list[tuple[float, float]]) -> tuple[float | None, float]:
     """OLS regression of next-day lnRMSSD delta (y) on load/chronic ratio (x); returns
@@ -83,25 +100,23 @@ def _ols_zero_crossing(pairs: list[tuple[float, float]]) -> tuple[float | None,
     return -intercept / slope, r2
 
 
-def _fit_multipliers_from_samples(
-    samples: dict[str, list[tuple[float, float]]],
+def _policy_from_fits(
+    counts: Mapping[str, float],
+    fit: Callable[[str], tuple[float | None, float]],
     *,
-    min_days: int = MIN_STATE_DAYS,
-    clamp: tuple[float, float] = MULT_CLAMP,
-    cap: float = STRAIN_CAP,
-    band_width: float = _BAND_WIDTH_DEFAULT,
+    min_days: float,
+    clamp: tuple[float, float],
+    cap: float,
+    band_width: float,
 ) -> tuple[StrainPolicy, dict[str, dict[str, Any]]]:
-    """Pure regression core — DB-free, the unit-test seam. ``samples`` maps readiness state -> list of
-    ``(load_ratio, next_day_ln_rmssd_delta)`` pairs, already assembled by ``fit_strain_multipliers`` (real
-    data) or a test fixture (synthetic). Returns the fitted ``StrainPolicy`` — falling back to the
-    heuristic multiplier for any state with too little data or a degenerate fit — plus a per-state report.
-    """
+    """Shared policy/report assembly: ``counts[state]`` gates the fit, and ``fit(state)`` returns
+    ``(zero crossing or None, r2)`` for states that pass the gate."""
     multipliers = dict(STATE_MULTIPLIER)
+    r2_by_state: dict[str, float] = {}
     report: dict[str, dict[str, Any]] = {}
 
     for state, heuristic_mult in STATE_MULTIPLIER.items():
-        pairs = samples.get(state, [])
-        n = len(pairs)
+        n = counts.get(state, 0)
         if n < min_days:
             report[state] = {
                 "n": n,
@@ -112,7 +127,7 @@ def _fit_multipliers_from_samples(
             }
             continue
 
-        crossing, r2 = _ols_zero_crossing(pairs)
+        crossing, r2 = fit(state)
         if crossing is None:
             report[state] = {
                 "n": n,
@@ -125,6 +140,7 @@ def _fit_multipliers_from_samples(
 
         clamped = round(max(clamp[0], min(clamp[1], crossing)), 3)
         multipliers[state] = clamped
+        r2_by_state[state] = round(r2, 3)
         report[state] = {
             "n": n,
             "fitted": round(crossing, 3),
@@ -134,18 +150,119 @@ def _fit_multipliers_from_samples(
         }
 
     policy = StrainPolicy(
-        version=FIT_VERSION, multipliers=multipliers, cap=cap, band_width=band_width
+        version=FIT_VERSION,
+        multipliers=multipliers,
+        cap=cap,
+        band_width=band_width,
+        r2=r2_by_state,
     )
     return policy, report
 
 
+def _fit_multipliers_from_samples(
+    samples: dict[str, list[tuple[float, float]]],
+    *,
+    min_days: int = MIN_STATE_DAYS,
+    clamp: tuple[float, float] = MULT_CLAMP,
+    cap: float = STRAIN_CAP,
+    band_width: float = _BAND_WIDTH_DEFAULT,
+) -> tuple[StrainPolicy, dict[str, dict[str, Any]]]:
+    """Pure regression core — DB-free, the unit-test seam. ``samples`` maps readiness state -> list of
+    ``(load_ratio, next_day_ln_rmssd_delta)`` pairs, already assembled by ``fit_strain_multipliers`` (real
+    data) or a test fixture (synthetic). Returns the fitted ``StrainPolicy`` — falling back to the
+    heuristic multiplier for any state with too little data or a degenerate fit — plus a per-state report.
+    """
+    return _policy_from_fits(
+        {state: len(pairs) for state, pairs in samples.items()},
+        lambda state: _ols_zero_crossing(samples[state]),
+        min_days=min_days,
+        clamp=clamp,
+        cap=cap,
+        band_width=band_width,
+    )
+
+
+@dataclass
+class DoseStats:
+    """Exponentially forgotten sufficient statistics of one state's (load_ratio, delta) samples.
+
+    ``n`` and the sums are weighted (every stored sample loses ``FORGET`` per calendar day), so a fit reads
+    the recent dose-response without keeping any samples. ``samples`` is the raw count, for the report.
+    """
+
+    n: float = 0.0
+    sx: float = 0.0
+    sy: float = 0.0
+    sxy: float = 0.0
+    sxx: float = 0.0
+    syy: float = 0.0
+    samples: int = 0
+
+    def decay(self, factor: float) -> None:
+        self.n *= factor
+        self.sx *= factor
+        self.sy *= factor
+        self.sxy *= factor
+        self.sxx *= factor
+        self.syy *= factor
+
+    def add(self, x: float, y: float) -> None:
+        self.n += 1.0
+        self.sx += x
+        self.sy += y
+        self.sxy += x * y
+        self.sxx += x * x
+        self.syy += y * y
+        self.samples += 1
+
+    def fit(self) -> tuple[float | None, float]:
+        """``_ols_zero_crossing`` from the sums alone: (x where the weighted OLS line crosses 0, r2)."""
+        if self.n <= 0:
+            return None, 0.0
+        sxx = self.sxx - self.sx * self.sx / self.n
+        sxy = self.sxy - self.sx * self.sy / self.n
+        syy = self.syy - self.sy * self.sy / self.n
+        # Centred sums from raw ones cancel to rounding noise, not exactly 0, when every x (or y) is equal
+        if sxx <= _DEGENERATE_EPS * max(self.sxx, 1.0):
+            return None, 0.0
+        slope = sxy / sxx
+        if syy <= _DEGENERATE_EPS * max(self.syy, 1.0):
+            r2 = 1.0 if slope == 0 else 0.0
+        else:
+            r2 = max(0.0, min(1.0, sxy * sxy / (sxx * syy)))
+        if slope == 0:
+            return None, r2
+        intercept = (self.sy - slope * self.sx) / self.n
+        return -intercept / slope, r2
+
+
+def fit_multipliers_from_stats(
+    stats: Mapping[str, DoseStats],
+    *,
+    min_days: int = MIN_STATE_DAYS,
+    clamp: tuple[float, float] = MULT_CLAMP,
+    cap: float = STRAIN_CAP,
+    band_width: float = _BAND_WIDTH_DEFAULT,
+) -> tuple[StrainPolicy, dict[str, dict[str, Any]]]:
+    """O(1) counterpart of ``_fit_multipliers_from_samples`` over stored ``DoseStats``. The data gate uses
+    the forgotten (effective) sample count."""
+    return _policy_from_fits(
+        {state: round(st.n, 1) for state, st in stats.items()},
+        lambda state: stats[state].fit(),
+        min_days=min_days,
+        clamp=clamp,
+        cap=cap,
+        band_width=band_width,
+    )
+
+
 def _next_calendar_day(day: str) -> str:
     return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
 
 
-def _assemble_samples(
+def _dose_samples(
     rmssd_days: list[dict[str, Any]], cardio_days: list[dict[str, Any]]
-) -> dict[str, list[tuple[float, float]]]:
+) -> Iterator[tuple[str, str, float, float]]:
     """Walk the overlapping (day, ln_rmssd) / (day, cardio_load) history and build per-state
     ``(load_ratio, next_day_delta)`` pairs.
 
@@ -167,7 +284,6 @@ def _assemble_samples(
     load_by_day = {d["day"]: d["cardio_load"] for d in cardio_days}
     days = sorted(set(ln_by_day) & set(load_by_day))
 
-    samples: dict[str, list[tuple[float, float]]] = {s: [] for s in STATE_MULTIPLIER}
     ln_series: list[float] = []
     for idx, day in enumerate(days):
         ln_series.append(ln_by_day[day])
@@ -191,8 +307,16 @@ def _assemble_samples(
         baseline = sum(baseline_window) / len(baseline_window)
         delta = ln_by_day[days[idx + 1]] - baseline
 
-        samples[state].append((ratio, delta))
+        yield day, state, ratio, delta
+
 
+def _assemble_samples(
+    rmssd_days: list[dict[str, Any]], cardio_days: list[dict[str, Any]]
+) -> dict[str, list[tuple[float, float]]]:
+    """Per-state ``(load_ratio, next_day_delta)`` pairs from ``_dose_samples``."""
+    samples: dict[str, list[tuple[float, float]]] = {s: [] for s in STATE_MULTIPLIER}
+    for _, state, ratio, delta in _dose_samples(rmssd_days, cardio_days):
+        samples[state].append((ratio, delta))
     return samples
 
 
@@ -203,7 +327,10 @@ def fit_strain_multipliers(user_id: int, days: int = 90) -> dict[str, Any]:
 
     Returns ``{"policy": StrainPolicy(version="strain-fitted-v1", ...), "report": {state: {...}}}``.
     """
-    from rivaflow.core.whoop_analytics import daily_cardio_load, daily_resting_rmssd
+    from rivaflow.core.services.whoop_daily_agg import (
+        daily_cardio_load,
+        daily_resting_rmssd,
+    )
 
     rmssd_days = daily_resting_rmssd(user_id, days=days)
     cardio_days = daily_cardio_load(user_id, days=days)
@@ -212,6 +339,152 @@ def fit_strain_multipliers(user_id: int, days: int = 90) -> dict[str, Any]:
     return {"policy": policy, "report": report}
 
 
+def _completed_history(
+    user_id: int, through: date, days: int
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """(rmssd_days, cardio_days) from the complete rollups of the ``days`` days ending the day after
+    ``through`` (the last sample day's next-day reading)."""
+    from rivaflow.core.services.whoop_daily_agg import daily_rollups
+
+    rows = [
+        r
+        for r in daily_rollups(user_id, days, today=through + timedelta(days=1))
+        if r["complete"]
+    ]
+    rmssd_days = [
+        {"day": r["day"], "ln_rmssd": r["ln_rmssd"]}
+        for r in rows
+        if r.get("ln_rmssd") is not None
+    ]
+    cardio_days = [
+        {"day": r["day"], "cardio_load": r["cardio_load"]}
+        for r in rows
+        if r.get("hr_samples")
+    ]
+    return rmssd_days, cardio_days
+
+
+def _fold(
+    stats: dict[str, DoseStats],
+    samples: Iterator[tuple[str, str, float, float]],
+    after: date | None,
+    through: date,
+) -> None:
+    """Fold the samples dated in (after, through] into ``stats``, decaying every state's sums by ``FORGET``
+    per calendar day in between and on to ``through``."""
+    cursor = after
+    for day, state, ratio, delta in samples:
+        d = date.fromisoformat(day)
+        if (after is not None and d <= after) or d > through:
+            continue
+        if cursor is not None:
+            factor = FORGET ** (d - cursor).days
+            for st in stats.values():
+                st.decay(factor)
+        stats[state].add(ratio, delta)
+        cursor = d
+    if cursor is not None and cursor < through:
+        factor = FORGET ** (through - cursor).days
+        for st in stats.values():
+            st.decay(factor)
+
+
+def _store_stats(user_id: int, stats: dict[str, DoseStats], through: date) -> None:
+    from rivaflow.db.repositories.whoop_repo import WhoopRepository
+
+    WhoopRepository.upsert_strain_dose_stats(
+        user_id,
+        [
+            (
+                state,
+                st.n,
+                st.sx,
+                st.sy,
+                st.sxy,
+                st.sxx,
+                st.syy,
+                st.samples,
+                through.isoformat(),
+                STATS_VERSION,
+            )
+            for state, st in stats.items()
+        ],
+    )
+
+
+def _fold_through(today: date | None, user_id: int) -> date:
+    if today is None:
+        from rivaflow.core.sleep_window import user_tz
+
+        today = datetime.now(user_tz(user_id)).date()
+    return today - timedelta(days=FOLD_LAG_DAYS)
+
+
+def refit_strain_stats(user_id: int, today: date | None = None) -> dict[str, DoseStats]:
+    """Full refit for audits (and first use): rebuild every state's sums from the last ``FULL_FIT_DAYS``
+    of completed days and store them, replacing whatever had accumulated."""
+    through = _fold_through(today, user_id)
+    stats = {state: DoseStats() for state in STATE_MULTIPLIER}
+    rmssd_days, cardio_days = _completed_history(user_id, through, FULL_FIT_DAYS + 1)
+    _fold(stats, _dose_samples(rmssd_days, cardio_days), None, through)
+    _store_stats(user_id, stats, through)
+    return stats
+
+
+def update_strain_stats(
+    user_id: int, today: date | None = None
+) -> dict[str, DoseStats]:
+    """Fold every day completed since the stored ``last_day`` into the user's sums and return them.
+
+    Up to date (the usual case) this is one four-row read. Otherwise only the new days plus
+    ``LOOKBACK_DAYS`` of context are read. Missing or differently versioned sums, or a gap longer than a
+    full fit, fall back to ``refit_strain_stats``.
+    """
+    from rivaflow.db.repositories.whoop_repo import WhoopRepository
+
+    through = _fold_through(today, user_id)
+    rows = WhoopRepository.get_strain_dose_stats(user_id)
+    if len(rows) != len(STATE_MULTIPLIER) or any(
+        r["version"] != STATS_VERSION for r in rows
+    ):
+        return refit_strain_stats(user_id, through + timedelta(days=FOLD_LAG_DAYS))
+
+    stats = {
+        r["state"]: DoseStats(
+            n=r["n"],
+            sx=r["sx"],
+            sy=r["sy"],
+            sxy=r["sxy"],
+            sxx=r["sxx"],
+            syy=r["syy"],
+            samples=r["samples"],
+        )
+        for r in rows
+    }
+    last_day = date.fromisoformat(str(rows[0]["last_day"])[:10])
+    if last_day >= through:
+        return stats
+    if (through - last_day).days > FULL_FIT_DAYS:
+        return refit_strain_stats(user_id, through + timedelta(days=FOLD_LAG_DAYS))
+
+    rmssd_days, cardio_days = _completed_history(
+        user_id, through, (through - last_day).days + LOOKBACK_DAYS + 1
+    )
+    _fold(stats, _dose_samples(rmssd_days, cardio_days), last_day, through)
+    _store_stats(user_id, stats, through)
+    return stats
+
+
+def stored_strain_policy(user_id: int, today: date | None = None) -> dict[str, Any]:
+    """The incremental counterpart of ``fit_strain_multipliers``: brings the stored sums up to date (a
+    no-op once today's day has been folded) and fits every state from them in O(1).
+
+    Returns ``{"policy": StrainPolicy(..., r2={state: r2}), "report": {state: {...}}}``.
+    """
+    policy, report = fit_multipliers_from_stats(update_strain_stats(user_id, today))
+    return {"policy": policy, "report": report}
+
+
 def apply_env_strain_policy(
     user_id: int,
     *,
@@ -242,3 +515,22 @@ def apply_env_strain_policy(
             user_id,
         )
     return get_strain_policy()
+
+
+def policy_for_user(
+    user_id: int, *, env: Mapping[str, str] | None = None
+) -> StrainPolicy | None:
+    """The policy to pass to ``prescribe_strain`` for ``user_id``: the stored fit when
+    ``WHOOP_STRAIN_POLICY=fitted``, otherwise None (the active policy applies). Like
+    ``apply_env_strain_policy``, a failed fit is logged and never raised."""
+    active_env = os.environ if env is None else env
+    if active_env.get(ENV_FLAG) != "fitted":
+        return None
+    try:
+        return stored_strain_policy(user_id)["policy"]
+    except Exception:
+        logger.exception(
+            "WHOOP_STRAIN_POLICY=fitted stored fit failed for user %s — using the current strain policy",
+            user_id,
+        )
+        return None
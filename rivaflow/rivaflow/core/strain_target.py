@@ -11,7 +11,7 @@ Depends on B1: the 0–21 strain scale is only meaningful once HR zones use the
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 STRAIN_CAP = 21.0
 DEFAULT_CHRONIC = (
@@ -48,12 +48,14 @@ class StrainPolicy:
     strain cap and target-band half-width, plus a version stamp. Defaults to
     the hand-tuned heuristic; ``set_strain_policy`` is the seam a fitted
     dose-response policy plugs into without touching ``prescribe_strain``.
+    ``r2`` holds the fit quality of each state whose multiplier was fitted.
     """
 
     version: str
     multipliers: dict[str, float]
     cap: float = STRAIN_CAP
     band_width: float = BAND_WIDTH
+    r2: dict[str, float] = field(default_factory=dict)
 
 
 _DEFAULT_POLICY = StrainPolicy(
@@ -79,10 +81,14 @@ def set_strain_policy(policy: StrainPolicy | None) -> None:
 
 
 def prescribe_strain(
-    state: str | None, chronic_load: float | None, acute_load: float | None = None
+    state: str | None,
+    chronic_load: float | None,
+    acute_load: float | None = None,
+    policy: StrainPolicy | None = None,
 ) -> dict:
     """Prescribe today's strain target from readiness `state` and the athlete's `chronic_load` (usual daily
-    strain). `acute_load` = today's strain so far, if known, to report headroom. Returns available=False for
+    strain). `acute_load` = today's strain so far, if known, to report headroom. `policy` overrides the
+    active policy for this call (a per-user fitted policy). Returns available=False for
     Rest/Building/unknown states."""
     if state in NO_TARGET_STATES:
         reason = (
@@ -93,7 +99,7 @@ def prescribe_strain(
         return {"available": False, "state": state, "reason": reason}
 
     assert state is not None  # narrowed by the NO_TARGET_STATES guard above
-    policy = get_strain_policy()
+    policy = policy or get_strain_policy()
     mult = policy.multipliers.get(state)
     if mult is None:
         return {
@@ -127,6 +133,8 @@ def prescribe_strain(
         "headline": headlines[state],
         "policy_version": policy.version,
     }
+    if state in policy.r2:
+        out["policy_r2"] = policy.r2[state]
     if acute_load is not None:
         out["acute_load"] = round(acute_load, 1)
         out["remaining"] = round(max(0.0, target - acute_load), 1)
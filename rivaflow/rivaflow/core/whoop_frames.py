@@ -0,0 +1,98 @@
+"""Server-side decoder for the raw strap frames in whoop_raw_frames (pure core, stdlib only).
+
+The phone decoded frames before upload, so the server never had a decoder and the "rebuildable" decoded
+streams could not actually be rebuilt. This covers the standard Bluetooth GATT characteristics the strap
+exposes, which are fully specified:
+
+  - ``2a37`` Heart Rate Measurement: a flags byte, bpm as uint8 or uint16, an optional uint16 energy field,
+    then zero or more uint16 RR intervals in 1/1024 s units. RR values from one notification share its
+    timestamp, as they did in the legacy whoop_rr table.
+  - ``2a19`` Battery Level: one uint8 state of charge (charging state is not part of the characteristic).
+
+WHOOP's proprietary ``fd4b…`` service is not documented, so those frames are counted as undecoded and left
+for the phone. The replay tool that feeds this is db/rebuild_whoop_streams.py.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+DECODER_VERSION = "gatt-v1"
+
+HEART_RATE_MEASUREMENT = "2a37"
+BATTERY_LEVEL = "2a19"
+
+_HR_UINT16 = 0x01
+_ENERGY_PRESENT = 0x08
+_RR_PRESENT = 0x10
+
+
+@dataclass
+class DecodedDay:
+    """One day's decoded samples (epoch-ms timestamps) and frame tallies."""
+
+    hr: list[tuple[int, int]] = field(default_factory=list)  # (ts_ms, bpm)
+    rr: list[tuple[int, int]] = field(default_factory=list)  # (ts_ms, rr_ms)
+    battery: list[tuple[int, int]] = field(default_factory=list)  # (ts_ms, soc)
+    frames: int = 0
+    undecoded: int = 0
+    # Outputs some frame actually fed ("hr", "rr", "battery"). A replay swaps only these, so a day of
+    # proprietary frames never wipes HR the phone decoded itself.
+    covered: set[str] = field(default_factory=set)
+
+
+def _char_short(char_uuid: str) -> str:
+    """'2a37', '00002a37-0000-1000-8000-00805f9b34fb' and '0x2A37' all name the same characteristic."""
+    uuid = char_uuid.strip().lower().removeprefix("0x")
+    if len(uuid) == 36 and uuid.endswith("-0000-1000-8000-00805f9b34fb"):
+        return uuid[4:8]
+    return uuid
+
+
+def decode_heart_rate(payload: bytes) -> tuple[int, list[int]] | None:
+    """(bpm, [rr_ms, ...]) from a Heart Rate Measurement value, or None if it is truncated."""
+    if not payload:
+        return None
+    flags = payload[0]
+    pos = 1
+    width = 2 if flags & _HR_UINT16 else 1
+    if len(payload) < pos + width:
+        return None
+    bpm = int.from_bytes(payload[pos : pos + width], "little")
+    pos += width
+    if flags & _ENERGY_PRESENT:
+        pos += 2
+    rr = []
+    if flags & _RR_PRESENT:
+        while pos + 2 <= len(payload):
+            raw = int.from_bytes(payload[pos : pos + 2], "little")
+            rr.append(round(raw * 1000 / 1024))
+            pos += 2
+    return bpm, rr
+
+
+def decode_day(frames: list[tuple[int, str, str]]) -> DecodedDay:
+    """Decode one user-day of (ts_ms, char_uuid, frame_hex) frames."""
+    out = DecodedDay(frames=len(frames))
+    for ts_ms, char_uuid, frame_hex in frames:
+        kind = _char_short(char_uuid)
+        payload = bytes.fromhex(frame_hex)
+        if kind == HEART_RATE_MEASUREMENT:
+            decoded = decode_heart_rate(payload)
+            if decoded is None:
+                out.undecoded += 1
+                continue
+            bpm, rr = decoded
+            out.covered.add("hr")
+            if bpm:
+                out.hr.append((ts_ms, bpm))
+            if rr:
+                # Not every strap firmware sends RR in 2a37 — only claim the stream when it does
+                out.covered.add("rr")
+                out.rr.extend((ts_ms, value) for value in rr)
+        elif kind == BATTERY_LEVEL and payload:
+            out.covered.add("battery")
+            out.battery.append((ts_ms, payload[0]))
+        else:
+            out.undecoded += 1
+    return out
@@ -0,0 +1,78 @@
+"""One-shot compaction: move legacy per-sample whoop_hr / whoop_rr rows into whoop_stream_chunks.
+
+Idempotent and resumable: each user-day is merged into its hourly chunks and deleted from the legacy
+table in the same transaction, so a crash leaves every day either fully moved or untouched. Once the
+legacy tables are empty this is two cheap queries, so it is safe to run on every deploy.
+"""
+
+import logging
+from datetime import timedelta
+
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.whoop_stream_repo import HR, RR, WhoopStreamRepository
+
+logger = logging.getLogger(__name__)
+
+# (legacy table, stream, value column)
+_LEGACY_STREAMS = (("whoop_hr", HR, "bpm"), ("whoop_rr", RR, "rr_ms"))
+
+
+def _compact_user(table: str, stream: str, column: str, user_id: int) -> int:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            convert_query(
+                f"SELECT MIN(ts) AS first_ts, MAX(ts) AS last_ts FROM {table} WHERE user_id = ?"
+            ),
+            (user_id,),
+        )
+        bounds = cursor.fetchone()
+    if not bounds or bounds["first_ts"] is None:
+        return 0
+
+    moved = 0
+    day = bounds["first_ts"].replace(hour=0, minute=0, second=0, microsecond=0)
+    while day <= bounds["last_ts"]:
+        window = (user_id, day, day + timedelta(days=1))
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query(
+                    f"SELECT ts, {column} AS value FROM {table} "
+                    "WHERE user_id = ? AND ts >= ? AND ts < ?"
+                ),
+                window,
+            )
+            samples = [(row["ts"], row["value"]) for row in cursor.fetchall()]
+            if samples:
+                WhoopStreamRepository.write(cursor, user_id, stream, samples)
+                cursor.execute(
+                    convert_query(
+                        f"DELETE FROM {table} WHERE user_id = ? AND ts >= ? AND ts < ?"
+                    ),
+                    window,
+                )
+                moved += len(samples)
+        day += timedelta(days=1)
+    return moved
+
+
+def compact_legacy_streams() -> dict[str, int]:
+    """Drain both legacy tables into the chunk store. Returns samples moved per stream."""
+    moved = {}
+    for table, stream, column in _LEGACY_STREAMS:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT DISTINCT user_id FROM {table}")
+            user_ids = [row["user_id"] for row in cursor.fetchall()]
+        moved[stream] = 0
+        for user_id in user_ids:
+            try:
+                moved[stream] += _compact_user(table, stream, column, user_id)
+            except Exception:
+                logger.warning(
+                    "  user %s: %s compaction failed", user_id, table, exc_info=True
+                )
+    if any(moved.values()):
+        logger.info("Compacted legacy WHOOP streams into chunks: %s", moved)
+    return moved
@@ -0,0 +1,14 @@
+-- 122_user_training_counters.sql
+-- SQLite local-dev variant of 122_user_training_counters_pg.sql.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+CREATE TABLE IF NOT EXISTS user_training_counters (
+    user_id       INTEGER PRIMARY KEY,
+    sessions      INTEGER NOT NULL DEFAULT 0,
+    total_mins    INTEGER NOT NULL DEFAULT 0,
+    rolls         INTEGER NOT NULL DEFAULT 0,
+    submissions   INTEGER NOT NULL DEFAULT 0,
+    partners      INTEGER NOT NULL DEFAULT 0,
+    techniques    INTEGER NOT NULL DEFAULT 0,
+    updated_at    TEXT    NOT NULL DEFAULT (datetime('now')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
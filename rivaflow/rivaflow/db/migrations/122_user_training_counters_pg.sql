@@ -0,0 +1,23 @@
+-- 122_user_training_counters_pg.sql
+-- Per-user lifetime training counters for milestone evaluation (PostgreSQL / production).
+-- See 122_user_training_counters.sql for the SQLite (local dev) variant.
+--
+-- Milestone checks used to re-aggregate every session, roll and technique a user
+-- had ever logged after each new session, and the dashboard did it twice more for
+-- progress-to-next. This row is updated in the same transaction as the session
+-- write (sessions, minutes, rolls, submissions are applied as deltas) and the
+-- distinct partner/technique counts are refreshed when a session's rolls or
+-- techniques change. rebuild/rebuild_all in training_counter_repo repair it from
+-- the source tables.
+-- (Keep these comments free of the semicolon character, which the migration runner treats as a
+--  statement separator even inside a comment.)
+CREATE TABLE IF NOT EXISTS user_training_counters (
+    user_id       INTEGER     PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    sessions      INTEGER     NOT NULL DEFAULT 0,
+    total_mins    INTEGER     NOT NULL DEFAULT 0,
+    rolls         INTEGER     NOT NULL DEFAULT 0,
+    submissions   INTEGER     NOT NULL DEFAULT 0,
+    partners      INTEGER     NOT NULL DEFAULT 0,
+    techniques    INTEGER     NOT NULL DEFAULT 0,
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,16 @@
+-- 123_report_snapshots.sql
+-- SQLite local-dev variant of 123_report_snapshots_pg.sql.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+CREATE TABLE IF NOT EXISTS report_snapshots (
+    user_id       INTEGER NOT NULL,
+    period_type   TEXT    NOT NULL,
+    period_start  TEXT    NOT NULL,
+    period_end    TEXT    NOT NULL,
+    payload       TEXT    NOT NULL,
+    generated_at  TEXT    NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (user_id, period_start, period_end),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_report_snapshots_user_type
+    ON report_snapshots (user_id, period_type, period_start);
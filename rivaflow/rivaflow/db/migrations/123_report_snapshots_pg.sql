@@ -0,0 +1,24 @@
+-- 123_report_snapshots_pg.sql
+-- Materialized weekly/monthly training reports (PostgreSQL / production).
+-- See 123_report_snapshots.sql for the SQLite (local dev) variant.
+--
+-- A closed week or month never changes unless the user edits history inside it,
+-- yet /reports/week, /reports/month and the CLI report command re-read every
+-- session and readiness row for the period on each request. Closed periods are
+-- stored here as one JSON payload per (user, period). A session or readiness
+-- write deletes only the snapshots whose period covers the written date, and the
+-- next read (or the rollover job) regenerates them.
+-- (Keep these comments free of the semicolon character, which the migration runner treats as a
+--  statement separator even inside a comment.)
+CREATE TABLE IF NOT EXISTS report_snapshots (
+    user_id       INTEGER     NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    period_type   TEXT        NOT NULL,
+    period_start  DATE        NOT NULL,
+    period_end    DATE        NOT NULL,
+    payload       TEXT        NOT NULL,
+    generated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, period_start, period_end)
+);
+
+CREATE INDEX IF NOT EXISTS idx_report_snapshots_user_type
+    ON report_snapshots (user_id, period_type, period_start);
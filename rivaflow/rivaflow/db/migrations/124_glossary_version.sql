@@ -0,0 +1,9 @@
+-- 124_glossary_version.sql
+-- SQLite local-dev variant of 124_glossary_version_pg.sql.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+CREATE TABLE IF NOT EXISTS glossary_version (
+    id       INTEGER PRIMARY KEY CHECK (id = 1),
+    version  INTEGER NOT NULL DEFAULT 1
+);
+
+INSERT OR IGNORE INTO glossary_version (id, version) VALUES (1, 1);
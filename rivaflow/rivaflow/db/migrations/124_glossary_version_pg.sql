@@ -0,0 +1,17 @@
+-- 124_glossary_version_pg.sql
+-- Glossary version counter (PostgreSQL / production).
+-- See 124_glossary_version.sql for the SQLite (local dev) variant.
+--
+-- Every process keeps an in-memory GlossaryIndex (id, folded name/alias and
+-- category maps) instead of running SELECT * FROM movements_glossary per request.
+-- Custom movement create/delete bumps this single-row counter in the same
+-- transaction, and each process reloads its index when the stored version moves.
+-- (Keep these comments free of the semicolon character, which the migration runner treats as a
+--  statement separator even inside a comment.)
+CREATE TABLE IF NOT EXISTS glossary_version (
+    id       INTEGER PRIMARY KEY CHECK (id = 1),
+    version  BIGINT  NOT NULL DEFAULT 1
+);
+
+INSERT INTO glossary_version (id, version) VALUES (1, 1)
+ON CONFLICT (id) DO NOTHING;
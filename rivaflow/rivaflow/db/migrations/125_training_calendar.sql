@@ -0,0 +1,15 @@
+-- 125_training_calendar.sql
+-- SQLite local-dev variant of 125_training_calendar_pg.sql.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+CREATE TABLE IF NOT EXISTS training_calendar (
+    user_id      INTEGER NOT NULL,
+    year         INTEGER NOT NULL,
+    class_type   TEXT    NOT NULL,
+    trained_days BLOB    NOT NULL,
+    counts       BLOB    NOT NULL,
+    intensity    BLOB    NOT NULL,
+    minutes      BLOB    NOT NULL,
+    updated_at   TEXT    NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (user_id, year, class_type),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
@@ -0,0 +1,24 @@
+-- 125_training_calendar_pg.sql
+-- Compact per-user, per-year training calendar (PostgreSQL / production).
+-- See 125_training_calendar.sql for the SQLite (local dev) variant.
+--
+-- The frequency heatmap, the training calendar and consistency analytics used
+-- to rebuild day grids from session rows on every call. Each row here holds one
+-- calendar year for one class type: a bitset of trained days (bit n = day-of-year
+-- n, 0-based) plus little-endian uint16 per-day session count, summed intensity
+-- and minutes arrays (366 slots). class_type '*' is the all-types union and also
+-- marks the year as built. Session writes re-aggregate the touched day in the
+-- same transaction, and years never read are built lazily from sessions.
+-- (Keep these comments free of the semicolon character, which the migration runner treats as a
+--  statement separator even inside a comment.)
+CREATE TABLE IF NOT EXISTS training_calendar (
+    user_id      INTEGER     NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    year         INTEGER     NOT NULL,
+    class_type   TEXT        NOT NULL,
+    trained_days BYTEA       NOT NULL,
+    counts       BYTEA       NOT NULL,
+    intensity    BYTEA       NOT NULL,
+    minutes      BYTEA       NOT NULL,
+    updated_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, year, class_type)
+);
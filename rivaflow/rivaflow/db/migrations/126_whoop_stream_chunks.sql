@@ -0,0 +1,13 @@
+-- 126_whoop_stream_chunks.sql
+-- SQLite local-dev variant of 126_whoop_stream_chunks_pg.sql.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+CREATE TABLE IF NOT EXISTS whoop_stream_chunks (
+    user_id      INTEGER NOT NULL,
+    stream       TEXT    NOT NULL,
+    bucket_start INTEGER NOT NULL,
+    n            INTEGER NOT NULL,
+    payload      BLOB    NOT NULL,
+    updated_at   TEXT    NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (user_id, stream, bucket_start),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
@@ -0,0 +1,21 @@
+-- 126_whoop_stream_chunks_pg.sql
+-- Chunked HR/RR stream store (PostgreSQL / production).
+-- See 126_whoop_stream_chunks.sql for the SQLite (local dev) variant.
+--
+-- whoop_hr and whoop_rr kept one row per sample, which is ~100k rows (plus a composite-PK index entry
+-- each) per user-day, all materialized as dicts on every range read. whoop_stream_chunks keeps ONE row
+-- per (user, stream, hour). Its payload holds that hour's samples sorted by (ts, value), as a codec
+-- byte followed by zlib-packed varints (delta-encoded ms offsets from bucket_start, then the values).
+-- n is the sample count, so range counts read it without decoding whole hours.
+-- See rivaflow.db.repositories.whoop_stream_repo for the codec and the idempotent merge-on-ingest.
+-- The legacy per-sample tables are drained into this one by db/compact_whoop_streams.py.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+CREATE TABLE IF NOT EXISTS whoop_stream_chunks (
+    user_id      INTEGER     NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    stream       TEXT        NOT NULL,
+    bucket_start BIGINT      NOT NULL,
+    n            INTEGER     NOT NULL,
+    payload      BYTEA       NOT NULL,
+    updated_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, stream, bucket_start)
+);
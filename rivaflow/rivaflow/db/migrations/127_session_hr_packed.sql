@@ -0,0 +1,4 @@
+-- 127_session_hr_packed.sql
+-- SQLite local-dev variant of 127_session_hr_packed_pg.sql.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+ALTER TABLE sessions ADD COLUMN garmin_hr_packed BLOB;
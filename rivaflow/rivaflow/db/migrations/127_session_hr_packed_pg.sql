@@ -0,0 +1,8 @@
+-- 127_session_hr_packed_pg.sql
+-- Per-session HR line as a compact blob (PostgreSQL / production).
+-- See 127_session_hr_packed.sql for the SQLite (local dev) variant.
+--
+-- The payload is a codec byte, then zlib over varint offset deltas and uint8 bpm
+-- (core/hr_series.py). It replaces the JSON text in garmin_hr_series, which startup
+-- drains into this column and clears. Session list queries select neither column.
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS garmin_hr_packed BYTEA;
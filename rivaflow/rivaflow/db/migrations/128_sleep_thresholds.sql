@@ -0,0 +1,11 @@
+-- 128_sleep_thresholds.sql
+-- SQLite local-dev variant of 128_sleep_thresholds_pg.sql.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+CREATE TABLE IF NOT EXISTS sleep_thresholds (
+    user_id     INTEGER PRIMARY KEY,
+    offset_bpm  REAL    NOT NULL,
+    version     TEXT    NOT NULL,
+    nights_used INTEGER NOT NULL,
+    computed_at TEXT    NOT NULL DEFAULT (datetime('now')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
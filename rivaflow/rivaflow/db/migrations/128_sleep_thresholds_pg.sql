@@ -0,0 +1,17 @@
+-- 128_sleep_thresholds_pg.sql
+-- Learned personal sleep-window threshold, one row per user (PostgreSQL / production).
+-- See 128_sleep_thresholds.sql for the SQLite (local dev) variant.
+--
+-- sleep_window.personal_threshold_for_user used to keep its result in a per-process dict, so every
+-- worker re-learned it from 30 nights of HR after each restart and every 6h. The row is the shared
+-- result: workers read it while computed_at is inside the TTL and only the first one past it re-learns.
+-- nights_used is how many nights fed the learner (fewer than MIN_NIGHTS means the floor was used).
+-- (Keep these comments free of the semicolon character, which the migration runner treats as a
+--  statement separator even inside a comment.)
+CREATE TABLE IF NOT EXISTS sleep_thresholds (
+    user_id     INTEGER     PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    offset_bpm  REAL        NOT NULL,
+    version     TEXT        NOT NULL,
+    nights_used INTEGER     NOT NULL,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
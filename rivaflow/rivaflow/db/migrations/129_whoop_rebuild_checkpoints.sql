@@ -0,0 +1,17 @@
+-- 129_whoop_rebuild_checkpoints.sql
+-- SQLite local-dev variant of 129_whoop_rebuild_checkpoints_pg.sql.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+CREATE TABLE IF NOT EXISTS whoop_rebuild_checkpoints (
+    run_id          TEXT    NOT NULL,
+    user_id         INTEGER NOT NULL,
+    day             TEXT    NOT NULL,
+    decoder_version TEXT    NOT NULL,
+    frames          INTEGER NOT NULL,
+    undecoded       INTEGER NOT NULL,
+    hr              INTEGER NOT NULL,
+    rr              INTEGER NOT NULL,
+    battery         INTEGER NOT NULL,
+    completed_at    TEXT    NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (run_id, user_id, day),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
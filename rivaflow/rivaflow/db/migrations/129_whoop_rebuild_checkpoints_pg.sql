@@ -0,0 +1,23 @@
+-- 129_whoop_rebuild_checkpoints_pg.sql
+-- Per-day checkpoints for the raw-frame replay (PostgreSQL / production).
+-- See 129_whoop_rebuild_checkpoints.sql for the SQLite (local dev) variant.
+--
+-- db/rebuild_whoop_streams.py re-decodes whoop_raw_frames one (user, UTC day) at a time and swaps the
+-- output into the chunk store and whoop_battery. Each day's checkpoint row is written in the SAME
+-- transaction as its swap, so an interrupted run resumes exactly after the last swapped day when it is
+-- restarted with the same run_id. The counts are what that day's replay produced.
+-- (Keep these comments free of the semicolon character, which the migration runner treats as a
+--  statement separator even inside a comment.)
+CREATE TABLE IF NOT EXISTS whoop_rebuild_checkpoints (
+    run_id          TEXT        NOT NULL,
+    user_id         INTEGER     NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    day             DATE        NOT NULL,
+    decoder_version TEXT        NOT NULL,
+    frames          INTEGER     NOT NULL,
+    undecoded       INTEGER     NOT NULL,
+    hr              INTEGER     NOT NULL,
+    rr              INTEGER     NOT NULL,
+    battery         INTEGER     NOT NULL,
+    completed_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (run_id, user_id, day)
+);
@@ -0,0 +1,19 @@
+-- 130_strain_dose_stats.sql
+-- SQLite local-dev variant of 130_strain_dose_stats_pg.sql.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+CREATE TABLE IF NOT EXISTS strain_dose_stats (
+    user_id    INTEGER NOT NULL,
+    state      TEXT    NOT NULL,
+    n          REAL    NOT NULL,
+    sx         REAL    NOT NULL,
+    sy         REAL    NOT NULL,
+    sxy        REAL    NOT NULL,
+    sxx        REAL    NOT NULL,
+    syy        REAL    NOT NULL,
+    samples    INTEGER NOT NULL,
+    last_day   TEXT    NOT NULL,
+    version    TEXT    NOT NULL,
+    updated_at TEXT    NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (user_id, state),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
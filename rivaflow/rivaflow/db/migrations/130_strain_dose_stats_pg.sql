@@ -0,0 +1,26 @@
+-- 130_strain_dose_stats_pg.sql
+-- Per-user, per-readiness-state dose-response sufficient statistics (PostgreSQL / production).
+-- See 130_strain_dose_stats.sql for the SQLite (local dev) variant.
+--
+-- strain_fit used to rebuild 90 days of (load ratio, next-day lnRMSSD delta) samples and refit OLS per
+-- state on every fit. These rows hold the exponentially forgotten sums instead (n, sx, sy, sxy, sxx, syy,
+-- all weighted), so the fitted multiplier and r2 are read from four rows. Each completed day is folded
+-- in once. last_day is the last day folded (the same on every row of a user) and version names the
+-- forgetting factor, so a change to it forces a full refit. samples is the raw, unweighted count.
+-- (Keep these comments free of the semicolon character, which the migration runner treats as a
+--  statement separator even inside a comment.)
+CREATE TABLE IF NOT EXISTS strain_dose_stats (
+    user_id    INTEGER          NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    state      TEXT             NOT NULL,
+    n          DOUBLE PRECISION NOT NULL,
+    sx         DOUBLE PRECISION NOT NULL,
+    sy         DOUBLE PRECISION NOT NULL,
+    sxy        DOUBLE PRECISION NOT NULL,
+    sxx        DOUBLE PRECISION NOT NULL,
+    syy        DOUBLE PRECISION NOT NULL,
+    samples    INTEGER          NOT NULL,
+    last_day   DATE             NOT NULL,
+    version    TEXT             NOT NULL,
+    updated_at TIMESTAMPTZ      NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, state)
+);
@@ -0,0 +1,17 @@
+-- 131_physiology_snapshots.sql
+-- SQLite local-dev variant of 131_physiology_snapshots_pg.sql.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+CREATE TABLE IF NOT EXISTS physiology_input_versions (
+    user_id INTEGER NOT NULL PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS physiology_snapshots (
+    user_id       INTEGER NOT NULL PRIMARY KEY,
+    day           TEXT    NOT NULL,
+    input_version INTEGER NOT NULL,
+    payload       TEXT    NOT NULL,
+    generated_at  TEXT    NOT NULL DEFAULT (datetime('now')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
@@ -0,0 +1,23 @@
+-- 131_physiology_snapshots_pg.sql
+-- Stored /analytics/physiology results and the input versions that key them (PostgreSQL / production).
+-- See 131_physiology_snapshots.sql for the SQLite (local dev) variant.
+--
+-- PhysiologyService.get_physiology recomputes readiness, ACWR, the strain target, sleep debt and
+-- monotony from garmin_daily and session TRIMP on every call, yet those inputs only change when a
+-- daily row or a session is written. physiology_input_versions holds a per-user counter that those
+-- writes bump in their own transaction. physiology_snapshots holds the latest result per user with
+-- the local day and input version it was computed for, and a read whose day or version differs recomputes.
+-- (Keep these comments free of the semicolon character, which the migration runner treats as a
+--  statement separator even inside a comment.)
+CREATE TABLE IF NOT EXISTS physiology_input_versions (
+    user_id INTEGER NOT NULL PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    version BIGINT  NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS physiology_snapshots (
+    user_id       INTEGER     NOT NULL PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    day           DATE        NOT NULL,
+    input_version BIGINT      NOT NULL,
+    payload       TEXT        NOT NULL,
+    generated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,13 @@
+-- 132_whoop_hrv_lab.sql
+-- SQLite local-dev variant of 132_whoop_hrv_lab_pg.sql.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+CREATE TABLE IF NOT EXISTS whoop_hrv_lab (
+    user_id      INTEGER NOT NULL,
+    day          TEXT    NOT NULL,
+    metrics_json TEXT    NOT NULL,
+    lab_version  TEXT    NOT NULL,
+    rr_count     INTEGER NOT NULL,
+    updated_at   TEXT    NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (user_id, day),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
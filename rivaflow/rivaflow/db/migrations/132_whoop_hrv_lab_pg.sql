@@ -0,0 +1,21 @@
+-- 132_whoop_hrv_lab_pg.sql
+-- Per-night HRV lab results, stored next to the whoop_daily_agg rollups (PostgreSQL / production).
+-- See 132_whoop_hrv_lab.sql for the SQLite (local dev) variant.
+--
+-- frequency_domain, poincare, dfa_alpha1 and estimate_respiratory_rate only ever ran on one
+-- caller-supplied segment. The nightly HRV lab (rivaflow.core.services.hrv_lab) runs them over every
+-- clean 5-minute window of a night and stores each metric's median and quartiles here, one row per
+-- (user_id, day), where day is the local day the night is attributed to (sleep_window.night_window).
+-- rr_count is the night's RR total when the row was computed, so beats that land late make the night
+-- stale, and lab_version does the same for a change to the pipeline. Trends read these rows only.
+-- (Keep these comments free of the semicolon character, which the migration runner treats as a
+--  statement separator even inside a comment.)
+CREATE TABLE IF NOT EXISTS whoop_hrv_lab (
+    user_id      INTEGER     NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    day          TEXT        NOT NULL,
+    metrics_json TEXT        NOT NULL,
+    lab_version  TEXT        NOT NULL,
+    rr_count     INTEGER     NOT NULL,
+    updated_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, day)
+);
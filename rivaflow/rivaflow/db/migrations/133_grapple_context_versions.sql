@@ -0,0 +1,10 @@
+-- 133_grapple_context_versions.sql
+-- SQLite local-dev variant of 133_grapple_context_versions_pg.sql.
+-- (Keep these comments free of the semicolon character, which the migration runner splits on.)
+CREATE TABLE IF NOT EXISTS grapple_context_versions (
+    user_id INTEGER NOT NULL,
+    domain  TEXT    NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, domain),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
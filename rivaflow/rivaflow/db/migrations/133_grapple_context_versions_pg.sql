@@ -0,0 +1,17 @@
+-- 133_grapple_context_versions_pg.sql
+-- Per-user data versions that key the cached Grapple prompt sections (PostgreSQL / production).
+-- See 133_grapple_context_versions.sql for the SQLite (local dev) variant.
+--
+-- GrappleContextBuilder rebuilt the whole user context (profile, gradings, 200 redacted sessions,
+-- check-ins, deep analytics) on every chat turn. Each rendered section is now cached per process
+-- under the versions of the data domains it reads: sessions, readiness (readiness and daily
+-- check-ins), profile (profile and gradings) and coach_prefs. Writes to a domain bump its counter in
+-- their own transaction, so every worker sees the change and only the sections reading it rebuild.
+-- (Keep these comments free of the semicolon character, which the migration runner treats as a
+--  statement separator even inside a comment.)
+CREATE TABLE IF NOT EXISTS grapple_context_versions (
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    domain  TEXT    NOT NULL,
+    version BIGINT  NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, domain)
+);
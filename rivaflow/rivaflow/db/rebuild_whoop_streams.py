@@ -0,0 +1,298 @@
+"""Rebuild the decoded WHOOP streams from whoop_raw_frames (re-decode and swap in, one user-day at a time).
+
+whoop_raw_frames is the source of truth, and everything decoded from it is meant to be rebuildable after
+a decoder fix. This replays it in bulk:
+
+  1. ``plan`` groups the raw frames into (user, UTC day) units with one query, skipping days this
+     ``run_id`` already finished.
+  2. Each day's frames are streamed with a server-side (named) cursor, so the client never buffers more
+     than ``FETCH_ROWS`` rows of a large day at once.
+  3. Decoding (core/whoop_frames.py) and chunk encoding are pure, so days fan out over a process pool with
+     a bounded number in flight. Small runs stay inline.
+  4. The parent swaps each decoded day in with ONE transaction: the day's chunks and battery samples are
+     COPYed into session temp tables, the day's covered streams are replaced from them, and the
+     checkpoint row is written. A crash leaves each day either fully swapped or untouched, and rerunning
+     with the same ``run_id`` resumes after the last swapped day.
+
+Only the streams a day's frames actually decode are replaced (see ``DecodedDay.covered``), so a day of
+proprietary frames never wipes HR/RR the phone uploaded. HRV windows are computed on the phone and are not
+rebuilt here. Swapped days' whoop_daily_agg rollups are invalidated.
+
+Usage: ``python -m rivaflow.db.rebuild_whoop_streams [--user-id N] [--run-id ID] [--workers N]``
+"""
+
+import argparse
+import io
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import UTC, date, datetime, timedelta
+
+from rivaflow.core.services import whoop_daily_agg
+from rivaflow.core.whoop_frames import DECODER_VERSION, decode_day
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.whoop_stream_repo import (
+    CHUNK_SECONDS,
+    HR,
+    RR,
+    build_chunks,
+    epoch_ms,
+)
+
+logger = logging.getLogger(__name__)
+
+FETCH_ROWS = 5000  # server-side cursor batch size
+POOL_MIN_DAYS = 8  # fewer days than this are replayed inline (a pool's startup costs more than it saves)
+MAX_IN_FLIGHT_PER_WORKER = (
+    2  # bounds decoded days held in memory while the parent swaps
+)
+
+_STAGE_TABLES = (
+    "CREATE TEMP TABLE IF NOT EXISTS whoop_chunk_stage "
+    "(stream TEXT, bucket_start BIGINT, n INTEGER, payload BYTEA) ON COMMIT DELETE ROWS",
+    "CREATE TEMP TABLE IF NOT EXISTS whoop_battery_stage "
+    "(ts TIMESTAMPTZ, soc SMALLINT) ON COMMIT DELETE ROWS",
+)
+
+
+def plan(run_id: str, user_id: int | None = None) -> list[tuple[int, date, int]]:
+    """(user_id, UTC day, frames) for every day with raw frames that ``run_id`` has not checkpointed."""
+    only_user = "AND r.user_id = ?" if user_id is not None else ""
+    params = (run_id, user_id) if user_id is not None else (run_id,)
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            convert_query(f"""
+                SELECT r.user_id, (r.ts AT TIME ZONE 'UTC')::date AS day, COUNT(*) AS frames
+                FROM whoop_raw_frames r
+                LEFT JOIN whoop_rebuild_checkpoints c
+                  ON c.run_id = ? AND c.user_id = r.user_id
+                 AND c.day = (r.ts AT TIME ZONE 'UTC')::date
+                WHERE c.run_id IS NULL {only_user}
+                GROUP BY r.user_id, (r.ts AT TIME ZONE 'UTC')::date
+                ORDER BY r.user_id, day
+                """),
+            params,
+        )
+        return [
+            (row["user_id"], row["day"], int(row["frames"]))
+            for row in cursor.fetchall()
+        ]
+
+
+def _day_bounds(day: date) -> tuple[datetime, datetime]:
+    start = datetime(day.year, day.month, day.day, tzinfo=UTC)
+    return start, start + timedelta(days=1)
+
+
+def _read_day(user_id: int, day: date) -> list[tuple[int, str, str]]:
+    """One day's (ts_ms, char_uuid, frame_hex) frames in ts order, via a server-side cursor."""
+    with get_connection() as conn:
+        cursor = conn.cursor(name=f"whoop_frames_{user_id}_{day:%Y%m%d}")
+        cursor.itersize = FETCH_ROWS
+        cursor.execute(
+            convert_query("""
+                SELECT ts, char_uuid, frame_hex FROM whoop_raw_frames
+                WHERE user_id = ? AND ts >= ? AND ts < ?
+                ORDER BY ts, id
+                """),
+            (user_id, *_day_bounds(day)),
+        )
+        frames = [
+            (epoch_ms(row["ts"]), row["char_uuid"], row["frame_hex"]) for row in cursor
+        ]
+        cursor.close()
+    return frames
+
+
+def _replay_job(job: tuple) -> dict:
+    """Process-pool entry point: (user_id, day, frames) -> decoded day with its chunk rows encoded."""
+    user_id, day, frames = job
+    decoded = decode_day(frames)
+    return {
+        "user_id": user_id,
+        "day": day,
+        "frames": decoded.frames,
+        "undecoded": decoded.undecoded,
+        "covered": decoded.covered,
+        "chunks": {
+            stream: build_chunks(stream, samples)
+            for stream, samples in ((HR, decoded.hr), (RR, decoded.rr))
+            if stream in decoded.covered
+        },
+        "battery": decoded.battery,
+        "counts": {
+            "hr": len(decoded.hr),
+            "rr": len(decoded.rr),
+            "battery": len(decoded.battery),
+        },
+    }
+
+
+def _copy(cursor, table: str, lines: list[str]) -> None:
+    if lines:
+        cursor.copy_expert(f"COPY {table} FROM STDIN", io.StringIO("".join(lines)))
+
+
+def _swap_day(run_id: str, result: dict) -> None:
+    """Replace the day's covered streams from the decoded result and checkpoint it, in one transaction."""
+    user_id, day = result["user_id"], result["day"]
+    start, end = _day_bounds(day)
+    first_bucket = int(start.timestamp())
+    last_bucket = int(end.timestamp()) - CHUNK_SECONDS
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        for ddl in _STAGE_TABLES:
+            cursor.execute(ddl)
+        # Text-format COPY: bytea goes in as \x-hex, with the backslash itself escaped
+        _copy(
+            cursor,
+            "whoop_chunk_stage",
+            [
+                f"{stream}\t{bucket}\t{n}\t\\\\x{payload.hex()}\n"
+                for stream, rows in result["chunks"].items()
+                for bucket, n, payload in rows
+            ],
+        )
+        for stream in result["chunks"]:
+            cursor.execute(
+                convert_query("""
+                    DELETE FROM whoop_stream_chunks
+                    WHERE user_id = ? AND stream = ? AND bucket_start BETWEEN ? AND ?
+                    """),
+                (user_id, stream, first_bucket, last_bucket),
+            )
+        cursor.execute(
+            convert_query("""
+                INSERT INTO whoop_stream_chunks (user_id, stream, bucket_start, n, payload)
+                SELECT ?, stream, bucket_start, n, payload FROM whoop_chunk_stage
+                """),
+            (user_id,),
+        )
+
+        if "battery" in result["covered"]:
+            epoch = datetime(1970, 1, 1, tzinfo=UTC)
+            _copy(
+                cursor,
+                "whoop_battery_stage",
+                [
+                    f"{(epoch + timedelta(milliseconds=ts)).isoformat()}\t{soc}\n"
+                    for ts, soc in result["battery"]
+                ],
+            )
+            # The characteristic has no charging flag, so rows the phone sent keep theirs
+            cursor.execute(
+                convert_query("""
+                    DELETE FROM whoop_battery b
+                    WHERE b.user_id = ? AND b.ts >= ? AND b.ts < ?
+                      AND NOT EXISTS (SELECT 1 FROM whoop_battery_stage s WHERE s.ts = b.ts)
+                    """),
+                (user_id, start, end),
+            )
+            cursor.execute(
+                convert_query("""
+                    INSERT INTO whoop_battery (user_id, ts, soc)
+                    SELECT DISTINCT ON (ts) ?, ts, soc FROM whoop_battery_stage ORDER BY ts
+                    ON CONFLICT (user_id, ts) DO UPDATE SET soc = EXCLUDED.soc
+                    """),
+                (user_id,),
+            )
+
+        counts = result["counts"]
+        cursor.execute(
+            convert_query("""
+                INSERT INTO whoop_rebuild_checkpoints
+                    (run_id, user_id, day, decoder_version, frames, undecoded, hr, rr, battery)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """),
+            (
+                run_id,
+                user_id,
+                day,
+                DECODER_VERSION,
+                result["frames"],
+                result["undecoded"],
+                counts["hr"],
+                counts["rr"],
+                counts["battery"],
+            ),
+        )
+
+    if result["chunks"]:
+        # Rollups are keyed by local day, which can sit either side of the UTC day
+        whoop_daily_agg.invalidate(
+            user_id, day - timedelta(days=1), day + timedelta(days=1)
+        )
+
+
+def rebuild(
+    run_id: str = DECODER_VERSION,
+    user_id: int | None = None,
+    workers: int | None = None,
+) -> dict:
+    """Replay raw frames into the decoded streams for every day ``run_id`` has not finished.
+
+    ``workers`` sizes the process pool used once there are ``POOL_MIN_DAYS`` days to replay (None = the
+    executor's default, 0 = always inline). Returns totals, including ``frames_per_sec``.
+    """
+    started = time.monotonic()
+    days = plan(run_id, user_id)
+    stats = {"days": 0, "frames": 0, "undecoded": 0, "hr": 0, "rr": 0, "battery": 0}
+
+    def _done(result: dict) -> None:
+        _swap_day(run_id, result)
+        stats["days"] += 1
+        stats["frames"] += result["frames"]
+        stats["undecoded"] += result["undecoded"]
+        for key, value in result["counts"].items():
+            stats[key] += value
+        if stats["days"] % 100 == 0:
+            logger.info("  %s/%s days replayed", stats["days"], len(days))
+
+    jobs = ((uid, day, _read_day(uid, day)) for uid, day, _ in days)
+    if workers != 0 and len(days) >= POOL_MIN_DAYS:
+        limit = (workers or os.cpu_count() or 1) * MAX_IN_FLIGHT_PER_WORKER
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = set()
+            for job in jobs:
+                in_flight.add(pool.submit(_replay_job, job))
+                if len(in_flight) >= limit:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        _done(future.result())
+            for future in wait(in_flight).done:
+                _done(future.result())
+    else:
+        for job in jobs:
+            _done(_replay_job(job))
+
+    stats["seconds"] = round(time.monotonic() - started, 3)
+    stats["frames_per_sec"] = (
+        round(stats["frames"] / stats["seconds"], 1) if stats["seconds"] else 0.0
+    )
+    logger.info("Rebuilt WHOOP streams from raw frames (%s): %s", run_id, stats)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--user-id", type=int, help="Only replay this user's frames")
+    parser.add_argument(
+        "--run-id",
+        default=DECODER_VERSION,
+        help="Checkpoint namespace — rerun with the same id to resume, a new one to replay everything",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Decode processes (0 = inline, default = CPU count)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    rebuild(run_id=args.run_id, user_id=args.user_id, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Audit the incremental strain dose-response sums against a full refit.
+
+For each user, brings the stored sums up to date, rebuilds them from history with
+``strain_fit.refit_strain_stats`` (which replaces the stored rows), and logs the multiplier and r² each
+produced per readiness state. Differences come from rollups that changed after their day was folded.
+
+Usage: ``python -m rivaflow.db.refit_strain_stats [user_id ...]`` (no ids = every user with stored sums)
+"""
+
+import argparse
+import logging
+
+from rivaflow.core.strain_fit import (
+    fit_multipliers_from_stats,
+    refit_strain_stats,
+    update_strain_stats,
+)
+from rivaflow.db.database import get_connection
+
+logger = logging.getLogger(__name__)
+
+
+def audit_user(user_id: int) -> dict[str, dict]:
+    """{state: {"incremental": (used, r2), "refit": (used, r2)}} for one user."""
+    _, before = fit_multipliers_from_stats(update_strain_stats(user_id))
+    _, after = fit_multipliers_from_stats(refit_strain_stats(user_id))
+    return {
+        state: {
+            "incremental": (before[state]["used"], before[state]["r2"]),
+            "refit": (after[state]["used"], after[state]["r2"]),
+        }
+        for state in after
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("user_ids", type=int, nargs="*")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    user_ids = args.user_ids
+    if not user_ids:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT user_id FROM strain_dose_stats")
+            user_ids = [row["user_id"] for row in cursor.fetchall()]
+    for user_id in user_ids:
+        for state, result in audit_user(user_id).items():
+            logger.info(
+                "user %s %-8s incremental=%s refit=%s",
+                user_id,
+                state,
+                result["incremental"],
+                result["refit"],
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,10 @@ from datetime import date, datetime
 
 from rivaflow.db.database import convert_query, execute_insert, get_connection
 from rivaflow.db.repositories.base_repository import BaseRepository
+from rivaflow.db.repositories.grapple_context_repo import (
+    READINESS,
+    GrappleContextRepository,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +59,7 @@ class CheckinRepository(BaseRepository):
         """Create or update daily check-in for a given slot."""
         with get_connection() as conn:
             cursor = conn.cursor()
+            GrappleContextRepository.bump(cursor, user_id, READINESS)
             cursor.execute(
                 convert_query(
                     "SELECT id FROM daily_checkins"
@@ -165,6 +170,7 @@ class CheckinRepository(BaseRepository):
         """Update tomorrow's intention for a specific date and slot."""
         with get_connection() as conn:
             cursor = conn.cursor()
+            GrappleContextRepository.bump(cursor, user_id, READINESS)
             # Try evening slot first, fall back to specified slot
             cursor.execute(
                 convert_query(
@@ -220,6 +226,7 @@ class CheckinRepository(BaseRepository):
         """Delete a check-in by ID. Returns True if deleted."""
         with get_connection() as conn:
             cursor = conn.cursor()
+            GrappleContextRepository.bump(cursor, user_id, READINESS)
             cursor.execute(
                 convert_query(
                     "DELETE FROM daily_checkins" " WHERE id = ? AND user_id = ?"
@@ -258,6 +265,7 @@ class CheckinRepository(BaseRepository):
         """Create or update midday check-in."""
         with get_connection() as conn:
             cursor = conn.cursor()
+            GrappleContextRepository.bump(cursor, user_id, READINESS)
             cursor.execute(
                 convert_query(
                     "SELECT id FROM daily_checkins"
@@ -313,6 +321,7 @@ class CheckinRepository(BaseRepository):
         checkin_type = "rest" if did_not_train else "evening"
         with get_connection() as conn:
             cursor = conn.cursor()
+            GrappleContextRepository.bump(cursor, user_id, READINESS)
             cursor.execute(
                 convert_query(
                     "SELECT id FROM daily_checkins"
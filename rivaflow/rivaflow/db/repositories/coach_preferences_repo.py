@@ -4,6 +4,10 @@ import json
 
 from rivaflow.db.database import convert_query, get_connection
 from rivaflow.db.repositories.base_repository import BaseRepository
+from rivaflow.db.repositories.grapple_context_repo import (
+    COACH_PREFS,
+    GrappleContextRepository,
+)
 
 JSON_FIELDS = ("focus_areas", "injuries", "motivations")
 
@@ -66,6 +70,7 @@ class CoachPreferencesRepository(BaseRepository):
 
         with get_connection() as conn:
             cursor = conn.cursor()
+            GrappleContextRepository.bump(cursor, user_id, COACH_PREFS)
             cursor.execute(
                 convert_query("SELECT id FROM coach_preferences WHERE user_id = ?"),
                 (user_id,),
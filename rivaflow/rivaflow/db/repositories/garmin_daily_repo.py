@@ -8,8 +8,13 @@ from __future__ import annotations
 
 from datetime import date, timedelta
 
+from psycopg2.extras import execute_values
+
 from rivaflow.db.database import convert_query, get_connection
 from rivaflow.db.repositories.base_repository import BaseRepository
+from rivaflow.db.repositories.physiology_snapshot_repo import (
+    PhysiologySnapshotRepository,
+)
 
 # Columns returned to the API (no internal id / user_id / synced_at).
 _DAILY_COLS = (
@@ -20,6 +25,8 @@ _DAILY_COLS = (
     "vo2max, active_calories, intensity_min_moderate, intensity_min_vigorous"
 )
 
+_PAGE_ROWS = 500  # days per INSERT statement
+
 # Upsertable metric fields (everything except the keys).
 _UPSERT_FIELDS = [
     "rhr",
@@ -55,19 +62,50 @@ class GarminDailyRepository(BaseRepository):
     def upsert(user_id: int, metric_date: str, **fields) -> None:
         """Insert or update one day's metrics. COALESCE keeps prior non-null
         values when a later payload omits a field."""
+        GarminDailyRepository.upsert_many(
+            user_id, [{"metric_date": metric_date, **fields}]
+        )
+
+    @staticmethod
+    def upsert_many(user_id: int, days: list[dict]) -> dict[str, int]:
+        """Upsert many days (dicts with ``metric_date`` plus metric fields) in one statement per page.
+
+        Same COALESCE merge as ``upsert``. A date repeated within the batch is folded first, later
+        non-null values winning, exactly as sequential upserts would leave it. The user's physiology input
+        version is bumped in the same transaction. Returns
+        ``{"inserted": new days, "updated": existing days}``.
+        """
+        merged: dict[str, list] = {}
+        for day in days:
+            row = merged.setdefault(day["metric_date"], [None] * len(_UPSERT_FIELDS))
+            for i, f in enumerate(_UPSERT_FIELDS):
+                if day.get(f) is not None:
+                    row[i] = day[f]
+        if not merged:
+            return {"inserted": 0, "updated": 0}
+
         cols = ["user_id", "metric_date"] + _UPSERT_FIELDS
-        placeholders = ", ".join(["?"] * len(cols))
-        values = [user_id, metric_date] + [fields.get(f) for f in _UPSERT_FIELDS]
         set_clause = ", ".join(
             f"{f} = COALESCE(excluded.{f}, garmin_daily.{f})" for f in _UPSERT_FIELDS
         )
-        query = convert_query(
-            f"INSERT INTO garmin_daily ({', '.join(cols)}) VALUES ({placeholders}) "
-            f"ON CONFLICT(user_id, metric_date) DO UPDATE SET {set_clause}"
+        # xmax is 0 only on a freshly inserted row version, so it tells inserts from updates
+        query = (
+            f"INSERT INTO garmin_daily ({', '.join(cols)}) VALUES %s "
+            f"ON CONFLICT(user_id, metric_date) DO UPDATE SET {set_clause} "
+            "RETURNING (xmax = 0) AS inserted"
         )
         with get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(query, tuple(values))
+            results = execute_values(
+                cursor,
+                query,
+                [(user_id, d, *values) for d, values in merged.items()],
+                page_size=_PAGE_ROWS,
+                fetch=True,
+            )
+            PhysiologySnapshotRepository.bump_version(cursor, user_id)
+        inserted = sum(1 for r in results if r["inserted"])
+        return {"inserted": inserted, "updated": len(results) - inserted}
 
     @staticmethod
     def get_range(user_id: int, days: int = 30) -> list[dict]:
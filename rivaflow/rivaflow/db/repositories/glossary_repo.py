@@ -10,6 +10,24 @@ from rivaflow.db.repositories.base_repository import BaseRepository
 class GlossaryRepository(BaseRepository):
     """Data access layer for movements glossary."""
 
+    # Committed glossary writes made by this process, so its own GlossaryIndex
+    # reloads without waiting for the next stored-version check.
+    local_writes = 0
+
+    @staticmethod
+    def get_version() -> int:
+        """Get the stored glossary version (bumped by custom create/delete)."""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM glossary_version WHERE id = 1")
+            row = cursor.fetchone()
+            return int(row["version"]) if row else 0
+
+    @staticmethod
+    def bump_version(cursor) -> None:
+        """Advance the glossary version inside the caller's transaction."""
+        cursor.execute("UPDATE glossary_version SET version = version + 1 WHERE id = 1")
+
     @staticmethod
     def list_all(
         category: str | None = None,
@@ -143,7 +161,9 @@ class GlossaryRepository(BaseRepository):
                 (movement_id,),
             )
             row = cursor.fetchone()
-            return GlossaryRepository._row_to_dict(row)
+            GlossaryRepository.bump_version(cursor)
+        GlossaryRepository.local_writes += 1
+        return GlossaryRepository._row_to_dict(row)
 
     @staticmethod
     def delete_custom(movement_id: int) -> bool:
@@ -156,7 +176,11 @@ class GlossaryRepository(BaseRepository):
                 ),
                 (movement_id,),
             )
-            return bool(cursor.rowcount > 0)
+            if cursor.rowcount == 0:
+                return False
+            GlossaryRepository.bump_version(cursor)
+        GlossaryRepository.local_writes += 1
+        return True
 
     @staticmethod
     def add_custom_video(
@@ -392,6 +416,8 @@ class GlossaryRepository(BaseRepository):
             )
             if cursor.rowcount == 0:
                 return None
+            GlossaryRepository.bump_version(cursor)
+        GlossaryRepository.local_writes += 1
 
         return technique_name
 
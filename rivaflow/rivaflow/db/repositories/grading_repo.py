@@ -5,6 +5,10 @@ from datetime import date, datetime
 from rivaflow.core.constants import GRADING_SORT_OPTIONS
 from rivaflow.db.database import convert_query, execute_insert, get_connection
 from rivaflow.db.repositories.base_repository import BaseRepository
+from rivaflow.db.repositories.grapple_context_repo import (
+    PROFILE,
+    GrappleContextRepository,
+)
 
 
 class GradingRepository(BaseRepository):
@@ -23,6 +27,7 @@ class GradingRepository(BaseRepository):
         """Create a new grading entry."""
         with get_connection() as conn:
             cursor = conn.cursor()
+            GrappleContextRepository.bump(cursor, user_id, PROFILE)
             grading_id = execute_insert(
                 cursor,
                 """
@@ -104,6 +109,7 @@ class GradingRepository(BaseRepository):
 
         with get_connection() as conn:
             cursor = conn.cursor()
+            GrappleContextRepository.bump(cursor, user_id, PROFILE)
 
             # Build dynamic update query — all field names validated against whitelist
             updates = []
@@ -158,6 +164,7 @@ class GradingRepository(BaseRepository):
         """Delete a grading by ID. Returns True if deleted."""
         with get_connection() as conn:
             cursor = conn.cursor()
+            GrappleContextRepository.bump(cursor, user_id, PROFILE)
             cursor.execute(
                 convert_query("DELETE FROM gradings WHERE id = ? AND user_id = ?"),
                 (grading_id, user_id),
@@ -0,0 +1,45 @@
+"""Repository for the per-user data versions that key cached Grapple context sections.
+
+``GrappleContextBuilder`` caches each rendered prompt section under the versions of the domains it reads.
+Writes to a domain call ``bump`` with their own cursor, so the version moves in the same transaction as
+the data and every worker's cached sections for that domain go stale together.
+"""
+
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.base_repository import BaseRepository
+
+SESSIONS = "sessions"
+READINESS = "readiness"  # readiness rows and daily check-ins
+PROFILE = "profile"  # profile and gradings
+COACH_PREFS = "coach_prefs"
+DOMAINS = (SESSIONS, READINESS, PROFILE, COACH_PREFS)
+
+
+class GrappleContextRepository(BaseRepository):
+    """Data access layer for grapple_context_versions."""
+
+    @staticmethod
+    def get_versions(user_id: int) -> dict[str, int]:
+        """Every domain's version for the user in one query (0 for a domain never written)."""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query(
+                    "SELECT domain, version FROM grapple_context_versions WHERE user_id = ?"
+                ),
+                (user_id,),
+            )
+            stored = {row["domain"]: int(row["version"]) for row in cursor.fetchall()}
+        return {domain: stored.get(domain, 0) for domain in DOMAINS}
+
+    @staticmethod
+    def bump(cursor, user_id: int, domain: str) -> None:
+        """Mark one of the user's context domains changed, using the caller's cursor."""
+        cursor.execute(
+            convert_query("""
+                INSERT INTO grapple_context_versions (user_id, domain, version) VALUES (?, ?, 1)
+                ON CONFLICT (user_id, domain) DO UPDATE
+                SET version = grapple_context_versions.version + 1
+                """),
+            (user_id, domain),
+        )
@@ -156,3 +156,22 @@ class MilestoneRepository(BaseRepository):
                 max_value = row_dict.get("max_value")
                 return max_value if max_value is not None else 0
             return 0
+
+    @staticmethod
+    def get_highest_achieved_by_type(user_id: int) -> dict[str, int]:
+        """Get the highest achieved value for every milestone type in one query."""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                SELECT milestone_type, MAX(milestone_value) as max_value
+                FROM milestones
+                WHERE user_id = ?
+                GROUP BY milestone_type
+                """),
+                (user_id,),
+            )
+            return {
+                row["milestone_type"]: row["max_value"] or 0
+                for row in cursor.fetchall()
+            }
@@ -0,0 +1,100 @@
+"""Repository for stored physiology results and their per-user input versions.
+
+``PhysiologyService.get_physiology`` is a pure function of the user's garmin_daily rows, their
+sessions' TRIMP and the local day. Writes to those inputs call ``bump_version`` with their own cursor,
+so the version moves in the same transaction as the data. A stored snapshot is served only while its
+day and input version both still match.
+"""
+
+import json
+from datetime import date, timedelta
+
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.base_repository import BaseRepository
+
+
+class PhysiologySnapshotRepository(BaseRepository):
+    """Data access layer for physiology_snapshots and physiology_input_versions."""
+
+    @staticmethod
+    def get(user_id: int, day: date) -> tuple[dict | None, int]:
+        """(the stored result if it is current for ``day``, the user's input version) in one query.
+
+        Save a recomputed result under the version returned here, read BEFORE computing: a write that
+        lands mid-computation then leaves the saved row already stale instead of masking the write.
+        """
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                    SELECT COALESCE(v.version, 0) AS version, s.payload
+                    FROM (SELECT ? AS user_id) u
+                    LEFT JOIN physiology_input_versions v ON v.user_id = u.user_id
+                    LEFT JOIN physiology_snapshots s
+                      ON s.user_id = u.user_id AND s.day = ?
+                     AND s.input_version = COALESCE(v.version, 0)
+                    """),
+                (user_id, day.isoformat()),
+            )
+            row = cursor.fetchone()
+        payload = json.loads(row["payload"]) if row["payload"] else None
+        return payload, int(row["version"])
+
+    @staticmethod
+    def save(user_id: int, day: date, input_version: int, payload: dict) -> None:
+        """Store (or replace) the user's snapshot."""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                    INSERT INTO physiology_snapshots (user_id, day, input_version, payload)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (user_id) DO UPDATE SET
+                        day = EXCLUDED.day,
+                        input_version = EXCLUDED.input_version,
+                        payload = EXCLUDED.payload,
+                        generated_at = CURRENT_TIMESTAMP
+                    """),
+                (user_id, day.isoformat(), input_version, json.dumps(payload)),
+            )
+
+    @staticmethod
+    def bump_version(cursor, user_id: int) -> None:
+        """Mark the user's physiology inputs changed, using the caller's cursor."""
+        cursor.execute(
+            convert_query("""
+                INSERT INTO physiology_input_versions (user_id, version) VALUES (?, 1)
+                ON CONFLICT (user_id) DO UPDATE
+                SET version = physiology_input_versions.version + 1
+                """),
+            (user_id,),
+        )
+
+    @staticmethod
+    def get_stale_user_ids(day: date, daily_days: int, load_days: int) -> list[int]:
+        """Users with physiology inputs (garmin_daily in the last ``daily_days``, or a TRIMP-carrying
+        session in the last ``load_days``) whose snapshot is missing, from another day, or outdated.
+        """
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                    SELECT a.user_id FROM (
+                        SELECT user_id FROM garmin_daily WHERE metric_date >= ?
+                        UNION
+                        SELECT user_id FROM sessions
+                        WHERE session_date >= ? AND garmin_training_load IS NOT NULL
+                    ) a
+                    LEFT JOIN physiology_input_versions v ON v.user_id = a.user_id
+                    LEFT JOIN physiology_snapshots s ON s.user_id = a.user_id
+                    WHERE s.user_id IS NULL OR s.day <> ?
+                       OR s.input_version <> COALESCE(v.version, 0)
+                    ORDER BY a.user_id
+                    """),
+                (
+                    (day - timedelta(days=daily_days)).isoformat(),
+                    (day - timedelta(days=load_days)).isoformat(),
+                    day.isoformat(),
+                ),
+            )
+            return [row["user_id"] for row in cursor.fetchall()]
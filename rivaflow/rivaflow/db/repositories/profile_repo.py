@@ -5,6 +5,10 @@ from datetime import date, datetime
 
 from rivaflow.db.database import convert_query, get_connection
 from rivaflow.db.repositories.base_repository import BaseRepository
+from rivaflow.db.repositories.grapple_context_repo import (
+    PROFILE,
+    GrappleContextRepository,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -114,6 +118,7 @@ class ProfileRepository(BaseRepository):
         ProfileRepository._ensure_timezone_column()
         with get_connection() as conn:
             cursor = conn.cursor()
+            GrappleContextRepository.bump(cursor, user_id, PROFILE)
 
             # Check if profile exists
             cursor.execute(
@@ -317,6 +322,7 @@ class ProfileRepository(BaseRepository):
             return
         with get_connection() as conn:
             cursor = conn.cursor()
+            GrappleContextRepository.bump(cursor, user_id, PROFILE)
             set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
             values = list(updates.values()) + [user_id]
 
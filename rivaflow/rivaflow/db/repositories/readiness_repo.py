@@ -4,6 +4,11 @@ from datetime import date, datetime
 
 from rivaflow.db.database import convert_query, execute_insert, get_connection
 from rivaflow.db.repositories.base_repository import BaseRepository
+from rivaflow.db.repositories.grapple_context_repo import (
+    READINESS,
+    GrappleContextRepository,
+)
+from rivaflow.db.repositories.report_snapshot_repo import ReportSnapshotRepository
 
 
 class ReadinessRepository(BaseRepository):
@@ -29,6 +34,8 @@ class ReadinessRepository(BaseRepository):
         """Create or update readiness entry for a date. Returns ID."""
         with get_connection() as conn:
             cursor = conn.cursor()
+            ReportSnapshotRepository.invalidate_date(cursor, user_id, check_date)
+            GrappleContextRepository.bump(cursor, user_id, READINESS)
             # Try to get existing entry
             cursor.execute(
                 convert_query(
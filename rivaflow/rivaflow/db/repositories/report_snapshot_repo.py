@@ -0,0 +1,180 @@
+"""Repository for materialized weekly/monthly report snapshots.
+
+A snapshot is the full ``ReportService.generate_report`` payload for one
+closed period, stored as JSON. Session and readiness writes call the
+``invalidate_*`` helpers with their own cursor so the snapshots covering the
+written date are dropped in the same transaction as the edit.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.base_repository import BaseRepository
+
+# Payload keys restored to native types when a snapshot is read back
+_DATE_KEYS = frozenset({"start_date", "end_date", "session_date", "check_date", "date"})
+_DATETIME_KEYS = frozenset({"created_at", "updated_at", "published_at"})
+
+
+def _encode(value):
+    if isinstance(value, date | datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Unserializable report value: {type(value).__name__}")
+
+
+def _decode(obj: dict) -> dict:
+    for key, value in obj.items():
+        if not isinstance(value, str):
+            continue
+        if key in _DATE_KEYS:
+            obj[key] = date.fromisoformat(value[:10])
+        elif key in _DATETIME_KEYS:
+            obj[key] = datetime.fromisoformat(value)
+    return obj
+
+
+class ReportSnapshotRepository(BaseRepository):
+    """Data access layer for stored report snapshots."""
+
+    @staticmethod
+    def get(user_id: int, start_date: date, end_date: date) -> dict | None:
+        """Get the stored report for exactly this period, or None."""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                    SELECT payload FROM report_snapshots
+                    WHERE user_id = ? AND period_start = ? AND period_end = ?
+                    """),
+                (user_id, start_date.isoformat(), end_date.isoformat()),
+            )
+            row = cursor.fetchone()
+        return json.loads(row["payload"], object_hook=_decode) if row else None
+
+    @staticmethod
+    def get_many(
+        user_id: int, periods: list[tuple[date, date]]
+    ) -> dict[tuple[date, date], dict]:
+        """Get stored reports for several periods in one query.
+
+        Returns a dict keyed by (start_date, end_date); missing periods are absent.
+        """
+        if not periods:
+            return {}
+        starts = sorted({start.isoformat() for start, _ in periods})
+        placeholders = ", ".join("?" for _ in starts)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query(f"""
+                    SELECT payload FROM report_snapshots
+                    WHERE user_id = ? AND period_start IN ({placeholders})
+                    """),
+                (user_id, *starts),
+            )
+            rows = cursor.fetchall()
+
+        wanted = set(periods)
+        found = {}
+        for row in rows:
+            report = json.loads(row["payload"], object_hook=_decode)
+            key = (report["start_date"], report["end_date"])
+            if key in wanted:
+                found[key] = report
+        return found
+
+    @staticmethod
+    def save(user_id: int, period_type: str, report: dict) -> None:
+        """Store (or replace) the snapshot for the report's period."""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                    INSERT INTO report_snapshots (
+                        user_id, period_type, period_start, period_end, payload
+                    ) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (user_id, period_start, period_end) DO UPDATE SET
+                        period_type = EXCLUDED.period_type,
+                        payload = EXCLUDED.payload,
+                        generated_at = CURRENT_TIMESTAMP
+                    """),
+                (
+                    user_id,
+                    period_type,
+                    report["start_date"].isoformat(),
+                    report["end_date"].isoformat(),
+                    json.dumps(report, default=_encode),
+                ),
+            )
+
+    @staticmethod
+    def invalidate_date(cursor, user_id: int, day: date | str) -> None:
+        """Drop the snapshots whose period covers *day*, using the caller's cursor."""
+        day_str = day.isoformat() if isinstance(day, date) else str(day)[:10]
+        cursor.execute(
+            convert_query("""
+                DELETE FROM report_snapshots
+                WHERE user_id = ? AND period_start <= ? AND period_end >= ?
+                """),
+            (user_id, day_str, day_str),
+        )
+
+    @staticmethod
+    def invalidate_session(cursor, user_id: int, session_id: int) -> None:
+        """Drop the snapshots covering a session's current date."""
+        cursor.execute(
+            convert_query("""
+                DELETE FROM report_snapshots
+                WHERE user_id = ?
+                  AND EXISTS (
+                      SELECT 1 FROM sessions s
+                      WHERE s.id = ? AND s.user_id = report_snapshots.user_id
+                        AND s.session_date BETWEEN report_snapshots.period_start
+                                               AND report_snapshots.period_end
+                  )
+                """),
+            (user_id, session_id),
+        )
+
+    @staticmethod
+    def invalidate_session_details(user_id: int, session_id: int) -> None:
+        """``invalidate_session`` on its own connection, for rolls and techniques
+        replaced after the session row was written."""
+        with get_connection() as conn:
+            ReportSnapshotRepository.invalidate_session(
+                conn.cursor(), user_id, session_id
+            )
+
+    @staticmethod
+    def invalidate_user(cursor, user_id: int) -> None:
+        """Drop every snapshot for a user after a bulk rewrite of their sessions."""
+        cursor.execute(
+            convert_query("DELETE FROM report_snapshots WHERE user_id = ?"),
+            (user_id,),
+        )
+
+    @staticmethod
+    def get_active_user_ids(start_date: date, end_date: date) -> list[int]:
+        """Users with a session or readiness entry inside the period."""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                    SELECT user_id FROM sessions
+                    WHERE session_date BETWEEN ? AND ?
+                    UNION
+                    SELECT user_id FROM readiness
+                    WHERE check_date BETWEEN ? AND ?
+                    """),
+                (
+                    start_date.isoformat(),
+                    end_date.isoformat(),
+                    start_date.isoformat(),
+                    end_date.isoformat(),
+                ),
+            )
+            return [row["user_id"] for row in cursor.fetchall()]
@@ -4,9 +4,22 @@ import json
 from collections.abc import Iterable
 from datetime import date, datetime
 
+from rivaflow.core import hr_series
 from rivaflow.core.settings import settings
 from rivaflow.db.database import convert_query, execute_insert, get_connection
 from rivaflow.db.repositories.base_repository import BaseRepository
+from rivaflow.db.repositories.grapple_context_repo import (
+    SESSIONS,
+    GrappleContextRepository,
+)
+from rivaflow.db.repositories.physiology_snapshot_repo import (
+    PhysiologySnapshotRepository,
+)
+from rivaflow.db.repositories.report_snapshot_repo import ReportSnapshotRepository
+from rivaflow.db.repositories.training_calendar_repo import (
+    TrainingCalendarRepository,
+)
+from rivaflow.db.repositories.training_counter_repo import TrainingCounterRepository
 
 # The single definition of a countable "class" — mat time under instruction.
 #
@@ -35,13 +48,24 @@ _SESSION_COLS = (
     "garmin_calories, garmin_duration_min, garmin_aerobic_te, garmin_anaerobic_te, "
     "garmin_te_label, garmin_training_load, "
     "garmin_hr_z1_sec, garmin_hr_z2_sec, garmin_hr_z3_sec, garmin_hr_z4_sec, garmin_hr_z5_sec, "
-    "garmin_hr_series, "
     "attacks_attempted, attacks_successful, "
     "defenses_attempted, defenses_successful, "
     "source, needs_review, "
     "session_score, score_breakdown, score_version, "
     "created_at, updated_at"
 )
+# The HR line is only selected for a single session (detail view), never for lists.
+# garmin_hr_series is the legacy JSON text, read until startup packs it.
+_HR_SERIES_COLS = "garmin_hr_packed, garmin_hr_series"
+
+# Session columns mirrored in user_training_counters -> apply_delta keyword
+_COUNTED_FIELDS = {
+    "duration_mins": "minutes",
+    "rolls": "rolls",
+    "submissions_for": "submissions",
+}
+# Columns the training calendar aggregates per day
+_CALENDAR_FIELDS = ("session_date", "class_type", "intensity", "duration_mins")
 
 
 class SessionRepository(BaseRepository):
@@ -84,7 +108,7 @@ class SessionRepository(BaseRepository):
         """Create a new session and return its ID."""
         with get_connection() as conn:
             cursor = conn.cursor()
-            return execute_insert(
+            session_id = execute_insert(
                 cursor,
                 """
                 INSERT INTO sessions (
@@ -133,6 +157,19 @@ class SessionRepository(BaseRepository):
                     external_ref,
                 ),
             )
+            TrainingCounterRepository.apply_delta(
+                cursor,
+                user_id,
+                sessions=1,
+                minutes=duration_mins,
+                rolls=rolls,
+                submissions=submissions_for,
+            )
+            ReportSnapshotRepository.invalidate_date(cursor, user_id, session_date)
+            PhysiologySnapshotRepository.bump_version(cursor, user_id)
+            GrappleContextRepository.bump(cursor, user_id, SESSIONS)
+            TrainingCalendarRepository.refresh_day(cursor, user_id, session_date)
+            return session_id
 
     @staticmethod
     def get_by_external_ref(user_id: int, external_ref: str) -> dict | None:
@@ -162,7 +199,7 @@ class SessionRepository(BaseRepository):
             cursor = conn.cursor()
             cursor.execute(
                 convert_query(
-                    f"SELECT {_SESSION_COLS} FROM sessions"
+                    f"SELECT {_SESSION_COLS}, {_HR_SERIES_COLS} FROM sessions"
                     " WHERE id = ? AND user_id = ?"
                 ),
                 (session_id, user_id),
@@ -245,6 +282,59 @@ class SessionRepository(BaseRepository):
                 return None
             return SessionRepository._row_to_dict(row)
 
+    @staticmethod
+    def get_hr_series(user_id: int, session_id: int) -> hr_series.HRSeries | None:
+        """The session's HR line, undecoded until ``.pairs`` is read. None if not owned."""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query(
+                    f"SELECT {_HR_SERIES_COLS} FROM sessions WHERE id = ? AND user_id = ?"
+                ),
+                (session_id, user_id),
+            )
+            row = cursor.fetchone()
+        if not row:
+            return None
+        return hr_series.HRSeries(row["garmin_hr_packed"] or row["garmin_hr_series"])
+
+    @staticmethod
+    def pack_legacy_hr_series(batch_size: int = 500) -> int:
+        """Move JSON ``garmin_hr_series`` text into ``garmin_hr_packed``. Returns rows packed.
+
+        Idempotent: packed rows have the JSON column cleared, so a rerun finds nothing.
+        """
+        packed = 0
+        while True:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    convert_query(
+                        "SELECT id, garmin_hr_series FROM sessions"
+                        " WHERE garmin_hr_series IS NOT NULL LIMIT ?"
+                    ),
+                    (batch_size,),
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    return packed
+                cursor.executemany(
+                    convert_query(
+                        "UPDATE sessions SET garmin_hr_packed = ?,"
+                        " garmin_hr_series = NULL WHERE id = ?"
+                    ),
+                    [
+                        (
+                            hr_series.pack(
+                                hr_series.HRSeries(row["garmin_hr_series"]).pairs
+                            ),
+                            row["id"],
+                        )
+                        for row in rows
+                    ],
+                )
+                packed += len(rows)
+
     @staticmethod
     def update(user_id: int, session_id: int, **kwargs) -> dict | None:
         """
@@ -283,9 +373,7 @@ class SessionRepository(BaseRepository):
                 "techniques": lambda v: (
                     json.dumps(v) if v is not None else json.dumps([])
                 ),
-                "garmin_hr_series": lambda v: (
-                    json.dumps(v) if v is not None else None
-                ),
+                "garmin_hr_series": hr_series.pack,
                 "needs_review": lambda v: bool(v),
                 "score_breakdown": lambda v: (
                     json.dumps(v) if isinstance(v, dict) else v
@@ -367,6 +455,12 @@ class SessionRepository(BaseRepository):
                     if value is not None:
                         updates.append(f"{field} = ?")
                         params.append(field_processors[field](value))
+                elif field == "garmin_hr_series":
+                    # Stored packed; the legacy JSON column is cleared on write
+                    if value is not None:
+                        updates.append("garmin_hr_packed = ?")
+                        updates.append("garmin_hr_series = NULL")
+                        params.append(field_processors[field](value))
                 elif value is not None:
                     updates.append(f"{field} = ?")
 
@@ -380,6 +474,37 @@ class SessionRepository(BaseRepository):
                 # Nothing to update, return current session
                 return SessionRepository.get_by_id(user_id, session_id)
 
+            # Snapshot counted fields so the counters get an exact delta
+            counted = [f for f in _COUNTED_FIELDS if kwargs.get(f) is not None]
+            before = None
+            if counted:
+                cursor.execute(
+                    convert_query(
+                        f"SELECT {', '.join(counted)} FROM sessions"
+                        " WHERE id = ? AND user_id = ?"
+                    ),
+                    (session_id, user_id),
+                )
+                before = cursor.fetchone()
+
+            # Drop report snapshots covering the date the session is leaving
+            ReportSnapshotRepository.invalidate_session(cursor, user_id, session_id)
+
+            # Calendar days to re-aggregate once the row is written
+            calendar_days = []
+            if any(kwargs.get(f) is not None for f in _CALENDAR_FIELDS):
+                cursor.execute(
+                    convert_query(
+                        "SELECT session_date FROM sessions WHERE id = ? AND user_id = ?"
+                    ),
+                    (session_id, user_id),
+                )
+                current = cursor.fetchone()
+                if current:
+                    calendar_days.append(current["session_date"])
+                if kwargs.get("session_date"):
+                    calendar_days.append(kwargs["session_date"])
+
             # Always update timestamp
             updates.append("updated_at = CURRENT_TIMESTAMP")
 
@@ -393,6 +518,19 @@ class SessionRepository(BaseRepository):
             if cursor.rowcount == 0:
                 return None
 
+            if before:
+                delta = {
+                    _COUNTED_FIELDS[f]: (kwargs[f] or 0) - (before[f] or 0)
+                    for f in counted
+                }
+                TrainingCounterRepository.apply_delta(cursor, user_id, **delta)
+            if "session_date" in kwargs:
+                ReportSnapshotRepository.invalidate_session(cursor, user_id, session_id)
+            PhysiologySnapshotRepository.bump_version(cursor, user_id)
+            GrappleContextRepository.bump(cursor, user_id, SESSIONS)
+            for day in calendar_days:
+                TrainingCalendarRepository.refresh_day(cursor, user_id, day)
+
             # Return updated session
             return SessionRepository.get_by_id(user_id, session_id)
 
@@ -557,11 +695,18 @@ class SessionRepository(BaseRepository):
 
             # Verify ownership first
             cursor.execute(
-                convert_query("SELECT id FROM sessions WHERE id = ? AND user_id = ?"),
+                convert_query(
+                    "SELECT session_date, duration_mins, rolls, submissions_for"
+                    " FROM sessions WHERE id = ? AND user_id = ?"
+                ),
                 (session_id, user_id),
             )
-            if not cursor.fetchone():
+            owned = cursor.fetchone()
+            if not owned:
                 return False
+            ReportSnapshotRepository.invalidate_session(cursor, user_id, session_id)
+            PhysiologySnapshotRepository.bump_version(cursor, user_id)
+            GrappleContextRepository.bump(cursor, user_id, SESSIONS)
 
             # Now safe to delete child records
             cursor.execute(
@@ -578,7 +723,20 @@ class SessionRepository(BaseRepository):
                 convert_query("DELETE FROM sessions WHERE id = ? AND user_id = ?"),
                 (session_id, user_id),
             )
-            return bool(cursor.rowcount > 0)
+            if cursor.rowcount == 0:
+                return False
+            TrainingCounterRepository.apply_delta(
+                cursor,
+                user_id,
+                sessions=-1,
+                minutes=-(owned["duration_mins"] or 0),
+                rolls=-(owned["rolls"] or 0),
+                submissions=-(owned["submissions_for"] or 0),
+            )
+            TrainingCalendarRepository.refresh_day(
+                cursor, user_id, owned["session_date"]
+            )
+            return True
 
     @staticmethod
     def get_active_user_count(since_date: str) -> int:
@@ -1145,72 +1303,8 @@ class SessionRepository(BaseRepository):
                 """),
                 (user_id,),
             )
-
-    @staticmethod
-    def get_milestone_totals(user_id: int) -> dict:
-        """Get hours, sessions, rolls, partners, techniques totals.
-
-        Single query with scalar subqueries for all five metrics.
-        """
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                convert_query("""
-                    SELECT
-                        COUNT(*) AS cnt,
-                        COALESCE(SUM(duration_mins), 0) AS total_mins,
-                        COALESCE(SUM(rolls), 0) AS total_rolls,
-                        (SELECT COUNT(DISTINCT sr.partner_id)
-                         FROM session_rolls sr
-                         JOIN sessions s2 ON sr.session_id = s2.id
-                         WHERE sr.partner_id IS NOT NULL AND s2.user_id = ?
-                        ) AS partners,
-                        (SELECT COUNT(DISTINCT st.movement_id)
-                         FROM session_techniques st
-                         JOIN sessions s3 ON st.session_id = s3.id
-                         WHERE s3.user_id = ?
-                        ) AS techniques
-                    FROM sessions
-                    WHERE user_id = ?
-                """),
-                (user_id, user_id, user_id),
-            )
-            row = cursor.fetchone()
-
-        return {
-            "hours": int((row["total_mins"] or 0) / 60),
-            "sessions": row["cnt"] or 0,
-            "rolls": row["total_rolls"] or 0,
-            "partners": row["partners"] or 0,
-            "techniques": row["techniques"] or 0,
-        }
-
-    @staticmethod
-    def get_total_count_for_user(user_id: int) -> int:
-        """Get total session count for a user."""
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                convert_query("SELECT COUNT(*) as cnt FROM sessions WHERE user_id = ?"),
-                (user_id,),
-            )
-            row = cursor.fetchone()
-            return row["cnt"] if row else 0
-
-    @staticmethod
-    def get_total_rolls_for_user(user_id: int) -> int:
-        """Get total rolls across all sessions for a user."""
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                convert_query(
-                    "SELECT COALESCE(SUM(rolls), 0) as total_rolls"
-                    " FROM sessions WHERE user_id = ?"
-                ),
-                (user_id,),
-            )
-            row = cursor.fetchone()
-            return row["total_rolls"] if row else 0
+            if cursor.rowcount:
+                ReportSnapshotRepository.invalidate_user(cursor, user_id)
 
     @staticmethod
     def _row_to_dict(row) -> dict:
@@ -1224,10 +1318,16 @@ class SessionRepository(BaseRepository):
             "intensity_tags",
             "class_tags",
             "techniques",
-            "garmin_hr_series",
         ):
             data[field] = json.loads(data[field]) if data.get(field) else []
 
+        # HR line: selected only by single-session reads, so list rows never decode it
+        if "garmin_hr_packed" in data:
+            series = hr_series.HRSeries(
+                data.pop("garmin_hr_packed") or data.get("garmin_hr_series")
+            )
+            data["garmin_hr_series"] = series.pairs
+
         # Parse date/datetime fields (handle both string and native types)
         for field, parser in (
             ("session_date", date.fromisoformat),
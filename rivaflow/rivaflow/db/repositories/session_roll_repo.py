@@ -1,6 +1,7 @@
 """Repository for session rolls (detailed roll tracking) data access."""
 
 import json
+from datetime import date
 
 from rivaflow.db.database import convert_query, execute_insert, get_connection
 from rivaflow.db.repositories.base_repository import BaseRepository
@@ -152,6 +153,34 @@ class SessionRollRepository(BaseRepository):
         """Alias for list_by_partner. Get all rolls with a specific partner."""
         return SessionRollRepository.list_by_partner(user_id, partner_id)
 
+    @staticmethod
+    def list_with_session_dates(user_id: int) -> list[dict]:
+        """Get every roll the user has logged with its session date, oldest first.
+
+        One JOIN instead of a session lookup per roll; each dict carries a
+        ``session_date`` key (date object) alongside the roll columns.
+        """
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                SELECT sr.*, s.session_date FROM session_rolls sr
+                JOIN sessions s ON sr.session_id = s.id
+                WHERE s.user_id = ?
+                ORDER BY s.session_date ASC, sr.session_id ASC, sr.roll_number ASC
+                """),
+                (user_id,),
+            )
+            rows = cursor.fetchall()
+
+        rolls = []
+        for row in rows:
+            roll = SessionRollRepository._row_to_dict(row)
+            if isinstance(roll["session_date"], str):
+                roll["session_date"] = date.fromisoformat(roll["session_date"][:10])
+            rolls.append(roll)
+        return rolls
+
     @staticmethod
     def list_by_partner_name(user_id: int, partner_name: str) -> list[dict]:
         """Get rolls where partner_id is NULL but partner_name matches.
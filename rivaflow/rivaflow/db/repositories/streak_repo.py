@@ -1,4 +1,11 @@
-"""Repository for streak tracking."""
+"""Repository for streak tracking.
+
+The ``streaks`` table is the single streak engine: one run-length state row per
+(user, streak_type) holding the current run start, last day, run length,
+longest run and grace days used. Writes advance it incrementally in O(1);
+back-dated writes and edits to past dates re-derive it from history with a
+gaps-and-islands query. Readers only ever touch the state row.
+"""
 
 from datetime import date
 
@@ -6,13 +13,96 @@ from rivaflow.core.constants import STREAK_GRACE_DAYS
 from rivaflow.db.database import convert_query, execute_insert, get_connection
 from rivaflow.db.repositories.base_repository import BaseRepository
 
+# Source-of-truth table and date column for each streak type (used by rebuilds).
+_STREAK_SOURCES = {
+    "training": ("sessions", "session_date"),
+    "checkin": ("daily_checkins", "check_date"),
+    "readiness": ("readiness", "check_date"),
+}
+
+
+def _live_current(streak: dict, today: date | None = None) -> int:
+    """Current run length as of *today* (0 once the run can no longer continue).
+
+    The stored ``current_streak`` is only advanced on check-ins, so a run that
+    lapsed days ago still holds its old length. A run is alive while the last
+    check-in was today/yesterday, or two days ago with a grace day remaining.
+    """
+    current = streak.get("current_streak") or 0
+    last_checkin = streak.get("last_checkin_date")
+    if not current or not last_checkin:
+        return current
+    today = today or date.today()
+    days_since_last = (today - date.fromisoformat(str(last_checkin)[:10])).days
+    if days_since_last <= 1:
+        return current
+    if days_since_last == 2 and streak.get("grace_days_used", 0) < STREAK_GRACE_DAYS:
+        return current
+    return 0
+
+
+def _fold_runs(runs: list[tuple[date, date, int]]) -> dict:
+    """Fold consecutive-day runs (islands) into the final streak state.
+
+    Applies the same rules as ``update_streak`` a run at a time: a one-day gap
+    is bridged while a grace day is available (the missed day is not counted),
+    and any consecutive check-in after the bridge resets the grace counter.
+
+    Args:
+        runs: ``(run_start, run_end, run_length)`` tuples in date order.
+
+    Returns:
+        Dict with current_streak, longest_streak, last_checkin_date,
+        streak_started_date and grace_days_used.
+    """
+    current = 0
+    longest = 0
+    grace_days_used = 0
+    started: date | None = None
+    last: date | None = None
+
+    for run_start, run_end, run_length in runs:
+        if (
+            last is not None
+            and (run_start - last).days == 2
+            and grace_days_used < STREAK_GRACE_DAYS
+        ):
+            current += run_length
+            grace_days_used = grace_days_used + 1 if run_length == 1 else 0
+        else:
+            current = run_length
+            grace_days_used = 0
+            started = run_start
+        last = run_end
+        longest = max(longest, current)
+
+    return {
+        "current_streak": current,
+        "longest_streak": longest,
+        "last_checkin_date": last.isoformat() if last else None,
+        "streak_started_date": started.isoformat() if started else None,
+        "grace_days_used": grace_days_used,
+    }
+
 
 class StreakRepository(BaseRepository):
     """Data access layer for streak tracking."""
 
     @staticmethod
     def get_streak(user_id: int, streak_type: str) -> dict:
-        """Get current streak info for type."""
+        """Get current streak info for type.
+
+        ``current_streak`` is the live run length: 0 if the run has lapsed
+        since the last check-in, even before the next write resets it.
+        """
+        streak = StreakRepository._get_stored_streak(user_id, streak_type)
+        streak["current_streak"] = _live_current(streak)
+        return streak
+
+    @staticmethod
+    def _get_stored_streak(user_id: int, streak_type: str) -> dict:
+        """The streak state row as stored, ``current_streak`` as of the last
+        check-in (not lapse-adjusted). Creates the row on first use."""
         with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -27,7 +117,7 @@ class StreakRepository(BaseRepository):
             row = cursor.fetchone()
             if row is None:
                 # Initialize if not exists
-                streak_id = execute_insert(
+                execute_insert(
                     cursor,
                     """
                     INSERT INTO streaks (user_id, streak_type, current_streak, longest_streak)
@@ -35,29 +125,24 @@ class StreakRepository(BaseRepository):
                     """,
                     (user_id, streak_type),
                 )
-                return {
-                    "id": streak_id,
-                    "streak_type": streak_type,
-                    "current_streak": 0,
-                    "longest_streak": 0,
-                    "last_checkin_date": None,
-                    "streak_started_date": None,
-                    "grace_days_used": 0,
-                    "updated_at": None,
-                }
-
-            # Convert row to dict (works for both SQLite Row and PostgreSQL RealDictRow)
-            row_dict = dict(row)
-            return {
-                "id": row_dict["id"],
-                "streak_type": row_dict["streak_type"],
-                "current_streak": row_dict["current_streak"],
-                "longest_streak": row_dict["longest_streak"],
-                "last_checkin_date": row_dict.get("last_checkin_date"),
-                "streak_started_date": row_dict.get("streak_started_date"),
-                "grace_days_used": row_dict["grace_days_used"],
-                "updated_at": row_dict.get("updated_at"),
-            }
+
+        if row is None:
+            # Seed the new state row from any history that predates it
+            StreakRepository.rebuild_streak(user_id, streak_type)
+            return StreakRepository._get_stored_streak(user_id, streak_type)
+
+        # Convert row to dict (works for both SQLite Row and PostgreSQL RealDictRow)
+        row_dict = dict(row)
+        return {
+            "id": row_dict["id"],
+            "streak_type": row_dict["streak_type"],
+            "current_streak": row_dict["current_streak"],
+            "longest_streak": row_dict["longest_streak"],
+            "last_checkin_date": row_dict.get("last_checkin_date"),
+            "streak_started_date": row_dict.get("streak_started_date"),
+            "grace_days_used": row_dict["grace_days_used"],
+            "updated_at": row_dict.get("updated_at"),
+        }
 
     @staticmethod
     def update_streak(user_id: int, streak_type: str, checkin_date: date) -> dict:
@@ -68,9 +153,13 @@ class StreakRepository(BaseRepository):
         - If checkin_date == last_checkin_date: no change (duplicate)
         - If checkin_date == last_checkin_date + 1 day: increment streak
         - If checkin_date == last_checkin_date + 2 days AND grace_days_used < GRACE_DAYS: use grace day
+        - If checkin_date < last_checkin_date: back-dated, rebuild from history
         - Otherwise: reset streak to 1
+
+        The run is extended from the stored length: a past day logged after
+        its predecessor still continues the run even if it lapsed long ago.
         """
-        streak = StreakRepository.get_streak(user_id, streak_type)
+        streak = StreakRepository._get_stored_streak(user_id, streak_type)
 
         last_checkin = streak["last_checkin_date"]
 
@@ -84,9 +173,14 @@ class StreakRepository(BaseRepository):
             last_date = date.fromisoformat(last_checkin)
             days_since_last = (checkin_date - last_date).days
 
+            # Back-dated check-in - the run state only moves forward, so
+            # re-derive it from history
+            if days_since_last < 0:
+                return StreakRepository.rebuild_streak(user_id, streak_type)
+
             # Same day - no change
             if days_since_last == 0:
-                return streak
+                return StreakRepository.get_streak(user_id, streak_type)
 
             # Consecutive day - extend streak
             elif days_since_last == 1:
@@ -160,83 +254,57 @@ class StreakRepository(BaseRepository):
             )
             rows = cursor.fetchall()
 
-            return [dict(row) for row in rows]
+        streaks = [dict(row) for row in rows]
+        for streak in streaks:
+            streak["current_streak"] = _live_current(streak)
+        return streaks
 
     @staticmethod
-    def recalculate_checkin_streak(user_id: int) -> dict:
-        """Recalculate the 'checkin' streak from daily_checkins history.
-
-        Scans distinct check-in dates backwards from today, counting
-        consecutive days (with grace-day tolerance). Updates the streaks
-        table with the correct values and returns the updated streak.
+    def rebuild_streak(user_id: int, streak_type: str) -> dict:
+        """Re-derive a streak from its source table after edits to past dates.
 
-        Only queries the last 60 days of check-ins for performance —
-        a current streak cannot span more than 60 days without a gap,
-        and longest_streak is preserved from the existing record.
+        A gaps-and-islands query collapses the user's distinct activity dates
+        into consecutive-day runs (``date - ROW_NUMBER()`` is constant within a
+        run), so only one row per run leaves the database. The runs are then
+        folded with the grace-day rules and the state row is overwritten.
         """
-        from datetime import timedelta
+        table, column = _STREAK_SOURCES[streak_type]
+        # Ensure the state row exists before overwriting it
+        StreakRepository.get_streak(user_id, streak_type)
 
-        cutoff = (date.today() - timedelta(days=60)).isoformat()
         with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                convert_query("""
-                    SELECT DISTINCT check_date
-                    FROM daily_checkins
-                    WHERE user_id = ?
-                      AND check_date >= ?
-                    ORDER BY check_date DESC
+                convert_query(f"""
+                    WITH days AS (
+                        SELECT DISTINCT {column}::date AS d
+                        FROM {table}
+                        WHERE user_id = ?
+                    ),
+                    islands AS (
+                        SELECT d, d - (ROW_NUMBER() OVER (ORDER BY d))::int AS grp
+                        FROM days
+                    )
+                    SELECT MIN(d) AS run_start, MAX(d) AS run_end,
+                           COUNT(*) AS run_length
+                    FROM islands
+                    GROUP BY grp
+                    ORDER BY run_start
                     """),
-                (user_id, cutoff),
+                (user_id,),
             )
             rows = cursor.fetchall()
 
-        if not rows:
-            return StreakRepository.get_streak(user_id, "checkin")
-
-        dates = sorted(
-            [date.fromisoformat(str(dict(r)["check_date"])[:10]) for r in rows],
-            reverse=True,
-        )
-
-        today = date.today()
-        # If most recent check-in isn't today or yesterday, streak is 0
-        gap_to_today = (today - dates[0]).days
-        if gap_to_today > 1:
-            current_streak = 0
-            streak_started = None
-            last_checkin = dates[0]
-        else:
-            current_streak = 1
-            last_checkin = dates[0]
-            streak_started = dates[0]
-            for i in range(1, len(dates)):
-                gap = (dates[i - 1] - dates[i]).days
-                if gap <= 2:  # consecutive or 1-day grace
-                    current_streak += 1
-                    streak_started = dates[i]
-                else:
-                    break
-
-        # Also compute longest streak across all history
-        longest_streak = current_streak
-        if len(dates) > 1:
-            run = 1
-            for i in range(1, len(dates)):
-                gap = (dates[i - 1] - dates[i]).days
-                if gap <= 2:
-                    run += 1
-                else:
-                    longest_streak = max(longest_streak, run)
-                    run = 1
-            longest_streak = max(longest_streak, run)
-
-        # Persist
-        existing = StreakRepository.get_streak(user_id, "checkin")
-        longest_streak = max(longest_streak, existing["longest_streak"])
+            runs = [
+                (
+                    date.fromisoformat(str(dict(r)["run_start"])[:10]),
+                    date.fromisoformat(str(dict(r)["run_end"])[:10]),
+                    dict(r)["run_length"],
+                )
+                for r in rows
+            ]
+            state = _fold_runs(runs)
 
-        with get_connection() as conn:
-            cursor = conn.cursor()
             cursor.execute(
                 convert_query("""
                     UPDATE streaks
@@ -244,19 +312,22 @@ class StreakRepository(BaseRepository):
                         longest_streak = ?,
                         last_checkin_date = ?,
                         streak_started_date = ?,
+                        grace_days_used = ?,
                         updated_at = CURRENT_TIMESTAMP
-                    WHERE user_id = ? AND streak_type = 'checkin'
+                    WHERE user_id = ? AND streak_type = ?
                     """),
                 (
-                    current_streak,
-                    longest_streak,
-                    last_checkin.isoformat(),
-                    streak_started.isoformat() if streak_started else None,
+                    state["current_streak"],
+                    state["longest_streak"],
+                    state["last_checkin_date"],
+                    state["streak_started_date"],
+                    state["grace_days_used"],
                     user_id,
+                    streak_type,
                 ),
             )
 
-        return StreakRepository.get_streak(user_id, "checkin")
+        return StreakRepository.get_streak(user_id, streak_type)
 
     @staticmethod
     def is_streak_at_risk(user_id: int, streak_type: str) -> bool:
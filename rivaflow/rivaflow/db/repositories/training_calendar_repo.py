@@ -0,0 +1,276 @@
+"""Repository for the compact per-user training calendar.
+
+One ``training_calendar`` row per (user, year, class type) holds a bitset of
+trained days plus per-day session count, summed intensity and minutes. The
+``'*'`` class type is the all-types union and marks the year as built. Session
+writes call ``refresh_day`` with their own cursor so the touched day is
+re-aggregated in the same transaction; years nobody has read yet are built
+lazily by ``get_years``.
+"""
+
+import sys
+from array import array
+from datetime import date
+
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.base_repository import BaseRepository
+
+DAYS_PER_YEAR = 366
+ALL_TYPES = "*"
+_BITSET_BYTES = (DAYS_PER_YEAR + 7) // 8
+_UINT16_MAX = 0xFFFF
+
+
+def day_index(day: date) -> int:
+    """0-based day-of-year slot for *day*."""
+    return day.timetuple().tm_yday - 1
+
+
+def _zeros() -> array:
+    return array("H", bytes(2 * DAYS_PER_YEAR))
+
+
+def _pack(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array("H", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unpack(raw) -> array:
+    values = array("H")
+    values.frombytes(bytes(raw))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class CalendarYear:
+    """One calendar year of trained-day bits and per-day totals."""
+
+    __slots__ = ("year", "trained", "counts", "intensity", "minutes")
+
+    def __init__(
+        self,
+        year: int,
+        trained: int = 0,
+        counts: array | None = None,
+        intensity: array | None = None,
+        minutes: array | None = None,
+    ):
+        self.year = year
+        self.trained = trained
+        self.counts = counts if counts is not None else _zeros()
+        self.intensity = intensity if intensity is not None else _zeros()
+        self.minutes = minutes if minutes is not None else _zeros()
+
+    @classmethod
+    def from_row(cls, row) -> "CalendarYear":
+        return cls(
+            row["year"],
+            int.from_bytes(bytes(row["trained_days"]), "little"),
+            _unpack(row["counts"]),
+            _unpack(row["intensity"]),
+            _unpack(row["minutes"]),
+        )
+
+    def set_day(self, index: int, count: int, intensity: int, minutes: int) -> None:
+        """Overwrite one day's totals and its trained bit."""
+        self.counts[index] = min(count, _UINT16_MAX)
+        self.intensity[index] = min(intensity, _UINT16_MAX)
+        self.minutes[index] = min(minutes, _UINT16_MAX)
+        if count:
+            self.trained |= 1 << index
+        else:
+            self.trained &= ~(1 << index)
+
+    def merge(self, other: "CalendarYear") -> None:
+        """Fold another class type's year into this one."""
+        self.trained |= other.trained
+        for index in _set_bits(other.trained):
+            self.counts[index] = min(
+                self.counts[index] + other.counts[index], _UINT16_MAX
+            )
+            self.intensity[index] = min(
+                self.intensity[index] + other.intensity[index], _UINT16_MAX
+            )
+            self.minutes[index] = min(
+                self.minutes[index] + other.minutes[index], _UINT16_MAX
+            )
+
+    def params(self) -> tuple[bytes, bytes, bytes, bytes]:
+        return (
+            self.trained.to_bytes(_BITSET_BYTES, "little"),
+            _pack(self.counts),
+            _pack(self.intensity),
+            _pack(self.minutes),
+        )
+
+
+def _set_bits(bits: int):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+_UPSERT_SQL = """
+    INSERT INTO training_calendar (
+        user_id, year, class_type, trained_days, counts, intensity, minutes
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (user_id, year, class_type) DO UPDATE SET
+        trained_days = EXCLUDED.trained_days,
+        counts = EXCLUDED.counts,
+        intensity = EXCLUDED.intensity,
+        minutes = EXCLUDED.minutes,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+class TrainingCalendarRepository(BaseRepository):
+    """Data access layer for the per-year training calendar rows."""
+
+    @staticmethod
+    def get_years(
+        user_id: int, years: list[int], types: list[str] | None = None
+    ) -> dict[int, CalendarYear]:
+        """Calendars for the given years, merged across *types* (all when None).
+
+        Years not built yet are built from sessions first. Every requested
+        year is present in the result, empty if the user never trained then.
+        """
+        if not years:
+            return {}
+        class_types = list(types) if types else [ALL_TYPES]
+        year_marks = ", ".join("?" for _ in years)
+        type_marks = ", ".join("?" for _ in class_types)
+        query = convert_query(f"""
+            SELECT year, class_type, trained_days, counts, intensity, minutes
+            FROM training_calendar
+            WHERE user_id = ? AND year IN ({year_marks})
+              AND class_type IN (?, {type_marks})
+            """)
+        params = (user_id, *years, ALL_TYPES, *class_types)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+        built = {row["year"] for row in rows if row["class_type"] == ALL_TYPES}
+        missing = [y for y in years if y not in built]
+        if missing:
+            for year in missing:
+                TrainingCalendarRepository.rebuild_year(user_id, year)
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+
+        calendars = {year: CalendarYear(year) for year in years}
+        for row in rows:
+            if row["class_type"] in class_types:
+                calendars[row["year"]].merge(CalendarYear.from_row(row))
+        return calendars
+
+    @staticmethod
+    def rebuild_year(user_id: int, year: int) -> None:
+        """Rebuild one year's rows (every class type plus the union) from sessions."""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                    SELECT session_date, class_type, COUNT(*) AS sessions,
+                           COALESCE(SUM(intensity), 0) AS intensity,
+                           COALESCE(SUM(duration_mins), 0) AS minutes
+                    FROM sessions
+                    WHERE user_id = ? AND session_date BETWEEN ? AND ?
+                    GROUP BY session_date, class_type
+                    """),
+                (user_id, date(year, 1, 1).isoformat(), date(year, 12, 31).isoformat()),
+            )
+            by_type: dict[str, CalendarYear] = {ALL_TYPES: CalendarYear(year)}
+            union = by_type[ALL_TYPES]
+            for row in cursor.fetchall():
+                day = row["session_date"]
+                if isinstance(day, str):
+                    day = date.fromisoformat(day[:10])
+                index = day_index(day)
+                totals = (row["sessions"], row["intensity"], row["minutes"])
+                calendar = by_type.setdefault(row["class_type"], CalendarYear(year))
+                calendar.set_day(index, *totals)
+                union.set_day(
+                    index,
+                    union.counts[index] + totals[0],
+                    union.intensity[index] + totals[1],
+                    union.minutes[index] + totals[2],
+                )
+
+            cursor.execute(
+                convert_query(
+                    "DELETE FROM training_calendar WHERE user_id = ? AND year = ?"
+                ),
+                (user_id, year),
+            )
+            for class_type, calendar in by_type.items():
+                cursor.execute(
+                    convert_query(_UPSERT_SQL),
+                    (user_id, year, class_type, *calendar.params()),
+                )
+
+    @staticmethod
+    def refresh_day(cursor, user_id: int, day: date | str | None) -> None:
+        """Re-aggregate one day from sessions, using the caller's cursor.
+
+        Runs inside the session write's transaction. Years that were never
+        built are left alone: their first read builds them from sessions.
+        """
+        if day is None:
+            return
+        if isinstance(day, str):
+            day = date.fromisoformat(day[:10])
+        cursor.execute(
+            convert_query("""
+                SELECT year, class_type, trained_days, counts, intensity, minutes
+                FROM training_calendar
+                WHERE user_id = ? AND year = ?
+                FOR UPDATE
+                """),
+            (user_id, day.year),
+        )
+        stored = {
+            row["class_type"]: CalendarYear.from_row(row) for row in cursor.fetchall()
+        }
+        if ALL_TYPES not in stored:
+            return
+
+        cursor.execute(
+            convert_query("""
+                SELECT class_type, COUNT(*) AS sessions,
+                       COALESCE(SUM(intensity), 0) AS intensity,
+                       COALESCE(SUM(duration_mins), 0) AS minutes
+                FROM sessions
+                WHERE user_id = ? AND session_date = ?
+                GROUP BY class_type
+                """),
+            (user_id, day.isoformat()),
+        )
+        totals = {
+            row["class_type"]: (row["sessions"], row["intensity"], row["minutes"])
+            for row in cursor.fetchall()
+        }
+        totals[ALL_TYPES] = (
+            sum(t[0] for t in totals.values()),
+            sum(t[1] for t in totals.values()),
+            sum(t[2] for t in totals.values()),
+        )
+
+        index = day_index(day)
+        for class_type in stored.keys() | totals.keys():
+            calendar = stored.get(class_type) or CalendarYear(day.year)
+            if class_type not in totals and not calendar.counts[index]:
+                continue
+            calendar.set_day(index, *totals.get(class_type, (0, 0, 0)))
+            cursor.execute(
+                convert_query(_UPSERT_SQL),
+                (user_id, day.year, class_type, *calendar.params()),
+            )
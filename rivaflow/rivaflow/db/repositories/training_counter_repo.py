@@ -0,0 +1,185 @@
+"""Repository for per-user lifetime training counters.
+
+One ``user_training_counters`` row per user holds the totals milestones are
+evaluated against. Session writes apply their deltas inside the same
+transaction (see ``SessionRepository``); distinct partner/technique counts are
+refreshed when a session's rolls or techniques change. ``rebuild`` and
+``rebuild_all`` repair the rows from the source tables.
+"""
+
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.base_repository import BaseRepository
+
+# Aggregate used by both rebuild paths; {user_filter} narrows it to one user.
+_REBUILD_SQL = """
+    INSERT INTO user_training_counters (
+        user_id, sessions, total_mins, rolls, submissions, partners, techniques
+    )
+    SELECT
+        s.user_id,
+        COUNT(*),
+        COALESCE(SUM(s.duration_mins), 0),
+        COALESCE(SUM(s.rolls), 0),
+        COALESCE(SUM(s.submissions_for), 0),
+        (SELECT COUNT(DISTINCT sr.partner_id)
+         FROM session_rolls sr
+         JOIN sessions s2 ON sr.session_id = s2.id
+         WHERE sr.partner_id IS NOT NULL AND s2.user_id = s.user_id),
+        (SELECT COUNT(DISTINCT st.movement_id)
+         FROM session_techniques st
+         JOIN sessions s3 ON st.session_id = s3.id
+         WHERE s3.user_id = s.user_id)
+    FROM sessions s
+    {user_filter}
+    GROUP BY s.user_id
+    ON CONFLICT (user_id) DO UPDATE SET
+        sessions = EXCLUDED.sessions,
+        total_mins = EXCLUDED.total_mins,
+        rolls = EXCLUDED.rolls,
+        submissions = EXCLUDED.submissions,
+        partners = EXCLUDED.partners,
+        techniques = EXCLUDED.techniques,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+class TrainingCounterRepository(BaseRepository):
+    """Data access layer for the per-user training counters row."""
+
+    @staticmethod
+    def apply_delta(
+        cursor,
+        user_id: int,
+        sessions: int = 0,
+        minutes: int = 0,
+        rolls: int = 0,
+        submissions: int = 0,
+    ) -> None:
+        """Apply a session write's deltas using the caller's cursor.
+
+        Runs inside the caller's transaction so the counters commit (or roll
+        back) with the session row. Users without a counters row yet are left
+        alone: their first ``get`` rebuilds the row from full history.
+        """
+        cursor.execute(
+            convert_query("""
+                UPDATE user_training_counters
+                SET sessions = sessions + ?,
+                    total_mins = total_mins + ?,
+                    rolls = rolls + ?,
+                    submissions = submissions + ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = ?
+                """),
+            (sessions, minutes or 0, rolls or 0, submissions or 0, user_id),
+        )
+
+    @staticmethod
+    def refresh_distinct(user_id: int) -> None:
+        """Recount distinct partners and techniques after rolls/techniques change.
+
+        Distinct counts cannot be maintained from a delta (removing one roll
+        with a partner says nothing about the partner's other rolls), so these
+        two are recounted from the indexed child tables for this user only.
+        """
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                    UPDATE user_training_counters
+                    SET partners = (
+                            SELECT COUNT(DISTINCT sr.partner_id)
+                            FROM session_rolls sr
+                            JOIN sessions s ON sr.session_id = s.id
+                            WHERE sr.partner_id IS NOT NULL AND s.user_id = ?
+                        ),
+                        techniques = (
+                            SELECT COUNT(DISTINCT st.movement_id)
+                            FROM session_techniques st
+                            JOIN sessions s ON st.session_id = s.id
+                            WHERE s.user_id = ?
+                        ),
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE user_id = ?
+                    """),
+                (user_id, user_id, user_id),
+            )
+
+    @staticmethod
+    def _fetch(user_id: int) -> dict | None:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                    SELECT sessions, total_mins, rolls, submissions,
+                           partners, techniques
+                    FROM user_training_counters
+                    WHERE user_id = ?
+                    """),
+                (user_id,),
+            )
+            return TrainingCounterRepository._row_to_dict(cursor.fetchone())
+
+    @staticmethod
+    def get(user_id: int) -> dict:
+        """Get milestone totals (hours, sessions, rolls, submissions, partners, techniques).
+
+        Builds the counters row from history the first time a user is read.
+        """
+        row = TrainingCounterRepository._fetch(user_id)
+        if row is None:
+            TrainingCounterRepository.rebuild(user_id)
+            row = TrainingCounterRepository._fetch(user_id)
+
+        return {
+            "hours": int((row["total_mins"] or 0) / 60),
+            "sessions": row["sessions"],
+            "rolls": row["rolls"],
+            "submissions": row["submissions"],
+            "partners": row["partners"],
+            "techniques": row["techniques"],
+        }
+
+    @staticmethod
+    def rebuild(user_id: int) -> None:
+        """Recompute one user's counters from the source tables."""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query(_REBUILD_SQL.format(user_filter="WHERE s.user_id = ?")),
+                (user_id,),
+            )
+            if cursor.rowcount == 0:
+                # No sessions: store a zero row so reads stop rebuilding
+                cursor.execute(
+                    convert_query("""
+                        INSERT INTO user_training_counters (user_id) VALUES (?)
+                        ON CONFLICT (user_id) DO UPDATE SET
+                            sessions = 0, total_mins = 0, rolls = 0,
+                            submissions = 0, partners = 0, techniques = 0,
+                            updated_at = CURRENT_TIMESTAMP
+                        """),
+                    (user_id,),
+                )
+
+    @staticmethod
+    def rebuild_all() -> int:
+        """Recompute every user's counters in one grouped statement.
+
+        Returns the number of counter rows written. Users whose sessions were
+        all deleted keep their row, zeroed.
+        """
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_REBUILD_SQL.format(user_filter=""))
+            written = cursor.rowcount
+            cursor.execute("""
+                UPDATE user_training_counters
+                SET sessions = 0, total_mins = 0, rolls = 0, submissions = 0,
+                    partners = 0, techniques = 0, updated_at = CURRENT_TIMESTAMP
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM sessions s
+                    WHERE s.user_id = user_training_counters.user_id
+                )
+                """)
+            return written
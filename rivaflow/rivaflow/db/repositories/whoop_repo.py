@@ -4,29 +4,53 @@ Populated by the Goose iOS app's WhoopVpsUploader. Raw-first + idempotent:
 whoop_raw_frames is the immutable source of truth; decoded streams are rebuildable
 from it. Every write is user-scoped and dedup-safe (ON CONFLICT DO NOTHING), so the
 app can retry a batch after a flaky connection without creating duplicates.
+
+The decoded HR and RR streams live in hourly compressed chunks
+(whoop_stream_repo.WhoopStreamRepository), not in the legacy per-sample whoop_hr /
+whoop_rr tables. The range reads below keep their row-dict shape, and the
+``*_series`` variants return the array views directly.
 """
 
 from __future__ import annotations
 
-import hashlib
+import io
 import logging
+import re
 from datetime import UTC, datetime, timedelta
 
+from psycopg2.extras import execute_values
+
 from rivaflow.db.database import convert_query, execute_insert, get_connection
 from rivaflow.db.repositories.base_repository import BaseRepository
+from rivaflow.db.repositories.whoop_stream_repo import (
+    HR,
+    RR,
+    StreamSeries,
+    WhoopStreamRepository,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def _is_hex(s: str) -> bool:
-    """True only for a valid, even-length hex string (guards the raw-frame ingest)."""
-    if not s or len(s) % 2 != 0:
-        return False
-    try:
-        bytes.fromhex(s)
-        return True
-    except ValueError:
-        return False
+# Even-length lowercase hex (the raw-frame ingest guard), checked with one regex instead of a trial decode
+_HEX_FRAME = re.compile(r"(?:[0-9a-f]{2})+")
+
+# The single ``VALUES (?, ...)`` row of an _insert_ignore query, replaced by execute_values' ``%s``
+_VALUES_ROW = re.compile(r"VALUES \((?:\?, )*\?\)")
+_PAGE_ROWS = 1000
+
+
+def _copy_field(value) -> str:
+    """One field of a text-format COPY row: ``\\N`` for NULL, backslash/tab/newline escaped."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
 
 
 # Suggested first-class tags surfaced in the tag-vocabulary endpoint — mirrors the
@@ -47,68 +71,96 @@ class WhoopRepository:
 
     @staticmethod
     def _insert_ignore(query: str, rows: list[tuple]) -> int:
-        """executemany an INSERT ... ON CONFLICT DO NOTHING; returns rows *received*.
-        (Exact dedup counts are driver-dependent under executemany; ON CONFLICT
-        guarantees idempotency regardless.)"""
+        """Run an ``INSERT ... VALUES (?, ...) ON CONFLICT DO NOTHING`` for every row. The rows go through
+        execute_values (one statement per ``_PAGE_ROWS`` rows), and each statement gets ``RETURNING 1``, so
+        the result is the exact number of rows inserted."""
         if not rows:
             return 0
+        query = convert_query(_VALUES_ROW.sub("VALUES %s", query))
         with get_connection() as conn:
-            conn.cursor().executemany(convert_query(query), rows)
-        return len(rows)
+            inserted = execute_values(
+                conn.cursor(),
+                f"{query} RETURNING 1",
+                rows,
+                page_size=_PAGE_ROWS,
+                fetch=True,
+            )
+        return len(inserted)
 
     @staticmethod
     def ingest_raw_frames(user_id: int, frames: list[dict]) -> dict:
-        rows: list[tuple] = []
+        """Store raw strap frames. Returns ``{"received", "inserted", "deduped", "rejected"}``.
+
+        The valid frames are COPYed into a session temp table. One ``INSERT ... SELECT ... ON CONFLICT DO
+        NOTHING`` then moves them across, hashing every frame's hex with the server's sha256() in the same
+        statement, so the statement's rowcount is the exact number inserted.
+        """
+        lines = []
         rejected = 0
         for f in frames:
             hex_ = (f.get("hex") or "").strip().lower()
-            if not _is_hex(hex_):
+            if not _HEX_FRAME.fullmatch(hex_):
                 rejected += 1
                 continue
-            sha = hashlib.sha256(hex_.encode("ascii")).hexdigest()
-            rows.append(
-                (
-                    user_id,
-                    f["ts"],
-                    sha,
-                    f.get("session_id"),
-                    f["char_uuid"],
-                    f.get("packet_type"),
-                    f.get("seq"),
-                    hex_,
-                )
+            fields = (
+                f["ts"],
+                f.get("session_id"),
+                f["char_uuid"],
+                f.get("packet_type"),
+                f.get("seq"),
+                hex_,
             )
-        received = WhoopRepository._insert_ignore(
-            "INSERT INTO whoop_raw_frames "
-            "(user_id, ts, frame_sha256, session_id, char_uuid, packet_type, seq, frame_hex) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
-            "ON CONFLICT (user_id, ts, frame_sha256) DO NOTHING",
-            rows,
-        )
+            lines.append("\t".join(map(_copy_field, fields)) + "\n")
+        inserted = 0
+        if lines:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS whoop_raw_frames_stage ON COMMIT DELETE ROWS AS
+                    SELECT ts, session_id, char_uuid, packet_type, seq, frame_hex
+                    FROM whoop_raw_frames WITH NO DATA
+                    """)
+                cursor.copy_expert(
+                    "COPY whoop_raw_frames_stage FROM STDIN",
+                    io.StringIO("".join(lines)),
+                )
+                cursor.execute(
+                    convert_query("""
+                        INSERT INTO whoop_raw_frames
+                            (user_id, ts, frame_sha256, session_id, char_uuid, packet_type, seq, frame_hex)
+                        SELECT ?, ts, encode(sha256(convert_to(frame_hex, 'UTF8')), 'hex'),
+                               session_id, char_uuid, packet_type, seq, frame_hex
+                        FROM whoop_raw_frames_stage
+                        ON CONFLICT (user_id, ts, frame_sha256) DO NOTHING
+                        """),
+                    (user_id,),
+                )
+                inserted = cursor.rowcount
         if rejected:
             logger.warning(
                 "whoop raw ingest — user_id=%s rejected=%s non-hex frames",
                 user_id,
                 rejected,
             )
-        return {"received": received, "rejected": rejected}
+        return {
+            "received": len(lines),
+            "inserted": inserted,
+            "deduped": len(lines) - inserted,
+            "rejected": rejected,
+        }
 
     @staticmethod
     def ingest_hr(user_id: int, samples: list[dict]) -> int:
-        rows = [(user_id, s["ts"], s["bpm"], s.get("session_id")) for s in samples]
-        return WhoopRepository._insert_ignore(
-            "INSERT INTO whoop_hr (user_id, ts, bpm, session_id) VALUES (?, ?, ?, ?) "
-            "ON CONFLICT (user_id, ts) DO NOTHING",
-            rows,
+        """Merge HR samples into the chunk store (first bpm per timestamp wins)."""
+        return WhoopStreamRepository.ingest(
+            user_id, HR, [(s["ts"], s["bpm"]) for s in samples]
         )
 
     @staticmethod
     def ingest_rr(user_id: int, samples: list[dict]) -> int:
-        rows = [(user_id, s["ts"], s["rr_ms"], s.get("session_id")) for s in samples]
-        return WhoopRepository._insert_ignore(
-            "INSERT INTO whoop_rr (user_id, ts, rr_ms, session_id) VALUES (?, ?, ?, ?) "
-            "ON CONFLICT (user_id, ts, rr_ms) DO NOTHING",
-            rows,
+        """Merge RR samples into the chunk store (deduplicated on ts + rr_ms)."""
+        return WhoopStreamRepository.ingest(
+            user_id, RR, [(s["ts"], s["rr_ms"]) for s in samples]
         )
 
     @staticmethod
@@ -173,15 +225,20 @@ class WhoopRepository:
 
     # ── Read side (shared: RivaFlow UI, health dashboard, LLM/MCP all consume these) ──
 
+    @staticmethod
+    def hr_series(user_id: int, start_iso: str, end_iso: str) -> StreamSeries:
+        """HR within [start, end] as array views (epoch-ms ts, bpm) — no per-sample dicts."""
+        return WhoopStreamRepository.series(user_id, HR, start_iso, end_iso)
+
+    @staticmethod
+    def rr_series(user_id: int, start_iso: str, end_iso: str) -> StreamSeries:
+        """RR within [start, end] as array views (epoch-ms ts, rr_ms)."""
+        return WhoopStreamRepository.series(user_id, RR, start_iso, end_iso)
+
     @staticmethod
     def hr_range(user_id: int, start_iso: str, end_iso: str) -> list[dict]:
         """HR samples within [start, end], ascending — for session zones + charts."""
-        return BaseRepository._fetchall(
-            convert_query(
-                "SELECT ts, bpm FROM whoop_hr WHERE user_id = ? AND ts >= ? AND ts <= ? ORDER BY ts ASC"
-            ),
-            (user_id, start_iso, end_iso),
-        )
+        return WhoopRepository.hr_series(user_id, start_iso, end_iso).rows("bpm")
 
     @staticmethod
     def hrv_range(
@@ -204,24 +261,14 @@ class WhoopRepository:
     @staticmethod
     def recent_hr(user_id: int, hours: int = 6) -> list[dict]:
         """Recent HR series (last `hours`) — for the live/health dashboard."""
-        cutoff = (datetime.now(UTC) - timedelta(hours=hours)).isoformat()
-        return BaseRepository._fetchall(
-            convert_query(
-                "SELECT ts, bpm FROM whoop_hr WHERE user_id = ? AND ts >= ? ORDER BY ts ASC"
-            ),
-            (user_id, cutoff),
-        )
+        cutoff = datetime.now(UTC) - timedelta(hours=hours)
+        return WhoopStreamRepository.series(user_id, HR, cutoff).rows("bpm")
 
     @staticmethod
     def rr_range(user_id: int, days: int = 14) -> list[dict]:
         """RR intervals over the last `days`, time-ordered — the raw truth for deriving HRV (RMSSD)."""
-        cutoff = (datetime.now(UTC) - timedelta(days=days)).isoformat()
-        return BaseRepository._fetchall(
-            convert_query(
-                "SELECT ts, rr_ms FROM whoop_rr WHERE user_id = ? AND ts >= ? ORDER BY ts ASC"
-            ),
-            (user_id, cutoff),
-        )
+        cutoff = datetime.now(UTC) - timedelta(days=days)
+        return WhoopStreamRepository.series(user_id, RR, cutoff).rows("rr_ms")
 
     @staticmethod
     def rr_range_between(user_id: int, start_iso: str, end_iso: str) -> list[dict]:
@@ -229,37 +276,20 @@ class WhoopRepository:
         hr_range, for computing one specific historical day's rollup (whoop_daily_agg, Wave 3.4) where
         rr_range's 'last N days from now' doesn't line up with an arbitrary past local day.
         """
-        return BaseRepository._fetchall(
-            convert_query(
-                "SELECT ts, rr_ms FROM whoop_rr WHERE user_id = ? AND ts >= ? AND ts <= ? ORDER BY ts ASC"
-            ),
-            (user_id, start_iso, end_iso),
-        )
+        return WhoopRepository.rr_series(user_id, start_iso, end_iso).rows("rr_ms")
 
     @staticmethod
     def hr_count_range(user_id: int, start_iso: str, end_iso: str) -> int:
-        """COUNT(*) of whoop_hr rows in [start, end] — an index range-scan count, no row materialization.
+        """HR sample count in [start, end] — summed from chunk counts, decoding only the boundary hours.
         Half of the whoop_daily_agg staleness check (see rr_count_range): a stored rollup whose CURRENT raw
         count no longer matches the count it was computed from has had rows land late (the phone's offline
         spool / a historical drain) and must be recomputed."""
-        row = BaseRepository._fetchone(
-            convert_query(
-                "SELECT COUNT(*) AS n FROM whoop_hr WHERE user_id = ? AND ts >= ? AND ts <= ?"
-            ),
-            (user_id, start_iso, end_iso),
-        )
-        return int(row["n"]) if row else 0
+        return WhoopStreamRepository.count_range(user_id, HR, start_iso, end_iso)
 
     @staticmethod
     def rr_count_range(user_id: int, start_iso: str, end_iso: str) -> int:
-        """COUNT(*) of whoop_rr rows in [start, end] — see hr_count_range."""
-        row = BaseRepository._fetchone(
-            convert_query(
-                "SELECT COUNT(*) AS n FROM whoop_rr WHERE user_id = ? AND ts >= ? AND ts <= ?"
-            ),
-            (user_id, start_iso, end_iso),
-        )
-        return int(row["n"]) if row else 0
+        """RR sample count in [start, end] — see hr_count_range."""
+        return WhoopStreamRepository.count_range(user_id, RR, start_iso, end_iso)
 
     # ── Daily aggregate rollups (whoop_daily_agg — Wave 3.4, append-only per-day compute cache) ──
 
@@ -274,6 +304,17 @@ class WhoopRepository:
             (user_id, day),
         )
 
+    @staticmethod
+    def get_daily_agg_range(user_id: int, start_day: str, end_day: str) -> list[dict]:
+        """Every stored rollup for start_day <= day <= end_day in one query, ascending by day."""
+        return BaseRepository._fetchall(
+            convert_query(
+                "SELECT day, metrics_json, deriver_version, sample_count, complete, updated_at "
+                "FROM whoop_daily_agg WHERE user_id = ? AND day >= ? AND day <= ? ORDER BY day"
+            ),
+            (user_id, start_day, end_day),
+        )
+
     @staticmethod
     def upsert_daily_agg(
         user_id: int,
@@ -286,19 +327,151 @@ class WhoopRepository:
         """Insert or replace one day's rollup. A day is only ever REPLACED by a fresher computation of the
         SAME day (deriver-version bump, or late-arriving raw data changing its sample_count) — never
         deleted, so the table stays append-only in spirit."""
+        WhoopRepository.upsert_daily_aggs(
+            user_id, [(day, metrics_json, deriver_version, sample_count, complete)]
+        )
+
+    @staticmethod
+    def upsert_daily_aggs(user_id: int, rows: list[tuple]) -> None:
+        """Bulk upsert_daily_agg: (day, metrics_json, deriver_version, sample_count, complete) rows, one
+        executemany in one transaction."""
+        if not rows:
+            return
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                convert_query(
+                    "INSERT INTO whoop_daily_agg "
+                    "(user_id, day, metrics_json, deriver_version, sample_count, complete, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP) "
+                    "ON CONFLICT (user_id, day) DO UPDATE SET "
+                    "metrics_json = EXCLUDED.metrics_json, deriver_version = EXCLUDED.deriver_version, "
+                    "sample_count = EXCLUDED.sample_count, complete = EXCLUDED.complete, "
+                    "updated_at = CURRENT_TIMESTAMP"
+                ),
+                [(user_id, *row) for row in rows],
+            )
+
+    @staticmethod
+    def invalidate_daily_agg(
+        user_id: int | None, start_day: str | None, end_day: str | None, version: str
+    ) -> int:
+        """Stamp rollups with `version` so the deriver treats them as stale, optionally bounded to one user
+        and/or [start_day, end_day]. Rows are kept (and stay readable) until they are recomputed.
+        """
+        query = "UPDATE whoop_daily_agg SET deriver_version = ? WHERE 1 = 1"
+        params: list = [version]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        if start_day:
+            query += " AND day >= ?"
+            params.append(start_day)
+        if end_day:
+            query += " AND day <= ?"
+            params.append(end_day)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(convert_query(query), tuple(params))
+            return cursor.rowcount
+
+    # ── Learned sleep-window threshold (sleep_thresholds — shared across workers) ──
+
+    @staticmethod
+    def get_sleep_threshold(user_id: int, fresh_since: datetime) -> dict | None:
+        """The stored learned threshold if it was computed at or after `fresh_since`, else None."""
+        return BaseRepository._fetchone(
+            convert_query(
+                "SELECT offset_bpm, version, nights_used, computed_at FROM sleep_thresholds "
+                "WHERE user_id = ? AND computed_at >= ?"
+            ),
+            (user_id, fresh_since),
+        )
+
+    @staticmethod
+    def upsert_sleep_threshold(
+        user_id: int, offset_bpm: float, version: str, nights_used: int
+    ) -> None:
+        """Replace the user's learned threshold, stamping computed_at now."""
         BaseRepository._execute(
             convert_query(
-                "INSERT INTO whoop_daily_agg "
-                "(user_id, day, metrics_json, deriver_version, sample_count, complete, updated_at) "
-                "VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP) "
-                "ON CONFLICT (user_id, day) DO UPDATE SET "
-                "metrics_json = EXCLUDED.metrics_json, deriver_version = EXCLUDED.deriver_version, "
-                "sample_count = EXCLUDED.sample_count, complete = EXCLUDED.complete, "
-                "updated_at = CURRENT_TIMESTAMP"
+                "INSERT INTO sleep_thresholds (user_id, offset_bpm, version, nights_used, computed_at) "
+                "VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP) "
+                "ON CONFLICT (user_id) DO UPDATE SET "
+                "offset_bpm = EXCLUDED.offset_bpm, version = EXCLUDED.version, "
+                "nights_used = EXCLUDED.nights_used, computed_at = CURRENT_TIMESTAMP"
             ),
-            (user_id, day, metrics_json, deriver_version, sample_count, complete),
+            (user_id, offset_bpm, version, nights_used),
         )
 
+    @staticmethod
+    def get_strain_dose_stats(user_id: int) -> list[dict]:
+        """The user's per-state dose-response sums (strain_fit.DoseStats), one row per readiness state."""
+        return BaseRepository._fetchall(
+            convert_query(
+                "SELECT state, n, sx, sy, sxy, sxx, syy, samples, last_day, version "
+                "FROM strain_dose_stats WHERE user_id = ? ORDER BY state"
+            ),
+            (user_id,),
+        )
+
+    @staticmethod
+    def upsert_strain_dose_stats(user_id: int, rows: list[tuple]) -> None:
+        """Replace per-state sums: rows of (state, n, sx, sy, sxy, sxx, syy, samples, last_day, version)."""
+        if not rows:
+            return
+        with get_connection() as conn:
+            conn.cursor().executemany(
+                convert_query(
+                    "INSERT INTO strain_dose_stats "
+                    "(user_id, state, n, sx, sy, sxy, sxx, syy, samples, last_day, version, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP) "
+                    "ON CONFLICT (user_id, state) DO UPDATE SET "
+                    "n = EXCLUDED.n, sx = EXCLUDED.sx, sy = EXCLUDED.sy, sxy = EXCLUDED.sxy, "
+                    "sxx = EXCLUDED.sxx, syy = EXCLUDED.syy, samples = EXCLUDED.samples, "
+                    "last_day = EXCLUDED.last_day, version = EXCLUDED.version, "
+                    "updated_at = CURRENT_TIMESTAMP"
+                ),
+                [(user_id, *row) for row in rows],
+            )
+
+    # ── Nightly HRV lab (whoop_hrv_lab — per-night window medians, see core/services/hrv_lab.py) ──
+
+    @staticmethod
+    def get_hrv_lab_range(user_id: int, start_day: str, end_day: str) -> list[dict]:
+        """Every stored lab night for start_day <= day <= end_day in one query, ascending by day."""
+        return BaseRepository._fetchall(
+            convert_query(
+                "SELECT day, metrics_json, lab_version, rr_count, updated_at "
+                "FROM whoop_hrv_lab WHERE user_id = ? AND day >= ? AND day <= ? ORDER BY day"
+            ),
+            (user_id, start_day, end_day),
+        )
+
+    @staticmethod
+    def upsert_hrv_labs(rows: list[tuple]) -> None:
+        """Replace lab nights: rows of (user_id, day, metrics_json, lab_version, rr_count), any mix of
+        users, one executemany in one transaction."""
+        if not rows:
+            return
+        with get_connection() as conn:
+            conn.cursor().executemany(
+                convert_query(
+                    "INSERT INTO whoop_hrv_lab "
+                    "(user_id, day, metrics_json, lab_version, rr_count, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP) "
+                    "ON CONFLICT (user_id, day) DO UPDATE SET "
+                    "metrics_json = EXCLUDED.metrics_json, lab_version = EXCLUDED.lab_version, "
+                    "rr_count = EXCLUDED.rr_count, updated_at = CURRENT_TIMESTAMP"
+                ),
+                rows,
+            )
+
+    @staticmethod
+    def rr_user_ids(start, end) -> list[int]:
+        """Users with any RR in [start, end] — the nightly HRV lab's candidates."""
+        return WhoopStreamRepository.user_ids(RR, start, end)
+
     @staticmethod
     def latest_capture(user_id: int) -> dict | None:
         """Most recent ingest heartbeat (capture-health)."""
@@ -0,0 +1,304 @@
+"""Repository for the chunked HR/RR stream store (whoop_stream_chunks, migration 126).
+
+One row per (user, stream, hour) instead of one row per sample. A chunk's payload is its samples sorted by
+(ts, value): a codec byte, then zlib-packed unsigned varints, the delta-encoded millisecond offsets from
+``bucket_start`` followed by the values. Reads return ``StreamSeries`` array views (``array('q')`` epoch-ms
+timestamps, ``array('H')`` values), so a night of HR is a few dozen rows and two flat arrays rather than
+~50k dicts.
+
+Ingest is idempotent in the same way the per-sample tables were. HR keeps the first value seen for a
+timestamp (``ON CONFLICT (user_id, ts) DO NOTHING``), and RR deduplicates on (ts, rr_ms). Each touched chunk
+is locked, decoded, merged and rewritten in one transaction. Timestamps are kept at millisecond
+resolution.
+"""
+
+from __future__ import annotations
+
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from rivaflow.db.database import convert_query, get_connection
+
+HR = "hr"
+RR = "rr"
+STREAMS = (HR, RR)
+CHUNK_SECONDS = 3600  # one row per user, stream and hour
+CODEC_VERSION = 1
+_MAX_TS_MS = 2**62  # "no upper bound" for open-ended reads
+
+
+def epoch_ms(ts) -> int:
+    """Epoch milliseconds for an ISO string (trailing Z allowed) or datetime. Naive values are UTC."""
+    if not isinstance(ts, datetime):
+        ts = datetime.fromisoformat(str(ts).replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return round(ts.timestamp() * 1000)
+
+
+def _put_varints(out: bytearray, values: Iterable[int]) -> None:
+    for v in values:
+        while v >= 0x80:
+            out.append((v & 0x7F) | 0x80)
+            v >>= 7
+        out.append(v)
+
+
+def _get_varints(buf: bytes, count: int, pos: int) -> tuple[list[int], int]:
+    values = []
+    for _ in range(count):
+        shift = result = 0
+        while True:
+            byte = buf[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        values.append(result)
+    return values, pos
+
+
+def encode_chunk(samples: list[tuple[int, int]]) -> bytes:
+    """Pack (offset_ms, value) pairs — sorted, offsets >= 0 — into a chunk payload."""
+    body = bytearray()
+    previous = 0
+    deltas = []
+    for offset, _ in samples:
+        deltas.append(offset - previous)
+        previous = offset
+    _put_varints(body, deltas)
+    _put_varints(body, (value for _, value in samples))
+    return bytes([CODEC_VERSION]) + zlib.compress(bytes(body))
+
+
+def decode_chunk(payload: bytes, n: int) -> tuple[array, array]:
+    """(offsets_ms as array('q'), values as array('H')) from a chunk payload holding n samples."""
+    payload = bytes(payload)
+    if payload[0] != CODEC_VERSION:
+        raise ValueError(f"Unknown stream chunk codec {payload[0]}")
+    body = zlib.decompress(payload[1:])
+    deltas, pos = _get_varints(body, n, 0)
+    values, _ = _get_varints(body, n, pos)
+    offsets = array("q")
+    total = 0
+    for d in deltas:
+        total += d
+        offsets.append(total)
+    return offsets, array("H", values)
+
+
+@dataclass
+class StreamSeries:
+    """A time-ordered stream slice as flat arrays: epoch-ms timestamps and uint16 values."""
+
+    ts_ms: array = field(default_factory=lambda: array("q"))
+    values: array = field(default_factory=lambda: array("H"))
+
+    def __len__(self) -> int:
+        return len(self.ts_ms)
+
+    def rows(self, value_key: str) -> list[dict]:
+        """Materialize as [{"ts": aware UTC datetime, value_key: int}] — the legacy row shape."""
+        epoch = datetime(1970, 1, 1, tzinfo=UTC)
+        return [
+            {"ts": epoch + timedelta(milliseconds=ts), value_key: value}
+            for ts, value in zip(self.ts_ms, self.values)
+        ]
+
+
+def _merge(
+    stream: str, existing: list[tuple[int, int]], incoming: list[tuple[int, int]]
+) -> list[tuple[int, int]]:
+    if stream == HR:
+        # first write wins, as ON CONFLICT (user_id, ts) DO NOTHING did
+        by_ts = dict(existing)
+        for offset, value in incoming:
+            by_ts.setdefault(offset, value)
+        return sorted(by_ts.items())
+    return sorted(set(existing) | set(incoming))
+
+
+def build_chunks(
+    stream: str, samples_ms: list[tuple[int, int]]
+) -> list[tuple[int, int, bytes]]:
+    """(bucket_start, n, payload) chunk rows for a fresh set of (epoch_ms, value) samples — merged with the
+    same per-stream rule as ingest, but against nothing stored. Pure, so it can run in a worker process.
+    """
+    bucket_ms = CHUNK_SECONDS * 1000
+    by_bucket: dict[int, list[tuple[int, int]]] = defaultdict(list)
+    for ms, value in samples_ms:
+        bucket = ms // bucket_ms * CHUNK_SECONDS
+        by_bucket[bucket].append((ms - bucket * 1000, int(value)))
+    rows = []
+    for bucket, pairs in sorted(by_bucket.items()):
+        merged = _merge(stream, [], pairs)
+        rows.append((bucket, len(merged), encode_chunk(merged)))
+    return rows
+
+
+class WhoopStreamRepository:
+    """Chunked, idempotent storage for the decoded HR and RR streams."""
+
+    @staticmethod
+    def ingest(user_id: int, stream: str, samples: list[tuple]) -> int:
+        """Merge (ts, value) samples into their hourly chunks. Returns samples received."""
+        if not samples:
+            return 0
+        with get_connection() as conn:
+            WhoopStreamRepository.write(conn.cursor(), user_id, stream, samples)
+        return len(samples)
+
+    @staticmethod
+    def write(cursor, user_id: int, stream: str, samples: list[tuple]) -> None:
+        """Merge samples into their chunks using the caller's cursor (one transaction with the caller)."""
+        if stream not in STREAMS:
+            raise ValueError(f"Unknown stream: {stream!r}")
+        bucket_ms = CHUNK_SECONDS * 1000
+        by_bucket: dict[int, list[tuple[int, int]]] = defaultdict(list)
+        for ts, value in samples:
+            ms = epoch_ms(ts)
+            bucket = ms // bucket_ms * CHUNK_SECONDS
+            by_bucket[bucket].append((ms - bucket * 1000, int(value)))
+        if not by_bucket:
+            return
+
+        buckets = sorted(by_bucket)
+        # Placeholder rows first, so concurrent writers of a new hour serialize on the row lock below
+        cursor.executemany(
+            convert_query("""
+                INSERT INTO whoop_stream_chunks (user_id, stream, bucket_start, n, payload)
+                VALUES (?, ?, ?, 0, ?)
+                ON CONFLICT (user_id, stream, bucket_start) DO NOTHING
+                """),
+            [(user_id, stream, bucket, encode_chunk([])) for bucket in buckets],
+        )
+        placeholders = ", ".join("?" for _ in buckets)
+        cursor.execute(
+            convert_query(f"""
+                SELECT bucket_start, n, payload FROM whoop_stream_chunks
+                WHERE user_id = ? AND stream = ? AND bucket_start IN ({placeholders})
+                ORDER BY bucket_start
+                FOR UPDATE
+                """),
+            (user_id, stream, *buckets),
+        )
+        updates = []
+        for row in cursor.fetchall():
+            offsets, values = decode_chunk(row["payload"], row["n"])
+            merged = _merge(
+                stream, list(zip(offsets, values)), by_bucket[row["bucket_start"]]
+            )
+            updates.append(
+                (
+                    len(merged),
+                    encode_chunk(merged),
+                    user_id,
+                    stream,
+                    row["bucket_start"],
+                )
+            )
+        cursor.executemany(
+            convert_query("""
+                UPDATE whoop_stream_chunks
+                SET n = ?, payload = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = ? AND stream = ? AND bucket_start = ?
+                """),
+            updates,
+        )
+
+    @staticmethod
+    def _chunks(user_id: int, stream: str, start_ms: int, end_ms: int) -> list[dict]:
+        first_bucket = start_ms // (CHUNK_SECONDS * 1000) * CHUNK_SECONDS
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                    SELECT bucket_start, n, payload FROM whoop_stream_chunks
+                    WHERE user_id = ? AND stream = ?
+                      AND bucket_start >= ? AND bucket_start <= ? AND n > 0
+                    ORDER BY bucket_start
+                    """),
+                (user_id, stream, first_bucket, end_ms // 1000),
+            )
+            return cursor.fetchall()
+
+    @staticmethod
+    def series(user_id: int, stream: str, start=None, end=None) -> StreamSeries:
+        """Samples with start <= ts <= end (either bound may be None), ascending by (ts, value)."""
+        start_ms = epoch_ms(start) if start is not None else 0
+        end_ms = epoch_ms(end) if end is not None else _MAX_TS_MS
+        out = StreamSeries()
+        for row in WhoopStreamRepository._chunks(user_id, stream, start_ms, end_ms):
+            base = row["bucket_start"] * 1000
+            offsets, values = decode_chunk(row["payload"], row["n"])
+            lo = bisect_left(offsets, start_ms - base)
+            hi = bisect_right(offsets, end_ms - base)
+            out.ts_ms.extend(base + offset for offset in offsets[lo:hi])
+            out.values.extend(values[lo:hi])
+        return out
+
+    @staticmethod
+    def count_range(user_id: int, stream: str, start, end) -> int:
+        """Samples with start <= ts <= end. Whole hours inside the range are counted from n alone, so only
+        the two boundary chunks are decoded."""
+        start_ms, end_ms = epoch_ms(start), epoch_ms(end)
+        total = 0
+        for row in WhoopStreamRepository._chunks(user_id, stream, start_ms, end_ms):
+            base = row["bucket_start"] * 1000
+            if base >= start_ms and base + CHUNK_SECONDS * 1000 - 1 <= end_ms:
+                total += row["n"]
+                continue
+            offsets, _ = decode_chunk(row["payload"], row["n"])
+            total += bisect_right(offsets, end_ms - base) - bisect_left(
+                offsets, start_ms - base
+            )
+        return total
+
+    @staticmethod
+    def bucket_counts(user_id: int, start, end) -> list[tuple[int, int]]:
+        """(bucket_start, samples across every stream) for each chunk hour overlapping [start, end], in one
+        grouped query. Late-landing samples change their hour's total, so this is a cheap staleness
+        signal for anything derived from a time window."""
+        start_ms, end_ms = epoch_ms(start), epoch_ms(end)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                    SELECT bucket_start, SUM(n) AS n FROM whoop_stream_chunks
+                    WHERE user_id = ? AND bucket_start >= ? AND bucket_start <= ?
+                    GROUP BY bucket_start
+                    ORDER BY bucket_start
+                    """),
+                (
+                    user_id,
+                    start_ms // (CHUNK_SECONDS * 1000) * CHUNK_SECONDS,
+                    end_ms // 1000,
+                ),
+            )
+            return [(row["bucket_start"], int(row["n"])) for row in cursor.fetchall()]
+
+    @staticmethod
+    def user_ids(stream: str, start, end) -> list[int]:
+        """Users with a non-empty ``stream`` chunk hour overlapping [start, end], ascending."""
+        start_ms, end_ms = epoch_ms(start), epoch_ms(end)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("""
+                    SELECT DISTINCT user_id FROM whoop_stream_chunks
+                    WHERE stream = ? AND bucket_start >= ? AND bucket_start <= ? AND n > 0
+                    ORDER BY user_id
+                    """),
+                (
+                    stream,
+                    start_ms // (CHUNK_SECONDS * 1000) * CHUNK_SECONDS,
+                    end_ms // 1000,
+                ),
+            )
+            return [row["user_id"] for row in cursor.fetchall()]
@@ -4,6 +4,7 @@ import json
 import logging
 
 from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.glossary_repo import GlossaryRepository
 
 logger = logging.getLogger(__name__)
 
@@ -780,7 +781,12 @@ def seed_glossary():
                 else:
                     raise
 
+        if inserted:
+            # Running processes reload their glossary index on the next check
+            GlossaryRepository.bump_version(cursor)
         conn.commit()
+        if inserted:
+            GlossaryRepository.local_writes += 1
         logger.info("Successfully seeded %s techniques into glossary!", inserted)
 
 
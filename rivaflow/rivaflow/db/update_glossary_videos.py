@@ -1,6 +1,7 @@
 """Update movements glossary with reference video URLs."""
 
 from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.glossary_repo import GlossaryRepository
 
 # Video URL mappings (movement name -> {gi_url, nogi_url})
 VIDEO_URLS = {
@@ -275,6 +276,10 @@ def update_video_urls():
                 not_found.append(movement_name)
                 print(f"Not found: {movement_name}")
 
+        if updated:
+            # Running processes reload their glossary index on the next check
+            GlossaryRepository.bump_version(cursor)
+
         print(f"\n{'='*60}")
         print(f"Successfully updated {updated} movements with video URLs!")
         if not_found:
@@ -282,6 +287,9 @@ def update_video_urls():
             for name in not_found:
                 print(f"  - {name}")
 
+    if updated:
+        GlossaryRepository.local_writes += 1
+
 
 if __name__ == "__main__":
     update_video_urls()
@@ -27,6 +27,9 @@ os.environ.setdefault("ENV", "test")
 
 import pytest  # noqa: E402
 
+from rivaflow.core.services.glossary_index import (  # noqa: E402
+    reset_glossary_index,
+)
 from rivaflow.core.utils.cache import get_cache  # noqa: E402
 from rivaflow.db.database import init_db  # noqa: E402
 
@@ -35,8 +38,10 @@ from rivaflow.db.database import init_db  # noqa: E402
 def _clear_analytics_cache():
     """Clear the in-memory analytics cache before each test."""
     get_cache().clear()
+    reset_glossary_index()
     yield
     get_cache().clear()
+    reset_glossary_index()
 
 
 @pytest.fixture(autouse=True)
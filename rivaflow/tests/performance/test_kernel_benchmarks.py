@@ -0,0 +1,327 @@
+"""Scaling benchmarks for the pure physiology and analytics kernels (no DB).
+
+Each kernel runs on deterministic synthetic input at realistic sizes — a 5-min spot check, an hour, an
+8-h night, 30 days — and records throughput (calls/sec, best of several timed runs) and peak traced
+memory per size. The log-log slope of time against input size is the kernel's scaling exponent, checked
+against the complexity it is documented to have, so an accidental O(n²) fails even without a baseline.
+
+Environment knobs:
+  - ``RIVAFLOW_BENCH_SAVE=path`` writes this run's numbers as a JSON baseline.
+  - ``RIVAFLOW_BENCH_BASELINE=path`` compares against a saved baseline and fails any kernel/size whose
+    calls/sec dropped by more than ``RIVAFLOW_BENCH_TOLERANCE`` (a fraction, default 0.25) or whose
+    peak memory grew by more than the same fraction. Baselines are machine-specific: save and compare
+    on the same box.
+  - ``RIVAFLOW_BENCH_MIN_TIME`` is the seconds spent timing each size (default 0.2).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from math import log, pi, sin
+
+import pytest
+
+from rivaflow.core.circadian import cosinor
+from rivaflow.core.hrv_spectral import dfa_alpha1, frequency_domain
+from rivaflow.core.max_hr import sustained_max
+from rivaflow.core.rr_quality import assess_rr
+from rivaflow.core.sleep_window import _otsu_split, bucket_hr
+from rivaflow.core.training_load import acwr
+
+pytestmark = pytest.mark.performance
+
+SECONDS = {
+    "5min": 300,
+    "1h": 3600,
+    "8h": 8 * 3600,
+    "30d": 30 * 86400,
+    "1y": 365 * 86400,
+}
+TOLERANCE = float(os.environ.get("RIVAFLOW_BENCH_TOLERANCE", "0.25"))
+MIN_TIME = float(os.environ.get("RIVAFLOW_BENCH_MIN_TIME", "0.2"))
+MAX_RUNS = 5  # timed runs per size; the best is kept
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+
+_results: dict[str, dict[str, dict]] = {}
+
+
+# ── Deterministic synthetic signals ─────────────────────────────────────────
+
+
+def synthetic_rr(
+    seconds: float, seed: int = 1, artifact_rate: float = 0.0
+) -> list[float]:
+    """RR intervals (ms) covering ``seconds``: ~60 bpm with 0.25 Hz respiratory and 0.1 Hz baroreflex
+    modulation plus beat noise. ``artifact_rate`` of beats become missed (doubled) or extra (halved)
+    detections."""
+    rng = random.Random(seed)
+    rr, t = [], 0.0
+    while t < seconds:
+        beat = (
+            1000.0
+            + 40.0 * sin(2 * pi * 0.25 * t)
+            + 25.0 * sin(2 * pi * 0.1 * t)
+            + rng.gauss(0, 12)
+        )
+        if artifact_rate and rng.random() < artifact_rate:
+            beat *= 2.0 if rng.random() < 0.5 else 0.5
+        rr.append(beat)
+        t += beat / 1000.0
+    return rr
+
+
+def synthetic_hr(seconds: int, seed: int = 2, hz: float = 1.0) -> list[int]:
+    """Integer bpm at ``hz`` over ``seconds``: a 24-h rhythm (low at night, peak mid-afternoon), a bout of
+    hard effort each day at 18:00, and sample noise."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(int(seconds * hz)):
+        t = i / hz
+        hour = (t / 3600.0) % 24
+        bpm = 62 + 12 * sin(2 * pi * (hour - 9) / 24) + rng.gauss(0, 3)
+        if 18 <= hour < 19:
+            bpm += 80 * sin(pi * (hour - 18))
+        out.append(max(35, min(200, round(bpm))))
+    return out
+
+
+def synthetic_hr_points(seconds: int, seed: int = 2) -> list[tuple[datetime, int]]:
+    """``synthetic_hr`` at 1 Hz as (timestamp, bpm) points, the shape ``bucket_hr`` consumes."""
+    return [
+        (T0 + timedelta(seconds=i), b)
+        for i, b in enumerate(synthetic_hr(seconds, seed))
+    ]
+
+
+def synthetic_daily_load(days: int, seed: int = 3) -> list[float]:
+    """Daily training load: three sessions a week with a rest day's zero in between."""
+    rng = random.Random(seed)
+    return [rng.uniform(200, 600) if d % 7 in (0, 2, 4) else 0.0 for d in range(days)]
+
+
+# ── Kernel table ────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class Kernel:
+    """One benchmarked kernel: ``build(size)`` makes its input (untimed), ``call(input)`` is timed.
+    ``n(input)`` is the input size the scaling exponent is fitted against, and ``max_exponent`` the
+    highest slope its documented complexity allows (with headroom for timer noise at small sizes).
+    """
+
+    build: Callable[[str], object]
+    call: Callable[[object], object]
+    sizes: tuple[str, ...]
+    max_exponent: float
+    n: Callable[[object], int] = len
+
+
+def _bucket_medians(size: str) -> list[int]:
+    # What bucket_hr hands _otsu_split: one median per 5-min bucket of 1 Hz HR
+    hr = synthetic_hr(SECONDS[size])
+    return [sorted(hr[i : i + 300])[150] for i in range(0, len(hr) - 299, 300)]
+
+
+def _cosinor_input(size: str) -> tuple[list[float], list[int]]:
+    # Minute-resolution HR, the density the daily rollups feed a window fit
+    values = synthetic_hr(SECONDS[size], hz=1 / 60)
+    return [(i / 60.0) % 24 for i in range(len(values))], values
+
+
+KERNELS = {
+    "frequency_domain": Kernel(
+        build=lambda s: synthetic_rr(SECONDS[s]),
+        call=frequency_domain,
+        sizes=("5min", "1h", "8h"),
+        max_exponent=1.6,
+    ),
+    "dfa_alpha1": Kernel(
+        build=lambda s: synthetic_rr(SECONDS[s]),
+        call=dfa_alpha1,
+        sizes=("5min", "1h", "8h"),
+        max_exponent=1.4,
+    ),
+    "assess_rr": Kernel(
+        build=lambda s: synthetic_rr(SECONDS[s], artifact_rate=0.02),
+        call=assess_rr,
+        sizes=("5min", "1h", "8h"),
+        max_exponent=1.4,
+    ),
+    "bucket_hr": Kernel(
+        build=lambda s: synthetic_hr_points(SECONDS[s]),
+        call=bucket_hr,
+        sizes=("5min", "1h", "8h"),
+        max_exponent=1.5,
+    ),
+    "_otsu_split": Kernel(
+        build=_bucket_medians,
+        call=_otsu_split,
+        sizes=("8h", "30d"),
+        max_exponent=1.4,
+    ),
+    "sustained_max": Kernel(
+        build=lambda s: synthetic_hr(SECONDS[s]),
+        call=lambda hr: sustained_max(hr, 10),
+        sizes=("5min", "1h", "8h"),
+        max_exponent=1.4,
+    ),
+    "cosinor": Kernel(
+        build=_cosinor_input,
+        call=lambda xy: cosinor(*xy),
+        sizes=("1h", "8h", "30d"),
+        max_exponent=1.4,
+        n=lambda xy: len(xy[0]),
+    ),
+    "acwr": Kernel(
+        build=lambda s: synthetic_daily_load(SECONDS[s] // 86400),
+        call=acwr,
+        sizes=("30d", "1y"),
+        max_exponent=1.4,
+    ),
+}
+
+
+# ── Measurement ─────────────────────────────────────────────────────────────
+
+
+def measure(call: Callable[[object], object], data: object) -> dict:
+    """Calls/sec (best of up to ``MAX_RUNS`` runs of ~``MIN_TIME / MAX_RUNS`` s each) and peak traced
+    memory (one call, measured separately so tracing doesn't skew the timing)."""
+    call(data)  # warm-up
+    start = time.perf_counter()
+    call(data)
+    single = time.perf_counter() - start
+    loops = max(1, int(MIN_TIME / MAX_RUNS / max(single, 1e-9)))
+    best = single
+    for _ in range(MAX_RUNS if single < MIN_TIME else 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            call(data)
+        best = min(best, (time.perf_counter() - start) / loops)
+
+    tracemalloc.start()
+    try:
+        call(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds_per_call": best,
+        "ops_per_sec": round(1.0 / best, 3) if best > 0 else None,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def scaling_exponent(points: list[tuple[int, float]]) -> float | None:
+    """Least-squares slope of log(seconds) on log(n) — 1.0 is linear, 2.0 quadratic."""
+    if len(points) < 2:
+        return None
+    xs = [log(n) for n, _ in points]
+    ys = [log(t) for _, t in points]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx if sxx else None
+
+
+def _baseline() -> dict:
+    path = os.environ.get("RIVAFLOW_BENCH_BASELINE")
+    if not path:
+        return {}
+    with open(path) as f:
+        return json.load(f)["kernels"]
+
+
+def regressions(
+    name: str, current: dict, baseline: dict, tolerance: float = TOLERANCE
+) -> list[str]:
+    """Human-readable regressions of one kernel's sizes against its baseline entry."""
+    found = []
+    for size, was in baseline.get(name, {}).get("sizes", {}).items():
+        now = current["sizes"].get(size)
+        if now is None:
+            continue
+        if was.get("ops_per_sec") and now["ops_per_sec"] < was["ops_per_sec"] * (
+            1 - tolerance
+        ):
+            found.append(
+                f"{name}[{size}] {now['ops_per_sec']:.3g} ops/s < baseline {was['ops_per_sec']:.3g}"
+            )
+        if was.get("peak_kib") and now["peak_kib"] > was["peak_kib"] * (1 + tolerance):
+            found.append(
+                f"{name}[{size}] peak {now['peak_kib']} KiB > baseline {was['peak_kib']} KiB"
+            )
+    return found
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _save_results():
+    yield
+    path = os.environ.get("RIVAFLOW_BENCH_SAVE")
+    if path and _results:
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "created": datetime.now(UTC).isoformat(timespec="seconds"),
+                    "kernels": _results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+
+
+@pytest.mark.parametrize("name", sorted(KERNELS))
+def test_kernel_scaling(name):
+    kernel = KERNELS[name]
+    sizes, points = {}, []
+    for size in kernel.sizes:
+        data = kernel.build(size)
+        result = measure(kernel.call, data)
+        result["n"] = kernel.n(data)
+        sizes[size] = result
+        points.append((result["n"], result["seconds_per_call"]))
+    exponent = scaling_exponent(points)
+    _results[name] = {
+        "sizes": sizes,
+        "scaling_exponent": round(exponent, 3) if exponent is not None else None,
+    }
+
+    if exponent is not None:
+        assert (
+            exponent <= kernel.max_exponent
+        ), f"{name} scales as n^{exponent:.2f} over {[n for n, _ in points]}"
+    found = regressions(name, _results[name], _baseline())
+    assert not found, "; ".join(found)
+
+
+def test_generators_are_deterministic():
+    assert synthetic_rr(300, seed=4) == synthetic_rr(300, seed=4)
+    assert synthetic_rr(300, seed=4) != synthetic_rr(300, seed=5)
+    rr = synthetic_rr(SECONDS["1h"])
+    assert 3500 <= len(rr) <= 3700
+    assert sum(rr) / 1000 >= SECONDS["1h"]
+    assert synthetic_hr(600) == synthetic_hr(600)
+    assert len(synthetic_hr(SECONDS["30d"], hz=1 / 60)) == 30 * 1440
+
+
+def test_regressions_flag_slowdowns_and_memory_growth():
+    current = {"sizes": {"1h": {"ops_per_sec": 70.0, "peak_kib": 100.0}}}
+    baseline = {"k": {"sizes": {"1h": {"ops_per_sec": 100.0, "peak_kib": 100.0}}}}
+    assert len(regressions("k", current, baseline, 0.25)) == 1
+    current["sizes"]["1h"]["ops_per_sec"] = 90.0
+    assert regressions("k", current, baseline, 0.25) == []
+    current["sizes"]["1h"]["peak_kib"] = 200.0
+    assert regressions("k", current, baseline, 0.25) == [
+        "k[1h] peak 200.0 KiB > baseline 100.0 KiB"
+    ]
+    assert regressions("other", current, baseline, 0.25) == []
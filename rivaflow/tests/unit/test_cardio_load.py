@@ -15,6 +15,7 @@ from datetime import datetime, timedelta
 import rivaflow.core.cardio_load as cl
 from rivaflow.core.cardio_load import (
     banister_trimp,
+    banister_trimp_ms,
     classify_hardness,
     hardness_cutoffs,
     scale_to_21,
@@ -155,6 +156,19 @@ def test_session_load_matches_banister_trimp():
     )
 
 
+def test_banister_trimp_ms_matches_datetime_path():
+    samples = _hard_day_samples()
+    epoch = datetime(1970, 1, 1)
+    ts_ms = [round((t - epoch).total_seconds() * 1000) for t, _ in samples]
+    bpm = [b for _, b in samples]
+    assert math.isclose(
+        banister_trimp_ms(ts_ms, bpm, MAX_HR, REST_HR),
+        banister_trimp(samples, MAX_HR, REST_HR),
+        rel_tol=1e-12,
+    )
+    assert banister_trimp_ms([], [], MAX_HR, REST_HR) == 0.0
+
+
 # ── hardness cutoffs + classification ────────────────────────────────────────────
 
 
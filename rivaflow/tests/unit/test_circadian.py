@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+import random
 from math import cos, pi
 
 import pytest
 
-from rivaflow.core.circadian import cosinor
+from rivaflow.core.circadian import (
+    CosinorSums,
+    cosinor,
+    rhythm_drift,
+    rolling_cosinor,
+    rolling_cosinor_by_user,
+)
 
 
 def test_cosinor_recovers_known_rhythm():
@@ -23,3 +30,73 @@ def test_cosinor_recovers_known_rhythm():
 
 def test_cosinor_needs_points():
     assert cosinor([1, 2, 3], [1, 2, 3])["available"] is False
+
+
+def _day(rng, acrophase: float, step_minutes: int = 30) -> tuple[list, list]:
+    omega = 2 * pi / 24
+    hours = [m / 60 for m in range(0, 24 * 60, step_minutes)]
+    return hours, [
+        60 + 12 * cos(omega * (h - acrophase)) + rng.gauss(0, 2) for h in hours
+    ]
+
+
+def test_sums_round_trip_and_add_up():
+    rng = random.Random(5)
+    (h1, v1), (h2, v2) = _day(rng, 15), _day(rng, 16)
+    a, b = CosinorSums.from_samples(h1, v1), CosinorSums.from_samples(h2, v2)
+    assert CosinorSums.from_list(a.as_list()) == a
+    assert (a + b).fit() == cosinor(h1 + h2, v1 + v2)
+    assert ((a + b) - b).fit() == a.fit()
+    assert CosinorSums.from_samples([6.0] * 20, list(range(20))).fit() == {
+        "available": False,
+        "reason": "Time points too clustered to fit a rhythm.",
+    }
+
+
+def test_rolling_cosinor_matches_refitting_each_window():
+    rng = random.Random(8)
+    samples, daily = [], []
+    for d in range(30):
+        if d % 6 == 5:
+            samples.append(([], []))
+            daily.append(None)
+            continue
+        hours, values = _day(rng, 14 + d * 0.1)
+        samples.append((hours, values))
+        daily.append(CosinorSums.from_samples(hours, values))
+
+    fits = rolling_cosinor(daily, 7)
+    assert len(fits) == 24
+    for fit in fits:
+        window = samples[fit["end_index"] - 6 : fit["end_index"] + 1]
+        direct = cosinor(
+            [h for hours, _ in window for h in hours],
+            [v for _, values in window for v in values],
+        )
+        assert {k: fit[k] for k in direct} == pytest.approx(direct)
+        assert fit["days_with_data"] == sum(1 for hours, _ in window if hours)
+
+    drift = rhythm_drift(fits)
+    assert drift["direction"] == "later"
+    assert drift["acrophase_per_week"] == pytest.approx(0.7, abs=0.2)
+
+    cohort = rolling_cosinor_by_user({1: daily, 2: daily[:10]}, 7)
+    assert cohort[1] == fits and len(cohort[2]) == 4
+
+
+def test_rhythm_drift_unwraps_midnight():
+    fits = [
+        {
+            "available": True,
+            "end_index": i,
+            "mesor": 60,
+            "amplitude": 10,
+            "acrophase_hour": h,
+        }
+        for i, h in enumerate([23.0, 23.5, 0.0, 0.5, 1.0])
+    ]
+    drift = rhythm_drift(fits)
+    assert drift["acrophase_shift_hours"] == 2.0
+    assert drift["acrophase_per_week"] == pytest.approx(3.5)
+    assert drift["mesor_per_week"] == 0
+    assert rhythm_drift(fits[:2])["available"] is False
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
-from rivaflow.core.hrv_spectral import dfa_alpha1
+import random
+from math import log
+
+import pytest
+
+from rivaflow.core.hrv_spectral import dfa_alpha1, dfa_alpha1_series
 
 
 def test_dfa_none_on_too_few():
@@ -24,3 +29,62 @@ def test_dfa_white_noise_near_half():
     r = dfa_alpha1(rr)
     assert r is not None
     assert r["alpha1"] < 1.0
+
+
+def _naive_alpha1(intervals: list[float], boxes: list[int]) -> float:
+    """Textbook DFA: integrate, fit every box with its own least-squares line, regress log F on log n."""
+    mean_rr = sum(intervals) / len(intervals)
+    y, acc = [], 0.0
+    for x in intervals:
+        acc += x - mean_rr
+        y.append(acc)
+    points = []
+    for box in boxes:
+        fluct = []
+        for start in range(0, len(y) - box + 1, box):
+            seg = y[start : start + box]
+            mx, my = (box - 1) / 2.0, sum(seg) / box
+            sxx = sum((i - mx) ** 2 for i in range(box))
+            slope = sum((i - mx) * (v - my) for i, v in enumerate(seg)) / sxx
+            fluct.append(
+                sum((v - (my + slope * (i - mx))) ** 2 for i, v in enumerate(seg)) / box
+            )
+        points.append((log(box), 0.5 * log(sum(fluct) / len(fluct))))
+    mlx = sum(p[0] for p in points) / len(points)
+    mly = sum(p[1] for p in points) / len(points)
+    return sum((p[0] - mlx) * (p[1] - mly) for p in points) / sum(
+        (p[0] - mlx) ** 2 for p in points
+    )
+
+
+def _random_rr(n: int, seed: int = 11) -> list[float]:
+    rng = random.Random(seed)
+    return [800.0 + rng.gauss(0, 30) + (i % 7) * 3 for i in range(n)]
+
+
+def test_dfa_prefix_sums_match_naive_fit():
+    rr = _random_rr(500)
+    r = dfa_alpha1(rr)
+    assert r["alpha1"] == pytest.approx(_naive_alpha1(rr, list(range(4, 17))), abs=1e-3)
+
+
+def test_dfa_arbitrary_boxes():
+    rr = _random_rr(800)
+    boxes = [4, 6, 10, 24, 40]
+    r = dfa_alpha1(rr, boxes=boxes)
+    assert r["alpha1"] == pytest.approx(_naive_alpha1(rr, boxes), abs=1e-3)
+    assert dfa_alpha1(rr[:150], boxes=boxes) is None  # needs 4 × the largest box
+
+
+def test_dfa_series_windows_match_single_window():
+    rr = _random_rr(600)
+    timeline = dfa_alpha1_series(rr, window=200, step=50)
+    assert [p["start_beat"] for p in timeline] == list(range(0, 401, 50))
+    for point in timeline:
+        single = dfa_alpha1(rr[point["start_beat"] : point["end_beat"]])
+        assert point["alpha1"] == single["alpha1"]
+        assert point["zone"] == single["zone"]
+
+
+def test_dfa_series_empty_when_session_shorter_than_window():
+    assert dfa_alpha1_series(_random_rr(100), window=200) == []
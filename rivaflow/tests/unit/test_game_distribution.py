@@ -1,14 +1,17 @@
 """Unit tests for GameDistributionService (the Game Distribution radar)."""
 
-from unittest.mock import MagicMock
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from rivaflow.core.services.game_distribution import (
     AXES,
+    WINDOW_WEEKS,
     GameDistributionService,
     _parse_movement_ids,
 )
+from rivaflow.core.services.glossary_index import GlossaryIndex
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -17,6 +20,8 @@ def _init_test_db():
     yield
 
 
+WINDOWS = ["all", *WINDOW_WEEKS]
+
 GLOSSARY = [
     {"id": 1, "name": "Armbar", "category": "submission"},
     {"id": 2, "name": "Triangle", "category": "submission"},
@@ -26,12 +31,21 @@ GLOSSARY = [
 ]
 
 
+@pytest.fixture(autouse=True)
+def _glossary_index():
+    with patch(
+        "rivaflow.core.services.game_distribution.get_glossary_index",
+        return_value=GlossaryIndex(GLOSSARY),
+    ):
+        yield
+
+
 def _service_with(sessions, techs_by_session, rolls_by_session):
+    for session in sessions:
+        session.setdefault("session_date", date.today())
     svc = GameDistributionService()
     svc.session_repo = MagicMock()
     svc.session_repo.get_by_date_range.return_value = sessions
-    svc.glossary_repo = MagicMock()
-    svc.glossary_repo.list_all.return_value = GLOSSARY
     svc.technique_repo = MagicMock()
     svc.technique_repo.batch_get_by_session_ids.return_value = techs_by_session
     svc.roll_repo = MagicMock()
@@ -98,8 +112,8 @@ def test_windowed_mode_supplies_prev_and_dates():
     assert out["window"]["mode"] == "8w"
     assert out["window"]["start"] is not None
     assert out["window"]["prev_start"] is not None
-    # two windows queried
-    assert svc.session_repo.get_by_date_range.call_count == 2
+    # current and previous windows sliced from one load
+    assert svc.session_repo.get_by_date_range.call_count == 1
     for axis in out["axes"]:
         assert axis["coverage"]["prev"] is not None or axis["coverage"]["prev"] == 0
 
@@ -112,6 +126,37 @@ def test_all_time_mode_no_prev():
     assert out["gaps"]["load_unattributed_pct"] is None  # no TRIMP at all
 
 
+def test_all_windows_sliced_from_one_load():
+    today = date.today()
+    sessions = [
+        {"id": 10, "session_date": today, "duration_mins": 60},
+        {"id": 11, "session_date": today - timedelta(weeks=10), "duration_mins": 60},
+        {"id": 12, "session_date": today - timedelta(weeks=20), "duration_mins": 60},
+    ]
+    techs = {
+        10: [{"movement_id": 1}],
+        11: [{"movement_id": 3}],
+        12: [{"movement_id": 4}, {"movement_id": 2}],
+    }
+    svc = _service_with(sessions, techs, {})
+
+    windows = {w: svc.get_game_distribution(user_id=4, window=w) for w in WINDOWS}
+
+    svc.session_repo.get_by_date_range.assert_called_once()
+    svc.technique_repo.batch_get_by_session_ids.assert_called_once()
+
+    def freq(out, key, field="value"):
+        return next(a for a in out["axes"] if a["key"] == key)["frequency"][field]
+
+    assert windows["all"]["totals"]["touches"] == 4
+    assert windows["all"]["totals"]["distinct_movements"] == 4
+    assert windows["8w"]["totals"]["touches"] == 1
+    assert freq(windows["8w"], "pass", "prev") == 1
+    assert windows["12w"]["gaps"]["sessions_in_window"] == 2
+    assert freq(windows["12w"], "sweep", "prev") == 1
+    assert freq(windows["12w"], "submission") == 1
+
+
 @pytest.mark.parametrize(
     "raw,expected",
     [
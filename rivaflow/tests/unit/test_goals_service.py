@@ -140,17 +140,14 @@ class TestCurrentWeekProgress:
 class TestStreakCalculations:
     """Test streak tracking functionality."""
 
-    def test_retrieves_training_streaks_from_analytics(self):
-        """Test that training streaks are retrieved from AnalyticsService."""
+    def test_retrieves_training_streaks_from_streak_state(self):
+        """Test that training streaks are read from the streak state row."""
         service = GoalsService()
 
-        # Mock analytics response
-        service.analytics_service.get_consistency_analytics = Mock(
+        service.streak_repo.get_streak = Mock(
             return_value={
-                "streaks": {
-                    "current": 7,
-                    "longest": 14,
-                }
+                "current_streak": 7,
+                "longest_streak": 14,
             }
         )
 
@@ -162,6 +159,7 @@ class TestStreakCalculations:
         assert streaks["current_streak"] == 7
         assert streaks["longest_streak"] == 14
         assert streaks["last_updated"] == "2026-01-22"
+        service.streak_repo.get_streak.assert_called_once_with(1, "training")
 
     def test_calculates_goal_completion_streaks(self):
         """Test calculation of consecutive weeks hitting all goals."""
@@ -0,0 +1,62 @@
+"""Per-session HR line — packed codec, lazy view, LTTB downsampling (pure, no DB)."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from rivaflow.core.hr_series import HRSeries, decode, encode, lttb, pack
+
+
+def test_codec_round_trip():
+    pairs = [[0, 92], [60, 118], [60, 119], [200_000, 255]]
+    assert decode(encode(pairs)) == pairs
+
+
+def test_codec_clamps_bpm_and_handles_empty():
+    assert decode(encode([[0, 300], [1, -4]])) == [[0, 255], [1, 0]]
+    assert decode(encode([])) == []
+
+
+def test_codec_rejects_unsorted_offsets():
+    with pytest.raises(ValueError):
+        encode([[60, 100], [0, 100]])
+
+
+def test_pack_sorts_offsets_and_drops_negative():
+    assert decode(pack([[120, 110], [-60, 80], [0, 90], [60, 100]])) == [
+        [0, 90],
+        [60, 100],
+        [120, 110],
+    ]
+
+
+def test_packed_is_smaller_than_json():
+    pairs = [[i * 60, 120 + i % 40] for i in range(480)]
+    assert len(encode(pairs)) < len(json.dumps(pairs)) / 4
+
+
+def test_lazy_view_decodes_once_and_reads_legacy_json():
+    view = HRSeries(encode([[0, 90], [60, 100]]))
+    assert view.pairs == [[0, 90], [60, 100]]
+    assert view.pairs is view.pairs
+    assert HRSeries("[[0, 90]]").pairs == [[0, 90]]
+    assert not HRSeries(None) and HRSeries(None).pairs == []
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    pairs = [[i, 100] for i in range(1000)]
+    pairs[437][1] = 190
+    pairs[801][1] = 40
+    out = lttb(pairs, 50)
+    assert len(out) == 50
+    assert out[0] == pairs[0] and out[-1] == pairs[-1]
+    assert [437, 190] in out and [801, 40] in out
+    assert [p[0] for p in out] == sorted(p[0] for p in out)
+
+
+def test_lttb_passthrough_when_small():
+    pairs = [[0, 1], [1, 2], [2, 3]]
+    assert lttb(pairs, 10) == pairs
+    assert lttb(pairs, 2) == pairs
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import random
+from cmath import exp
 from math import pi, sin, sqrt
 
 import pytest
 
+from rivaflow.core.fft import fft
 from rivaflow.core.hrv_spectral import (
     MIN_BEATS,
     frequency_domain,
+    lomb_scargle,
     poincare,
     sdnn,
 )
@@ -80,3 +84,64 @@ def test_sdnn_none_on_too_few():
 
 def test_min_beats_constant_guard():
     assert frequency_domain([1000.0] * (MIN_BEATS - 1)) is None
+
+
+def _noisy_rr(n: int, seed: int = 7) -> list[float]:
+    """Irregular beat times — LF + HF modulation plus jitter, so the sampling is genuinely uneven."""
+    rng = random.Random(seed)
+    return [
+        1000.0
+        + 40.0 * sin(2 * pi * 0.25 * i)
+        + 25.0 * sin(2 * pi * 0.1 * i)
+        + rng.gauss(0, 15)
+        for i in range(n)
+    ]
+
+
+def _times_values(rr: list[float]) -> tuple[list[float], list[float]]:
+    times, t = [], 0.0
+    for x in rr:
+        t += x / 1000.0
+        times.append(t)
+    mean = sum(rr) / len(rr)
+    return times, [x - mean for x in rr]
+
+
+@pytest.mark.parametrize(("method", "rel"), [("recurrence", 1e-9), ("fast", 1e-3)])
+def test_lomb_scargle_engines_match_reference(method, rel):
+    """Every engine reproduces the reference per-frequency periodogram on uneven beat times."""
+    times, values = _times_values(_noisy_rr(400))
+    reference = lomb_scargle(times, values, 0.0033, 0.002, 199, method="reference")
+    powers = lomb_scargle(times, values, 0.0033, 0.002, 199, method=method)
+    peak = max(reference)
+    assert len(powers) == len(reference)
+    for got, want in zip(powers, reference):
+        assert got == pytest.approx(want, rel=rel, abs=rel * peak)
+
+
+def test_frequency_domain_bands_agree_across_methods():
+    rr = _noisy_rr(600)
+    reference = frequency_domain(rr, method="reference")
+    for method in ("recurrence", "fast"):
+        fd = frequency_domain(rr, method=method)
+        assert fd.vlf == pytest.approx(reference.vlf, rel=1e-3)
+        assert fd.lf == pytest.approx(reference.lf, rel=1e-4)
+        assert fd.hf == pytest.approx(reference.hf, rel=1e-4)
+        assert fd.lf_hf == pytest.approx(reference.lf_hf, rel=1e-4)
+
+
+def test_lomb_scargle_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        lomb_scargle([1.0, 2.0], [0.5, -0.5], 0.1, 0.01, 3, method="numpy")
+
+
+def test_fft_matches_direct_dft():
+    rng = random.Random(3)
+    xs = [complex(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(16)]
+    for inverse, sign in ((False, -1), (True, 1)):
+        got = fft(xs, inverse=inverse)
+        for k in range(16):
+            want = sum(x * exp(sign * 2j * pi * k * m / 16) for m, x in enumerate(xs))
+            assert abs(got[k] - want) < 1e-9
+    with pytest.raises(ValueError):
+        fft([0j] * 12)
@@ -0,0 +1,154 @@
+"""B6 tuning harness — incremental baselines, backtest parity with the engine, grid sweep (pure, no DB)."""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from math import log
+from statistics import median
+
+import pytest
+
+from rivaflow.core.prevention import (
+    CUSUM_K,
+    WORSE_WHEN,
+    cusum_positive,
+    evaluate_prevention,
+    mad,
+    robust_baseline,
+    robust_z,
+    slow_drift,
+)
+from rivaflow.core.prevention_tuning import (
+    BASELINE_DAYS,
+    DRIFT_SHORT_DAYS,
+    RollingWindow,
+    backtest_timeline,
+    param_grid,
+    tune,
+)
+
+DAY0 = date(2026, 1, 1)
+
+
+def _user(seed: int, n_days: int = 120, onsets=(60, 100)) -> dict:
+    """Noisy daily signals with RHR up / lnRMSSD down in the two days before each onset."""
+    rng = random.Random(seed)
+    days = []
+    for t in range(n_days):
+        sick = any(0 <= onset - t <= 1 for onset in onsets)
+        days.append(
+            {
+                "day": (DAY0 + timedelta(days=t)).isoformat(),
+                "rhr": rng.gauss(52, 1.5) + (6 if sick else 0),
+                "lnrmssd": log(rng.gauss(60, 5)) - (0.35 if sick else 0),
+                "resp_rate": rng.gauss(14, 0.5) if t % 9 else None,
+                "sleeping_hr": None,
+            }
+        )
+    return {
+        "days": days,
+        "onsets": {(DAY0 + timedelta(days=o)).isoformat() for o in onsets},
+    }
+
+
+def _naive_tiers(days: list[dict]) -> list[dict]:
+    """The engine as a live service would run it: every day, recompute everything from the raw history."""
+    timeline = []
+    for t, row in enumerate(days):
+        readings = {}
+        for name in WORSE_WHEN:
+            if row.get(name) is None:
+                continue
+            history = [d[name] for d in days[max(0, t - BASELINE_DAYS) : t]]
+            base = robust_baseline([v for v in history if v is not None])
+            if base is None:
+                continue
+            worse = []
+            for u in range(t + 1):
+                past = [d[name] for d in days[max(0, u - BASELINE_DAYS) : u]]
+                b = robust_baseline([v for v in past if v is not None])
+                if days[u].get(name) is not None and b is not None:
+                    worse.append(
+                        robust_z(days[u][name], b["median"], b["mad"], WORSE_WHEN[name])
+                    )
+            recent = [d[name] for d in days[max(0, t - DRIFT_SHORT_DAYS + 1) : t + 1]]
+            readings[name] = {
+                "value": row[name],
+                "median": base["median"],
+                "mad": base["mad"],
+                "cusum": cusum_positive(worse, CUSUM_K),
+                "drift": slow_drift(
+                    median([v for v in recent if v is not None]),
+                    base["median"],
+                    base["mad"],
+                    WORSE_WHEN[name],
+                ),
+            }
+        result = evaluate_prevention(readings)
+        if result["available"]:
+            timeline.append({"day": row["day"], "tier": result["tier"]})
+    return timeline
+
+
+def test_rolling_window_matches_statistics():
+    rng = random.Random(3)
+    window = RollingWindow(9)
+    history: list[float | None] = []
+    for _ in range(200):
+        value = None if rng.random() < 0.2 else float(rng.randint(40, 60))
+        window.push(value)
+        history.append(value)
+        live = [v for v in history[-9:] if v is not None]
+        if live:
+            m = median(live)
+            assert window.median() == m
+            assert window.mad(m) == mad(live, m)
+
+
+def test_backtest_matches_engine_recomputed_daily():
+    days = _user(7, n_days=90)["days"]
+    timeline = backtest_timeline(days)
+    assert timeline == _naive_tiers(days)
+    assert {row["tier"] for row in timeline} >= {"green", "amber"}
+
+
+def test_param_grid():
+    grid = param_grid(amber_z=[1.25, 1.5], cusum_h=[3.0, 4.0, 5.0])
+    assert len(grid) == 6
+    assert {p["red_z"] for p in grid} == {2.0}
+    with pytest.raises(ValueError):
+        param_grid(amber=[1.0])
+
+
+def test_tune_ranks_grid_and_pool_matches_inline():
+    users = [_user(seed) for seed in range(4)]
+    off = 1e9
+    grid = param_grid(
+        amber_z=[1.5, off], red_z=[2.0, off], cusum_h=[4.0, off], drift_delta=[1.0, off]
+    )
+
+    inline = tune(users, grid, workers=0)
+    pooled = tune(users, grid, workers=2)
+    assert pooled == inline
+
+    best = inline[0]
+    assert best["users"] == 4 and best["onsets_tagged"] == 8
+    assert best["detection_rate"] > 0.5
+    # With every threshold out of reach the engine never fires
+    (silent,) = [
+        r
+        for r in inline
+        if all(
+            r["params"][p] == off
+            for p in ("amber_z", "red_z", "cusum_h", "drift_delta")
+        )
+    ]
+    assert silent["onsets_detected"] == silent["false_ambers"] == 0
+    assert inline.index(silent) > 0
+
+
+def test_tune_defaults_to_shipped_constants():
+    (result,) = tune([_user(1)], workers=0)
+    assert result["params"]["amber_z"] == 1.5
+    assert result["days_backtested"] > 0
@@ -0,0 +1,72 @@
+"""Wave 3.5 spectral respiratory rate — pure-core tests (no DB)."""
+
+from __future__ import annotations
+
+import random
+from math import pi, sin
+
+import pytest
+
+from rivaflow.core.fft import rfft_power
+from rivaflow.core.respiratory_spectral import (
+    MAX_WINDOW_SEC,
+    estimate_night,
+    estimate_respiratory_rate,
+)
+
+
+def _rsa_rr(
+    n: int, breath_hz: float, noise: float = 10.0, seed: int = 5
+) -> list[float]:
+    """RR series (ms) whose beat-to-beat value oscillates at the breathing frequency in real beat time."""
+    rng = random.Random(seed)
+    out, t = [], 0.0
+    for _ in range(n):
+        rr = 950.0 + 45.0 * sin(2 * pi * breath_hz * t) + rng.gauss(0, noise)
+        out.append(rr)
+        t += rr / 1000.0
+    return out
+
+
+@pytest.mark.parametrize("breath_hz", [0.15, 0.25, 0.33])
+def test_recovers_breathing_rate(breath_hz):
+    est = estimate_respiratory_rate(_rsa_rr(400, breath_hz))
+    assert est is not None
+    assert est.rpm == pytest.approx(60.0 * breath_hz, abs=0.3)
+    assert est.n_windows > 1  # Welch-averaged, not a single periodogram
+
+
+def test_noisy_signal_still_peaks_at_breathing_rate():
+    est = estimate_respiratory_rate(_rsa_rr(600, 0.2, noise=35.0))
+    assert est.rpm == pytest.approx(12.0, abs=0.5)
+
+
+def test_window_longer_than_five_minutes_is_used():
+    """The old 5-minute DFT cost cap is lifted — a 12-minute segment feeds the whole spectrum."""
+    est = estimate_respiratory_rate(_rsa_rr(760, 0.25))
+    assert 300.0 < est.window_sec <= MAX_WINDOW_SEC
+
+
+def test_short_segment_returns_none():
+    assert estimate_respiratory_rate(_rsa_rr(50, 0.25)) is None
+    assert estimate_respiratory_rate([]) is None
+
+
+def test_estimate_night_one_estimate_per_clean_segment():
+    """A dropout splits the night; each clean stretch gets its own estimate and short ones are skipped."""
+    night = (
+        _rsa_rr(300, 0.25)
+        + [3000.0]
+        + _rsa_rr(40, 0.3, seed=6)
+        + [200.0]
+        + _rsa_rr(400, 0.18, seed=7)
+    )
+    estimates = estimate_night(night)
+    assert [round(e.rpm) for e in estimates] == [15, 11]
+
+
+def test_rfft_power_puts_pure_tone_in_its_bin():
+    size = 64
+    power = rfft_power([sin(2 * pi * 5 * i / size) for i in range(size)], size)
+    assert len(power) == size // 2 + 1
+    assert max(range(len(power)), key=power.__getitem__) == 5
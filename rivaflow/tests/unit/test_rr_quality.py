@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import random
 from math import log
 
 import pytest
@@ -11,6 +12,7 @@ from rivaflow.core.rr_quality import (
     MAX_ARTIFACT_FRACTION,
     RR_MAX_MS,
     RR_MIN_MS,
+    RRQualityStream,
     assess_rr,
     clean_segments,
     ln_rmssd,
@@ -128,3 +130,74 @@ def test_empty_series():
     assert q.n_raw == 0
     assert q.usable is False
     assert q.artifact_pct == 100.0
+
+
+def _artifact_series(n: int, seed: int) -> list[float | None]:
+    """Physiological RR with ectopic jumps, out-of-band spikes, short dropouts and the odd None."""
+    rng = random.Random(seed)
+    out: list[float | None] = []
+    base = 950.0
+    for _ in range(n):
+        base = min(max(base + rng.gauss(0, 8), 700.0), 1200.0)
+        roll = rng.random()
+        if roll < 0.04:
+            out.append(base * rng.choice([0.6, 1.5]))  # ectopic / missed beat
+        elif roll < 0.06:
+            out.append(rng.choice([200.0, 2500.0]))  # out of band
+        elif roll < 0.07:
+            out.extend([3000.0] * rng.randint(2, 6))  # dropout run
+        elif roll < 0.075:
+            out.append(None)
+        else:
+            out.append(base)
+    return out
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_stream_matches_batch_for_any_chunking(seed):
+    """Pushing the series in random chunks yields exactly the batch assess_rr + clean_segments output."""
+    series = [2500.0, 300.0] + _artifact_series(
+        800, seed
+    )  # flagged run at the very start
+    rng = random.Random(seed)
+    stream = RRQualityStream(rmssd_window=50)
+    beats, corrected, segments = [], [], []
+    i = 0
+    while i < len(series):
+        size = rng.randint(1, 40)
+        update = stream.push(series[i : i + size])
+        beats += update.beats
+        corrected += update.corrected_idx
+        segments += update.segments
+        i += size
+    final = stream.close()
+    beats += final.beats
+    segments += final.segments
+
+    batch = assess_rr(series)
+    assert beats == batch.cleaned
+    assert corrected == batch.corrected_idx
+    assert stream.n_flagged == batch.n_flagged
+    assert stream.artifact_pct == batch.artifact_pct
+    assert stream.as_meta() == batch.as_meta()
+    assert segments == clean_segments(series)
+    assert stream.rmssd == rmssd(batch.cleaned)
+    assert stream.ln_rmssd == ln_rmssd(batch.cleaned)
+    assert stream.rolling_rmssd == pytest.approx(rmssd(batch.cleaned[-51:]))
+
+
+def test_stream_drops_trailing_flagged_run_and_rejects_push_after_close():
+    stream = RRQualityStream()
+    update = stream.push([900.0, 910.0, 2500.0, 2500.0])
+    assert update.beats == [900.0, 910.0]
+    assert stream.close().beats == []
+    assert stream.artifact_pct == 50.0
+    with pytest.raises(ValueError):
+        stream.push([900.0])
+
+
+def test_stream_empty_is_unusable():
+    stream = RRQualityStream()
+    assert stream.artifact_pct == 100.0
+    assert stream.rmssd is None
+    assert stream.usable is False
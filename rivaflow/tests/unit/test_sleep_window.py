@@ -132,3 +132,28 @@ def test_personal_threshold_offset_accepts_callable_source():
     offset_list, version_list = sw.personal_threshold_offset(nights)
     offset_callable, version_callable = sw.personal_threshold_offset(lambda: nights)
     assert (offset_list, version_list) == (offset_callable, version_callable)
+
+
+# ── integer-epoch bucketing matches bucket_hr ──────────────────────────────────
+
+
+def test_night_bucket_medians_ms_matches_bucket_hr():
+    from array import array
+    from datetime import UTC, datetime, timedelta
+
+    rng = random.Random(7)
+    t0 = datetime(2025, 3, 1, 18, 0, 3, tzinfo=UTC)
+    offsets = sorted(rng.randrange(0, 18 * 3600 * 1000) for _ in range(4000))
+    bpm = [rng.choice([0, 50, 55, 61, 70]) for _ in offsets]
+    base = round(t0.timestamp() * 1000)
+    ts_ms = array("q", (base + o for o in offsets))
+
+    expected, _, _ = sw.bucket_hr(
+        [
+            (t0 + timedelta(milliseconds=o), b)
+            for o, b in zip(offsets, bpm, strict=True)
+            if b
+        ]
+    )
+    assert sw.night_bucket_medians_ms(ts_ms, array("H", bpm), 0, len(ts_ms)) == expected
+    assert sw.night_bucket_medians_ms(ts_ms, array("H", bpm), 5, 5) == {}
@@ -7,8 +7,11 @@ import pytest
 from rivaflow.core.strain_fit import (
     MIN_STATE_DAYS,
     MULT_CLAMP,
+    DoseStats,
     _fit_multipliers_from_samples,
+    _ols_zero_crossing,
     apply_env_strain_policy,
+    fit_multipliers_from_stats,
 )
 from rivaflow.core.strain_target import (
     STATE_MULTIPLIER,
@@ -220,3 +223,68 @@ def test_env_flag_fit_failure_never_raises_and_keeps_current_policy():
         1, fit_fn=failing_fit, env={"WHOOP_STRAIN_POLICY": "fitted"}
     )
     assert policy.version == "strain-heuristic-v1"  # untouched, never raised
+
+
+# --- (h) incremental sufficient statistics -----------------------------------
+
+
+def _stats_from(pairs, forget: float = 1.0) -> DoseStats:
+    st = DoseStats()
+    for x, y in pairs:
+        st.decay(forget)
+        st.add(x, y)
+    return st
+
+
+def test_dose_stats_match_batch_ols_without_forgetting():
+    pairs = [
+        (0.6 + 0.1 * i, 0.05 - 0.04 * i + (0.01 if i % 3 else -0.02)) for i in range(12)
+    ]
+    crossing, r2 = _stats_from(pairs).fit()
+    expected_crossing, expected_r2 = _ols_zero_crossing(pairs)
+    assert crossing == pytest.approx(expected_crossing)
+    assert r2 == pytest.approx(expected_r2)
+
+
+def test_dose_stats_forgetting_is_weighted_ols():
+    pairs = [
+        (0.5 + 0.1 * i, (-1.0 if i < 6 else -3.0) * (0.5 + 0.1 * i - 1.0))
+        for i in range(12)
+    ]
+    forget = 0.8
+    weights = [forget ** (len(pairs) - 1 - i) for i in range(len(pairs))]
+    w = sum(weights)
+    mx = sum(wi * x for wi, (x, _) in zip(weights, pairs)) / w
+    my = sum(wi * y for wi, (_, y) in zip(weights, pairs)) / w
+    slope = sum(wi * (x - mx) * (y - my) for wi, (x, y) in zip(weights, pairs)) / sum(
+        wi * (x - mx) ** 2 for wi, (x, _) in zip(weights, pairs)
+    )
+    crossing, _ = _stats_from(pairs, forget).fit()
+    assert crossing == pytest.approx(mx - my / slope)
+
+
+def test_dose_stats_degenerate_and_empty():
+    assert DoseStats().fit() == (None, 0.0)
+    assert _stats_from([(1.1, 0.1 * i) for i in range(MIN_STATE_DAYS)]).fit()[0] is None
+
+
+def test_fit_from_stats_carries_r2_into_prescriptions():
+    stats = {
+        state: _stats_from(_linear_samples(-2.0, xing))
+        for state, xing in {"Prime": 1.3, "Balanced": 0.9}.items()
+    }
+    stats["Strained"] = DoseStats()
+    stats["Rundown"] = DoseStats()
+    policy, report = fit_multipliers_from_stats(stats)
+
+    assert policy.multipliers["Prime"] == pytest.approx(1.3, abs=0.01)
+    assert report["Strained"]["reason"] == "insufficient_data"
+    assert policy.r2 == {"Prime": 1.0, "Balanced": 1.0}
+
+    r = prescribe_strain("Balanced", chronic_load=10.0, policy=policy)
+    assert r["target_load"] == pytest.approx(9.0)
+    assert r["policy_r2"] == 1.0
+    assert r["policy_version"] == "strain-fitted-v1"
+    # The per-call policy never touches the active one
+    assert "policy_r2" not in prescribe_strain("Balanced", chronic_load=10.0)
+    assert get_strain_policy().version == "strain-heuristic-v1"
@@ -0,0 +1,40 @@
+"""Server-side GATT decoder for whoop_raw_frames (pure, no DB)."""
+
+from __future__ import annotations
+
+from rivaflow.core.whoop_frames import decode_day, decode_heart_rate
+
+
+def test_heart_rate_uint8_without_rr():
+    assert decode_heart_rate(bytes([0x00, 62])) == (62, [])
+
+
+def test_heart_rate_uint16_with_energy_and_rr():
+    # flags: uint16 HR | energy present | RR present, then HR 300, energy 7, RR 1024 and 512 (1/1024 s)
+    payload = bytes([0x19, 0x2C, 0x01, 0x07, 0x00, 0x00, 0x04, 0x00, 0x02])
+    assert decode_heart_rate(payload) == (300, [1000, 500])
+
+
+def test_heart_rate_truncated():
+    assert decode_heart_rate(b"") is None
+    assert decode_heart_rate(bytes([0x01, 0x3C])) is None
+
+
+def test_decode_day_routes_by_characteristic():
+    frames = [
+        (1000, "2a37", "103c0004"),  # 60 bpm, one 1000 ms beat
+        (2000, "00002a37-0000-1000-8000-00805f9b34fb", "0040"),  # 64 bpm, no RR
+        (3000, "0x2A19", "55"),  # 85 % battery
+        (4000, "fd4b0002-cce1-4033-93ce-002d5875f58a", "aa0102"),  # proprietary
+        (5000, "2a37", ""),  # truncated
+    ]
+    day = decode_day(frames)
+    assert day.hr == [(1000, 60), (2000, 64)]
+    assert day.rr == [(1000, 1000)]
+    assert day.battery == [(3000, 85)]
+    assert (day.frames, day.undecoded) == (5, 2)
+    assert day.covered == {"hr", "rr", "battery"}
+
+
+def test_decode_day_without_rr_does_not_claim_rr():
+    assert decode_day([(0, "2a37", "0040")]).covered == {"hr"}
@@ -394,9 +394,11 @@ class TestExportCommand:
     """Tests for data export command."""
 
     def test_export_creates_file(
-        self, temp_db, test_user, session_factory, monkeypatch
+        self, temp_db, test_user, session_factory, monkeypatch, tmp_path
     ):
         """Test that export creates a JSON file."""
+        # The default output path is relative to the working directory
+        monkeypatch.chdir(tmp_path)
         monkeypatch.setattr(
             "rivaflow.cli.utils.user_context.get_current_user_id",
             lambda: test_user["id"],
@@ -408,3 +410,4 @@ class TestExportCommand:
 
         assert result.exit_code == 0
         assert "export" in result.output.lower() or ".json" in result.output.lower()
+        assert len(list(tmp_path.glob("rivaflow_export_*.json"))) == 1
@@ -15,8 +15,10 @@ from rivaflow.core.utils.cache import get_cache
 def _clear_analytics_cache():
     """Clear the in-memory analytics cache before each test to prevent stale data."""
     get_cache().clear()
+    reset_glossary_index()
     yield
     get_cache().clear()
+    reset_glossary_index()
 
 
 # Set required environment variables for testing
@@ -28,6 +30,7 @@ if not os.environ.get("DATABASE_URL"):
     )
 
 from rivaflow.core.auth import create_access_token, hash_password  # noqa: E402
+from rivaflow.core.services.glossary_index import reset_glossary_index
 
 # Shared test password constant — used across all test files
 TEST_PASSWORD = "TestPass123!secure"
@@ -1,6 +1,7 @@
 """Integration tests for analytics endpoints."""
 
 from datetime import date, timedelta
+from unittest.mock import patch
 
 
 class TestPerformanceOverview:
@@ -105,6 +106,38 @@ class TestConsistencyAnalytics:
         assert response.status_code == 200
 
 
+class TestTrainingCalendar:
+    """Training calendar endpoint tests."""
+
+    def test_calendar_served_from_stored_bitmap(self, authenticated_client, test_user):
+        """Test the calendar reads the stored per-year bitmap, not session rows."""
+        from rivaflow.db.repositories.session_repo import SessionRepository
+        from rivaflow.db.repositories.training_calendar_repo import (
+            TrainingCalendarRepository,
+        )
+
+        SessionRepository.create(
+            user_id=test_user["id"],
+            session_date=date(2025, 3, 2),
+            class_type="gi",
+            gym_name="Test Gym",
+            intensity=4,
+        )
+        TrainingCalendarRepository.get_years(test_user["id"], [2025])
+
+        with patch.object(SessionRepository, "get_by_date_range") as by_range:
+            response = authenticated_client.get(
+                "/api/v1/analytics/training-calendar",
+                params={"start_date": "2025-03-01", "end_date": "2025-03-03"},
+            )
+
+        assert response.status_code == 200
+        by_range.assert_not_called()
+        body = response.json()
+        assert [d["count"] for d in body["calendar"]] == [0, 1, 0]
+        assert body["total_active_days"] == 1
+
+
 class TestMilestones:
     """Milestones endpoint tests."""
 
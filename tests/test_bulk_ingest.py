@@ -0,0 +1,125 @@
+"""Tests for the bulk wearable ingest paths (WHOOP raw frames, Garmin daily batches)."""
+
+import hashlib
+
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.garmin_daily_repo import GarminDailyRepository
+from rivaflow.db.repositories.whoop_repo import WhoopRepository
+
+
+def _frames(n: int, start: int = 0) -> list[dict]:
+    return [
+        {
+            "ts": f"2025-03-01T00:{(start + i) // 60:02d}:{(start + i) % 60:02d}Z",
+            "char_uuid": "2a37",
+            "hex": f"00{(50 + (start + i) % 100):02X}",
+            "seq": start + i,
+            "session_id": "s\\1\t",  # exercises COPY escaping
+        }
+        for i in range(n)
+    ]
+
+
+class TestRawFrameIngest:
+    """COPY + INSERT ... SELECT returns exact counts and hashes like the old per-row path."""
+
+    def test_counts_inserted_deduped_and_rejected(self, temp_db, test_user):
+        user_id = test_user["id"]
+        first = WhoopRepository.ingest_raw_frames(user_id, _frames(1500))
+        assert first == {
+            "received": 1500,
+            "inserted": 1500,
+            "deduped": 0,
+            "rejected": 0,
+        }
+
+        retry = _frames(20, start=1490) + [{"ts": "2025-03-01T01:00:00Z", "hex": "abc"}]
+        retry.append({**retry[0], "char_uuid": "2a37"})  # duplicate within the batch
+        assert WhoopRepository.ingest_raw_frames(user_id, retry) == {
+            "received": 21,
+            "inserted": 10,
+            "deduped": 11,
+            "rejected": 1,
+        }
+
+    def test_stored_hash_and_fields(self, temp_db, test_user):
+        user_id = test_user["id"]
+        WhoopRepository.ingest_raw_frames(user_id, _frames(1))
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query(
+                    "SELECT frame_sha256, frame_hex, session_id, seq FROM whoop_raw_frames "
+                    "WHERE user_id = ?"
+                ),
+                (user_id,),
+            )
+            row = cursor.fetchone()
+        assert row["frame_hex"] == "0032"
+        assert row["frame_sha256"] == hashlib.sha256(b"0032").hexdigest()
+        assert row["session_id"] == "s\\1\t"
+        assert row["seq"] == 0
+
+    def test_empty_batch(self, temp_db, test_user):
+        assert WhoopRepository.ingest_raw_frames(test_user["id"], []) == {
+            "received": 0,
+            "inserted": 0,
+            "deduped": 0,
+            "rejected": 0,
+        }
+
+    def test_insert_ignore_counts_exactly(self, temp_db, test_user):
+        user_id = test_user["id"]
+        samples = [{"ts": f"2025-03-01T00:00:{s:02d}Z", "soc": 90} for s in range(30)]
+        assert WhoopRepository.ingest_battery(user_id, samples) == 30
+        assert WhoopRepository.ingest_battery(user_id, samples[:5]) == 0
+        assert WhoopRepository.add_tag(user_id, "2025-03-01", "travel") == 1
+        assert WhoopRepository.add_tag(user_id, "2025-03-01", "travel") == 0
+
+
+class TestGarminDailyBatch:
+    """Many days upsert in one statement with the per-day COALESCE semantics."""
+
+    def test_upsert_many_counts_and_merges(self, temp_db, test_user):
+        user_id = test_user["id"]
+        GarminDailyRepository.upsert(user_id, "2025-03-01", rhr=50, steps=9000)
+
+        counts = GarminDailyRepository.upsert_many(
+            user_id,
+            [
+                {"metric_date": "2025-03-01", "rhr": 48},
+                {"metric_date": "2025-03-02", "rhr": 52, "hrv_ms": 60},
+                {"metric_date": "2025-03-02", "steps": 4000},
+            ],
+        )
+        assert counts == {"inserted": 1, "updated": 1}
+
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query(
+                    "SELECT metric_date, rhr, hrv_ms, steps FROM garmin_daily "
+                    "WHERE user_id = ? ORDER BY metric_date"
+                ),
+                (user_id,),
+            )
+            rows = [
+                (str(r["metric_date"]), r["rhr"], r["hrv_ms"], r["steps"])
+                for r in cursor.fetchall()
+            ]
+        assert rows == [("2025-03-01", 48, None, 9000), ("2025-03-02", 52, 60, 4000)]
+
+    def test_batch_endpoint(self, authenticated_client, test_user):
+        metrics = [
+            {"metric_date": f"2025-01-{d:02d}", "rhr": 50 + d % 5} for d in range(1, 32)
+        ]
+        response = authenticated_client.post(
+            "/api/v1/garmin/daily", json={"metrics": metrics}
+        )
+        assert response.status_code == 200
+        assert response.json() == {"upserted": 31, "inserted": 31, "updated": 0}
+
+        response = authenticated_client.post(
+            "/api/v1/garmin/daily", json={"metrics": metrics[:3]}
+        )
+        assert response.json() == {"upserted": 3, "inserted": 0, "updated": 3}
@@ -8,10 +8,11 @@ candidates. Candidates only: evidence stays human-confirmed.
 from unittest.mock import MagicMock, patch
 
 from rivaflow.core.services.curriculum_service import CurriculumService
+from rivaflow.core.services.glossary_index import GlossaryIndex
 
 _TECH = "rivaflow.db.repositories.session_technique_repo.SessionTechniqueRepository"
 _ROLL = "rivaflow.db.repositories.session_roll_repo.SessionRollRepository"
-_GLOSS = "rivaflow.db.repositories.GlossaryRepository"
+_GLOSS = "rivaflow.core.services.glossary_index.get_glossary_index"
 
 _MOVEMENTS = [
     {"id": 34, "name": "Armbar", "aliases": '["Juji Gatame"]'},
@@ -56,10 +57,13 @@ def _service(slots=None, evidence=None):
 
 
 def _derive(svc, techniques, rolls):
-    with patch(_TECH) as tech, patch(_ROLL) as roll, patch(_GLOSS) as gloss:
+    with (
+        patch(_TECH) as tech,
+        patch(_ROLL) as roll,
+        patch(_GLOSS, return_value=GlossaryIndex(_MOVEMENTS)),
+    ):
         tech.get_by_session_id.return_value = techniques
         roll.get_by_session_id.return_value = rolls
-        gloss.list_all.return_value = _MOVEMENTS
         return svc.derive_evidence_candidates(user_id=4, session_id=99)
 
 
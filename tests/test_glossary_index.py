@@ -0,0 +1,121 @@
+"""Tests for GlossaryIndex — shared glossary lookups and versioned reload."""
+
+from unittest.mock import patch
+
+from rivaflow.core.services.glossary_index import GlossaryIndex, get_glossary_index
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.glossary_repo import GlossaryRepository
+
+_MOVEMENTS = [
+    {
+        "id": 3,
+        "name": "Armbar",
+        "category": "submission",
+        "description": "Hyperextend the elbow",
+        "aliases": '["Juji Gatame", "Arm Bar"]',
+    },
+    {
+        "id": 7,
+        "name": "Triangle Choke",
+        "category": "submission",
+        "description": None,
+        "aliases": ["Sankaku"],
+    },
+    {"id": 12, "name": "Knee Cut", "category": "pass", "aliases": None},
+]
+
+
+class TestGlossaryIndex:
+    """Lookups over one glossary snapshot."""
+
+    def test_resolve_by_folded_name_then_alias(self):
+        index = GlossaryIndex(_MOVEMENTS)
+
+        assert index.resolve("ARM-BAR")["id"] == 3
+        assert index.resolve("juji gatame")["id"] == 3
+        assert index.resolve("sankaku")["id"] == 7
+        assert index.resolve("kimura") is None
+        assert index.resolve("  ") is None
+
+    def test_maps_by_id_and_category(self):
+        index = GlossaryIndex(_MOVEMENTS)
+
+        assert index.get(12)["name"] == "Knee Cut"
+        assert index.get(99) is None
+        assert [m["id"] for m in index.by_category["submission"]] == [3, 7]
+
+    def test_keys_for_includes_aliases(self):
+        index = GlossaryIndex(_MOVEMENTS)
+
+        assert index.keys_for(3) == {"armbar", "jujigatame"}
+        assert index.keys_for(99) == set()
+
+    def test_search_matches_name_description_and_alias_any_case(self):
+        index = GlossaryIndex(_MOVEMENTS)
+
+        assert [m["id"] for m in index.search("ELBOW")] == [3]
+        assert [m["id"] for m in index.search("sank")] == [7]
+        assert [m["id"] for m in index.search("E")] == [3, 7, 12]
+
+
+class TestSharedIndex:
+    """The process-wide index reloads only when the glossary changes."""
+
+    def test_reused_until_glossary_write(self, temp_db):
+        first = get_glossary_index()
+        with patch.object(GlossaryRepository, "list_all") as list_all:
+            assert get_glossary_index() is first
+            list_all.assert_not_called()
+
+        movement = GlossaryRepository.create_custom(
+            name="Worm Guard Sweep", category="sweep"
+        )
+
+        reloaded = get_glossary_index()
+        assert reloaded is not first
+        assert reloaded.resolve("worm guard sweep")["id"] == movement["id"]
+
+    def test_custom_create_and_delete_bump_stored_version(self, temp_db):
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query(
+                    "INSERT INTO glossary_version (id, version) VALUES (?, ?)"
+                ),
+                (1, 1),
+            )
+
+        movement = GlossaryRepository.create_custom(
+            name="Worm Guard Sweep", category="sweep"
+        )
+        assert GlossaryRepository.get_version() == 2
+
+        assert GlossaryRepository.delete_custom(movement["id"]) is True
+        assert GlossaryRepository.get_version() == 3
+        assert GlossaryRepository.delete_custom(movement["id"]) is False
+        assert GlossaryRepository.get_version() == 3
+
+    def test_seed_and_video_update_bump_stored_version(self, temp_db):
+        from rivaflow.db.seed_glossary import seed_glossary
+        from rivaflow.db.update_glossary_videos import update_video_urls
+
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(convert_query("DELETE FROM movements_glossary"))
+            cursor.execute(
+                convert_query(
+                    "INSERT INTO glossary_version (id, version) VALUES (?, ?)"
+                ),
+                (1, 1),
+            )
+        first = get_glossary_index()
+
+        seed_glossary()
+        assert GlossaryRepository.get_version() == 2
+        seeded = get_glossary_index()
+        assert seeded is not first
+        assert seeded.resolve("armbar") is not None
+
+        update_video_urls()
+        assert GlossaryRepository.get_version() == 3
+        assert get_glossary_index() is not seeded
@@ -0,0 +1,123 @@
+"""Tests for the versioned, per-section cache behind the Grapple system prompt."""
+
+from datetime import date
+
+import pytest
+from rivaflow.core.services.grapple.context_builder import GrappleContextBuilder
+from rivaflow.db.repositories.checkin_repo import CheckinRepository
+from rivaflow.db.repositories.coach_preferences_repo import (
+    CoachPreferencesRepository,
+)
+from rivaflow.db.repositories.grading_repo import GradingRepository
+from rivaflow.db.repositories.grapple_context_repo import GrappleContextRepository
+from rivaflow.db.repositories.profile_repo import ProfileRepository
+from rivaflow.db.repositories.readiness_repo import ReadinessRepository
+from rivaflow.db.repositories.session_repo import SessionRepository
+
+PRODUCERS = {
+    "directives": "_build_directives",
+    "profile": "_build_profile_section",
+    "timetable": "_build_timetable_section",
+    "streak": "_build_streak_section",
+    "sessions": "_build_sessions_section",
+    "readiness": "_build_readiness_section",
+    "checkins": "_build_checkin_context",
+    "deep_analytics": "_build_deep_analytics_context",
+    "physiology": "_build_physiology_context",
+    "curriculum": "_build_curriculum_context",
+}
+UNCACHED = {"physiology", "curriculum"}
+
+
+@pytest.fixture
+def built(monkeypatch):
+    """Names of the sections actually produced, reset per assertion by the test."""
+    calls: list[str] = []
+    for name, attr in PRODUCERS.items():
+        original = getattr(GrappleContextBuilder, attr)
+
+        def spy(self, *a, _name=name, _original=original, **k):
+            calls.append(_name)
+            return _original(self, *a, **k)
+
+        monkeypatch.setattr(GrappleContextBuilder, attr, spy)
+    return calls
+
+
+def _log_session(user_id: int, gym: str = "Test Academy") -> int:
+    return SessionRepository.create(
+        user_id=user_id,
+        session_date=date.today(),
+        class_type="gi",
+        gym_name=gym,
+    )
+
+
+def _prompt(user_id: int, built: list[str]) -> tuple[str, set[str]]:
+    built.clear()
+    prompt = GrappleContextBuilder(user_id).build_system_prompt()
+    return prompt, set(built)
+
+
+def test_follow_up_turn_rebuilds_only_uncached_sections(temp_db, test_user, built):
+    user_id = test_user["id"]
+    _log_session(user_id)
+    first, produced = _prompt(user_id, built)
+    assert produced == set(PRODUCERS)
+
+    again, produced = _prompt(user_id, built)
+    assert again == first
+    assert produced == UNCACHED
+
+
+def test_session_write_rebuilds_only_session_sections(temp_db, test_user, built):
+    user_id = test_user["id"]
+    _log_session(user_id)
+    _prompt(user_id, built)
+
+    _log_session(user_id, gym="Second Gym")
+    prompt, produced = _prompt(user_id, built)
+    assert "Second Gym" in prompt
+    assert produced == {"streak", "sessions", "deep_analytics"} | UNCACHED
+
+
+def test_readiness_write_rebuilds_readiness_sections(temp_db, test_user, built):
+    user_id = test_user["id"]
+    _log_session(user_id)
+    _prompt(user_id, built)
+
+    ReadinessRepository.upsert(
+        user_id, date.today(), sleep=4, stress=2, soreness=2, energy=5
+    )
+    prompt, produced = _prompt(user_id, built)
+    assert "Energy 5/5" in prompt
+    assert produced == {"readiness", "checkins", "deep_analytics"} | UNCACHED
+
+
+def test_coach_preferences_write_rebuilds_directives(temp_db, test_user, built):
+    user_id = test_user["id"]
+    _prompt(user_id, built)
+
+    CoachPreferencesRepository.upsert(user_id, weaknesses="Guard retention")
+    prompt, produced = _prompt(user_id, built)
+    assert "Self-identified weaknesses: Guard retention" in prompt
+    # With no sessions logged, the uncached sections are built but go unused
+    assert produced == {"directives", "profile"} | UNCACHED
+
+
+def test_domain_writes_bump_their_versions(temp_db, test_user):
+    user_id = test_user["id"]
+    assert set(GrappleContextRepository.get_versions(user_id).values()) == {0}
+
+    ProfileRepository.update(user_id, default_gym="Home Gym")
+    GradingRepository.create(user_id, grade="Blue", date_graded="2026-01-10")
+    CheckinRepository.upsert_checkin(user_id, date.today(), "rest")
+    session_id = _log_session(user_id)
+    SessionRepository.delete(user_id, session_id)
+
+    assert GrappleContextRepository.get_versions(user_id) == {
+        "sessions": 2,
+        "readiness": 1,
+        "profile": 2,
+        "coach_prefs": 0,
+    }
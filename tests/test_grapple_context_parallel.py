@@ -0,0 +1,131 @@
+"""Tests for concurrent, time-boxed assembly of the Grapple system prompt."""
+
+import threading
+import time
+from datetime import date
+
+import pytest
+import rivaflow.core.services.grapple.context_builder as cb
+from rivaflow.core.services.grapple.context_builder import GrappleContextBuilder
+from rivaflow.core.utils.cache import get_cache
+from rivaflow.db.repositories.session_repo import SessionRepository
+
+
+@pytest.fixture
+def user_with_session(temp_db, test_user):
+    SessionRepository.create(
+        user_id=test_user["id"],
+        session_date=date.today(),
+        class_type="gi",
+        gym_name="Test Academy",
+    )
+    return test_user["id"]
+
+
+def _slow(monkeypatch, name: str, text: str, release: threading.Event | None = None):
+    """Replace a section's producer with one that blocks and then returns ``text``."""
+
+    def producer(self):
+        if release is None:
+            time.sleep(0.3)
+        else:
+            release.wait(5)
+        return text
+
+    monkeypatch.setattr(GrappleContextBuilder, cb.SECTION_PRODUCERS[name][0], producer)
+
+
+def test_sections_are_built_concurrently(user_with_session, monkeypatch):
+    for name in ("readiness", "checkins", "deep_analytics"):
+        _slow(monkeypatch, name, f"{name.upper()} BLOCK")
+
+    started = time.monotonic()
+    prompt = GrappleContextBuilder(user_with_session).build_system_prompt()
+    elapsed = time.monotonic() - started
+
+    assert all(f"{n.upper()} BLOCK" in prompt for n in ("readiness", "checkins"))
+    assert "DEEP_ANALYTICS BLOCK" in prompt
+    assert elapsed < 0.8  # three 0.3 s sections, not run back to back
+
+
+def test_concurrent_builds_do_not_starve_each_other(user_with_session, monkeypatch):
+    """Queueing behind other sections, or another build, never counts as slow."""
+    for name, (attr, _) in cb.SECTION_PRODUCERS.items():
+        original = getattr(GrappleContextBuilder, attr)
+
+        def producer(self, _original=original):
+            time.sleep(0.2)
+            return _original(self)
+
+        monkeypatch.setattr(GrappleContextBuilder, attr, producer)
+        monkeypatch.setitem(cb.SECTION_TIMEOUT_SECONDS, name, 0.5)
+
+    prompts = []
+    builds = [
+        threading.Thread(
+            target=lambda: prompts.append(
+                GrappleContextBuilder(user_with_session).build_system_prompt()
+            )
+        )
+        for _ in range(2)
+    ]
+    for build in builds:
+        build.start()
+    for build in builds:
+        build.join()
+
+    # Ten 0.2 s sections on SECTION_WORKERS threads queue well past 0.5 s
+    assert len(prompts) == 2
+    assert all("Test Academy" in prompt for prompt in prompts)
+    assert not any("unavailable this turn" in prompt for prompt in prompts)
+
+
+def test_slow_section_is_dropped_with_note_and_cached_late(
+    user_with_session, monkeypatch
+):
+    release = threading.Event()
+    _slow(monkeypatch, "deep_analytics", "DEEP BLOCK", release)
+    monkeypatch.setitem(cb.SECTION_TIMEOUT_SECONDS, "deep_analytics", 0.2)
+    builder = GrappleContextBuilder(user_with_session)
+
+    started = time.monotonic()
+    prompt = builder.build_system_prompt()
+    assert time.monotonic() - started < 2
+    assert "DEEP BLOCK" not in prompt
+    assert "Deep analytics data unavailable this turn" in prompt
+    assert "Test Academy" in prompt
+
+    # The dropped section finishes in the background and serves the next turn
+    release.set()
+    key = builder._section_key("deep_analytics")
+    for _ in range(200):
+        if get_cache().get(key) is not None:
+            break
+        time.sleep(0.01)
+    monkeypatch.setattr(
+        GrappleContextBuilder,
+        "_build_deep_analytics_context",
+        lambda self: pytest.fail("rebuilt"),
+    )
+    assert (
+        "DEEP BLOCK" in GrappleContextBuilder(user_with_session).build_system_prompt()
+    )
+
+
+def test_required_section_errors_still_propagate(user_with_session, monkeypatch):
+    def broken(self):
+        raise ConnectionError("db down")
+
+    monkeypatch.setattr(GrappleContextBuilder, "_build_sessions_section", broken)
+    with pytest.raises(ConnectionError):
+        GrappleContextBuilder(user_with_session).build_system_prompt()
+
+
+def test_optional_section_errors_only_drop_their_block(user_with_session, monkeypatch):
+    def broken(self):
+        raise RuntimeError("analytics bug")
+
+    monkeypatch.setattr(GrappleContextBuilder, "_build_deep_analytics_context", broken)
+    prompt = GrappleContextBuilder(user_with_session).build_system_prompt()
+    assert "Test Academy" in prompt
+    assert "Deep analytics data unavailable" not in prompt
@@ -0,0 +1,112 @@
+"""Tests for the nightly HRV lab pipeline."""
+
+import json
+import random
+from datetime import UTC, date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+import rivaflow.core.services.hrv_lab as lab
+from rivaflow.db.repositories.whoop_repo import WhoopRepository
+
+UTC_TZ = ZoneInfo("UTC")
+NIGHT = date(2025, 3, 1)  # its night runs 18:00 Mar 1 -> 12:00 Mar 2
+NOW = datetime(2025, 3, 3, 13, tzinfo=UTC)
+
+
+def _beats(seconds: float, seed: int = 7, jitter: float = 25.0) -> list[int]:
+    rng = random.Random(seed)
+    beats, t = [], 0.0
+    while t < seconds:
+        beats.append(round(rng.gauss(1000, jitter)))
+        t += beats[-1] / 1000
+    return beats
+
+
+def _ingest_night(user_id: int, beats: list[int], start_hour: int = 23) -> None:
+    t = datetime.combine(NIGHT, datetime.min.time(), UTC) + timedelta(hours=start_hour)
+    rows = []
+    for beat in beats:
+        rows.append({"ts": t.isoformat(), "rr_ms": beat})
+        t += timedelta(milliseconds=beat)
+    WhoopRepository.ingest_rr(user_id, rows)
+
+
+@pytest.fixture
+def utc_users(monkeypatch):
+    monkeypatch.setattr(lab, "user_tz", lambda _: UTC_TZ)
+
+
+def test_split_windows_cover_whole_windows_only():
+    segment = [1000.0] * 950
+    windows = lab.split_windows(segment)
+    assert [len(w) for w in windows] == [300, 300, 300]
+    assert all(sum(w) >= lab.WINDOW_SEC * 1000 for w in windows)
+    # a dropout splits the night, and neither side borrows beats from the other
+    assert len(lab.night_windows(segment[:400] + [5000.0] + segment[:400])) == 2
+
+
+def test_analyse_nights_pool_matches_inline(monkeypatch):
+    nights = {("a", 1): _beats(1900, seed=1), ("b", 2): _beats(1600, seed=2)}
+    monkeypatch.setattr(lab, "POOL_MIN_WINDOWS", 2)
+    pooled = lab.analyse_nights(nights, workers=2)
+    inline = lab.analyse_nights(nights, workers=0)
+    assert pooled == inline
+    assert pooled[("a", 1)]["windows"] == 6 and pooled[("b", 2)]["windows"] == 5
+    hf = pooled[("a", 1)]["hf"]
+    assert hf["n"] == 6 and hf["p25"] <= hf["median"] <= hf["p75"]
+    assert hf["min"] <= hf["p25"] and hf["p75"] <= hf["max"]
+    assert pooled[("a", 1)]["resp_rpm"]["median"] > 0
+
+
+def test_alpha1_withheld_from_artifact_heavy_nights():
+    beats = [250] * 100 + _beats(
+        1900
+    )  # ~5% out-of-band beats, one clean run after them
+    summary = lab.analyse_nights({"n": beats}, workers=0)["n"]
+    assert summary["alpha1_gated"] and summary["alpha1"] is None
+    assert summary["sd1"] is not None
+
+
+def test_run_nightly_stores_each_night_once(temp_db, test_user, utc_users):
+    user_id = test_user["id"]
+    _ingest_night(user_id, _beats(1900))
+
+    first = lab.run_nightly(now=NOW, workers=0)
+    assert first == {"users": 1, "nights": 1, "windows": 6}
+    assert lab.run_nightly(now=NOW, workers=0)["nights"] == 0
+
+    rows = WhoopRepository.get_hrv_lab_range(user_id, "2025-03-01", "2025-03-02")
+    assert [r["day"] for r in rows] == ["2025-03-01"]
+    assert rows[0]["lab_version"] == lab.LAB_VERSION
+    assert json.loads(rows[0]["metrics_json"])["windows"] == 6
+
+    # Late beats for the same night make it stale again
+    _ingest_night(user_id, _beats(600, seed=3), start_hour=27)
+    assert lab.run_nightly(now=NOW, workers=0) == {
+        "users": 1,
+        "nights": 1,
+        "windows": 8,
+    }
+
+
+def test_run_nightly_skips_nights_still_in_progress(temp_db, test_user, utc_users):
+    _ingest_night(test_user["id"], _beats(600))
+    before_noon = datetime(2025, 3, 2, 11, tzinfo=UTC)
+    assert lab.run_nightly(now=before_noon, workers=0)["nights"] == 0
+    assert lab.run_nightly(now=NOW, workers=0)["nights"] == 1
+
+
+def test_trend_reads_stored_nights_only(temp_db, test_user, utc_users, monkeypatch):
+    user_id = test_user["id"]
+    _ingest_night(user_id, _beats(1900))
+    lab.run_nightly(now=NOW, workers=0)
+
+    monkeypatch.setattr(lab, "analyse_nights", lambda *a, **k: pytest.fail("compute"))
+    monkeypatch.setattr(
+        WhoopRepository, "rr_series", staticmethod(lambda *a: pytest.fail("raw read"))
+    )
+    trend = lab.trend(user_id, days=7, today=date(2025, 3, 3))
+    assert [n["day"] for n in trend["nights"]] == ["2025-03-01"]
+    assert trend["nights"][0]["hf"] == trend["latest"]["hf"]["median"]
+    assert trend["latest"]["windows"] == 6
@@ -9,51 +9,61 @@ class TestCheckAllMilestones:
     """Tests for check_all_milestones."""
 
     @patch("rivaflow.core.services.milestone_service.StreakRepository")
-    @patch("rivaflow.core.services.milestone_service.SessionRepository")
+    @patch("rivaflow.core.services.milestone_service.TrainingCounterRepository")
     @patch("rivaflow.core.services.milestone_service.MilestoneRepository")
     def test_returns_new_milestones(
-        self, MockMilestoneRepo, MockSessionRepo, MockStreakRepo
+        self, MockMilestoneRepo, MockCounterRepo, MockStreakRepo
     ):
         """Should return list of newly achieved milestones."""
-        MockSessionRepo.get_milestone_totals.return_value = {
-            "total_sessions": 100,
-            "total_rolls": 500,
+        MockCounterRepo.get.return_value = {
+            "sessions": 100,
+            "rolls": 500,
         }
         MockStreakRepo.return_value.get_streak.return_value = {"current_streak": 10}
+        MockMilestoneRepo.return_value.get_highest_achieved_by_type.return_value = {
+            "rolls": 500,
+        }
 
         mock_milestone = {
             "id": 1,
-            "milestone_type": "total_sessions",
+            "milestone_type": "sessions",
             "milestone_value": 100,
-            "milestone_label": "100 Sessions",
+            "milestone_label": "100 Sessions Logged",
         }
         MockMilestoneRepo.return_value.check_and_create_milestone.side_effect = (
-            lambda uid, mt, cv: (mock_milestone if mt == "total_sessions" else None)
+            lambda uid, mt, cv: (mock_milestone if mt == "sessions" else None)
         )
 
         service = MilestoneService()
         result = service.check_all_milestones(user_id=1)
 
         assert len(result) == 1
-        assert result[0]["milestone_type"] == "total_sessions"
+        assert result[0]["milestone_type"] == "sessions"
+        # rolls already at its crossed threshold: no insert attempted
+        checked = [
+            c.args[1]
+            for c in MockMilestoneRepo.return_value.check_and_create_milestone.call_args_list
+        ]
+        assert "rolls" not in checked
 
     @patch("rivaflow.core.services.milestone_service.StreakRepository")
-    @patch("rivaflow.core.services.milestone_service.SessionRepository")
+    @patch("rivaflow.core.services.milestone_service.TrainingCounterRepository")
     @patch("rivaflow.core.services.milestone_service.MilestoneRepository")
     def test_no_new_milestones(
-        self, MockMilestoneRepo, MockSessionRepo, MockStreakRepo
+        self, MockMilestoneRepo, MockCounterRepo, MockStreakRepo
     ):
-        """Should return empty list when no new milestones achieved."""
-        MockSessionRepo.get_milestone_totals.return_value = {
-            "total_sessions": 5,
+        """Should skip the insert path when no threshold was crossed."""
+        MockCounterRepo.get.return_value = {
+            "sessions": 5,
         }
         MockStreakRepo.return_value.get_streak.return_value = {"current_streak": 2}
-        MockMilestoneRepo.return_value.check_and_create_milestone.return_value = None
+        MockMilestoneRepo.return_value.get_highest_achieved_by_type.return_value = {}
 
         service = MilestoneService()
         result = service.check_all_milestones(user_id=1)
 
         assert result == []
+        MockMilestoneRepo.return_value.check_and_create_milestone.assert_not_called()
 
 
 class TestGetCelebrationDisplay:
@@ -85,13 +95,13 @@ class TestGetProgressToNext:
     """Tests for get_progress_to_next."""
 
     @patch("rivaflow.core.services.milestone_service.StreakRepository")
-    @patch("rivaflow.core.services.milestone_service.SessionRepository")
+    @patch("rivaflow.core.services.milestone_service.TrainingCounterRepository")
     @patch("rivaflow.core.services.milestone_service.MilestoneRepository")
     def test_returns_progress_list(
-        self, MockMilestoneRepo, MockSessionRepo, MockStreakRepo
+        self, MockMilestoneRepo, MockCounterRepo, MockStreakRepo
     ):
         """Should return progress toward next milestones."""
-        MockSessionRepo.get_milestone_totals.return_value = {
+        MockCounterRepo.get.return_value = {
             "total_sessions": 80,
         }
         MockStreakRepo.return_value.get_streak.return_value = {"current_streak": 5}
@@ -121,13 +131,13 @@ class TestGetProgressToNext:
         assert sessions_progress[0]["remaining"] == 20
 
     @patch("rivaflow.core.services.milestone_service.StreakRepository")
-    @patch("rivaflow.core.services.milestone_service.SessionRepository")
+    @patch("rivaflow.core.services.milestone_service.TrainingCounterRepository")
     @patch("rivaflow.core.services.milestone_service.MilestoneRepository")
     def test_empty_when_no_next_milestones(
-        self, MockMilestoneRepo, MockSessionRepo, MockStreakRepo
+        self, MockMilestoneRepo, MockCounterRepo, MockStreakRepo
     ):
         """Should return empty list when all milestones achieved."""
-        MockSessionRepo.get_milestone_totals.return_value = {"total_sessions": 9999}
+        MockCounterRepo.get.return_value = {"total_sessions": 9999}
         MockStreakRepo.return_value.get_streak.return_value = {"current_streak": 9999}
         MockMilestoneRepo.return_value.get_next_milestone.return_value = None
 
@@ -190,11 +200,11 @@ class TestGetCurrentTotals:
     """Tests for get_current_totals (public method)."""
 
     @patch("rivaflow.core.services.milestone_service.StreakRepository")
-    @patch("rivaflow.core.services.milestone_service.SessionRepository")
+    @patch("rivaflow.core.services.milestone_service.TrainingCounterRepository")
     @patch("rivaflow.core.services.milestone_service.MilestoneRepository")
-    def test_includes_streak(self, MockMilestoneRepo, MockSessionRepo, MockStreakRepo):
+    def test_includes_streak(self, MockMilestoneRepo, MockCounterRepo, MockStreakRepo):
         """Should include streak from StreakRepository."""
-        MockSessionRepo.get_milestone_totals.return_value = {
+        MockCounterRepo.get.return_value = {
             "total_sessions": 50,
             "total_rolls": 200,
         }
@@ -211,11 +221,11 @@ class TestGetClosestMilestone:
     """Tests for get_closest_milestone."""
 
     @patch("rivaflow.core.services.milestone_service.StreakRepository")
-    @patch("rivaflow.core.services.milestone_service.SessionRepository")
+    @patch("rivaflow.core.services.milestone_service.TrainingCounterRepository")
     @patch("rivaflow.core.services.milestone_service.MilestoneRepository")
-    def test_returns_closest(self, MockMilestoneRepo, MockSessionRepo, MockStreakRepo):
+    def test_returns_closest(self, MockMilestoneRepo, MockCounterRepo, MockStreakRepo):
         """Should return milestone with highest percentage completion."""
-        MockSessionRepo.get_milestone_totals.return_value = {
+        MockCounterRepo.get.return_value = {
             "total_sessions": 95,
         }
         MockStreakRepo.return_value.get_streak.return_value = {"current_streak": 3}
@@ -244,13 +254,13 @@ class TestGetClosestMilestone:
         assert result["type"] == "total_sessions"
 
     @patch("rivaflow.core.services.milestone_service.StreakRepository")
-    @patch("rivaflow.core.services.milestone_service.SessionRepository")
+    @patch("rivaflow.core.services.milestone_service.TrainingCounterRepository")
     @patch("rivaflow.core.services.milestone_service.MilestoneRepository")
     def test_returns_none_when_no_upcoming(
-        self, MockMilestoneRepo, MockSessionRepo, MockStreakRepo
+        self, MockMilestoneRepo, MockCounterRepo, MockStreakRepo
     ):
         """Should return None when no upcoming milestones."""
-        MockSessionRepo.get_milestone_totals.return_value = {}
+        MockCounterRepo.get.return_value = {}
         MockStreakRepo.return_value.get_streak.return_value = {"current_streak": 0}
         MockMilestoneRepo.return_value.get_next_milestone.return_value = None
 
@@ -0,0 +1,103 @@
+"""Tests for PartnerRollIndex — one-pass partner grouping and cached loading."""
+
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from rivaflow.core.services.insights_data import compute_partner_progression
+from rivaflow.core.services.partner_index import PartnerRollIndex, get_partner_index
+from rivaflow.db.repositories.friend_repo import FriendRepository
+from rivaflow.db.repositories.session_repo import SessionRepository
+from rivaflow.db.repositories.session_roll_repo import SessionRollRepository
+
+
+def _roll(session_id, day, partner_id=None, partner_name=None, sf=0, sa=0):
+    return {
+        "session_id": session_id,
+        "session_date": date(2025, 1, day),
+        "partner_id": partner_id,
+        "partner_name": partner_name,
+        "submissions_for": [1] * sf,
+        "submissions_against": [1] * sa,
+    }
+
+
+class TestPartnerRollIndex:
+    """Tests for grouping and per-partner lookups."""
+
+    def test_merges_linked_and_unlinked_rolls_by_date(self):
+        index = PartnerRollIndex(
+            [
+                _roll(1, 1, partner_name="Alice"),
+                _roll(2, 3, partner_id=7),
+                _roll(3, 5, partner_name=" alice "),
+                _roll(4, 6, partner_id=8),
+            ]
+        )
+
+        rolls = index.rolls_for(7, "Alice")
+
+        assert [r["session_id"] for r in rolls] == [1, 2, 3]
+
+    def test_stats_count_linked_rolls_only(self):
+        index = PartnerRollIndex(
+            [
+                _roll(1, 1, partner_id=7, sf=2),
+                _roll(2, 2, partner_id=7, sa=1),
+                _roll(3, 3, partner_name="Alice", sf=5),
+            ]
+        )
+
+        stats = index.stats(7)
+
+        assert stats["total_rolls"] == 2
+        assert stats["total_submissions_for"] == 2
+        assert stats["sub_ratio"] == 2.0
+        assert index.stats(99)["total_rolls"] == 0
+
+    def test_index_cached_per_user(self):
+        roll_repo = MagicMock()
+        roll_repo.list_with_session_dates.return_value = []
+
+        first = get_partner_index(roll_repo, 1)
+        second = get_partner_index(roll_repo, 1)
+
+        assert first is second
+        roll_repo.list_with_session_dates.assert_called_once_with(1)
+
+
+def test_progression_loads_dates_without_per_roll_session_lookups(temp_db, test_user):
+    """Progression reads session dates from the joined roll load.
+
+    Rolls are logged by name (unlinked), the quick-log path progression merges in.
+    """
+    user_id = test_user["id"]
+    partner = FriendRepository.create(user_id=user_id, name="Alice")
+    for day in (10, 3, 20):
+        session_id = SessionRepository.create(
+            user_id=user_id,
+            session_date=date(2025, 1, day),
+            class_type="gi",
+            gym_name="Test Gym",
+        )
+        SessionRollRepository.create(
+            session_id=session_id,
+            user_id=user_id,
+            partner_name="Alice",
+            submissions_for=[1],
+        )
+
+    with patch.object(SessionRepository, "get_by_id") as get_by_id:
+        result = compute_partner_progression(
+            SessionRepository(),
+            SessionRollRepository(),
+            FriendRepository(),
+            user_id,
+            partner["id"],
+        )
+
+    get_by_id.assert_not_called()
+    assert [p["date"] for p in result["progression"]] == [
+        "2025-01-03",
+        "2025-01-10",
+        "2025-01-20",
+    ]
@@ -3,6 +3,7 @@
 from datetime import date
 from unittest.mock import MagicMock, patch
 
+from rivaflow.core.services.glossary_index import GlossaryIndex
 from rivaflow.core.services.performance_scoring import (
     calculate_daily_timeseries,
     calculate_performance_by_belt,
@@ -249,7 +250,7 @@ class TestComputeHeadToHead:
     """Tests for compute_head_to_head."""
 
     def test_returns_comparison(self):
-        """Should return stats for both partners."""
+        """Should return stats for both partners from one roll load."""
         mock_roll_repo = MagicMock()
         mock_friend_repo = MagicMock()
 
@@ -257,9 +258,28 @@ class TestComputeHeadToHead:
             {"name": "Alice", "belt_rank": "blue"},
             {"name": "Bob", "belt_rank": "purple"},
         ]
-        mock_roll_repo.get_partner_stats.side_effect = [
-            {"total_rolls": 10, "total_submissions_for": 5},
-            {"total_rolls": 8, "total_submissions_for": 3},
+        mock_roll_repo.list_with_session_dates.return_value = [
+            {
+                "session_id": 1,
+                "session_date": date(2025, 1, 1),
+                "partner_id": 2,
+                "submissions_for": [10, 11],
+                "submissions_against": [],
+            },
+            {
+                "session_id": 1,
+                "session_date": date(2025, 1, 1),
+                "partner_id": 3,
+                "submissions_for": [],
+                "submissions_against": [12],
+            },
+            {
+                "session_id": 2,
+                "session_date": date(2025, 1, 8),
+                "partner_id": 2,
+                "submissions_for": [],
+                "submissions_against": [12],
+            },
         ]
 
         result = compute_head_to_head(
@@ -268,7 +288,11 @@ class TestComputeHeadToHead:
 
         assert result["partner1"]["name"] == "Alice"
         assert result["partner2"]["name"] == "Bob"
-        assert result["partner1"]["total_rolls"] == 10
+        assert result["partner1"]["total_rolls"] == 2
+        assert result["partner1"]["total_submissions_for"] == 2
+        assert result["partner2"]["sub_ratio"] == 0
+        mock_roll_repo.list_with_session_dates.assert_called_once_with(1)
+        mock_roll_repo.get_partner_stats.assert_not_called()
 
     def test_returns_empty_when_partner_not_found(self):
         """Should return empty dict when a partner is missing."""
@@ -336,12 +360,11 @@ class TestComputePartnerRelationship:
         session_repo, roll_repo, friend_repo = self._repos(rolls, sessions)
 
         with patch(
-            "rivaflow.core.services.performance_scoring.GlossaryRepository"
-        ) as mock_glossary:
-            mock_glossary.return_value.list_all.return_value = [
-                {"id": 3, "name": "Armbar"},
-                {"id": 7, "name": "Triangle"},
-            ]
+            "rivaflow.core.services.performance_scoring.get_glossary_index",
+            return_value=GlossaryIndex(
+                [{"id": 3, "name": "Armbar"}, {"id": 7, "name": "Triangle"}]
+            ),
+        ):
             result = compute_partner_relationship(
                 session_repo, roll_repo, friend_repo, user_id=1, partner_id=2
             )
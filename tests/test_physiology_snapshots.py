@@ -0,0 +1,144 @@
+"""Tests for the stored physiology snapshots and the input versions that key them."""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+import rivaflow.core.services.physiology_service as ps
+from rivaflow.core.services.physiology_service import (
+    TZ,
+    PhysiologyService,
+    warm_snapshots,
+)
+from rivaflow.db.repositories.garmin_daily_repo import GarminDailyRepository
+from rivaflow.db.repositories.physiology_snapshot_repo import (
+    PhysiologySnapshotRepository,
+)
+from rivaflow.db.repositories.session_repo import SessionRepository
+
+
+def _ingest(user_id: int, days: int = 14, hrv: float = 40.0) -> None:
+    today = datetime.now(TZ).date()
+    GarminDailyRepository.upsert_many(
+        user_id,
+        [
+            {
+                "metric_date": (today - timedelta(days=i)).isoformat(),
+                "hrv_ms": hrv + i % 3,
+                "rhr": 55 + i % 2,
+                "sleep_hours": 7.5,
+            }
+            for i in range(days)
+        ],
+    )
+
+
+def _no_compute(monkeypatch):
+    monkeypatch.setattr(
+        PhysiologyService,
+        "_compute",
+        lambda *a: pytest.fail("recomputed a current snapshot"),
+    )
+
+
+def _version(user_id: int) -> int:
+    return PhysiologySnapshotRepository.get(user_id, date.today())[1]
+
+
+def test_live_result_is_stored_and_served(temp_db, test_user, monkeypatch):
+    user_id = test_user["id"]
+    _ingest(user_id)
+    first = PhysiologyService().get_physiology(user_id)
+    assert first["readiness"]["state"] != "Building"
+
+    _no_compute(monkeypatch)
+    assert PhysiologyService().get_physiology(user_id) == first
+
+
+def test_garmin_ingest_invalidates(temp_db, test_user):
+    user_id = test_user["id"]
+    _ingest(user_id)
+    before = PhysiologyService().get_physiology(user_id)
+
+    version = _version(user_id)
+    _ingest(user_id, days=1, hrv=90.0)
+    assert _version(user_id) == version + 1
+    after = PhysiologyService().get_physiology(user_id)
+    assert after["readiness"]["basis"] != before["readiness"]["basis"]
+
+
+def test_session_writes_bump_the_input_version(temp_db, test_user):
+    user_id = test_user["id"]
+    assert _version(user_id) == 0
+    session_id = SessionRepository.create(
+        user_id=user_id,
+        session_date=date.today(),
+        class_type="gi",
+        gym_name="Test Academy",
+    )
+    assert _version(user_id) == 1
+    SessionRepository.update(user_id, session_id, garmin_training_load=120.0)
+    assert _version(user_id) == 2
+    SessionRepository.delete(user_id, session_id)
+    assert _version(user_id) == 3
+
+
+def test_snapshot_is_keyed_by_day(temp_db, test_user):
+    user_id = test_user["id"]
+    today = datetime.now(TZ).date()
+    PhysiologySnapshotRepository.save(user_id, today, 0, {"date": "stored"})
+    assert PhysiologySnapshotRepository.get(user_id, today) == ({"date": "stored"}, 0)
+    assert PhysiologySnapshotRepository.get(user_id, today + timedelta(days=1)) == (
+        None,
+        0,
+    )
+
+
+def test_write_during_compute_leaves_snapshot_stale(temp_db, test_user, monkeypatch):
+    user_id = test_user["id"]
+    _ingest(user_id)
+    compute = PhysiologyService._compute
+
+    def racing(self, uid, today):
+        result = compute(self, uid, today)
+        _ingest(user_id, days=1, hrv=90.0)  # lands after the inputs were read
+        return result
+
+    monkeypatch.setattr(PhysiologyService, "_compute", racing)
+    PhysiologyService().get_physiology(user_id)
+    today = datetime.now(TZ).date()
+    assert PhysiologySnapshotRepository.get(user_id, today)[0] is None
+
+
+def test_explicit_day_and_injected_sources_bypass_snapshots(
+    temp_db, test_user, monkeypatch
+):
+    user_id = test_user["id"]
+    _ingest(user_id)
+    monkeypatch.setattr(
+        PhysiologySnapshotRepository,
+        "save",
+        staticmethod(lambda *a: pytest.fail("stored a non-live result")),
+    )
+    PhysiologyService().get_physiology(user_id, today=date(2026, 1, 5))
+    assert PhysiologyService(garmin_repo=GarminDailyRepository).snapshot_repo
+    assert PhysiologyService(session_repo=SessionRepository()).snapshot_repo is None
+
+
+def test_warm_snapshots_precomputes_stale_users(
+    temp_db, test_user, test_user2, monkeypatch
+):
+    _ingest(test_user["id"])
+    assert warm_snapshots() == 1
+    assert warm_snapshots() == 0
+
+    _ingest(test_user["id"], days=1, hrv=90.0)
+    _ingest(test_user2["id"])
+    assert warm_snapshots() == 2
+
+    _no_compute(monkeypatch)
+    assert PhysiologyService().get_physiology(test_user2["id"])["readiness"]
+    # A new local day makes every snapshot stale again
+    monkeypatch.undo()
+    tomorrow = datetime.now(TZ).date() + timedelta(days=1)
+    assert warm_snapshots(tomorrow) == 2
+    assert ps.PhysiologySnapshotRepository.get(test_user["id"], tomorrow)[0]
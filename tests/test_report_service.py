@@ -5,8 +5,10 @@ from datetime import date
 from pathlib import Path
 from unittest.mock import patch
 
+from rivaflow.core.services import report_service
 from rivaflow.core.services.report_service import ReportService
 from rivaflow.core.services.session_service import SessionService
+from rivaflow.db.repositories.profile_repo import ProfileRepository
 
 
 def test_get_week_dates(temp_db):
@@ -176,3 +178,192 @@ def test_calculate_rates(temp_db, test_user):
         assert abs(report["summary"]["subs_per_roll"] - 0.3) < 0.01  # 3/10
         assert abs(report["summary"]["taps_per_roll"] - 0.2) < 0.01  # 2/10
         assert abs(report["summary"]["sub_ratio"] - 1.5) < 0.01  # 3/2
+
+
+def test_closed_week_served_from_snapshot(temp_db, test_user):
+    """A closed week is stored on first read and reused until an edit touches it."""
+    service = ReportService()
+    session_service = SessionService()
+    session_id = session_service.create_session(
+        user_id=test_user["id"],
+        session_date=date(2025, 1, 21),
+        class_type="gi",
+        gym_name="Test Gym",
+        rolls=4,
+    )
+
+    first = service.generate_report(
+        test_user["id"], date(2025, 1, 20), date(2025, 1, 26)
+    )
+    stored = service.snapshot_repo.get(
+        test_user["id"], date(2025, 1, 20), date(2025, 1, 26)
+    )
+
+    assert stored is not None
+    assert stored["summary"] == first["summary"]
+    assert stored["start_date"] == date(2025, 1, 20)
+    assert stored["sessions"][0]["session_date"] == date(2025, 1, 21)
+
+    with patch.object(service, "_build_report") as build:
+        service.generate_report(test_user["id"], date(2025, 1, 20), date(2025, 1, 26))
+    build.assert_not_called()
+
+    # Moving the session out of the week drops the snapshot
+    session_service.update_session(
+        test_user["id"], session_id, session_date=date(2025, 2, 3)
+    )
+    assert (
+        service.snapshot_repo.get(test_user["id"], date(2025, 1, 20), date(2025, 1, 26))
+        is None
+    )
+
+    report = service.generate_report(
+        test_user["id"], date(2025, 1, 20), date(2025, 1, 26)
+    )
+    assert report["summary"]["total_sessions"] == 0
+
+
+def test_edit_outside_period_keeps_snapshot(temp_db, test_user):
+    """Only snapshots covering the edited date are invalidated."""
+    service = ReportService()
+    session_service = SessionService()
+    session_service.create_session(
+        user_id=test_user["id"],
+        session_date=date(2025, 1, 21),
+        class_type="gi",
+        gym_name="Test Gym",
+    )
+    service.generate_report(test_user["id"], date(2025, 1, 20), date(2025, 1, 26))
+    service.generate_report(test_user["id"], date(2025, 1, 1), date(2025, 1, 31))
+
+    session_service.create_session(
+        user_id=test_user["id"],
+        session_date=date(2025, 1, 29),
+        class_type="gi",
+        gym_name="Test Gym",
+    )
+
+    assert service.snapshot_repo.get(
+        test_user["id"], date(2025, 1, 20), date(2025, 1, 26)
+    )
+    assert (
+        service.snapshot_repo.get(test_user["id"], date(2025, 1, 1), date(2025, 1, 31))
+        is None
+    )
+
+
+def test_roll_only_edit_drops_snapshot(temp_db, test_user, monkeypatch):
+    """Replacing rolls invalidates the period even when no session field changes."""
+    # Best-effort scoring rewrites the row; don't let it mask the gap
+    monkeypatch.setattr(SessionService, "_score_session", lambda *a: None)
+    service = ReportService()
+    session_service = SessionService()
+    session_id = session_service.create_session(
+        user_id=test_user["id"],
+        session_date=date(2025, 1, 21),
+        class_type="gi",
+        gym_name="Test Gym",
+    )
+    service.generate_report(test_user["id"], date(2025, 1, 20), date(2025, 1, 26))
+
+    session_service.update_session(
+        test_user["id"],
+        session_id,
+        session_rolls=[{"roll_number": 1, "partner_name": "Alex"}],
+        preserve_review=True,
+    )
+
+    assert (
+        service.snapshot_repo.get(test_user["id"], date(2025, 1, 20), date(2025, 1, 26))
+        is None
+    )
+
+
+def test_snapshot_closed_period(temp_db, test_user):
+    """The rollover job materializes last week for users active in it."""
+    service = ReportService()
+    SessionService().create_session(
+        user_id=test_user["id"],
+        session_date=date(2025, 1, 22),
+        class_type="gi",
+        gym_name="Test Gym",
+    )
+
+    # Tuesday after the week of Jan 20-26
+    assert service.snapshot_closed_period("week", today=date(2025, 1, 28)) == 1
+    assert service.snapshot_closed_period("week", today=date(2025, 1, 28)) == 0
+    assert service.snapshot_repo.get(
+        test_user["id"], date(2025, 1, 20), date(2025, 1, 26)
+    )
+
+
+def test_custom_range_not_snapshotted(temp_db, test_user):
+    """Arbitrary ranges are computed and never stored."""
+    service = ReportService()
+
+    service.generate_report(test_user["id"], date(2025, 1, 3), date(2025, 1, 17))
+
+    assert (
+        service.snapshot_repo.get(test_user["id"], date(2025, 1, 3), date(2025, 1, 17))
+        is None
+    )
+
+
+def test_compare_periods_reads_closed_snapshots_in_one_query(temp_db, test_user):
+    """Month-over-month comparison fetches every stored period at once."""
+    service = ReportService()
+    session_service = SessionService()
+    for day in (date(2025, 1, 10), date(2025, 2, 12), date(2025, 2, 20)):
+        session_service.create_session(
+            user_id=test_user["id"],
+            session_date=day,
+            class_type="gi",
+            gym_name="Test Gym",
+        )
+    for month in (1, 2, 3):
+        service.generate_report(
+            test_user["id"], *service.get_month_dates(date(2025, month, 1))
+        )
+
+    get_many = service.snapshot_repo.get_many
+    with (
+        patch.object(
+            service.snapshot_repo, "get_many", side_effect=get_many
+        ) as batched,
+        patch.object(service.snapshot_repo, "get") as single,
+        patch.object(service, "_build_report") as build,
+    ):
+        periods = service.compare_periods(
+            test_user["id"], "month", 3, target_date=date(2025, 3, 15)
+        )
+
+    batched.assert_called_once()
+    single.assert_not_called()
+    build.assert_not_called()
+    assert [p["start_date"] for p in periods] == [
+        date(2025, 1, 1),
+        date(2025, 2, 1),
+        date(2025, 3, 1),
+    ]
+    assert [p["summary"]["total_sessions"] for p in periods] == [1, 2, 0]
+
+
+def test_compare_periods_defaults_to_profile_local_today(
+    temp_db, test_user, monkeypatch
+):
+    """Without target_date the newest period is the user's local today's."""
+    ProfileRepository.update(test_user["id"], timezone="Pacific/Kiritimati")
+    seen = []
+
+    def fake_today(tz=None):
+        seen.append(tz)
+        return date(2025, 3, 15)
+
+    monkeypatch.setattr(report_service, "today_in_tz", fake_today)
+    periods = ReportService().compare_periods(test_user["id"], "month", 2)
+
+    assert seen == ["Pacific/Kiritimati"]
+    assert periods[-1]["start_date"] == date(2025, 3, 1)
+
+    ReportService().compare_periods(test_user["id"], "month", 2, tz="Europe/Paris")
+    assert seen[-1] == "Europe/Paris"
@@ -0,0 +1,45 @@
+"""Integration tests for report endpoints."""
+
+from datetime import date
+
+from rivaflow.core.services.session_service import SessionService
+
+
+class TestCompareReports:
+    """Period comparison endpoint tests."""
+
+    def test_compare_requires_auth(self, client, temp_db):
+        """Test GET /api/v1/reports/compare requires auth."""
+        response = client.get("/api/v1/reports/compare")
+        assert response.status_code == 401
+
+    def test_compare_weeks_oldest_first(self, authenticated_client, test_user):
+        """Test weekly comparison returns one summary per week, oldest first."""
+        SessionService().create_session(
+            user_id=test_user["id"],
+            session_date=date(2025, 1, 14),
+            class_type="gi",
+            gym_name="Test Gym",
+        )
+
+        response = authenticated_client.get(
+            "/api/v1/reports/compare",
+            params={"period": "week", "count": 3, "target_date": "2025-01-22"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["period"] == "week"
+        assert [p["start_date"] for p in data["periods"]] == [
+            "2025-01-06",
+            "2025-01-13",
+            "2025-01-20",
+        ]
+        assert [p["summary"]["total_sessions"] for p in data["periods"]] == [0, 1, 0]
+
+    def test_compare_rejects_unknown_period(self, authenticated_client, test_user):
+        """Test only week and month periods are accepted."""
+        response = authenticated_client.get(
+            "/api/v1/reports/compare", params={"period": "year"}
+        )
+        assert response.status_code == 422
@@ -8,13 +8,16 @@ technique names were saved as free strings, never glossary movement IDs.
 
 from unittest.mock import patch
 
+from rivaflow.core.services.glossary_index import GlossaryIndex
 from rivaflow.core.services.grapple.session_extraction_service import (
     EXTRACTION_SYSTEM_PROMPT,
     normalize_class_type,
     resolve_movements,
 )
 
-_GLOSSARY = "rivaflow.db.repositories.GlossaryRepository"
+_GLOSSARY = (
+    "rivaflow.core.services.grapple.session_extraction_service.get_glossary_index"
+)
 
 _MOVEMENTS = [
     {"id": 3, "name": "Armbar", "aliases": '["Juji Gatame", "Arm Bar"]'},
@@ -55,8 +58,7 @@ class TestClassTypeNormalization:
 
 class TestMovementResolution:
     def _resolve(self, names):
-        with patch(_GLOSSARY) as repo:
-            repo.list_all.return_value = _MOVEMENTS
+        with patch(_GLOSSARY, return_value=GlossaryIndex(_MOVEMENTS)):
             return resolve_movements(names)
 
     def test_exact_and_case_insensitive_match(self):
@@ -157,3 +157,69 @@ class TestSessionRange:
         data = response.json()
         assert isinstance(data, list)
         assert len(data) == 0
+
+
+class TestSessionHRSeries:
+    """Per-session HR line endpoint tests."""
+
+    def test_hr_series_full_and_downsampled(
+        self, authenticated_client, test_user, session_factory
+    ):
+        """Test the HR line is served packed-and-decoded, and LTTB keeps the peak."""
+        session_id = session_factory()
+        series = [[i * 60, 100 + (i % 5)] for i in range(60)]
+        series[30][1] = 185
+        response = authenticated_client.put(
+            f"/api/v1/sessions/{session_id}", json={"garmin_hr_series": series}
+        )
+        assert response.status_code == 200
+
+        full = authenticated_client.get(f"/api/v1/sessions/{session_id}/hr-series")
+        assert full.status_code == 200
+        assert full.json() == {
+            "session_id": session_id,
+            "total_points": 60,
+            "points": series,
+        }
+
+        small = authenticated_client.get(
+            f"/api/v1/sessions/{session_id}/hr-series", params={"points": 12}
+        ).json()
+        assert len(small["points"]) == 12
+        assert small["points"][0] == series[0]
+        assert small["points"][-1] == series[-1]
+        assert [1800, 185] in small["points"]
+
+    def test_lists_skip_hr_series(
+        self, authenticated_client, test_user, session_factory
+    ):
+        """Test session lists no longer carry the HR line; the detail view still does."""
+        session_id = session_factory()
+        authenticated_client.put(
+            f"/api/v1/sessions/{session_id}",
+            json={"garmin_hr_series": [[0, 90], [60, 120]]},
+        )
+
+        listed = authenticated_client.get("/api/v1/sessions/").json()
+        assert listed[0]["garmin_hr_series"] is None
+        detail = authenticated_client.get(f"/api/v1/sessions/{session_id}").json()
+        assert detail["garmin_hr_series"] == [[0, 90], [60, 120]]
+
+    def test_unsorted_hr_series_is_stored_sorted(
+        self, authenticated_client, test_user, session_factory
+    ):
+        """Test samples sent out of order are accepted and stored by offset."""
+        session_id = session_factory()
+        response = authenticated_client.put(
+            f"/api/v1/sessions/{session_id}",
+            json={"garmin_hr_series": [[120, 130], [0, 90], [60, 120]]},
+        )
+        assert response.status_code == 200
+
+        full = authenticated_client.get(f"/api/v1/sessions/{session_id}/hr-series")
+        assert full.json()["points"] == [[0, 90], [60, 120], [120, 130]]
+
+    def test_hr_series_not_found(self, authenticated_client, test_user):
+        """Test a missing session returns 404."""
+        response = authenticated_client.get("/api/v1/sessions/999999/hr-series")
+        assert response.status_code == 404
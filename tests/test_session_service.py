@@ -4,6 +4,8 @@ from datetime import date
 from unittest.mock import patch
 
 from rivaflow.core.services.session_service import SessionService
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.session_repo import SessionRepository
 
 
 def test_create_session(temp_db, test_user):
@@ -305,3 +307,29 @@ def test_hr_series_roundtrip(temp_db, test_user):
 
         session = service.get_session(user_id=test_user["id"], session_id=session_id)
         assert session["garmin_hr_series"] == series
+
+
+def test_legacy_hr_series_json_is_packed(temp_db, test_user):
+    """Legacy JSON garmin_hr_series rows read back, and startup packing clears the text."""
+    session_id = SessionRepository.create(
+        user_id=test_user["id"],
+        session_date=date(2025, 1, 24),
+        class_type="gi",
+        gym_name="Test Gym",
+    )
+    with get_connection() as conn:
+        conn.cursor().execute(
+            convert_query("UPDATE sessions SET garmin_hr_series = ? WHERE id = ?"),
+            ("[[0, 92], [60, 118]]", session_id),
+        )
+
+    assert SessionRepository.get_hr_series(test_user["id"], session_id).pairs == [
+        [0, 92],
+        [60, 118],
+    ]
+    assert SessionRepository.pack_legacy_hr_series() == 1
+    assert SessionRepository.pack_legacy_hr_series() == 0
+
+    session = SessionRepository.get_by_id(test_user["id"], session_id)
+    assert session["garmin_hr_series"] == [[0, 92], [60, 118]]
+    assert "garmin_hr_packed" not in session
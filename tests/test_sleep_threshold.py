@@ -0,0 +1,106 @@
+"""Tests for the DB-backed, persisted personal sleep-threshold learner."""
+
+import json
+import random
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+import rivaflow.core.sleep_window as sw
+from rivaflow.db.repositories.whoop_repo import WhoopRepository
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    sw._clear_threshold_cache()
+    yield
+    sw._clear_threshold_cache()
+
+
+def _ingest_bimodal_nights(user_id: int, today: date, nights: int) -> None:
+    """One sample a minute, 18:00 -> 12:00 UTC: awake ~70 bpm around an asleep ~52 bpm block."""
+    rng = random.Random(user_id)
+    samples = []
+    for n in range(1, nights + 1):
+        start = datetime.combine(today - timedelta(days=n), datetime.min.time(), UTC)
+        start = start.replace(hour=18)
+        for minute in range(18 * 60):
+            asleep = 4 * 60 <= minute < 12 * 60
+            bpm = round(rng.gauss(52, 2) if asleep else rng.gauss(70, 3))
+            samples.append(
+                {"ts": (start + timedelta(minutes=minute)).isoformat(), "bpm": bpm}
+            )
+    WhoopRepository.ingest_hr(user_id, samples)
+
+
+def _reference_nights(user_id: int, today: date) -> list[dict[int, int]]:
+    """The old per-night path: hr_range + datetime bucketing, one query per night."""
+    nights = []
+    for n in range(1, 31):
+        start = datetime.combine(today - timedelta(days=n), datetime.min.time(), UTC)
+        start = start.replace(hour=18)
+        rows = WhoopRepository.hr_range(
+            user_id, start.isoformat(), (start + timedelta(hours=18)).isoformat()
+        )
+        med, _, _ = sw.bucket_hr([(r["ts"], r["bpm"]) for r in rows if r["bpm"]])
+        nights.append(med)
+    return nights
+
+
+def test_learns_from_one_stream_read_and_persists(temp_db, test_user, monkeypatch):
+    user_id = test_user["id"]
+    today = datetime.now(UTC).date()
+    _ingest_bimodal_nights(user_id, today, 20)
+    expected = sw.personal_threshold_offset(_reference_nights(user_id, today))
+    assert expected[1] == sw.LEARNED_VERSION
+
+    reads = []
+    original = WhoopRepository.hr_series
+    monkeypatch.setattr(
+        WhoopRepository,
+        "hr_series",
+        staticmethod(lambda *args: reads.append(args) or original(*args)),
+    )
+    assert sw.personal_threshold_for_user(user_id) == expected
+    assert len(reads) == 1
+
+    stored = WhoopRepository.get_sleep_threshold(
+        user_id, datetime.now(UTC) - timedelta(hours=1)
+    )
+    assert stored["offset_bpm"] == pytest.approx(expected[0])
+    assert stored["version"] == sw.LEARNED_VERSION
+    assert stored["nights_used"] == 20
+
+    # Another worker (empty process cache) serves the persisted row without re-learning
+    sw._clear_threshold_cache()
+    monkeypatch.setattr(
+        sw, "_learning_nights", lambda *a: pytest.fail("re-learned a fresh threshold")
+    )
+    assert sw.personal_threshold_for_user(user_id) == expected
+
+
+def test_complete_rollups_supply_their_nights(temp_db, test_user, monkeypatch):
+    user_id = test_user["id"]
+    today = datetime.now(UTC).date()
+    night = today - timedelta(days=3)
+    medians = {0: 60, 1: 61}
+    WhoopRepository.upsert_daily_agg(
+        user_id,
+        night.isoformat(),
+        json.dumps({sw.NIGHT_BUCKETS_KEY: medians}),
+        "test",
+        0,
+        True,
+    )
+    nights = [today - timedelta(days=n) for n in range(30, 0, -1)]
+
+    learned = sw._learning_nights(user_id, nights, sw.ZoneInfo("UTC"))
+    assert learned[nights.index(night)] == medians
+    assert sum(1 for m in learned if m) == 1
+
+
+def test_failure_falls_back_to_floor(temp_db, test_user, monkeypatch):
+    def boom(*args):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(WhoopRepository, "get_sleep_threshold", staticmethod(boom))
+    assert sw.personal_threshold_for_user(test_user["id"]) == (12.0, sw.FLOOR_VERSION)
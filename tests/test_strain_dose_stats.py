@@ -0,0 +1,108 @@
+"""Tests for the stored, incrementally updated strain dose-response statistics."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+import rivaflow.core.strain_fit as sf
+from rivaflow.db.repositories.whoop_repo import WhoopRepository
+
+DAY0 = date(2025, 1, 1)
+HISTORY_DAYS = 70
+
+
+def _history() -> tuple[list[dict], list[dict]]:
+    """Daily lnRMSSD and cardio load where a heavy day suppresses the next night's HRV."""
+    rng = random.Random(5)
+    rmssd, cardio = [], []
+    previous_load = 10.0
+    for i in range(HISTORY_DAYS):
+        day = (DAY0 + timedelta(days=i)).isoformat()
+        load = rng.uniform(4, 18)
+        ln = 4.0 + rng.gauss(0, 0.08) - 0.02 * (previous_load - 10)
+        rmssd.append({"day": day, "ln_rmssd": ln})
+        cardio.append({"day": day, "cardio_load": load})
+        previous_load = load
+    return rmssd, cardio
+
+
+@pytest.fixture
+def history(monkeypatch):
+    """Serve the synthetic history through the rollup reader, honouring its window, and count reads."""
+    rmssd, cardio = _history()
+    reads = []
+
+    def _completed_history(user_id, through, days):
+        end = through + timedelta(days=1)
+        start = end - timedelta(days=days - 1)
+        reads.append(days)
+
+        def window(rows):
+            return [r for r in rows if start <= date.fromisoformat(r["day"]) <= end]
+
+        return window(rmssd), window(cardio)
+
+    monkeypatch.setattr(sf, "_completed_history", _completed_history)
+    return reads
+
+
+def _as_tuple(stats: dict) -> dict:
+    return {
+        state: (st.n, st.sx, st.sy, st.sxy, st.sxx, st.syy, st.samples)
+        for state, st in stats.items()
+    }
+
+
+def test_daily_updates_match_a_full_refit(temp_db, test_user, history):
+    user_id = test_user["id"]
+    today = DAY0 + timedelta(days=20)
+    sf.update_strain_stats(user_id, today)  # first use = full refit
+    while today < DAY0 + timedelta(days=HISTORY_DAYS):
+        today += timedelta(days=1)
+        incremental = sf.update_strain_stats(user_id, today)
+
+    refit = sf.refit_strain_stats(user_id, today)
+    for state, values in _as_tuple(incremental).items():
+        assert values == pytest.approx(_as_tuple(refit)[state])
+    assert sum(st.samples for st in refit.values()) > 20
+
+    rows = WhoopRepository.get_strain_dose_stats(user_id)
+    assert len(rows) == 4
+    assert {str(r["last_day"])[:10] for r in rows} == {
+        (today - timedelta(days=sf.FOLD_LAG_DAYS)).isoformat()
+    }
+
+
+def test_up_to_date_stats_are_read_without_history(temp_db, test_user, history):
+    user_id = test_user["id"]
+    today = DAY0 + timedelta(days=40)
+    first = sf.stored_strain_policy(user_id, today)
+    reads = len(history)
+
+    again = sf.stored_strain_policy(user_id, today)
+    assert len(history) == reads
+    assert again["report"] == first["report"]
+    assert again["policy"].version == sf.FIT_VERSION
+
+    sf.stored_strain_policy(user_id, today + timedelta(days=1))
+    assert history[-1] == 1 + sf.LOOKBACK_DAYS + 1  # one new day plus context
+
+
+def test_version_change_forces_refit(temp_db, test_user, history, monkeypatch):
+    user_id = test_user["id"]
+    today = DAY0 + timedelta(days=40)
+    sf.update_strain_stats(user_id, today)
+    monkeypatch.setattr(sf, "STATS_VERSION", "dose-stats-test")
+
+    sf.update_strain_stats(user_id, today)
+    assert history[-1] == sf.FULL_FIT_DAYS + 1
+    assert {r["version"] for r in WhoopRepository.get_strain_dose_stats(user_id)} == {
+        "dose-stats-test"
+    }
+
+
+def test_policy_for_user_is_gated_by_env(temp_db, test_user, history):
+    user_id = test_user["id"]
+    assert sf.policy_for_user(user_id, env={}) is None
+    policy = sf.policy_for_user(user_id, env={sf.ENV_FLAG: "fitted"})
+    assert policy is not None and policy.version == sf.FIT_VERSION
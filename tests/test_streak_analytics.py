@@ -1,9 +1,35 @@
 """Unit tests for StreakAnalyticsService — consistency, streaks, milestones."""
 
 from datetime import date, timedelta
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from rivaflow.core.services.streak_analytics import StreakAnalyticsService
+from rivaflow.db.repositories.training_calendar_repo import CalendarYear, day_index
+
+_CALENDAR = "rivaflow.core.services.streak_analytics.TrainingCalendarRepository"
+
+
+def _empty_calendar_repo():
+    repo = MagicMock()
+    repo.return_value.get_years.side_effect = lambda user_id, years, types=None: {
+        y: CalendarYear(y) for y in years
+    }
+    return repo
+
+
+def _calendar_repo(days: dict[date, tuple[int, int, int]]):
+    """Calendar repo mock serving (sessions, intensity sum, minutes) per day."""
+    repo = _empty_calendar_repo()
+
+    def get_years(user_id, years, types=None):
+        calendars = {y: CalendarYear(y) for y in years}
+        for day, totals in days.items():
+            if day.year in calendars:
+                calendars[day.year].set_day(day_index(day), *totals)
+        return calendars
+
+    repo.return_value.get_years.side_effect = get_years
+    return repo
 
 
 def _make_session(
@@ -30,95 +56,16 @@ def _make_session(
     }
 
 
-class TestCalculateStreaks:
-    """Tests for _calculate_streaks (private but critical logic)."""
-
-    @patch("rivaflow.core.services.streak_analytics.SessionRepository")
-    @patch("rivaflow.core.services.streak_analytics.GradingRepository")
-    def test_empty_sessions_returns_zeros(self, MockGrading, MockSession):
-        """Should return (0, 0) for no sessions."""
-        service = StreakAnalyticsService()
-        current, longest = service._calculate_streaks([])
-
-        assert current == 0
-        assert longest == 0
-
-    @patch("rivaflow.core.services.streak_analytics.SessionRepository")
-    @patch("rivaflow.core.services.streak_analytics.GradingRepository")
-    def test_single_session_today(self, MockGrading, MockSession):
-        """Should return streak of 1 for a session today."""
-        today = date.today()
-        sessions = [_make_session(today)]
-
-        service = StreakAnalyticsService()
-        current, longest = service._calculate_streaks(sessions)
-
-        assert current == 1
-        assert longest == 1
-
-    @patch("rivaflow.core.services.streak_analytics.SessionRepository")
-    @patch("rivaflow.core.services.streak_analytics.GradingRepository")
-    def test_consecutive_days_streak(self, MockGrading, MockSession):
-        """Should correctly count consecutive day streaks."""
-        today = date.today()
-        sessions = [
-            _make_session(today),
-            _make_session(today - timedelta(days=1)),
-            _make_session(today - timedelta(days=2)),
-        ]
-
-        service = StreakAnalyticsService()
-        current, longest = service._calculate_streaks(sessions)
-
-        assert current == 3
-        assert longest == 3
-
-    @patch("rivaflow.core.services.streak_analytics.SessionRepository")
-    @patch("rivaflow.core.services.streak_analytics.GradingRepository")
-    def test_broken_streak(self, MockGrading, MockSession):
-        """Should detect a broken streak (gap in dates)."""
-        today = date.today()
-        sessions = [
-            _make_session(today),
-            _make_session(today - timedelta(days=1)),
-            # gap on day -2
-            _make_session(today - timedelta(days=3)),
-            _make_session(today - timedelta(days=4)),
-            _make_session(today - timedelta(days=5)),
-        ]
-
-        service = StreakAnalyticsService()
-        current, longest = service._calculate_streaks(sessions)
-
-        assert current == 2
-        assert longest == 3
-
-    @patch("rivaflow.core.services.streak_analytics.SessionRepository")
-    @patch("rivaflow.core.services.streak_analytics.GradingRepository")
-    def test_no_current_streak_when_gap_from_today(self, MockGrading, MockSession):
-        """Should return 0 current streak when last session was >1 day ago."""
-        today = date.today()
-        sessions = [
-            _make_session(today - timedelta(days=5)),
-            _make_session(today - timedelta(days=6)),
-        ]
-
-        service = StreakAnalyticsService()
-        current, longest = service._calculate_streaks(sessions)
-
-        assert current == 0
-        assert longest == 2
-
-
 class TestGetConsistencyAnalytics:
     """Tests for get_consistency_analytics."""
 
+    @patch(_CALENDAR, _empty_calendar_repo())
+    @patch("rivaflow.core.services.streak_analytics.StreakRepository")
     @patch("rivaflow.core.services.streak_analytics.SessionRepository")
     @patch("rivaflow.core.services.streak_analytics.GradingRepository")
-    def test_returns_expected_keys(self, MockGrading, MockSession):
+    def test_returns_expected_keys(self, MockGrading, MockSession, MockStreak):
         """Should return dict with all expected top-level keys."""
         MockSession.return_value.get_by_date_range.return_value = []
-        MockSession.return_value.get_recent.return_value = []
 
         service = StreakAnalyticsService()
         result = service.get_consistency_analytics(user_id=1)
@@ -128,9 +75,11 @@ class TestGetConsistencyAnalytics:
         assert "gym_breakdown" in result
         assert "streaks" in result
 
+    @patch(_CALENDAR, _empty_calendar_repo())
+    @patch("rivaflow.core.services.streak_analytics.StreakRepository")
     @patch("rivaflow.core.services.streak_analytics.SessionRepository")
     @patch("rivaflow.core.services.streak_analytics.GradingRepository")
-    def test_weekly_volume_aggregation(self, MockGrading, MockSession):
+    def test_weekly_volume_aggregation(self, MockGrading, MockSession, MockStreak):
         """Should group sessions by week."""
         today = date.today()
         sessions = [
@@ -138,7 +87,6 @@ class TestGetConsistencyAnalytics:
             _make_session(today - timedelta(days=1), duration_mins=90, rolls=8),
         ]
         MockSession.return_value.get_by_date_range.return_value = sessions
-        MockSession.return_value.get_recent.return_value = sessions
 
         service = StreakAnalyticsService()
         result = service.get_consistency_analytics(user_id=1)
@@ -146,9 +94,11 @@ class TestGetConsistencyAnalytics:
         total_sessions = sum(w["sessions"] for w in result["weekly_volume"])
         assert total_sessions == 2
 
+    @patch(_CALENDAR, _empty_calendar_repo())
+    @patch("rivaflow.core.services.streak_analytics.StreakRepository")
     @patch("rivaflow.core.services.streak_analytics.SessionRepository")
     @patch("rivaflow.core.services.streak_analytics.GradingRepository")
-    def test_class_type_distribution(self, MockGrading, MockSession):
+    def test_class_type_distribution(self, MockGrading, MockSession, MockStreak):
         """Should count sessions by class type."""
         today = date.today()
         sessions = [
@@ -157,7 +107,6 @@ class TestGetConsistencyAnalytics:
             _make_session(today - timedelta(days=2), class_type="gi"),
         ]
         MockSession.return_value.get_by_date_range.return_value = sessions
-        MockSession.return_value.get_recent.return_value = sessions
 
         service = StreakAnalyticsService()
         result = service.get_consistency_analytics(user_id=1)
@@ -166,9 +115,11 @@ class TestGetConsistencyAnalytics:
         assert dist["gi"] == 2
         assert dist["no-gi"] == 1
 
+    @patch(_CALENDAR, _empty_calendar_repo())
+    @patch("rivaflow.core.services.streak_analytics.StreakRepository")
     @patch("rivaflow.core.services.streak_analytics.SessionRepository")
     @patch("rivaflow.core.services.streak_analytics.GradingRepository")
-    def test_gym_breakdown(self, MockGrading, MockSession):
+    def test_gym_breakdown(self, MockGrading, MockSession, MockStreak):
         """Should count sessions by gym name."""
         today = date.today()
         sessions = [
@@ -177,7 +128,6 @@ class TestGetConsistencyAnalytics:
             _make_session(today - timedelta(days=2), gym_name="Alliance"),
         ]
         MockSession.return_value.get_by_date_range.return_value = sessions
-        MockSession.return_value.get_recent.return_value = sessions
 
         service = StreakAnalyticsService()
         result = service.get_consistency_analytics(user_id=1)
@@ -186,16 +136,34 @@ class TestGetConsistencyAnalytics:
         assert gym_map["Alliance"] == 2
         assert gym_map["Gracie Barra"] == 1
 
+    @patch(_CALENDAR, _empty_calendar_repo())
+    @patch("rivaflow.core.services.streak_analytics.StreakRepository")
+    @patch("rivaflow.core.services.streak_analytics.SessionRepository")
+    @patch("rivaflow.core.services.streak_analytics.GradingRepository")
+    def test_streaks_read_from_streak_state(self, MockGrading, MockSession, MockStreak):
+        """Should report the maintained training streak without scanning sessions."""
+        MockSession.return_value.get_by_date_range.return_value = []
+        MockStreak.return_value.get_streak.return_value = {
+            "current_streak": 4,
+            "longest_streak": 9,
+        }
+
+        service = StreakAnalyticsService()
+        result = service.get_consistency_analytics(user_id=1)
+
+        assert result["streaks"] == {"current": 4, "longest": 9}
+        MockStreak.return_value.get_streak.assert_called_once_with(1, "training")
+        MockSession.return_value.get_recent.assert_not_called()
+
 
 class TestGetTrainingFrequencyHeatmap:
     """Tests for get_training_frequency_heatmap."""
 
+    @patch(_CALENDAR, _empty_calendar_repo())
     @patch("rivaflow.core.services.streak_analytics.SessionRepository")
     @patch("rivaflow.core.services.streak_analytics.GradingRepository")
     def test_empty_calendar(self, MockGrading, MockSession):
         """Should return calendar with all zero counts when no sessions."""
-        MockSession.return_value.get_by_date_range.return_value = []
-
         service = StreakAnalyticsService()
         result = service.get_training_frequency_heatmap(
             user_id=1,
@@ -207,16 +175,14 @@ class TestGetTrainingFrequencyHeatmap:
         assert result["total_active_days"] == 0
         assert result["activity_rate"] == 0
 
+    @patch(
+        _CALENDAR,
+        _calendar_repo({date(2025, 1, 1): (1, 7, 60), date(2025, 1, 3): (2, 17, 90)}),
+    )
     @patch("rivaflow.core.services.streak_analytics.SessionRepository")
     @patch("rivaflow.core.services.streak_analytics.GradingRepository")
     def test_heatmap_with_sessions(self, MockGrading, MockSession):
-        """Should populate calendar with session data."""
-        sessions = [
-            _make_session(date(2025, 1, 1), intensity=7),
-            _make_session(date(2025, 1, 3), intensity=9),
-        ]
-        MockSession.return_value.get_by_date_range.return_value = sessions
-
+        """Should populate calendar from the stored training calendar."""
         service = StreakAnalyticsService()
         result = service.get_training_frequency_heatmap(
             user_id=1,
@@ -228,6 +194,12 @@ class TestGetTrainingFrequencyHeatmap:
         assert result["total_days"] == 3
         # activity_rate = 2/3 * 100 = 66.7
         assert result["activity_rate"] == 66.7
+        assert result["calendar"][2] == {
+            "date": "2025-01-03",
+            "count": 2,
+            "intensity": 8.5,
+        }
+        MockSession.return_value.get_by_date_range.assert_not_called()
 
 
 class TestGetMilestones:
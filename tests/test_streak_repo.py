@@ -0,0 +1,204 @@
+"""Tests for StreakRepository — incremental run state and gaps-and-islands rebuild."""
+
+from datetime import date, timedelta
+
+from rivaflow.db.repositories.session_repo import SessionRepository
+from rivaflow.db.repositories.streak_repo import (
+    StreakRepository,
+    _fold_runs,
+    _live_current,
+)
+
+
+def _run(start: date, length: int) -> tuple[date, date, int]:
+    """Build a (run_start, run_end, run_length) tuple."""
+    return (start, start + timedelta(days=length - 1), length)
+
+
+def _add_session(user_id: int, session_date: date) -> int:
+    return SessionRepository.create(
+        user_id=user_id,
+        session_date=session_date,
+        class_type="gi",
+        gym_name="Test Gym",
+    )
+
+
+class TestFoldRuns:
+    """Tests for the pure run-folding rules."""
+
+    def test_no_runs(self):
+        state = _fold_runs([])
+        assert state["current_streak"] == 0
+        assert state["longest_streak"] == 0
+        assert state["last_checkin_date"] is None
+
+    def test_single_run(self):
+        state = _fold_runs([_run(date(2025, 1, 1), 3)])
+        assert state["current_streak"] == 3
+        assert state["longest_streak"] == 3
+        assert state["streak_started_date"] == "2025-01-01"
+        assert state["last_checkin_date"] == "2025-01-03"
+
+    def test_one_day_gap_bridged_by_grace(self):
+        """A single missed day joins runs without counting the missed day."""
+        state = _fold_runs([_run(date(2025, 1, 1), 3), _run(date(2025, 1, 5), 2)])
+        assert state["current_streak"] == 5
+        assert state["streak_started_date"] == "2025-01-01"
+        assert state["grace_days_used"] == 0
+
+    def test_grace_exhausted_by_single_day_run(self):
+        """Two bridges with no consecutive day between them break the run."""
+        state = _fold_runs(
+            [
+                _run(date(2025, 1, 1), 2),
+                _run(date(2025, 1, 4), 1),
+                _run(date(2025, 1, 6), 2),
+            ]
+        )
+        assert state["current_streak"] == 2
+        assert state["longest_streak"] == 3
+        assert state["streak_started_date"] == "2025-01-06"
+
+    def test_longer_gap_resets(self):
+        state = _fold_runs([_run(date(2025, 1, 1), 4), _run(date(2025, 1, 10), 1)])
+        assert state["current_streak"] == 1
+        assert state["longest_streak"] == 4
+
+    def test_matches_incremental_rules(self):
+        """Folding runs agrees with replaying day-by-day check-ins."""
+        days = [date(2025, 1, d) for d in (1, 2, 4, 6, 7, 8, 10, 13, 14)]
+        current, grace, longest, last = 0, 0, 0, None
+        for d in days:
+            gap = (d - last).days if last else None
+            if gap == 1:
+                current, grace = current + 1, 0
+            elif gap == 2 and grace < 1:
+                current, grace = current + 1, grace + 1
+            else:
+                current, grace = 1, 0
+            longest = max(longest, current)
+            last = d
+
+        runs = []
+        for d in days:
+            if runs and (d - runs[-1][1]).days == 1:
+                start, _, length = runs[-1]
+                runs[-1] = (start, d, length + 1)
+            else:
+                runs.append((d, d, 1))
+        state = _fold_runs(runs)
+
+        assert state["current_streak"] == current
+        assert state["longest_streak"] == longest
+        assert state["grace_days_used"] == grace
+
+
+class TestLiveCurrent:
+    """Tests for read-time lapse detection."""
+
+    def test_alive_yesterday(self):
+        today = date(2025, 1, 10)
+        streak = {
+            "current_streak": 4,
+            "last_checkin_date": "2025-01-09",
+            "grace_days_used": 0,
+        }
+        assert _live_current(streak, today) == 4
+
+    def test_alive_on_grace_day(self):
+        today = date(2025, 1, 10)
+        streak = {
+            "current_streak": 4,
+            "last_checkin_date": "2025-01-08",
+            "grace_days_used": 0,
+        }
+        assert _live_current(streak, today) == 4
+
+    def test_lapsed_when_grace_used(self):
+        today = date(2025, 1, 10)
+        streak = {
+            "current_streak": 4,
+            "last_checkin_date": "2025-01-08",
+            "grace_days_used": 1,
+        }
+        assert _live_current(streak, today) == 0
+
+    def test_lapsed_after_long_gap(self):
+        today = date(2025, 1, 10)
+        streak = {
+            "current_streak": 4,
+            "last_checkin_date": "2025-01-01",
+            "grace_days_used": 0,
+        }
+        assert _live_current(streak, today) == 0
+
+
+class TestRebuildStreak:
+    """Tests for the SQL gaps-and-islands rebuild."""
+
+    def test_rebuild_from_sessions(self, temp_db, test_user):
+        today = date.today()
+        for offset in (0, 1, 2, 6, 7, 8, 9):
+            _add_session(test_user["id"], today - timedelta(days=offset))
+        # Duplicate day must not inflate the run
+        _add_session(test_user["id"], today)
+
+        streak = StreakRepository.rebuild_streak(test_user["id"], "training")
+
+        assert streak["current_streak"] == 3
+        assert streak["longest_streak"] == 4
+        assert streak["last_checkin_date"] == today.isoformat()
+        assert streak["streak_started_date"] == (today - timedelta(2)).isoformat()
+
+    def test_rebuild_with_no_history_resets(self, temp_db, test_user):
+        StreakRepository.update_streak(test_user["id"], "training", date.today())
+
+        streak = StreakRepository.rebuild_streak(test_user["id"], "training")
+
+        assert streak["current_streak"] == 0
+        assert streak["longest_streak"] == 0
+        assert streak["last_checkin_date"] is None
+
+    def test_backdated_checkin_rebuilds(self, temp_db, test_user):
+        """A check-in older than the last one is folded in from history."""
+        today = date.today()
+        for offset in (0, 2):
+            day = today - timedelta(days=offset)
+            _add_session(test_user["id"], day)
+            StreakRepository.update_streak(test_user["id"], "training", day)
+        # offset 2 arrived after today: before the rebuild this reset to 1
+        backfill = today - timedelta(days=1)
+        _add_session(test_user["id"], backfill)
+
+        streak = StreakRepository.update_streak(test_user["id"], "training", backfill)
+
+        assert streak["current_streak"] == 3
+        assert streak["last_checkin_date"] == today.isoformat()
+
+    def test_get_streak_reports_lapsed_run_as_zero(self, temp_db, test_user):
+        old_day = date.today() - timedelta(days=10)
+        StreakRepository.update_streak(test_user["id"], "training", old_day)
+
+        streak = StreakRepository.get_streak(test_user["id"], "training")
+
+        assert streak["current_streak"] == 0
+        assert streak["longest_streak"] == 1
+
+    def test_past_days_logged_in_order_extend_the_run(self, temp_db, test_user):
+        """Stored run length, not the lapsed live view, is what a check-in extends."""
+        first = date.today() - timedelta(weeks=6)
+        for offset in range(4):
+            streak = StreakRepository.update_streak(
+                test_user["id"], "training", first + timedelta(days=offset)
+            )
+        # Grace day: skip one, then log the next
+        StreakRepository.update_streak(
+            test_user["id"], "training", first + timedelta(days=5)
+        )
+
+        assert streak["current_streak"] == 0  # lapsed as of today
+        assert (
+            StreakRepository.get_streak(test_user["id"], "training")["longest_streak"]
+            == 5
+        )
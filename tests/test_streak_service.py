@@ -147,8 +147,8 @@ class TestGetStreakStatus:
     def test_returns_all_streak_types(self, MockRepo):
         """Should return all streak types and at_risk flag."""
         mock_repo = MockRepo.return_value
-        mock_repo.recalculate_checkin_streak.return_value = _make_streak(current=5)
         mock_repo.get_streak.side_effect = [
+            _make_streak(current=5),
             _make_streak(current=3),
             _make_streak(current=2),
         ]
@@ -161,12 +161,12 @@ class TestGetStreakStatus:
         assert "training" in result
         assert "readiness" in result
         assert result["any_at_risk"] is False
+        mock_repo.rebuild_streak.assert_not_called()
 
     @patch("rivaflow.core.services.streak_service.StreakRepository")
     def test_any_at_risk_true(self, MockRepo):
         """Should set any_at_risk=True when any streak is at risk."""
         mock_repo = MockRepo.return_value
-        mock_repo.recalculate_checkin_streak.return_value = _make_streak()
         mock_repo.get_streak.return_value = _make_streak()
         mock_repo.is_streak_at_risk.side_effect = [False, True, False]
 
@@ -226,3 +226,31 @@ class TestGetStreak:
         result = service.get_all_streaks(1)
 
         assert result == mock_all
+
+
+class TestRebuildStreaks:
+    """Tests for rebuild_streaks."""
+
+    @patch("rivaflow.core.services.streak_service.StreakRepository")
+    def test_rebuilds_training_by_default(self, MockRepo):
+        """Should rebuild only the training streak unless told otherwise."""
+        mock_repo = MockRepo.return_value
+        mock_repo.rebuild_streak.return_value = _make_streak(current=2)
+
+        service = StreakService()
+        result = service.rebuild_streaks(1)
+
+        assert result == {"training": _make_streak(current=2)}
+        mock_repo.rebuild_streak.assert_called_once_with(1, "training")
+
+    @patch("rivaflow.core.services.streak_service.StreakRepository")
+    def test_rebuilds_requested_types(self, MockRepo):
+        """Should rebuild each requested streak type."""
+        mock_repo = MockRepo.return_value
+        mock_repo.rebuild_streak.return_value = _make_streak()
+
+        service = StreakService()
+        result = service.rebuild_streaks(1, ("training", "checkin"))
+
+        assert set(result) == {"training", "checkin"}
+        assert mock_repo.rebuild_streak.call_count == 2
@@ -0,0 +1,131 @@
+"""Tests for the compact training calendar — bit metrics and write maintenance."""
+
+from datetime import date
+
+from rivaflow.core.services.streak_analytics import StreakAnalyticsService
+from rivaflow.core.services.training_calendar import TrainingCalendar, longest_run
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.session_repo import SessionRepository
+from rivaflow.db.repositories.training_calendar_repo import (
+    ALL_TYPES,
+    CalendarYear,
+    TrainingCalendarRepository,
+    day_index,
+)
+
+
+def _year(year: int, *days: date) -> CalendarYear:
+    calendar = CalendarYear(year)
+    for day in days:
+        calendar.set_day(day_index(day), 1, 3, 60)
+    return calendar
+
+
+def _stored(user_id: int, year: int) -> dict[str, tuple]:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            convert_query("""
+                SELECT year, class_type, trained_days, counts, intensity, minutes
+                FROM training_calendar WHERE user_id = ? AND year = ?
+                """),
+            (user_id, year),
+        )
+        rows = cursor.fetchall()
+    return {
+        row["class_type"]: (
+            (cal := CalendarYear.from_row(row)).trained,
+            cal.counts.tolist(),
+            cal.intensity.tolist(),
+            cal.minutes.tolist(),
+        )
+        for row in rows
+    }
+
+
+def _add_session(user_id: int, day: date, **kwargs) -> int:
+    fields = {"class_type": "gi", "gym_name": "Test Gym", "duration_mins": 60}
+    fields.update(kwargs)
+    return SessionRepository.create(user_id=user_id, session_date=day, **fields)
+
+
+class TestTrainingCalendarBits:
+    """Range stitching and consistency metrics over the bitset."""
+
+    def test_stitches_years_into_one_range(self):
+        calendar = TrainingCalendar(
+            date(2024, 12, 30),
+            date(2025, 1, 2),
+            {
+                2024: _year(2024, date(2024, 12, 30), date(2024, 12, 31)),
+                2025: _year(2025, date(2025, 1, 2)),
+            },
+        )
+
+        assert calendar.bits == 0b1011
+        assert calendar.active_days == 3
+        assert [count for _, count, _ in calendar.days()] == [1, 1, 0, 1]
+
+    def test_runs_gaps_and_weekly_days(self):
+        days = [date(2025, 3, d) for d in (1, 2, 3, 10, 11, 15)]
+        calendar = TrainingCalendar(
+            date(2025, 3, 1), date(2025, 3, 21), {2025: _year(2025, *days)}
+        )
+
+        metrics = calendar.consistency()
+
+        assert metrics["longest_run_days"] == 3
+        assert metrics["longest_gap_days"] == 6
+        assert metrics["weekly_days"] == [3, 2, 1]
+        assert metrics["days_per_week"] == 2.0
+
+    def test_longest_run(self):
+        assert longest_run(0) == 0
+        assert longest_run(0b1110111101) == 4
+
+
+class TestCalendarMaintenance:
+    """Session writes keep stored years equal to a rebuild from sessions."""
+
+    def test_create_update_delete_match_rebuild(self, temp_db, test_user):
+        user_id = test_user["id"]
+        _add_session(user_id, date(2025, 2, 1), intensity=4)
+        TrainingCalendarRepository.get_years(user_id, [2025])
+
+        moved = _add_session(user_id, date(2025, 2, 1), class_type="no-gi")
+        dropped = _add_session(user_id, date(2025, 2, 3), duration_mins=30)
+        SessionRepository.update(
+            user_id, moved, session_date=date(2025, 2, 5), duration_mins=45
+        )
+        SessionRepository.delete(user_id, dropped)
+
+        incremental = _stored(user_id, 2025)
+        TrainingCalendarRepository.rebuild_year(user_id, 2025)
+        rebuilt = _stored(user_id, 2025)
+
+        assert incremental == rebuilt
+        assert incremental[ALL_TYPES][0] == (
+            1 << day_index(date(2025, 2, 1)) | 1 << day_index(date(2025, 2, 5))
+        )
+
+    def test_heatmap_filters_by_class_type(self, temp_db, test_user):
+        user_id = test_user["id"]
+        _add_session(user_id, date(2025, 5, 1), intensity=2)
+        _add_session(user_id, date(2025, 5, 1), intensity=4, class_type="no-gi")
+        _add_session(user_id, date(2025, 5, 2), class_type="no-gi")
+
+        service = StreakAnalyticsService()
+        everything = service.get_training_frequency_heatmap(
+            user_id, date(2025, 5, 1), date(2025, 5, 2)
+        )
+        nogi = service.get_training_frequency_heatmap(
+            user_id, date(2025, 5, 1), date(2025, 5, 2), types=["no-gi"]
+        )
+
+        assert everything["calendar"][0] == {
+            "date": "2025-05-01",
+            "count": 2,
+            "intensity": 3.0,
+        }
+        assert nogi["calendar"][0]["count"] == 1
+        assert nogi["total_active_days"] == 2
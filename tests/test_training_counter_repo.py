@@ -0,0 +1,126 @@
+"""Tests for TrainingCounterRepository — incremental milestone counters."""
+
+from datetime import date
+from unittest.mock import patch
+
+from rivaflow.core.services.session_service import SessionService
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.session_repo import SessionRepository
+from rivaflow.db.repositories.training_counter_repo import TrainingCounterRepository
+
+
+def _add_session(user_id: int, **kwargs) -> int:
+    fields = {
+        "session_date": date(2025, 1, 15),
+        "class_type": "gi",
+        "gym_name": "Test Gym",
+        "duration_mins": 90,
+        "rolls": 4,
+        "submissions_for": 2,
+    }
+    fields.update(kwargs)
+    return SessionRepository.create(user_id=user_id, **fields)
+
+
+def _stored(user_id: int) -> dict:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            convert_query("""
+                SELECT sessions, total_mins, rolls, submissions, partners, techniques
+                FROM user_training_counters WHERE user_id = ?
+                """),
+            (user_id,),
+        )
+        return dict(cursor.fetchone())
+
+
+class TestTrainingCounters:
+    """Session writes keep the counters row in step with the sessions table."""
+
+    def test_first_read_builds_from_history(self, temp_db, test_user):
+        _add_session(test_user["id"])
+        _add_session(test_user["id"], duration_mins=30, rolls=0)
+
+        totals = TrainingCounterRepository.get(test_user["id"])
+
+        assert totals["sessions"] == 2
+        assert totals["hours"] == 2
+        assert totals["rolls"] == 4
+        assert totals["submissions"] == 4
+
+    def test_create_update_delete_apply_deltas(self, temp_db, test_user):
+        user_id = test_user["id"]
+        TrainingCounterRepository.get(user_id)
+
+        first = _add_session(user_id)
+        second = _add_session(user_id, rolls=6, submissions_for=1)
+        SessionRepository.update(user_id, first, duration_mins=60, rolls=5)
+        SessionRepository.delete(user_id, second)
+
+        assert _stored(user_id) == {
+            "sessions": 1,
+            "total_mins": 60,
+            "rolls": 5,
+            "submissions": 2,
+            "partners": 0,
+            "techniques": 0,
+        }
+
+    def test_rebuild_matches_incremental(self, temp_db, test_user):
+        user_id = test_user["id"]
+        TrainingCounterRepository.get(user_id)
+        service = SessionService()
+        session_id = service.create_session(
+            user_id=user_id,
+            session_date=date(2025, 1, 15),
+            class_type="gi",
+            gym_name="Test Gym",
+            rolls=3,
+            techniques=["armbar", "triangle"],
+        )
+        _add_session(user_id, duration_mins=45)
+        service.update_session(user_id, session_id, submissions_for=3)
+
+        incremental = _stored(user_id)
+        TrainingCounterRepository.rebuild(user_id)
+
+        assert _stored(user_id) == incremental
+        assert incremental["techniques"] == 2
+
+    def test_rebuild_all_zeroes_users_without_sessions(self, temp_db, test_user):
+        user_id = test_user["id"]
+        session_id = _add_session(user_id)
+        TrainingCounterRepository.get(user_id)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                convert_query("DELETE FROM sessions WHERE id = ?"), (session_id,)
+            )
+
+        TrainingCounterRepository.rebuild_all()
+
+        assert _stored(user_id)["sessions"] == 0
+
+    def test_failed_distinct_recount_does_not_fail_session_write(
+        self, temp_db, test_user
+    ):
+        user_id = test_user["id"]
+        TrainingCounterRepository.get(user_id)
+        service = SessionService()
+
+        with patch.object(
+            TrainingCounterRepository,
+            "refresh_distinct",
+            side_effect=RuntimeError("db down"),
+        ):
+            session_id = service.create_session(
+                user_id=user_id,
+                session_date=date(2025, 1, 15),
+                class_type="gi",
+                gym_name="Test Gym",
+                techniques=["armbar"],
+            )
+            assert service.delete_session(user_id, session_id) is True
+
+        assert _stored(user_id)["sessions"] == 0
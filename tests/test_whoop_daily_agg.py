@@ -0,0 +1,247 @@
+"""Tests for the whoop_daily_agg batch deriver."""
+
+import json
+import random
+from datetime import UTC, date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+import rivaflow.core.services.whoop_daily_agg as agg
+import rivaflow.core.sleep_window as sw
+from rivaflow.core.circadian import cosinor
+from rivaflow.core.rr_quality import assess_rr, ln_rmssd
+from rivaflow.db.repositories.whoop_repo import WhoopRepository
+from rivaflow.db.repositories.whoop_stream_repo import WhoopStreamRepository
+
+UTC_TZ = ZoneInfo("UTC")
+DAY0 = date(2025, 3, 1)
+NOW = datetime(2025, 3, 10, tzinfo=UTC)
+
+
+def _at(day: date, hour: int, seconds: float = 0) -> datetime:
+    return datetime.combine(day, datetime.min.time(), UTC) + timedelta(
+        hours=hour, seconds=seconds
+    )
+
+
+def _ingest_days(user_id: int, days: int) -> list[int]:
+    """HR once a minute around the clock, RR beats 00:00-01:00. Returns each night's RR values."""
+    rng = random.Random(11)
+    hr, rr, nights = [], [], []
+    for d in range(days):
+        day = DAY0 + timedelta(days=d)
+        for minute in range(24 * 60):
+            asleep = minute < 6 * 60 or minute >= 22 * 60
+            bpm = round(rng.gauss(52, 2) if asleep else rng.gauss(72, 4))
+            hr.append({"ts": _at(day, 0, minute * 60).isoformat(), "bpm": bpm})
+        t = 0.0
+        night = []
+        while t < 3600:
+            beat = round(rng.gauss(1050, 25))
+            rr.append({"ts": _at(day, 0, t).isoformat(), "rr_ms": beat})
+            night.append(beat)
+            t += beat / 1000
+        nights.append(night)
+    WhoopRepository.ingest_hr(user_id, hr)
+    WhoopRepository.ingest_rr(user_id, rr)
+    return nights
+
+
+def _refresh(user_id: int, days: int, **kwargs) -> dict:
+    return agg.refresh(
+        user_id,
+        DAY0,
+        DAY0 + timedelta(days=days - 1),
+        tz=UTC_TZ,
+        now=NOW,
+        **kwargs,
+    )
+
+
+def test_refresh_derives_each_day_once(temp_db, test_user):
+    user_id = test_user["id"]
+    nights = _ingest_days(user_id, 3)
+
+    assert _refresh(user_id, 4) == {"checked": 4, "recomputed": 3}
+    assert _refresh(user_id, 4) == {"checked": 4, "recomputed": 0}
+
+    rows = WhoopRepository.get_daily_agg_range(user_id, "2025-03-01", "2025-03-04")
+    assert [r["day"] for r in rows] == ["2025-03-01", "2025-03-02", "2025-03-03"]
+    assert all(r["deriver_version"] == agg.DERIVER_VERSION for r in rows)
+    assert all(r["complete"] for r in rows)
+
+    # Day 2's night (18:00 Mar 2 -> 12:00 Mar 3) holds Mar 3's 00:00-01:00 beats
+    metrics = json.loads(rows[1]["metrics_json"])
+    expected = ln_rmssd(assess_rr(nights[2]).cleaned)
+    assert metrics["ln_rmssd"] == pytest.approx(expected, abs=1e-4)
+    assert metrics["hr_samples"] == 24 * 60
+    assert 48 <= metrics["resting_hr"] <= 54
+    assert metrics["cardio_load"] > 0
+
+
+def test_late_samples_recompute_only_their_days(temp_db, test_user):
+    user_id = test_user["id"]
+    _ingest_days(user_id, 3)
+    _refresh(user_id, 3)
+
+    # 14:30:30 on Mar 3 lies only in Mar 3's day window (Mar 2's night ended at 12:00)
+    WhoopRepository.ingest_hr(
+        user_id,
+        [{"ts": _at(DAY0 + timedelta(days=2), 14, 1830).isoformat(), "bpm": 99}],
+    )
+    assert _refresh(user_id, 3)["recomputed"] == 1
+    row = WhoopRepository.get_daily_agg(user_id, "2025-03-03")
+    assert json.loads(row["metrics_json"])["hr_samples"] == 24 * 60 + 1
+
+
+def test_version_invalidation(temp_db, test_user, monkeypatch):
+    user_id = test_user["id"]
+    _ingest_days(user_id, 3)
+    _refresh(user_id, 3)
+
+    assert agg.invalidate(user_id, DAY0, DAY0) == 1
+    assert _refresh(user_id, 3)["recomputed"] == 1
+
+    monkeypatch.setattr(agg, "DERIVER_VERSION", "daily-agg-test")
+    assert _refresh(user_id, 3)["recomputed"] == 3
+
+
+def test_batched_staleness_uses_one_count_query(temp_db, test_user, monkeypatch):
+    user_id = test_user["id"]
+    _ingest_days(user_id, 2)
+    calls = []
+    original = WhoopStreamRepository.bucket_counts
+    monkeypatch.setattr(
+        WhoopStreamRepository,
+        "bucket_counts",
+        staticmethod(lambda *a: calls.append(a) or original(*a)),
+    )
+    monkeypatch.setattr(
+        WhoopRepository,
+        "hr_count_range",
+        staticmethod(lambda *a: pytest.fail("per-day COUNT")),
+    )
+    _refresh(user_id, 14)
+    assert len(calls) == 1
+
+
+def test_process_pool_matches_inline(temp_db, test_user, monkeypatch):
+    user_id = test_user["id"]
+    _ingest_days(user_id, 3)
+    monkeypatch.setattr(agg, "POOL_MIN_DAYS", 2)
+
+    _refresh(user_id, 3, workers=2)
+    pooled = WhoopRepository.get_daily_agg_range(user_id, "2025-03-01", "2025-03-03")
+    agg.invalidate(user_id)
+    _refresh(user_id, 3, workers=0)
+    inline = WhoopRepository.get_daily_agg_range(user_id, "2025-03-01", "2025-03-03")
+    assert [r["metrics_json"] for r in pooled] == [r["metrics_json"] for r in inline]
+
+
+def test_rollup_night_buckets_match_the_learner(temp_db, test_user):
+    user_id = test_user["id"]
+    _ingest_days(user_id, 3)
+    nights = [DAY0, DAY0 + timedelta(days=1)]
+    from_stream = sw._learning_nights(user_id, nights, UTC_TZ)
+
+    _refresh(user_id, 3)
+    from_rollups = sw._learning_nights(user_id, nights, UTC_TZ)
+    assert from_rollups == from_stream
+    assert len(from_stream[0]) >= sw.MIN_BUCKETS_PER_NIGHT
+
+
+def test_summaries_read_rollups_only(temp_db, test_user, monkeypatch):
+    user_id = test_user["id"]
+    _ingest_days(user_id, 3)
+    today = DAY0 + timedelta(days=4)
+    monkeypatch.setattr(agg, "user_tz", lambda _: UTC_TZ)
+    original = agg.refresh
+    monkeypatch.setattr(
+        agg, "refresh", lambda *a, **k: original(*a, **{**k, "now": NOW})
+    )
+    # Feb 28's night runs into Mar 1, so it has a rollup without any day-window HR
+    assert len(agg.daily_rollups(user_id, 7, today=today)) == 4
+
+    monkeypatch.setattr(
+        WhoopRepository, "hr_series", staticmethod(lambda *a: pytest.fail("raw read"))
+    )
+    rows = agg.daily_rollups(user_id, 7, today=today)
+    assert [r["day"] for r in rows][1:] == ["2025-03-01", "2025-03-02", "2025-03-03"]
+    assert rows[0]["hr_samples"] == 0 and rows[0]["resting_hr"] is not None
+    assert agg.NIGHT_BUCKETS_KEY not in rows[0]
+
+
+def test_circadian_rhythm_fits_from_rollup_sums(temp_db, test_user, monkeypatch):
+    user_id = test_user["id"]
+    _ingest_days(user_id, 9)
+    _refresh(user_id, 9)  # what the nightly backfill leaves stored
+    today = DAY0 + timedelta(days=8)
+    monkeypatch.setattr(agg, "user_tz", lambda _: UTC_TZ)
+    original = agg.refresh
+    monkeypatch.setattr(
+        agg, "refresh", lambda *a, **k: original(*a, **{**k, "now": NOW})
+    )
+    rhythm = agg.circadian_rhythm(user_id, days=9, window_days=7, today=today)
+    assert [w["end_day"] for w in rhythm["windows"]] == [
+        "2025-03-07",
+        "2025-03-08",
+        "2025-03-09",
+    ]
+
+    # The last window, refit from the raw samples
+    start = _at(DAY0 + timedelta(days=2), 0)
+    hr = WhoopRepository.hr_series(
+        user_id,
+        start.isoformat(),
+        (_at(today + timedelta(days=1), 0) - timedelta(seconds=1)).isoformat(),
+    )
+    start_ms = start.timestamp() * 1000
+    direct = cosinor(
+        [((ts - start_ms) / 3_600_000) % 24 for ts in hr.ts_ms], list(hr.values)
+    )
+    current = rhythm["current"]
+    assert {k: current[k] for k in direct} == pytest.approx(direct)
+    assert current["days_with_data"] == 7
+    # Asleep 22:00-06:00, so HR peaks mid-afternoon
+    assert 12 <= current["acrophase_hour"] <= 16
+    assert rhythm["drift"]["available"] is True
+    assert rhythm["drift"]["direction"] == "stable"
+
+    monkeypatch.setattr(
+        WhoopRepository, "hr_series", staticmethod(lambda *a: pytest.fail("raw read"))
+    )
+    assert agg.circadian_rhythm(user_id, days=9, window_days=7, today=today) == rhythm
+
+
+def test_backfill_derives_recent_days_of_active_users(temp_db, test_user, monkeypatch):
+    user_id = test_user["id"]
+    _ingest_days(user_id, 3)
+    monkeypatch.setattr(agg, "user_tz", lambda _: UTC_TZ)
+
+    assert agg.backfill(days=10, now=NOW, workers=0) == {"users": 1, "recomputed": 3}
+    assert agg.backfill(days=10, now=NOW, workers=0)["recomputed"] == 0
+
+
+def test_request_readers_never_start_the_pool(temp_db, test_user, monkeypatch):
+    user_id = test_user["id"]
+    monkeypatch.setattr(agg, "user_tz", lambda _: UTC_TZ)
+    seen = []
+    monkeypatch.setattr(agg, "refresh", lambda *a, **k: seen.append(k["workers"]))
+
+    agg.daily_rollups(user_id, 7, today=DAY0)
+    agg.daily_cosinor_sums(user_id, 7, today=DAY0)
+    assert seen == [0, 0]
+
+
+def test_year_long_cosinor_read_refreshes_only_recent_days(
+    temp_db, test_user, monkeypatch
+):
+    monkeypatch.setattr(agg, "user_tz", lambda _: UTC_TZ)
+    spans = []
+    monkeypatch.setattr(
+        agg, "refresh", lambda _, start, end, **k: spans.append((start, end))
+    )
+
+    daily = agg.daily_cosinor_sums(test_user["id"], 365, today=DAY0)
+    assert len(daily) == 365
+    assert spans == [(DAY0 - timedelta(days=agg.INLINE_REFRESH_DAYS - 1), DAY0)]
@@ -0,0 +1,123 @@
+"""Tests for the bulk raw-frame replay into the decoded WHOOP streams."""
+
+from datetime import UTC, datetime, timedelta
+
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.rebuild_whoop_streams import plan, rebuild
+from rivaflow.db.repositories.whoop_repo import WhoopRepository
+
+from rivaflow.db import rebuild_whoop_streams as rebuild_mod
+
+_T0 = datetime(2025, 3, 1, tzinfo=UTC)
+_PROPRIETARY = "fd4b0002-cce1-4033-93ce-002d5875f58a"
+
+
+def _frame(day: int, seconds: float, char_uuid: str, hex_: str) -> dict:
+    ts = _T0 + timedelta(days=day, seconds=seconds)
+    return {"ts": ts.isoformat(), "char_uuid": char_uuid, "hex": hex_}
+
+
+def _hr_frame(day: int, seconds: float, bpm: int, rr_ms: int) -> dict:
+    raw = round(rr_ms * 1024 / 1000)
+    return _frame(day, seconds, "2a37", f"10{bpm:02x}{raw & 0xFF:02x}{raw >> 8:02x}")
+
+
+def _ingest(user_id: int, days: int) -> None:
+    frames = []
+    for day in range(days):
+        frames += [_hr_frame(day, i * 60, 60 + day, 1000) for i in range(90)]
+        frames.append(_frame(day, 30, "2a19", "50"))
+        frames.append(_frame(day, 45, _PROPRIETARY, "aa01"))
+    WhoopRepository.ingest_raw_frames(user_id, frames)
+
+
+def _battery(user_id: int) -> list[dict]:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            convert_query(
+                "SELECT ts, soc, charging FROM whoop_battery WHERE user_id = ? ORDER BY ts"
+            ),
+            (user_id,),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+
+def test_rebuild_replaces_decoded_streams(temp_db, test_user):
+    user_id = test_user["id"]
+    _ingest(user_id, 2)
+    # Wrong phone-decoded HR inside a replayed day, and HR on a day with no raw frames
+    WhoopRepository.ingest_hr(
+        user_id,
+        [
+            {"ts": (_T0 + timedelta(seconds=7)).isoformat(), "bpm": 140},
+            {"ts": (_T0 + timedelta(days=5)).isoformat(), "bpm": 55},
+        ],
+    )
+    WhoopRepository.ingest_battery(
+        user_id,
+        [
+            {
+                "ts": (_T0 + timedelta(seconds=30)).isoformat(),
+                "soc": 20,
+                "charging": True,
+            }
+        ],
+    )
+
+    stats = rebuild(run_id="t1", workers=0)
+
+    assert stats["days"] == 2
+    assert (stats["frames"], stats["undecoded"]) == (184, 2)
+    assert (stats["hr"], stats["rr"], stats["battery"]) == (180, 180, 2)
+    assert stats["frames_per_sec"] > 0
+
+    day0 = WhoopRepository.hr_series(user_id, _T0, _T0 + timedelta(hours=23))
+    assert len(day0) == 90
+    assert set(day0.values) == {60}
+    untouched = _T0 + timedelta(days=5)
+    assert list(WhoopRepository.hr_series(user_id, untouched, untouched).values) == [55]
+    rr = WhoopRepository.rr_range_between(user_id, _T0, _T0 + timedelta(days=2))
+    assert {r["rr_ms"] for r in rr} == {1000}
+
+    battery = _battery(user_id)
+    assert [b["soc"] for b in battery] == [80, 80]
+    assert battery[0]["charging"] is True  # the phone's charging flag survives
+
+
+def test_rebuild_resumes_from_checkpoints(temp_db, test_user):
+    user_id = test_user["id"]
+    _ingest(user_id, 3)
+
+    assert len(plan("t2")) == 3
+    assert rebuild(run_id="t2", user_id=user_id, workers=0)["days"] == 3
+    assert plan("t2") == []
+    assert rebuild(run_id="t2", workers=0)["days"] == 0
+    assert rebuild(run_id="t3", workers=0)["days"] == 3
+
+
+def test_pool_matches_inline(temp_db, test_user, monkeypatch):
+    user_id = test_user["id"]
+    _ingest(user_id, 3)
+    rebuild(run_id="inline", workers=0)
+    inline = WhoopRepository.hr_series(user_id, _T0, _T0 + timedelta(days=3))
+
+    monkeypatch.setattr(rebuild_mod, "POOL_MIN_DAYS", 1)
+    stats = rebuild(run_id="pool", workers=2)
+    pooled = WhoopRepository.hr_series(user_id, _T0, _T0 + timedelta(days=3))
+    assert stats["days"] == 3
+    assert (list(pooled.ts_ms), list(pooled.values)) == (
+        list(inline.ts_ms),
+        list(inline.values),
+    )
+
+
+def test_proprietary_only_day_is_left_alone(temp_db, test_user):
+    user_id = test_user["id"]
+    WhoopRepository.ingest_raw_frames(user_id, [_frame(0, 10, _PROPRIETARY, "aa02")])
+    WhoopRepository.ingest_hr(user_id, [{"ts": _T0.isoformat(), "bpm": 58}])
+
+    stats = rebuild(run_id="t4", workers=0)
+
+    assert (stats["days"], stats["undecoded"]) == (1, 1)
+    assert list(WhoopRepository.hr_series(user_id, _T0, _T0).values) == [58]
@@ -0,0 +1,131 @@
+"""Tests for the chunked WHOOP HR/RR stream store."""
+
+from datetime import UTC, datetime, timedelta
+
+from rivaflow.db.compact_whoop_streams import compact_legacy_streams
+from rivaflow.db.database import convert_query, get_connection
+from rivaflow.db.repositories.whoop_repo import WhoopRepository
+from rivaflow.db.repositories.whoop_stream_repo import (
+    HR,
+    RR,
+    WhoopStreamRepository,
+    decode_chunk,
+    encode_chunk,
+    epoch_ms,
+)
+
+_T0 = datetime(2025, 3, 1, 22, 30, tzinfo=UTC)
+
+
+def _iso(seconds: float) -> str:
+    return (_T0 + timedelta(seconds=seconds)).isoformat()
+
+
+def _chunk_rows(user_id: int) -> list[dict]:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            convert_query("""
+                SELECT stream, bucket_start, n FROM whoop_stream_chunks
+                WHERE user_id = ? ORDER BY stream, bucket_start
+                """),
+            (user_id,),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+
+class TestChunkCodec:
+    """Delta + varint + zlib payloads round-trip exactly."""
+
+    def test_round_trip(self):
+        samples = [(0, 60), (1000, 61), (1000, 62), (3_599_999, 65535)]
+        offsets, values = decode_chunk(encode_chunk(samples), len(samples))
+        assert list(zip(offsets, values)) == samples
+
+    def test_empty_chunk(self):
+        offsets, values = decode_chunk(encode_chunk([]), 0)
+        assert len(offsets) == len(values) == 0
+
+    def test_epoch_ms_accepts_z_and_naive(self):
+        assert epoch_ms("2025-03-01T22:30:00Z") == epoch_ms(_T0)
+        assert epoch_ms(_T0.replace(tzinfo=None)) == epoch_ms(_T0)
+
+
+class TestStreamStore:
+    """Ingest merges idempotently into hourly chunks and range reads slice them."""
+
+    def test_hr_ingest_spans_hours_and_dedups(self, temp_db, test_user):
+        user_id = test_user["id"]
+        samples = [{"ts": _iso(i * 60), "bpm": 50 + i % 10} for i in range(120)]
+
+        assert WhoopRepository.ingest_hr(user_id, samples) == 120
+        # Retried batch with one conflicting value: the first bpm per ts wins
+        retry = samples[:10] + [{"ts": _iso(0), "bpm": 99}]
+        WhoopRepository.ingest_hr(user_id, retry)
+
+        chunks = _chunk_rows(user_id)
+        assert [c["n"] for c in chunks] == [30, 60, 30]
+        assert sum(c["n"] for c in chunks) == 120
+
+        series = WhoopRepository.hr_series(user_id, _iso(0), _iso(119 * 60))
+        assert len(series) == 120
+        assert series.values[0] == 50
+        assert list(series.ts_ms) == sorted(series.ts_ms)
+
+    def test_rr_keeps_distinct_values_at_same_ts(self, temp_db, test_user):
+        user_id = test_user["id"]
+        WhoopRepository.ingest_rr(
+            user_id,
+            [
+                {"ts": _iso(1), "rr_ms": 900},
+                {"ts": _iso(1), "rr_ms": 880},
+                {"ts": _iso(1), "rr_ms": 900},
+            ],
+        )
+        rows = WhoopRepository.rr_range_between(user_id, _iso(0), _iso(2))
+        assert [r["rr_ms"] for r in rows] == [880, 900]
+        assert rows[0]["ts"] == _T0 + timedelta(seconds=1)
+
+    def test_range_reads_and_counts_slice_boundary_chunks(self, temp_db, test_user):
+        user_id = test_user["id"]
+        WhoopRepository.ingest_hr(
+            user_id, [{"ts": _iso(i * 30), "bpm": 60} for i in range(600)]
+        )
+        start, end = _iso(45 * 60), _iso(4 * 3600)
+
+        rows = WhoopRepository.hr_range(user_id, start, end)
+        assert rows[0]["ts"] == _T0 + timedelta(minutes=45)
+        assert rows[-1]["ts"] == _T0 + timedelta(hours=4)
+        assert len(rows) == 391
+        assert WhoopRepository.hr_count_range(user_id, start, end) == 391
+        assert WhoopStreamRepository.count_range(user_id, RR, start, end) == 0
+
+    def test_compacts_legacy_rows(self, temp_db, test_user):
+        user_id = test_user["id"]
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                convert_query(
+                    "INSERT INTO whoop_hr (user_id, ts, bpm) VALUES (?, ?, ?)"
+                ),
+                [(user_id, _iso(i * 600), 55) for i in range(12)],
+            )
+            cursor.executemany(
+                convert_query(
+                    "INSERT INTO whoop_rr (user_id, ts, rr_ms) VALUES (?, ?, ?)"
+                ),
+                [(user_id, _iso(5), 1000), (user_id, _iso(5), 1010)],
+            )
+        WhoopRepository.ingest_hr(user_id, [{"ts": _iso(0), "bpm": 70}])
+
+        assert compact_legacy_streams() == {HR: 12, RR: 2}
+        assert compact_legacy_streams() == {HR: 0, RR: 0}
+
+        hr = WhoopRepository.hr_range(user_id, _iso(0), _iso(7200))
+        assert len(hr) == 12
+        assert hr[0]["bpm"] == 70  # the chunk's existing sample wins
+        assert len(WhoopRepository.rr_range_between(user_id, _iso(0), _iso(10))) == 2
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) AS n FROM whoop_hr")
+            assert cursor.fetchone()["n"] == 0